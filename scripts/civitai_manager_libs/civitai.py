@@ -1,7 +1,7 @@
 import os
-import json
 from typing import Optional, Dict, Any
 from . import settings
+from .json_store import get_json_store
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -439,8 +439,7 @@ def write_model_info(file, model_info: dict) -> bool:
         logger.debug(" write_model_info: model_info is None or empty")
         return False
     try:
-        with open(file, 'w') as f:
-            f.write(json.dumps(model_info, indent=4))
+        get_json_store().write(file, model_info)
         logger.debug(f" write_model_info: Successfully wrote model info to {file}")
     except Exception as e:
         logger.error(f" Exception in write_model_info: {e}")
@@ -460,8 +459,7 @@ def write_version_info(file, version_info: dict) -> bool:
         logger.debug(" write_version_info: version_info is None or empty")
         return False
     try:
-        with open(file, 'w') as f:
-            f.write(json.dumps(version_info, indent=4))
+        get_json_store().write(file, version_info)
         logger.debug(f" write_version_info: Successfully wrote version info to {file}")
     except Exception as e:
         logger.error(f" Exception in write_version_info: {e}")
@@ -571,8 +569,7 @@ def write_LoRa_metadata(filepath, version_info) -> bool:
     if notes:
         LoRa_metadata['notes'] = ", ".join(notes)
     try:
-        with open(filepath, 'w') as f:
-            json.dump(LoRa_metadata, f, indent=4)
+        get_json_store().write(filepath, LoRa_metadata)
         logger.debug(
             f"[civitai] write_LoRa_metadata: Successfully wrote LoRa metadata to {filepath}"
         )
@@ -3,7 +3,6 @@
 # through the compatibility layer.
 
 import datetime
-import os
 import gradio as gr
 
 from .error_handler import with_error_handling
@@ -620,7 +619,7 @@ def on_scan_new_version_btn(sc_types, progress=gr.Progress()):
     logger.debug(
         f"[civitai_shortcut_action] on_scan_new_version_btn called with sc_types: {sc_types}"
     )
-    model.update_downloaded_model()
+    model.refresh_downloaded_model()
     result = None
     scan_list = None
     shortlist = get_shortcut_list(sc_types, True)
@@ -639,10 +638,7 @@ def on_scan_new_version_btn(sc_types, progress=gr.Progress()):
                 if ishortcut.imageprocessor.is_sc_image(v['id']):
                     result.append(
                         (
-                            os.path.join(
-                                settings.shortcut_thumbnail_folder,
-                                f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                            ),
+                            settings.get_shortcut_thumbnail_file(v['id']),
                             settings.set_shortcutname(v['name'], v['id']),
                         )
                     )
@@ -1,47 +1,203 @@
-import os
-import json
+import threading
+from contextlib import contextmanager
 
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
 
-from . import settings
+from . import document_store
+
+
+class ClassificationStore:
+    """In-memory classification data with a model -> classifications index.
+
+    The stored classifications are re-read only when their storage stamp
+    changes. Changes are written immediately, or once at the end of a
+    ``batch()`` block.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = {}
+        self._members = {}
+        self._models = {}
+        self._order = {}
+        self._stamp = None
+        self._loaded = False
+        self._batch_depth = 0
+        self._dirty = False
+
+    def load(self) -> dict:
+        """Return a copy of the classifications, or None if there are none."""
+        with self._lock:
+            self._refresh()
+            if not self._data:
+                return None
+            return {
+                name: dict(cis, shortcuts=list(cis.get('shortcuts') or []))
+                for name, cis in self._data.items()
+            }
+
+    def save(self, CISC: dict) -> str:
+        """Replace the classifications and write them unless a batch is open."""
+        with self._lock:
+            data = {
+                name: dict(cis, shortcuts=list(cis.get('shortcuts') or []))
+                for name, cis in (CISC or {}).items()
+            }
+            self._set_data(data, self._stamp)
+            return self._changed()
+
+    def get_names(self) -> list:
+        with self._lock:
+            self._refresh()
+            return list(self._data)
+
+    def get(self, name) -> dict:
+        with self._lock:
+            self._refresh()
+            cis = self._data.get(name)
+            return dict(cis, shortcuts=list(cis.get('shortcuts') or [])) if cis else None
+
+    def get_names_by_modelid(self, modelid) -> list:
+        """Return the classifications containing a model, in classification order."""
+        with self._lock:
+            self._refresh()
+            names = self._models.get(str(modelid), ())
+            return sorted(names, key=self._order.__getitem__)
+
+    def add_shortcut(self, name, modelid) -> bool:
+        with self._lock:
+            self._refresh()
+            if name not in self._data:
+                return False
+            modelid = str(modelid)
+            if modelid not in self._members[name]:
+                self._data[name]['shortcuts'].append(modelid)
+                self._members[name].add(modelid)
+                self._models.setdefault(modelid, set()).add(name)
+                self._changed()
+            return True
+
+    def remove_shortcut(self, modelid) -> bool:
+        """Remove a model from every classification containing it."""
+        with self._lock:
+            self._refresh()
+            if not self._data:
+                return False
+            modelid = str(modelid)
+            names = self._models.pop(modelid, None)
+            if names:
+                for name in names:
+                    shortcuts = self._data[name]['shortcuts']
+                    while modelid in shortcuts:
+                        shortcuts.remove(modelid)
+                    self._members[name].discard(modelid)
+                self._changed()
+            return True
+
+    @contextmanager
+    def batch(self):
+        """Collect the changes made inside the block into a single file write."""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._write()
+
+    def _changed(self) -> str:
+        if self._batch_depth:
+            self._dirty = True
+            return ""
+        return self._write()
+
+    def _write(self) -> str:
+        self._dirty = False
+        document = document_store.get_document(document_store.CLASSIFICATIONS)
+        try:
+            document.write(self._data)
+        except Exception:
+            logger.error(f"Error when writing file: {document.location}")
+            # Re-read the file on next access
+            self._loaded = False
+            return ""
+        self._stamp = document.stamp()
+        self._loaded = True
+
+        output = f"Civitai Internet Shortcut Classification saved to: {document.location}"
+        logger.info(output)
+        return output
+
+    @staticmethod
+    def _file_stamp():
+        return document_store.get_document(document_store.CLASSIFICATIONS).stamp()
+
+    def _refresh(self) -> None:
+        if self._dirty:
+            # Pending batch changes win over the file
+            return
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+
+        if stamp is None:
+            self._set_data({}, None)
+            self._write()
+            return
+
+        data = None
+        document = document_store.get_document(document_store.CLASSIFICATIONS)
+        try:
+            data = document.read()
+        except Exception:
+            logger.debug(f"Unable to read classification file: {document.location}")
+        self._set_data(data if isinstance(data, dict) else {}, stamp)
+        self._loaded = True
+
+    def _set_data(self, data: dict, stamp) -> None:
+        data = {name: cis for name, cis in data.items() if isinstance(cis, dict)}
+        members = {}
+        models = {}
+        for name, cis in data.items():
+            if not isinstance(cis.get('shortcuts'), list):
+                cis['shortcuts'] = list(cis.get('shortcuts') or [])
+            members[name] = set(str(mid) for mid in cis['shortcuts'])
+            for mid in members[name]:
+                models.setdefault(mid, set()).add(name)
+        self._data = data
+        self._members = members
+        self._models = models
+        self._order = {name: position for position, name in enumerate(data)}
+        self._stamp = stamp
+
+
+_store = ClassificationStore()
+
+
+def batch():
+    """Context manager writing all classification changes made inside it once."""
+    return _store.batch()
 
 
 # ============================================================
 # =======================wrap=================================
 def get_classification_names_by_modelid(modelid):
-    c_name_list = list()
     if not modelid:
         return
 
-    CISC = load()
-    if CISC:
-        c_name_list = [k for k, v in CISC.items() if str(modelid) in v['shortcuts']]
-
-    return c_name_list
+    return _store.get_names_by_modelid(modelid)
 
 
 def clean_classification_shortcut(modelid):
-    CISC = load()
-    if CISC:
-        for cis in CISC.values():
-            if str(modelid) in cis['shortcuts']:
-                cis['shortcuts'].remove(str(modelid))
-
-        save(CISC)
-        return True
-    return False
+    return _store.remove_shortcut(modelid)
 
 
 def add_classification_shortcut(name, modelid):
     if name and len(name.strip()) > 0:
-        CISC = load()
-        if CISC:
-            if name in CISC:
-                CISC[name]['shortcuts'].append(str(modelid))
-                save(CISC)
-                return True
+        return _store.add_shortcut(name, modelid)
     return False
 
 
@@ -87,9 +243,9 @@ def get_classification_shortcuts(s_name):
         logger.warning(f"get_classification_shortcuts received list instead of string: {s_name}")
         return None
 
-    CISC = load()
-    if CISC and s_name in CISC:
-        return CISC[s_name]['shortcuts']
+    cis = _store.get(s_name)
+    if cis:
+        return cis['shortcuts']
 
     return None
 
@@ -124,11 +280,7 @@ def get_classification(s_name):
     if not s_name:
         return None
 
-    CISC = load()
-    if s_name in CISC:
-        return CISC[s_name]
-
-    return None
+    return _store.get(s_name)
 
 
 def get_classification_info(s_name):
@@ -140,22 +292,15 @@ def get_classification_info(s_name):
         logger.warning(f"get_classification_info received list instead of string: {s_name}")
         return None
 
-    CISC = load()
-    if CISC and s_name in CISC:
-        return CISC[s_name]['info']
+    cis = _store.get(s_name)
+    if cis:
+        return cis.get('info')
 
     return None
 
 
 def get_list():
-
-    CISC = load()
-
-    tmp_cisc_name = []
-    if CISC:
-        tmp_cisc_name = [k for k in CISC.keys()]
-
-    return tmp_cisc_name
+    return _store.get_names()
 
 
 # =========================================================
@@ -296,39 +441,11 @@ def update(CISC: dict, classification, name, info):
 
 
 def save(CISC: dict):
-    output = ""
-
-    # write to file
-    try:
-        with open(settings.shortcut_classification, 'w') as f:
-            json.dump(CISC, f, indent=4)
-    except Exception:
-        logger.error(f"Error when writing file: {settings.shortcut_classification}")
-        return output
-
-    output = f"Civitai Internet Shortcut Classification saved to: {settings.shortcut_classification}"
-    logger.info(output)
-    return output
+    return _store.save(CISC)
 
 
 def load() -> dict:
-    if not os.path.isfile(settings.shortcut_classification):
-        save({})
-        return
-
-    json_data = None
-    try:
-        with open(settings.shortcut_classification, 'r') as f:
-            json_data = json.load(f)
-    except Exception:
-        return None
-
-    # check error
-    if not json_data:
-        return None
-
-    # check for new key
-    return json_data
+    return _store.load()
 
 
 # =========================================================================
@@ -1,4 +1,3 @@
-import os
 import math
 import gradio as gr
 import datetime
@@ -631,7 +630,7 @@ def on_classification_gallery_loading(shortcuts, page=0):
     totals = 0
     max_page = 1
     cur_page = 1
-    ISC = ishortcut.shortcutcollectionmanager.load_shortcuts()
+    ISC = ishortcut.shortcutcollectionmanager.load_summaries()
     if not ISC:
         return None, gr.update(minimum=1), gr.update(visible=False)
 
@@ -663,10 +662,7 @@ def on_classification_gallery_loading(shortcuts, page=0):
                     else:
                         result_list.append(
                             (
-                                os.path.join(
-                                    settings.shortcut_thumbnail_folder,
-                                    f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                ),
+                                settings.get_shortcut_thumbnail_file(v['id']),
                                 settings.set_shortcutname(v['name'], v['id']),
                             )
                         )
@@ -753,8 +749,11 @@ def on_classification_clear_shortcut_btn_click():
 )
 def on_classification_create_btn_click(new_name, new_info, classification_shortcuts):
     current_time = datetime.datetime.now()
-    if classification.create_classification(new_name, new_info):
-        classification.update_classification_shortcut(new_name, classification_shortcuts)
+    with classification.batch():
+        created = classification.create_classification(new_name, new_info)
+        if created:
+            classification.update_classification_shortcut(new_name, classification_shortcuts)
+    if created:
         return (
             gr.update(value=new_name),
             gr.update(choices=classification.get_list(), value=new_name),
@@ -789,9 +788,10 @@ def on_classification_update_btn_click(select_name, new_name, new_info, classifi
 
     if select_name:
         # classification.update_classification_shortcut(select_name,new_shortcuts)
-        if classification.update_classification(select_name, new_name, new_info):
-            classification.update_classification_shortcut(new_name, classification_shortcuts)
-            chg_name = new_name
+        with classification.batch():
+            if classification.update_classification(select_name, new_name, new_info):
+                classification.update_classification_shortcut(new_name, classification_shortcuts)
+                chg_name = new_name
 
     current_time = datetime.datetime.now()
     return (
@@ -1,14 +1,13 @@
 import gradio as gr
 import math
-import os
 import datetime
 from typing import Optional
 
 from . import util
 from . import settings
-from . import model
 from . import classification
 import scripts.civitai_manager_libs.ishortcut_core as ishortcut
+from .sc_browser_page import get_downloaded_filter
 
 DOWNLOADED_MODEL = "Downloaded"
 NOT_DOWNLOADED_MODEL = "Not Downloaded"
@@ -394,11 +393,16 @@ def get_thumbnail_list(
 
     total = 0
     max_page = 1
-    shortcut_list = (
-        ishortcut.shortcutsearchfilter.get_filtered_shortcuts(
-            shortcut_types, search, shortcut_basemodels, sc_classifications
-        )
-        or []
+    downloaded, downloaded_ids = get_downloaded_filter(downloaded_sc)
+
+    shortcut_ids = ishortcut.shortcutsearchfilter.get_result_view(
+        shortcut_types,
+        search,
+        shortcut_basemodels,
+        sc_classifications,
+        downloaded,
+        downloaded_ids,
+        sort_by=settings.shortcut_browser_sort,
     )
     # ex_shortcuts 轉 id list
     if ex_shortcuts is not None and hasattr(ex_shortcuts, 'value'):
@@ -407,66 +411,17 @@ def get_thumbnail_list(
         ex_shortcuts = []
     shortlist = []
     result = []
-    if not shortcut_list:
+    if not shortcut_ids:
         return [], total, max_page
 
-    if downloaded_sc == DOWNLOADED_MODEL:
-        if model.Downloaded_Models:
-            downloaded_list = list()
-            for short in shortcut_list:
-                mid = short['id']
-                if str(mid) in model.Downloaded_Models.keys():
-                    downloaded_list.append(short)
-            shortcut_list = downloaded_list
-        else:
-            shortcut_list = None
-    elif downloaded_sc == NOT_DOWNLOADED_MODEL:
-        if model.Downloaded_Models:
-            downloaded_list = list()
-            for short in shortcut_list:
-                mid = short['id']
-                if str(mid) not in model.Downloaded_Models.keys():
-                    downloaded_list.append(short)
-            shortcut_list = downloaded_list
-
-    # if downloaded_sc:
-    #     if model.Downloaded_Models:
-    #         downloaded_list = list()
-    #         for short in shortcut_list:
-    #             mid = short['id']
-    #             if str(mid) in model.Downloaded_Models.keys():
-    #                 downloaded_list.append(short)
-    #         shortcut_list = downloaded_list
-    #     else:
-    #         shortcut_list = None
-
     # ex_shortcuts에 있는 shortcut은 제외한다.
     if ex_shortcuts:
-        ex_shortcut_list = []
-        for short in shortcut_list:
-            mid = short['id']
-            if str(mid) not in ex_shortcuts:
-                ex_shortcut_list.append(short)
-        shortcut_list = ex_shortcut_list
-
-    if shortcut_list:
-        total = len(shortcut_list)
-
-        # name 기준으로 정렬
-        shortcut_list = sorted(
-            shortcut_list, key=lambda x: x["name"].lower().strip(), reverse=False
-        )
-
-        # 등록일 기준으로 정렬
-        # strptime str을 datetime 형식으로 변환(스트링과 형식일치해야함)
-        # strftime datetime 형식을 str로 변환(스트링과 형식이 일치할필요는 없다.)
-        # shortcut_list = sorted(shortcut_list, key=lambda x: datetime.datetime.strptime(x["date"], '%Y-%m-%d %H:%M:%S').strftime('%Y-%m-%d'), reverse=True)
-        # shortcut_list = sorted(shortcut_list, key=lambda x: x["date"], reverse=True)
-        # shortcut_list = sorted(shortcut_list, key=lambda x: (x["date"], x['name']) , reverse=True)
-
-        shortlist = shortcut_list
+        ex_set = {str(mid) for mid in ex_shortcuts}
+        shortcut_ids = [mid for mid in shortcut_ids if mid not in ex_set]
 
+    total = len(shortcut_ids)
     if total > 0:
+        page_ids = shortcut_ids
         shortcut_count_per_page = columns * rows
         if shortcut_count_per_page > 0:
             max_page = math.ceil(total / shortcut_count_per_page)
@@ -475,18 +430,15 @@ def get_thumbnail_list(
         if page > 0 and shortcut_count_per_page > 0:
             item_start = shortcut_count_per_page * (page - 1)
             item_end = shortcut_count_per_page * page
-            if total < item_end:
-                item_end = total
-            shortlist = shortcut_list[item_start:item_end] if shortcut_list else []
-    else:
-        shortlist = []
+            page_ids = shortcut_ids[item_start:item_end]
+        shortlist = ishortcut.shortcutsearchfilter.get_summaries_by_ids(page_ids)
 
     if shortlist:
         result = []
         # 썸네일이 있는지 판단해서 대체 이미지 작업
         for v in shortlist:
             if v:
-                if ishortcut.imageprocessor.is_sc_image(v['id']):
+                if v.get('has_thumbnail') or ishortcut.imageprocessor.is_sc_image(v['id']):
                     if 'nsfw' in v.keys() and bool(v['nsfw']) and settings.nsfw_filter_enable:
                         result.append(
                             (
@@ -497,10 +449,7 @@ def get_thumbnail_list(
                     else:
                         result.append(
                             (
-                                os.path.join(
-                                    settings.shortcut_thumbnail_folder,
-                                    f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                ),
+                                settings.get_shortcut_thumbnail_file(v['id']),
                                 settings.set_shortcutname(v['name'], v['id']),
                             )
                         )
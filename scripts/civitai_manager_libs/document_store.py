@@ -0,0 +1,959 @@
+"""
+Storage backends for the shortcut, classification, recipe and URL backup data.
+
+Each collection is a JSON object keyed by model ID, classification name,
+recipe name or URL. Two backends are available, selected by the
+``shortcut_storage_backend`` setting:
+
+- ``json`` (default): one JSON file per collection, rewritten on every save;
+  with ``shortcut_storage_journal`` enabled saves append the changed entries
+  to a journal instead, which is folded into the file in the background
+- ``sqlite``: one row per entry in a SQLite database in WAL mode; saves
+  write only the entries that changed, in a single transaction, and readers
+  never block the writer
+
+When the SQLite backend first opens a collection it imports the existing JSON
+file. Switching the setting back makes the JSON backend write the collections
+changed in the database back to their files, and switching to SQLite again
+re-imports files edited meanwhile. ``migrate_to_sqlite()`` and
+``export_to_json()`` copy every collection explicitly.
+
+Every collection has a lock file next to its JSON file. ``get_lock()``
+returns a lock that is re-entrant within a thread and excludes other threads
+and other processes, so load -> modify -> save sequences can run as
+transactions.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from . import settings
+from .exceptions import StorageConflictError
+from .logging_config import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = get_logger(__name__)
+
+SHORTCUTS = 'shortcuts'
+CLASSIFICATIONS = 'classifications'
+RECIPES = 'recipes'
+URL_BACKUP = 'url_backup'
+
+# Settings attribute holding the JSON file of each collection
+_COLLECTION_FILES = {
+    SHORTCUTS: 'shortcut',
+    CLASSIFICATIONS: 'shortcut_classification',
+    RECIPES: 'shortcut_recipe',
+    URL_BACKUP: 'shortcut_civitai_internet_shortcut_url',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (collection, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_order ON entries (collection, position);
+CREATE TABLE IF NOT EXISTS collections (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS synced (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    stamp TEXT
+);
+"""
+
+
+# Journal size that triggers folding it into the JSON snapshot
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+_MISSING = object()
+
+# Seconds to wait for another writer to release a collection lock
+LOCK_TIMEOUT = 30.0
+
+# Seconds between attempts to take an OS file lock held by another process
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _encode(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def get_json_path(collection: str) -> str:
+    """Return the JSON file of a collection."""
+    return getattr(settings, _COLLECTION_FILES[collection])
+
+
+class FileLock:
+    """
+    Lock excluding other threads and processes, re-entrant within a thread.
+
+    The OS lock is taken on ``path`` when the owning thread first acquires the
+    lock and released when it leaves its outermost block.
+    """
+
+    def __init__(self, path: str, timeout: float = LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+        self._owner = None
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Acquire the lock.
+
+        Args:
+            timeout: Seconds to wait; the lock's default if omitted
+
+        Raises:
+            StorageConflictError: If the lock is not released in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        if not self._lock.acquire(timeout=max(timeout, 0)):
+            raise StorageConflictError(f"Timed out waiting for lock: {self.path}")
+        if self._depth == 0:
+            try:
+                self._handle = self._lock_file(deadline)
+            except BaseException:
+                self._lock.release()
+                raise
+            self._owner = threading.get_ident()
+        self._depth += 1
+
+    def release(self) -> None:
+        """Release one level of the lock held by the current thread."""
+        self._depth -= 1
+        if self._depth == 0:
+            handle, self._handle = self._handle, None
+            self._owner = None
+            try:
+                self._unlock_file(handle)
+            finally:
+                self._lock.release()
+        else:
+            self._lock.release()
+
+    def is_held(self) -> bool:
+        """Return True if the current thread holds the lock."""
+        return self._owner == threading.get_ident()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _lock_file(self, deadline: float):
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        handle = open(self.path, 'a+b')
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+                return handle
+            except OSError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    raise StorageConflictError(f"Timed out waiting for lock: {self.path}")
+                time.sleep(LOCK_POLL_INTERVAL)
+
+    @staticmethod
+    def _unlock_file(handle) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            logger.debug(f"[FileLock] Failed to unlock {handle.name}", exc_info=True)
+        finally:
+            handle.close()
+
+
+_locks: Dict[str, FileLock] = {}
+_locks_lock = threading.Lock()
+
+
+def get_lock(collection: str) -> FileLock:
+    """Get the lock serializing writers of a collection, in both backends."""
+    return _get_file_lock(get_json_path(collection))
+
+
+def _get_file_lock(json_path: str) -> FileLock:
+    path = f"{json_path}.lock"
+    with _locks_lock:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = FileLock(path)
+    return lock
+
+
+class JsonJournal:
+    """Append-only change log next to a JSON snapshot file.
+
+    Saves append one ``{"op": "set" | "del", "key": ..., "value": ...}`` line
+    per changed entry to ``<file>.journal`` instead of rewriting the snapshot.
+    Reads replay the journal over the snapshot; a line torn by a crash is
+    dropped, and cut off by the next writer. Once the journal outgrows
+    ``compact_bytes`` a background thread folds it into the snapshot. Records
+    are absolute values, so replaying a journal that was already folded in is
+    harmless.
+
+    Writers and the compactor hold the collection lock (see ``get_lock()``)
+    while they touch the files, so appends from other processes are not lost
+    and the files don't change under a transaction. It is taken before the
+    in-process lock.
+    """
+
+    def __init__(self, path: str, compact_bytes: int = None):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.compact_bytes = compact_bytes or JOURNAL_COMPACT_BYTES
+        self._lock = threading.RLock()
+        self._state: Optional[Dict] = None
+        self._stamp = None
+        self._compactor: Optional[threading.Thread] = None
+        self._torn = False
+
+    @property
+    def file_lock(self) -> FileLock:
+        """Return the collection lock guarding the snapshot and the journal."""
+        return _get_file_lock(self.path)
+
+    def stamp(self):
+        """Return (path, snapshot and journal marker, journal size), or None if both are missing."""
+        try:
+            snapshot = os.stat(self.path)
+            marker = f"{snapshot.st_mtime_ns}:{snapshot.st_size}"
+        except OSError:
+            snapshot = None
+            marker = "-"
+        try:
+            journal = os.stat(self.journal_path)
+        except OSError:
+            if snapshot is None:
+                return None
+            return (self.path, marker, 0)
+        return (self.path, f"{marker}:{journal.st_mtime_ns}", journal.st_size)
+
+    def has_journal(self) -> bool:
+        return os.path.exists(self.journal_path)
+
+    def read(self) -> Dict:
+        """Return the snapshot with the journal replayed; raises if both are missing."""
+        with self._lock:
+            data, state = self._load()
+            self._state = state
+            self._stamp = self.stamp()
+            return data
+
+    def write(self, data: Dict) -> int:
+        """
+        Append the entries that differ from the last known state.
+
+        Args:
+            data: Complete new collection
+
+        Returns:
+            Number of journal records appended
+        """
+        with self.file_lock, self._lock:
+            state = self._current_state()
+            lines = []
+            keys = set()
+            for key, value in data.items():
+                key = str(key)
+                keys.add(key)
+                if key in state and state[key] == value:
+                    continue
+                encoded = _encode(value)
+                lines.append(f'{{"op":"set","key":{_encode(key)},"value":{encoded}}}\n')
+                state[key] = json.loads(encoded)
+            for key in [key for key in state if key not in keys]:
+                lines.append(f'{{"op":"del","key":{_encode(key)}}}\n')
+                del state[key]
+            self._append(lines)
+            return len(lines)
+
+    def update(self, changes: Dict, removed: Iterable[str] = ()) -> None:
+        """Append records setting and removing single entries."""
+        with self.file_lock, self._lock:
+            state = self._current_state()
+            lines = []
+            for key, value in changes.items():
+                encoded = _encode(value)
+                lines.append(f'{{"op":"set","key":{_encode(str(key))},"value":{encoded}}}\n')
+                state[str(key)] = json.loads(encoded)
+            for key in removed:
+                if state.pop(str(key), _MISSING) is not _MISSING:
+                    lines.append(f'{{"op":"del","key":{_encode(str(key))}}}\n')
+            self._append(lines)
+
+    def replace(self, data: Dict) -> None:
+        """Rewrite the snapshot and drop the journal."""
+        with self.file_lock, self._lock:
+            with open(self.path, 'w') as f:
+                json.dump(data, f, indent=4)
+            if self.has_journal():
+                os.remove(self.journal_path)
+            self._state = None
+
+    def compact(self, wait: bool = True) -> None:
+        """Fold the journal into the snapshot, in the background unless ``wait``."""
+        if wait:
+            self._compact()
+            return
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self._compactor = threading.Thread(
+                target=self._compact, name="JsonJournalCompactor", daemon=True
+            )
+            self._compactor.start()
+
+    def _compact(self) -> None:
+        try:
+            self._compact_locked()
+        except StorageConflictError as e:
+            # The next append past the threshold tries again
+            logger.warning(f"[JsonJournal] Skipped compacting {self.path}: {e}")
+
+    def _compact_locked(self) -> None:
+        with self.file_lock, self._lock:
+            if not self.has_journal():
+                return
+            state = dict(self._current_state())
+            offset = os.path.getsize(self.journal_path)
+            snapshot = self._snapshot_marker()
+
+        # Appends continue while the snapshot is written
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"[JsonJournal] Failed to compact {self.path}: {e}")
+            return
+
+        with self.file_lock, self._lock:
+            if self._snapshot_marker() != snapshot or not self._journal_reaches(offset):
+                # Another process compacted or replaced the collection meanwhile
+                os.remove(tmp_path)
+                return
+            os.replace(tmp_path, self.path)
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                tail = f.read()
+            if tail:
+                journal_tmp = f"{self.journal_path}.tmp"
+                with open(journal_tmp, 'wb') as f:
+                    f.write(tail)
+                os.replace(journal_tmp, self.journal_path)
+            else:
+                os.remove(self.journal_path)
+            self._stamp = self.stamp()
+        logger.debug(f"[JsonJournal] Compacted {self.path}")
+
+    def _snapshot_marker(self):
+        try:
+            snapshot = os.stat(self.path)
+        except OSError:
+            return None
+        return (snapshot.st_mtime_ns, snapshot.st_size)
+
+    def _journal_reaches(self, offset: int) -> bool:
+        try:
+            return os.path.getsize(self.journal_path) >= offset
+        except OSError:
+            return False
+
+    def _current_state(self) -> Dict:
+        if self._state is None or self._stamp != self.stamp():
+            try:
+                _, self._state = self._load()
+            except FileNotFoundError:
+                self._state = {}
+            except ValueError as e:
+                logger.warning(f"[JsonJournal] Ignoring unreadable snapshot {self.path}: {e}")
+                self._state = {}
+        return self._state
+
+    def _load(self):
+        """Return two independent copies of the replayed collection."""
+        try:
+            with open(self.path, 'r') as f:
+                text = f.read()
+        except FileNotFoundError:
+            if not self.has_journal():
+                raise
+            text = "{}"
+        data = json.loads(text)
+        state = json.loads(text)
+        if not isinstance(data, dict):
+            return data, {}
+
+        self._torn = False
+        try:
+            with open(self.journal_path, 'rb') as f:
+                journal = f.read()
+        except FileNotFoundError:
+            return data, state
+
+        good = 0
+        for line in journal.splitlines(keepends=True):
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("incomplete record")
+                record = json.loads(line)
+                key = record['key']
+                if record['op'] == 'set':
+                    data[key] = record['value']
+                    state[key] = json.loads(line)['value']
+                else:
+                    data.pop(key, None)
+                    state.pop(key, None)
+            except (ValueError, KeyError, TypeError):
+                logger.warning(
+                    f"[JsonJournal] Dropping torn records at the end of {self.journal_path}"
+                )
+                # Readers leave the file alone; another process may be appending
+                self._torn = not self.file_lock.is_held()
+                if not self._torn:
+                    with open(self.journal_path, 'r+b') as f:
+                        f.truncate(good)
+                break
+            good += len(line)
+        return data, state
+
+    def _append(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        if self._torn:
+            # Cut the torn records off before appending after them
+            try:
+                self._load()
+            except (OSError, ValueError):
+                pass
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+        self._stamp = self.stamp()
+        if self._stamp and self._stamp[2] > self.compact_bytes:
+            self.compact(wait=False)
+
+
+_journals: Dict[str, JsonJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_journal(path: str) -> JsonJournal:
+    """Get or create the journal of a JSON file."""
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            journal = _journals[path] = JsonJournal(path)
+    return journal
+
+
+def is_journal_enabled() -> bool:
+    """Return True if JSON collections are saved through a journal."""
+    return bool(settings.shortcut_storage_journal)
+
+
+class JsonDocument:
+    """A collection stored as one JSON file, optionally with a change journal."""
+
+    def __init__(self, collection: str):
+        self.collection = collection
+
+    @property
+    def location(self) -> str:
+        """Return where the collection is stored, for messages."""
+        return get_json_path(self.collection)
+
+    def _journal(self, for_write: bool = False) -> Optional[JsonJournal]:
+        journal = get_journal(get_json_path(self.collection))
+        # A journal left behind by an earlier session is replayed even if disabled now
+        if (for_write and is_journal_enabled()) or journal.has_journal():
+            return journal
+        return None
+
+    def stamp(self):
+        """Return (path, change marker, size) of the file, or None if it is missing."""
+        path = get_json_path(self.collection)
+        journal = self._journal()
+        if journal is not None:
+            return journal.stamp()
+        try:
+            stat = os.stat(path)
+        except (OSError, TypeError):
+            return None
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+    def read(self):
+        """Return the parsed file; raises if it is missing or malformed."""
+        journal = self._journal()
+        if journal is not None:
+            return journal.read()
+        with open(get_json_path(self.collection), 'r') as f:
+            return json.load(f)
+
+    def write(self, data: Dict) -> None:
+        """Replace the collection, appending only the changes when journaling."""
+        journal = self._journal(for_write=True)
+        if journal is None:
+            with open(get_json_path(self.collection), 'w') as f:
+                json.dump(data, f, indent=4)
+        elif is_journal_enabled():
+            journal.write(data)
+        else:
+            journal.replace(data)
+
+    def update(self, changes: Dict, removed: Iterable[str] = ()) -> None:
+        """Set and remove single entries."""
+        if is_journal_enabled():
+            get_journal(get_json_path(self.collection)).update(changes, removed)
+            return
+        try:
+            data = self.read()
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        data.update(changes)
+        for key in removed:
+            data.pop(key, None)
+        self.write(data)
+
+
+class SQLiteStorage:
+    """SQLite database in WAL mode holding every collection, one row per entry."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Decoded rows as last written, per collection: (version, {key: [position, value]})
+        self._snapshots: Dict[str, tuple] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection of the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            parent = os.path.dirname(self.db_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the connection of the calling thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def version(self, collection: str) -> Optional[int]:
+        """Return the change counter of a collection, or None if it was never written."""
+        row = (
+            self.connection()
+            .execute("SELECT version FROM collections WHERE name = ?", (collection,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def read(self, collection: str) -> Dict:
+        """Return a collection in its stored order."""
+        rows = self.connection().execute(
+            "SELECT key, value FROM entries WHERE collection = ? ORDER BY position",
+            (collection,),
+        )
+        return {key: json.loads(value) for key, value in rows}
+
+    def get(self, collection: str, key: str):
+        """Return one entry, or None."""
+        row = (
+            self.connection()
+            .execute(
+                "SELECT value FROM entries WHERE collection = ? AND key = ?",
+                (collection, str(key)),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def write(self, collection: str, data: Dict, source: Optional[str] = None) -> int:
+        """
+        Replace a collection, writing only the entries that changed.
+
+        Args:
+            collection: Collection name
+            data: Complete new collection; its key order is kept
+            source: File the data was imported from, recorded for reference
+
+        Returns:
+            Number of rows inserted, updated or deleted
+        """
+        conn = self.connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = dict(self._snapshot(conn, collection))
+                snapshot = {}
+                upserts = []
+                keys = [str(key) for key in data]
+                last = float('-inf')
+                for index, (key, value) in enumerate(zip(keys, data.values())):
+                    old = stored.pop(key, None)
+                    position = old[0] if old and old[0] > last else None
+                    if position is None:
+                        # Place between the previous entry and the next kept one
+                        following = stored.get(keys[index + 1]) if index + 1 < len(keys) else None
+                        if last == float('-inf'):
+                            position = following[0] - 1 if following else 0.0
+                        elif following and following[0] - last > 1e-6:
+                            position = (last + following[0]) / 2
+                        else:
+                            position = last + 1
+                    if old is None or old[0] != position or old[1] != value:
+                        encoded = _encode(value)
+                        upserts.append((collection, key, position, encoded))
+                        # Keep a private copy; callers may mutate the written value
+                        snapshot[key] = [position, json.loads(encoded)]
+                    else:
+                        snapshot[key] = old
+                    last = position
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (collection, key, position, value) "
+                    "VALUES (?, ?, ?, ?)",
+                    upserts,
+                )
+                conn.executemany(
+                    "DELETE FROM entries WHERE collection = ? AND key = ?",
+                    [(collection, key) for key in stored],
+                )
+                version = self._bump(conn, collection, source)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._snapshots.pop(collection, None)
+                raise
+            self._snapshots[collection] = (version, snapshot)
+        return len(upserts) + len(stored)
+
+    def update(self, collection: str, changes: Dict, removed: Iterable[str] = ()) -> None:
+        """Set and remove single entries; new entries are appended."""
+        conn = self.connection()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, value in changes.items():
+                    row = conn.execute(
+                        "SELECT position FROM entries WHERE collection = ? AND key = ?",
+                        (collection, str(key)),
+                    ).fetchone()
+                    if row is None:
+                        row = conn.execute(
+                            "SELECT COALESCE(MAX(position) + 1, 0) FROM entries "
+                            "WHERE collection = ?",
+                            (collection,),
+                        ).fetchone()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (collection, key, position, value) "
+                        "VALUES (?, ?, ?, ?)",
+                        (collection, str(key), row[0], _encode(value)),
+                    )
+                conn.executemany(
+                    "DELETE FROM entries WHERE collection = ? AND key = ?",
+                    [(collection, str(key)) for key in removed],
+                )
+                self._bump(conn, collection)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._snapshots.pop(collection, None)
+
+    def migrate(self, collection: str, path: str, force: bool = False) -> bool:
+        """
+        Import a collection from its JSON file.
+
+        Args:
+            collection: Collection name
+            path: JSON file to import, with its journal replayed
+            force: Import even if the collection already exists in the database
+
+        Returns:
+            True if the file was imported
+        """
+        if not force and self.version(collection) is not None:
+            return False
+        try:
+            data = get_journal(path).read()
+        except FileNotFoundError:
+            return False
+        if not isinstance(data, dict):
+            logger.warning(f"[SQLiteStorage] Not importing {path}: not a JSON object")
+            return False
+        self.write(collection, data, source=path)
+        logger.info(f"[SQLiteStorage] Imported {len(data)} {collection} entries from {path}")
+        return True
+
+    def ensure_migrated(self, collection: str) -> None:
+        """Import the JSON file of a collection if it is missing here or was edited since."""
+        path = get_json_path(collection)
+        try:
+            synced = self._get_synced(collection)
+            version = self.version(collection)
+            edited = (
+                synced is not None
+                and synced[0] == version
+                and synced[1] != _encode(get_journal(path).stamp())
+            )
+            if version is None or edited:
+                if edited:
+                    logger.info(f"[SQLiteStorage] {path} changed since it was last synced")
+                if self.migrate(collection, path, force=True):
+                    self.mark_synced(collection)
+        except Exception as e:
+            logger.error(f"[SQLiteStorage] Failed to import {collection}: {e}")
+
+    def ensure_exported(self, collection: str) -> None:
+        """Write a collection back to its JSON file if it changed here since the last sync."""
+        try:
+            version = self.version(collection)
+            synced = self._get_synced(collection)
+            if version is None or (synced is not None and synced[0] == version):
+                return
+            if synced is None and not self._is_newer_than(get_json_path(collection)):
+                # Never synced before: keep a file edited after the database
+                return
+            count = self.export(collection, get_json_path(collection))
+            self.mark_synced(collection)
+            logger.info(f"[SQLiteStorage] Exported {count} {collection} entries to JSON")
+        except Exception as e:
+            logger.error(f"[SQLiteStorage] Failed to export {collection}: {e}")
+
+    def export(self, collection: str, path: str) -> int:
+        """Write a collection to a JSON file, dropping its journal; returns the entry count."""
+        data = self.read(collection)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=4)
+        os.replace(tmp_path, path)
+        journal = get_journal(path)
+        if journal.has_journal():
+            os.remove(journal.journal_path)
+        return len(data)
+
+    def mark_synced(self, collection: str) -> None:
+        """Record that the collection and its JSON file hold the same entries."""
+        stamp = get_journal(get_json_path(collection)).stamp()
+        self.connection().execute(
+            "INSERT OR REPLACE INTO synced (name, version, stamp) VALUES (?, ?, ?)",
+            (collection, self.version(collection), _encode(stamp)),
+        )
+
+    def _is_newer_than(self, path: str) -> bool:
+        """Return True if the database was modified after a JSON file and its journal."""
+        journal = get_journal(path)
+        mtimes = []
+        for file_path in (path, journal.journal_path):
+            try:
+                mtimes.append(os.stat(file_path).st_mtime_ns)
+            except OSError:
+                pass
+        if not mtimes:
+            return True
+        database = 0
+        for file_path in (self.db_path, f"{self.db_path}-wal"):
+            try:
+                database = max(database, os.stat(file_path).st_mtime_ns)
+            except OSError:
+                pass
+        return database > max(mtimes)
+
+    def _get_synced(self, collection: str) -> Optional[tuple]:
+        """Return (version, JSON file stamp) of the last import or export, or None."""
+        return (
+            self.connection()
+            .execute("SELECT version, stamp FROM synced WHERE name = ?", (collection,))
+            .fetchone()
+        )
+
+    def _snapshot(self, conn, collection: str) -> Dict[str, list]:
+        """Return the decoded rows of a collection, re-reading them if another writer changed it."""
+        row = conn.execute(
+            "SELECT version FROM collections WHERE name = ?", (collection,)
+        ).fetchone()
+        version = row[0] if row else None
+        cached = self._snapshots.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        return {
+            key: [position, json.loads(value)]
+            for key, position, value in conn.execute(
+                "SELECT key, position, value FROM entries WHERE collection = ?", (collection,)
+            )
+        }
+
+    @staticmethod
+    def _bump(conn, collection: str, source: Optional[str] = None) -> int:
+        conn.execute(
+            "INSERT INTO collections (name, version, source) VALUES (?, 1, ?) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1, "
+            "source = COALESCE(excluded.source, source)",
+            (collection, source),
+        )
+        return conn.execute(
+            "SELECT version FROM collections WHERE name = ?", (collection,)
+        ).fetchone()[0]
+
+
+class SQLiteDocument:
+    """A collection stored in a SQLiteStorage."""
+
+    def __init__(self, storage: SQLiteStorage, collection: str):
+        self.storage = storage
+        self.collection = collection
+
+    @property
+    def location(self) -> str:
+        """Return where the collection is stored, for messages."""
+        return f"{self.storage.db_path} ({self.collection})"
+
+    def stamp(self):
+        """Return (location, version, 0), or None if the collection does not exist."""
+        version = self.storage.version(self.collection)
+        if version is None:
+            return None
+        return (self.location, version, 0)
+
+    def read(self):
+        """Return the collection; raises FileNotFoundError if it does not exist."""
+        if self.storage.version(self.collection) is None:
+            raise FileNotFoundError(self.location)
+        return self.storage.read(self.collection)
+
+    def write(self, data: Dict) -> None:
+        """Replace the collection, writing only the changed entries."""
+        self.storage.write(self.collection, data)
+
+    def update(self, changes: Dict, removed: Iterable[str] = ()) -> None:
+        """Set and remove single entries."""
+        self.storage.update(self.collection, changes, removed)
+
+
+_storages: Dict[str, SQLiteStorage] = {}
+_storages_lock = threading.Lock()
+
+# Backend that last opened each collection in this process
+_opened_backends: Dict[str, str] = {}
+
+
+def get_sqlite_storage(db_path: Optional[str] = None) -> SQLiteStorage:
+    """Get or create the SQLite storage of a database file."""
+    db_path = db_path or settings.shortcut_database
+    with _storages_lock:
+        storage = _storages.get(db_path)
+        if storage is None:
+            storage = _storages[db_path] = SQLiteStorage(db_path)
+    return storage
+
+
+def is_sqlite_backend() -> bool:
+    """Return True if the SQLite backend is selected."""
+    return str(settings.shortcut_storage_backend or "").lower() == 'sqlite'
+
+
+def get_document(collection: str):
+    """Return the document of a collection in the selected backend.
+
+    The first time a backend opens a collection, and whenever the backend
+    setting changed since, the collection is brought over from the other one.
+    """
+    backend = 'sqlite' if is_sqlite_backend() else 'json'
+    if _opened_backends.get(collection) != backend:
+        if backend == 'sqlite':
+            with get_lock(collection):
+                get_sqlite_storage().ensure_migrated(collection)
+        elif os.path.exists(settings.shortcut_database):
+            with get_lock(collection):
+                get_sqlite_storage().ensure_exported(collection)
+        _opened_backends[collection] = backend
+    if backend == 'sqlite':
+        return SQLiteDocument(get_sqlite_storage(), collection)
+    return JsonDocument(collection)
+
+
+def migrate_to_sqlite(force: bool = False, db_path: Optional[str] = None) -> Dict[str, bool]:
+    """
+    Import every collection from its JSON file into the SQLite database.
+
+    Args:
+        force: Replace collections that already exist in the database
+        db_path: Database file; the configured one if omitted
+
+    Returns:
+        Whether each collection was imported
+    """
+    storage = get_sqlite_storage(db_path)
+    imported = {}
+    for collection in _COLLECTION_FILES:
+        imported[collection] = storage.migrate(collection, get_json_path(collection), force)
+        if imported[collection]:
+            storage.mark_synced(collection)
+    return imported
+
+
+def export_to_json(db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Write every collection of the SQLite database back to its JSON file.
+
+    Args:
+        db_path: Database file; the configured one if omitted
+
+    Returns:
+        Number of entries exported per collection
+    """
+    storage = get_sqlite_storage(db_path)
+    exported = {}
+    for collection in _COLLECTION_FILES:
+        if storage.version(collection) is not None:
+            exported[collection] = storage.export(collection, get_json_path(collection))
+            storage.mark_synced(collection)
+    return exported
@@ -33,6 +33,14 @@ class FileOperationError(CivitaiShortcutError):
     pass
 
 
+class StorageConflictError(FileOperationError):
+    """Stored data was changed by another writer during a transaction."""
+
+    def __init__(self, message: str, collection: Optional[str] = None, **kwargs):
+        super().__init__(message, **kwargs)
+        self.collection = collection
+
+
 class ConfigurationError(CivitaiShortcutError):
     """Configuration and settings related errors."""
 
@@ -0,0 +1,186 @@
+"""
+Parallel directory walker for model folders.
+
+Model folders may sit on network storage where every directory listing is a
+round trip, so ``FileWalker``:
+
+- Lists directories with ``os.scandir`` on a thread pool, several roots and
+  subdirectories at a time
+- Filters file names by extension and base name without splitting every name
+- Skips files and directories matching exclusion globs, without descending
+  into excluded directories
+- Keeps directory listings keyed by the directory's modification time, so a
+  rescan of an unchanged tree costs one ``stat`` per directory
+- Yields matching paths as soon as their directory has been listed
+
+Like ``os.walk``, symbolic links to directories are listed as entries but not
+descended into.
+"""
+
+import concurrent.futures
+import os
+import threading
+from collections import OrderedDict
+from fnmatch import fnmatch
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Directories listed concurrently
+MAX_WORKERS = 8
+
+# Directory listings kept for rescans
+MAX_CACHED_DIRS = 20000
+
+
+class FileWalker:
+    """Walks directory trees concurrently and yields matching files lazily."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS, max_cached_dirs: int = MAX_CACHED_DIRS):
+        self.max_workers = max_workers
+        self.max_cached_dirs = max_cached_dirs
+        self._lock = threading.Lock()
+        self._listings: "OrderedDict[str, Tuple[int, list, list]]" = OrderedDict()
+
+    def walk(
+        self,
+        roots: Iterable[str],
+        exts: Optional[Iterable[str]] = None,
+        bases: Optional[Iterable[str]] = None,
+        exclude: Optional[Iterable[str]] = None,
+    ) -> Iterator[str]:
+        """
+        Yield the files below the given roots.
+
+        Args:
+            roots: Directories to walk; relative paths are resolved against
+                the working directory
+            exts: File extensions including the dot, e.g. ``.safetensors``;
+                all files if omitted
+            bases: File names without extension; all names if omitted
+            exclude: Glob patterns matched against entry names and full paths
+
+        Yields:
+            Absolute paths of matching files, in no particular order across
+            directories and sorted by name within a directory
+        """
+        exts = tuple(exts) if exts else None
+        bases = set(bases) if bases else None
+        exclude = tuple(exclude) if exclude else ()
+
+        pending = set()
+        seen = set()
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="FileWalker"
+        )
+        try:
+            for root in roots or ():
+                if not root:
+                    continue
+                root = os.path.abspath(root)
+                if root not in seen:
+                    seen.add(root)
+                    pending.add(executor.submit(self._list, root))
+
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    directory, subdirs, files = future.result()
+                    for name in subdirs:
+                        path = os.path.join(directory, name)
+                        if path in seen or (exclude and self._is_excluded(name, path, exclude)):
+                            continue
+                        seen.add(path)
+                        pending.add(executor.submit(self._list, path))
+                    for name in files:
+                        if not self._matches(name, exts, bases):
+                            continue
+                        path = os.path.join(directory, name)
+                        if exclude and self._is_excluded(name, path, exclude):
+                            continue
+                        yield path
+        finally:
+            # Stops listing directories if the caller abandons the generator
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def invalidate(self, directory: Optional[str] = None) -> None:
+        """Forget the cached listing of a directory, or of all directories."""
+        with self._lock:
+            if directory is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(os.path.abspath(directory), None)
+
+    def _list(self, directory: str) -> Tuple[str, List[str], List[str]]:
+        """Return the subdirectories and files of a directory, from the cache if unchanged."""
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return directory, [], []
+
+        with self._lock:
+            cached = self._listings.get(directory)
+            if cached is not None and cached[0] == mtime:
+                self._listings.move_to_end(directory)
+                return directory, cached[1], cached[2]
+
+        subdirs = []
+        files = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(entry.name)
+                    elif not entry.is_symlink():
+                        # Like os.walk: symlinked directories are not descended into
+                        subdirs.append(entry.name)
+        except OSError as e:
+            logger.debug(f"[FileWalker] Cannot list {directory}: {e}")
+            return directory, [], []
+        subdirs.sort()
+        files.sort()
+
+        with self._lock:
+            self._listings[directory] = (mtime, subdirs, files)
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.max_cached_dirs:
+                self._listings.popitem(last=False)
+        return directory, subdirs, files
+
+    @staticmethod
+    def _matches(name: str, exts: Optional[tuple], bases: Optional[set]) -> bool:
+        if exts is not None and not name.endswith(exts):
+            return False
+        if exts is None and bases is None:
+            return True
+        base, ext = os.path.splitext(name)
+        if exts is not None and ext not in exts:
+            return False
+        return bases is None or base in bases
+
+    @staticmethod
+    def _is_excluded(name: str, path: str, patterns: tuple) -> bool:
+        return any(fnmatch(name, pattern) or fnmatch(path, pattern) for pattern in patterns)
+
+
+_global_file_walker = None
+_file_walker_lock = threading.Lock()
+
+
+def get_file_walker() -> FileWalker:
+    """Get or create the global file walker."""
+    global _global_file_walker
+
+    if _global_file_walker is None:
+        with _file_walker_lock:
+            if _global_file_walker is None:
+                _global_file_walker = FileWalker()
+    return _global_file_walker
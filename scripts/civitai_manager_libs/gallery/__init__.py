@@ -71,6 +71,12 @@ def on_send_to_recipe_click(model_id, img_file_info, img_index, civitai_images):
     )
 
 
+def on_img_file_info_change(img_file_info):
+    """Show which models referenced by the generation info are downloaded."""
+    _, _, data_processor, _, _ = get_gallery_components()
+    return data_processor.format_hash_references(img_file_info)
+
+
 def on_open_image_folder_click(modelid):
     """Open image folder handler - backward compatibility."""
     _, event_handlers, _, _, _ = get_gallery_components()
@@ -139,6 +145,12 @@ def on_refresh_gallery_change(images_url, progress=None):
     return event_handlers.handle_refresh_gallery_change(images_url, progress)
 
 
+def on_refresh_gallery_stream(images_url):
+    """Progressive refresh gallery handler."""
+    _, event_handlers, _, _, _ = get_gallery_components()
+    yield from event_handlers.handle_refresh_gallery_stream(images_url)
+
+
 def on_pre_loading_change(usergal_page_url, paging_information):
     """Pre-loading handler - backward compatibility."""
     _, event_handlers, _, _, _ = get_gallery_components()
@@ -295,6 +307,7 @@ __all__ = [
     'on_versions_list_select',
     'on_usergal_page_url_change',
     'on_refresh_gallery_change',
+    'on_refresh_gallery_stream',
     'on_pre_loading_change',
     'on_civitai_hidden_change',
     'format_civitai_metadata_to_auto1111',
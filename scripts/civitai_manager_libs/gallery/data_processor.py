@@ -304,6 +304,12 @@ class GalleryDataProcessor:
 
         return '\n'.join(lines)
 
+    def format_hash_references(self, png_info: str) -> str:
+        """Describe the downloaded state of the models referenced by generation info."""
+        from ..ishortcut_core.model_hash_index import format_hash_references
+
+        return format_hash_references(png_info)
+
     def store_page_metadata(self, image_data: List[Dict]) -> None:
         """Store image metadata for current page."""
         global _current_page_metadata
@@ -11,7 +11,7 @@ import shutil
 import time
 import threading
 import datetime
-from typing import List, Tuple, Optional, Callable
+from typing import Iterator, List, Tuple, Optional, Callable
 
 import gradio as gr
 
@@ -19,6 +19,8 @@ from ..error_handler import with_error_handling
 from ..exceptions import NetworkError, FileOperationError
 from ..logging_config import get_logger
 from ..http import get_http_client, ParallelImageDownloader
+from ..image_store import get_image_store
+from ..image_transcoder import get_image_transcoder
 from .. import settings
 from .. import util
 
@@ -65,11 +67,24 @@ class GalleryDownloadManager:
         logger.debug(f"Saving to: {save_path}")
         success = client.download_file(img_url, save_path)
         if success:
+            settings.discard_image_variants(save_path)
             logger.debug(f"Successfully downloaded image: {save_path}")
         else:
             logger.warning(f"Failed to download image: {img_url}")
         return success
 
+    def _fetch_image(self, img_url: str, save_path: str, client) -> bool:
+        """Fetch one image through the shared image store when it is enabled."""
+        store = get_image_store()
+        if store.enabled:
+            success = store.fetch(img_url, save_path, client)
+        else:
+            success = client.download_file(img_url, save_path)
+        if success:
+            settings.discard_image_variants(save_path)
+            get_image_transcoder().submit(save_path)
+        return success
+
     def download_images_parallel(
         self, dn_image_list: List[str], progress_callback: Optional[Callable] = None
     ) -> int:
@@ -120,7 +135,7 @@ class GalleryDownloadManager:
             for img_url in batch:
                 gallery_img_file = settings.get_image_url_to_gallery_file(img_url)
                 if gallery_img_file and not os.path.isfile(gallery_img_file):
-                    if client.download_file(img_url, gallery_img_file):
+                    if self._fetch_image(img_url, gallery_img_file, client):
                         success_count += 1
             time.sleep(0.5)
 
@@ -146,7 +161,7 @@ class GalleryDownloadManager:
                 continue
 
             logger.debug(f"Downloading image: {img_url}")
-            if gallery_img_file and client.download_file(img_url, gallery_img_file):
+            if gallery_img_file and self._fetch_image(img_url, gallery_img_file, client):
                 success_count += 1
                 logger.debug(f"Successfully downloaded: {gallery_img_file}")
             else:
@@ -291,6 +306,68 @@ class GalleryDownloadManager:
         # Use explicit update dict for compatibility with tests
         return None, None, {"__type__": "update", "visible": False}
 
+    def stream_gallery_images(self, images_url: List[str], min_interval: float = 0.2) -> Iterator:
+        """
+        Load gallery images progressively.
+
+        Yields the gallery lists first with a placeholder for every image that is
+        still downloading, then again as downloads complete (at most once per
+        ``min_interval`` seconds), so the grid fills in at the pace of the fastest
+        images. The pre-loading trigger is only updated by the final yield.
+
+        Args:
+            images_url: Gallery image URLs or local file paths
+            min_interval: Minimum seconds between intermediate updates
+
+        Yields:
+            (dn_image_list, image_list, pre_loading) tuples
+        """
+        if not images_url:
+            yield None, None, {"__type__": "update", "visible": False}
+            return
+
+        if not os.path.exists(settings.shortcut_gallery_folder):
+            os.makedirs(settings.shortcut_gallery_folder)
+
+        placeholder = settings.get_no_card_preview_image()
+        image_list = []
+        pending = {}
+        for index, img_url in enumerate(images_url):
+            result = util.is_url_or_filepath(img_url)
+            if result == "filepath":
+                image_list.append(img_url)
+            elif result == "url":
+                description_img = settings.get_image_url_to_gallery_file(img_url)
+                if description_img and os.path.isfile(description_img):
+                    image_list.append(description_img)
+                else:
+                    image_list.append(placeholder)
+                    if description_img:
+                        pending.setdefault((img_url, description_img), []).append(index)
+            else:
+                image_list.append(placeholder)
+
+        if pending:
+            yield list(image_list), list(image_list), {"__type__": "update"}
+
+            downloader = ParallelImageDownloader(max_workers=10)
+            # Show the first finished image right away, then throttle updates
+            last_yield = 0.0
+            for img_url, filepath, success in downloader.iter_download_images(
+                list(pending.keys()), get_http_client()
+            ):
+                if not success:
+                    continue
+                # The file may already have been transcoded in the background
+                local_path = settings.resolve_image_variant(filepath)
+                for index in pending[(img_url, filepath)]:
+                    image_list[index] = local_path
+                if time.monotonic() - last_yield >= min_interval:
+                    yield list(image_list), list(image_list), {"__type__": "update"}
+                    last_yield = time.monotonic()
+
+        yield list(image_list), list(image_list), datetime.datetime.now()
+
     def preload_next_page(self, usergal_page_url: str, paging_information: dict) -> None:
         """Preload images for next page in background."""
         if not settings.usergallery_preloading:
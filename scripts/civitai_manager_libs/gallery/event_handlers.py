@@ -406,6 +406,10 @@ class GalleryEventHandlers:
             progress = gr.Progress()
         return self.download_manager.load_gallery_images(images_url, progress)
 
+    def handle_refresh_gallery_stream(self, images_url: list):
+        """Handle refresh gallery action, yielding the gallery as images arrive."""
+        yield from self.download_manager.stream_gallery_images(images_url)
+
     def handle_pre_loading_change(self, usergal_page_url: str, paging_information: dict) -> None:
         """Handle pre-loading action."""
         return self.download_manager.preload_next_page(usergal_page_url, paging_information)
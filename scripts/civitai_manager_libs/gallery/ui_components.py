@@ -75,6 +75,7 @@ class GalleryUIComponents:
                             container=True,
                             show_copy_button=True,
                         )
+                        img_hash_references = gr.Markdown()
                         try:
                             parameters_copypaste = import_manager.get_webui_module(
                                 'extras', 'parameters_copypaste'
@@ -147,6 +148,7 @@ class GalleryUIComponents:
             hidden,
             info_tabs,
             img_file_info,
+            img_hash_references,
             usergal_images,
             usergal_images_url,
             paging_information,
@@ -177,6 +179,7 @@ class GalleryUIComponents:
         hidden,
         info_tabs,
         img_file_info,
+        img_hash_references,
         usergal_images,
         usergal_images_url,
         paging_information,
@@ -188,8 +191,9 @@ class GalleryUIComponents:
             on_gallery_select,
             on_open_image_folder_click,
             on_send_to_recipe_click,
+            on_img_file_info_change,
             on_download_images_click,
-            on_refresh_gallery_change,
+            on_refresh_gallery_stream,
             on_usergal_page_url_change,
             on_selected_model_id_change,
             on_versions_list_select,
@@ -209,6 +213,13 @@ class GalleryUIComponents:
         # Button clicks
         open_image_folder.click(on_open_image_folder_click, [selected_model_id], None)
 
+        img_file_info.change(
+            fn=on_img_file_info_change,
+            inputs=[img_file_info],
+            outputs=[img_hash_references],
+            show_progress=False,
+        )
+
         send_to_recipe.click(
             fn=on_send_to_recipe_click,
             inputs=[selected_model_id, img_file_info, img_index, usergal_images],
@@ -222,10 +233,12 @@ class GalleryUIComponents:
         )
 
         # Gallery refresh and loading
+        # Streamed so the grid fills in as images arrive instead of after the slowest one
         gallery = refresh_gallery.change(
-            fn=on_refresh_gallery_change,
+            fn=on_refresh_gallery_stream,
             inputs=[usergal_images_url],
             outputs=[usergal_gallery, usergal_images, pre_loading],
+            show_progress="minimal",
         )
 
         gallery_page = usergal_page_url.change(
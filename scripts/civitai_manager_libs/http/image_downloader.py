@@ -5,10 +5,13 @@ Parallel image downloader with thread-safe progress tracking.
 import threading
 import time
 import concurrent.futures
-from typing import Callable, List, Tuple, Optional
+from typing import Callable, Iterator, List, Tuple, Optional
 
+from .. import settings
 from ..logging_config import get_logger
 from ..exceptions import AuthenticationError
+from ..image_store import get_image_store
+from ..image_transcoder import get_image_transcoder
 from ..ui.notification_service import get_notification_service
 
 logger = get_logger(__name__)
@@ -83,18 +86,7 @@ class ParallelImageDownloader:
                     finally:
                         self._update_progress(progress_callback)
 
-            # Show authentication error if any images failed due to auth issues
-            if self._auth_errors:
-                # Notify the first authentication error via notification service
-                first_auth_error = self._auth_errors[0]
-                service = get_notification_service()
-                if service:
-                    service.show_error(str(first_auth_error))
-                auth_count = len(self._auth_errors)
-                logger.error(
-                    f"[parallel_downloader] {auth_count} image(s) failed due to authentication"
-                )
-
+            self._report_auth_errors()
             return success_count
         finally:
             # Stop periodic timer and send final update
@@ -103,10 +95,75 @@ class ParallelImageDownloader:
             if progress_callback:
                 self._send_final_progress_update(progress_callback)
 
+    def iter_download_images(
+        self, image_tasks: List[Tuple[str, str]], client=None
+    ) -> Iterator[Tuple[str, str, bool]]:
+        """
+        Download images in parallel and yield each result as soon as it completes.
+
+        Args:
+            image_tasks: List of (url, filepath) tuples
+            client: HTTP client providing ``download_file``
+
+        Yields:
+            (url, filepath, success) tuples in completion order
+        """
+        if not image_tasks:
+            return
+
+        self._auth_errors = []
+        if client is None:
+            from .client_manager import get_http_client
+
+            client = get_http_client()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_task = {
+                executor.submit(self._download_single_image, url, filepath, client): (
+                    url,
+                    filepath,
+                )
+                for url, filepath in image_tasks
+            }
+            try:
+                for future in concurrent.futures.as_completed(future_to_task):
+                    url, filepath = future_to_task[future]
+                    try:
+                        success = bool(future.result())
+                    except Exception as e:
+                        logger.error(f"[parallel_downloader] Download exception for {url}: {e}")
+                        success = False
+                    yield url, filepath, success
+                self._report_auth_errors()
+            finally:
+                # Stop queued downloads when the consumer goes away (e.g. a cancelled event)
+                for future in future_to_task:
+                    future.cancel()
+
+    def _report_auth_errors(self) -> None:
+        """Show authentication error if any images failed due to auth issues."""
+        if not self._auth_errors:
+            return
+        # Notify the first authentication error via notification service
+        first_auth_error = self._auth_errors[0]
+        service = get_notification_service()
+        if service:
+            service.show_error(str(first_auth_error))
+        auth_count = len(self._auth_errors)
+        logger.error(f"[parallel_downloader] {auth_count} image(s) failed due to authentication")
+
     def _download_single_image(self, url: str, filepath: str, client) -> bool:
         """Download single image with error handling."""
         try:
-            return client.download_file(url, filepath)
+            store = get_image_store()
+            if store.enabled:
+                success = store.fetch(url, filepath, client)
+            else:
+                success = client.download_file(url, filepath)
+            if success:
+                settings.discard_image_variants(filepath)
+                get_image_transcoder().submit(filepath)
+            return success
         except AuthenticationError as e:
             # Log authentication error and let the caller handle it
             logger.warning(f"[parallel_downloader] Authentication error for {url}: {e}")
@@ -252,6 +252,31 @@ class ImageFormatFilter:
             logger.warning(f"[ImageFormatFilter] Error checking file {filepath}: {e}")
             return False
 
+    @staticmethod
+    def get_static_image_file_extension(filepath: str) -> Optional[str]:
+        """
+        Return the extension matching a static image file's magic bytes.
+
+        Returns:
+            ``.png``, ``.jpg``, ``.webp`` or ``.avif``, or None if the file is
+            not a static image
+        """
+        try:
+            with open(filepath, 'rb') as fh:
+                header = fh.read(16)
+        except OSError:
+            return None
+
+        if header[:4] == b'\x89PNG':
+            return '.png'
+        if header[:3] == b'\xff\xd8\xff':
+            return '.jpg'
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return '.webp'
+        if header[4:8] == b'ftyp' and header[8:12] in (b'avif', b'avis', b'mif1'):
+            return '.avif'
+        return None
+
     @staticmethod
     def get_supported_formats() -> List[str]:
         """
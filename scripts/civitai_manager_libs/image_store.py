@@ -0,0 +1,334 @@
+"""
+Image Store Module
+
+Content-addressed store for downloaded Civitai images.
+
+The same Civitai image can be requested by the shortcut information folder
+(``sc_infos``), the gallery cache (``sc_gallery``) and the per-model download
+folders. When the store is enabled every image is fetched once into
+``sc_image_store`` and then materialized at each destination by hardlink,
+reflink or, as a last resort, a plain copy.
+
+Materialized files may share an inode with the store entry, so consumers must
+replace them (write to a temporary file and ``os.replace``) instead of
+rewriting them in place.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+from . import settings
+from .image_format_filter import ImageFormatFilter
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Civitai image URLs carry the image UUID as a path segment
+_UUID_PATTERN = re.compile(
+    r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+)
+_WIDTH_PATTERN = re.compile(r'/width=(\d+)/')
+
+# Linux FICLONE ioctl request number used for copy-on-write clones
+_FICLONE = 0x40049409
+
+# Number of striped locks serializing concurrent fetches of the same entry
+_LOCK_STRIPES = 64
+
+
+def get_image_key(url: str) -> Optional[str]:
+    """
+    Derive the store key for an image URL.
+
+    The key is the Civitai image UUID when present, otherwise a SHA256 digest of
+    the URL. The requested width is appended so different renditions of the same
+    image are never served in place of each other.
+
+    Args:
+        url: Image URL
+
+    Returns:
+        Store key, or None for empty or non-URL input
+    """
+    if not url or not url.lower().startswith(("http://", "https://")):
+        return None
+
+    match = _UUID_PATTERN.search(urlparse(url).path)
+    if match:
+        key = match.group(0).lower()
+    else:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:40]
+
+    width = _WIDTH_PATTERN.search(url)
+    if width:
+        key = f"{key}-w{width.group(1)}"
+    return key
+
+
+def _try_reflink(src: str, dest: str) -> bool:
+    """Create a copy-on-write clone of src at dest where the filesystem supports it."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdest:
+            fcntl.ioctl(fdest.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except (OSError, AttributeError):
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        return False
+
+
+class ImageStore:
+    """Content-addressed image store shared by all image download consumers."""
+
+    def __init__(self, store_folder: Optional[str] = None):
+        self._store_folder = store_folder
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'downloads': 0,
+            'hits': 0,
+            'hardlink': 0,
+            'reflink': 0,
+            'copy': 0,
+            'adopted': 0,
+        }
+
+    @property
+    def store_folder(self) -> str:
+        """Return the folder holding store entries."""
+        return self._store_folder or settings.shortcut_image_store_folder
+
+    @property
+    def enabled(self) -> bool:
+        """Return True when image deduplication through the store is enabled."""
+        return bool(settings.image_store_enabled)
+
+    def get_store_path(self, url: str) -> Optional[str]:
+        """Return the store path for an image URL, or None if the URL has no key."""
+        key = get_image_key(url)
+        if not key:
+            return None
+        return os.path.join(self.store_folder, key[:2], key)
+
+    def contains(self, url: str) -> bool:
+        """Check whether the image for a URL is already in the store."""
+        store_path = self.get_store_path(url)
+        return bool(store_path) and os.path.isfile(store_path)
+
+    def materialize(self, url: str, dest_path: str) -> bool:
+        """
+        Place the stored image for a URL at dest_path without downloading.
+
+        Args:
+            url: Image URL
+            dest_path: Destination file path
+
+        Returns:
+            True if the image was in the store and dest_path now holds it
+        """
+        store_path = self.get_store_path(url)
+        if not store_path or not dest_path or not os.path.isfile(store_path):
+            return False
+
+        try:
+            if os.path.exists(dest_path) and os.path.samefile(store_path, dest_path):
+                return True
+        except OSError:
+            pass
+
+        try:
+            method = self._link_or_copy(store_path, dest_path)
+        except OSError as e:
+            logger.warning(f"[ImageStore] Failed to materialize {store_path} -> {dest_path}: {e}")
+            return False
+
+        self._count('hits')
+        self._count(method)
+        logger.debug(f"[ImageStore] Materialized {dest_path} by {method}")
+        return True
+
+    def fetch(self, url: str, dest_path: str, client=None) -> bool:
+        """
+        Materialize an image at dest_path, downloading it into the store first if needed.
+
+        Args:
+            url: Image URL
+            dest_path: Destination file path
+            client: HTTP client providing ``download_file``
+
+        Returns:
+            True if dest_path holds the image afterwards
+        """
+        store_path = self.get_store_path(url)
+        if not store_path:
+            if client is None:
+                from .http import get_http_client
+
+                client = get_http_client()
+            return client.download_file(url, dest_path)
+
+        if self.materialize(url, dest_path):
+            return True
+
+        with self._get_lock(store_path):
+            # Another worker may have fetched the same image while we waited
+            if self.materialize(url, dest_path):
+                return True
+
+            if client is None:
+                from .http import get_http_client
+
+                client = get_http_client()
+
+            os.makedirs(os.path.dirname(store_path), exist_ok=True)
+            part_path = f"{store_path}.{threading.get_ident()}.part"
+            try:
+                success = client.download_file(url, part_path)
+                if not success or not os.path.isfile(part_path):
+                    return False
+
+                if not ImageFormatFilter.is_valid_static_image_file(part_path):
+                    # Deliver the file as before, but keep it out of the shared store
+                    logger.debug(f"[ImageStore] Not storing non-static image: {url}")
+                    self._ensure_parent(dest_path)
+                    shutil.move(part_path, dest_path)
+                    return True
+
+                os.replace(part_path, store_path)
+                self._count('downloads')
+            finally:
+                if os.path.exists(part_path):
+                    try:
+                        os.remove(part_path)
+                    except OSError:
+                        pass
+
+            # Materialize before prune_orphans can see the new entry unlinked
+            return self.materialize(url, dest_path)
+
+    def adopt(self, url: str, filepath: str) -> bool:
+        """
+        Register an already downloaded image as the store entry for a URL.
+
+        Args:
+            url: Image URL the file was downloaded from
+            filepath: Existing valid image file
+
+        Returns:
+            True if the store holds the image afterwards
+        """
+        store_path = self.get_store_path(url)
+        if not store_path or not os.path.isfile(filepath):
+            return False
+        if os.path.isfile(store_path):
+            return True
+        if not ImageFormatFilter.is_valid_static_image_file(filepath):
+            return False
+
+        try:
+            with self._get_lock(store_path):
+                if not os.path.isfile(store_path):
+                    self._link_or_copy(filepath, store_path)
+                    self._count('adopted')
+            return True
+        except OSError as e:
+            logger.debug(f"[ImageStore] Failed to adopt {filepath}: {e}")
+            return False
+
+    def prune_orphans(self) -> int:
+        """
+        Remove store entries that no consumer folder links to any more.
+
+        Only hardlinked materializations are tracked; entries that were copied
+        are removed too and will be downloaded again on next use. Entries lose
+        their links when shortcuts are deleted, caches are cleaned up or
+        cached images are transcoded.
+
+        Returns:
+            Number of removed entries
+        """
+        removed = 0
+        if not os.path.isdir(self.store_folder):
+            return removed
+
+        for root, _, files in os.walk(self.store_folder):
+            for filename in files:
+                if filename.endswith(('.part', '.link')):
+                    # Leave in-flight downloads and links alone
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    # Entries are materialized under the same lock right after download
+                    with self._get_lock(path):
+                        if os.stat(path).st_nlink <= 1:
+                            os.remove(path)
+                            removed += 1
+                except OSError as e:
+                    logger.debug(f"[ImageStore] Failed to prune {path}: {e}")
+
+        logger.info(f"[ImageStore] Pruned {removed} orphaned store entries")
+        return removed
+
+    def get_statistics(self) -> dict:
+        """Return store usage counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _link_or_copy(self, src: str, dest: str) -> str:
+        """Atomically place src at dest, returning the method used."""
+        self._ensure_parent(dest)
+        tmp_path = f"{dest}.{threading.get_ident()}.link"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        try:
+            os.link(src, tmp_path)
+            method = 'hardlink'
+        except OSError:
+            if _try_reflink(src, tmp_path):
+                method = 'reflink'
+            else:
+                shutil.copyfile(src, tmp_path)
+                method = 'copy'
+
+        os.replace(tmp_path, dest)
+        return method
+
+    def _ensure_parent(self, path: str) -> None:
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+    def _get_lock(self, store_path: str) -> threading.Lock:
+        return self._locks[hash(store_path) % _LOCK_STRIPES]
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] = self._stats.get(name, 0) + 1
+
+
+_global_image_store = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    """Get or create the global image store instance."""
+    global _global_image_store
+
+    if _global_image_store is None:
+        with _store_lock:
+            if _global_image_store is None:
+                _global_image_store = ImageStore()
+    return _global_image_store
@@ -0,0 +1,420 @@
+"""
+Image Transcoder Module
+
+Optional background re-encoding of cached images to WebP or AVIF.
+
+Cached previews (``sc_infos``), gallery images (``sc_gallery``) and shortcut
+thumbnails (``sc_thumb_images``) are downloaded and saved with
+``PREVIEW_IMAGE_EXT`` regardless of their real format. When
+``image_transcode_format`` is set to ``webp`` or ``avif`` newly cached images
+are queued for a worker thread that re-encodes them at
+``image_transcode_quality`` and stores them under the matching extension.
+Images that do not shrink are stored under the extension of their real format
+instead. Consumers find the new file through ``settings.resolve_image_variant``.
+
+The worker keeps the original file for ``ORIGINAL_GRACE_SECONDS``, because its
+path may already have been handed to the UI, and removes it afterwards. The
+explicit sweep removes originals right away, including ones left behind when
+the worker did not get to them.
+
+Transcoded files are written to a temporary file, validated by magic bytes and
+moved into place, so readers never observe a partially written image.
+"""
+
+import os
+import collections
+import queue
+import shutil
+import threading
+import time
+from typing import Callable, Iterable, List, Optional
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from . import settings
+from .image_format_filter import ImageFormatFilter
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Supported target formats and the extension their files are stored under
+TRANSCODE_FORMATS = {
+    'webp': '.webp',
+    'avif': '.avif',
+}
+
+# Seconds the worker keeps an original next to its variant before removing it
+ORIGINAL_GRACE_SECONDS = 60.0
+
+
+def is_format_supported(fmt: str) -> bool:
+    """
+    Check whether Pillow can encode the given transcode format.
+
+    AVIF needs Pillow 11.2+ or the ``pillow-avif-plugin`` package.
+
+    Args:
+        fmt: Target format name (``webp`` or ``avif``)
+
+    Returns:
+        True if images can be saved in the format
+    """
+    ext = TRANSCODE_FORMATS.get(fmt)
+    if Image is None or not ext:
+        return False
+
+    if fmt == 'avif':
+        try:
+            import pillow_avif  # noqa: F401
+        except ImportError:
+            pass
+    return ext in Image.registered_extensions()
+
+
+def transcode_image(
+    image_path: str, fmt: str, quality: int = 80, keep_original: bool = False
+) -> Optional[str]:
+    """
+    Re-encode a cached image and store it under a format-correct extension.
+
+    The transcoded file is kept only when it is a valid static image and
+    smaller than the original. Otherwise an original whose extension does not
+    match its real format is copied to the correct extension.
+
+    Args:
+        image_path: Path of the cached image
+        fmt: Target format name (``webp`` or ``avif``)
+        quality: Encoder quality (0-100)
+        keep_original: Leave the original file next to the new one
+
+    Returns:
+        Path of the new file, or None if the image was left unchanged
+    """
+    ext = TRANSCODE_FORMATS.get(fmt)
+    root, source_ext = os.path.splitext(image_path)
+    if Image is None or not ext or source_ext.lower() == ext:
+        return None
+    real_ext = ImageFormatFilter.get_static_image_file_extension(image_path)
+    if real_ext is None:
+        return None
+
+    tmp_path = f"{root}.{os.getpid()}.{threading.get_ident()}.tmp{ext}"
+    try:
+        with Image.open(image_path) as image:
+            if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            image.save(tmp_path, format=fmt.upper(), quality=quality)
+
+        if not ImageFormatFilter.is_valid_static_image_file(tmp_path):
+            logger.warning(f"[ImageTranscoder] Encoder produced an invalid file for {image_path}")
+            return None
+        if os.path.getsize(tmp_path) < os.path.getsize(image_path):
+            dest_path = f"{root}{ext}"
+            os.replace(tmp_path, dest_path)
+        elif real_ext != source_ext.lower() and real_ext in settings.TRANSCODED_IMAGE_EXTS:
+            logger.debug(f"[ImageTranscoder] Keeping smaller original as {real_ext}: {image_path}")
+            dest_path = f"{root}{real_ext}"
+            shutil.copyfile(image_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+        else:
+            logger.debug(f"[ImageTranscoder] Keeping smaller original: {image_path}")
+            return None
+
+        if not keep_original:
+            os.remove(image_path)
+        return dest_path
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _remove_transcoded_original(image_path: str) -> bool:
+    """
+    Remove an original that was kept next to its transcoded variant.
+
+    The original is only removed if the variant is not older than it, so an
+    image rewritten after it was transcoded is left alone.
+
+    Args:
+        image_path: Path of the original image
+
+    Returns:
+        True if the original was removed
+    """
+    root, ext = os.path.splitext(image_path)
+    if ext.lower() in TRANSCODE_FORMATS.values():
+        return False
+    try:
+        original_mtime = os.path.getmtime(image_path)
+    except OSError:
+        return False
+
+    for variant_ext in settings.TRANSCODED_IMAGE_EXTS:
+        variant = f"{root}{variant_ext}"
+        if variant == image_path:
+            continue
+        try:
+            if os.path.getmtime(variant) < original_mtime:
+                continue
+            os.remove(image_path)
+            return True
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.debug(f"[ImageTranscoder] Could not remove original {image_path}: {e}")
+            return False
+    return False
+
+
+class ImageTranscoder:
+    """Queues cached images and transcodes them on a background worker thread."""
+
+    def __init__(self, folders: Optional[List[str]] = None):
+        self._folders = folders
+        self._queue = queue.Queue()
+        self._kept_originals = collections.deque()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'transcoded': 0,
+            'skipped': 0,
+            'failed': 0,
+            'saved_bytes': 0,
+        }
+
+    @property
+    def folders(self) -> List[str]:
+        """Return the cache folders whose images may be transcoded."""
+        if self._folders is not None:
+            return self._folders
+        return [
+            settings.shortcut_info_folder,
+            settings.shortcut_gallery_folder,
+            settings.shortcut_thumbnail_folder,
+        ]
+
+    @property
+    def target_format(self) -> Optional[str]:
+        """Return the configured target format, or None when transcoding is off."""
+        fmt = str(settings.image_transcode_format or '').strip().lower()
+        return fmt if fmt in TRANSCODE_FORMATS else None
+
+    @property
+    def quality(self) -> int:
+        """Return the configured encoder quality clamped to 1-100."""
+        try:
+            quality = int(settings.image_transcode_quality)
+        except (TypeError, ValueError):
+            quality = 80
+        return max(1, min(100, quality))
+
+    @property
+    def enabled(self) -> bool:
+        """Return True when a supported target format is configured."""
+        fmt = self.target_format
+        return fmt is not None and is_format_supported(fmt)
+
+    def is_candidate(self, image_path: str) -> bool:
+        """Check whether a file is a cached image that still needs transcoding."""
+        fmt = self.target_format
+        if not fmt or not image_path or not os.path.isfile(image_path):
+            return False
+
+        _, ext = os.path.splitext(image_path)
+        ext = ext.lower()
+        if ext not in ImageFormatFilter.get_supported_formats() or ext == TRANSCODE_FORMATS[fmt]:
+            return False
+        if '.tmp' in os.path.basename(image_path):
+            return False
+        root, _ = os.path.splitext(image_path)
+        variants = (f"{root}{variant}" for variant in settings.TRANSCODED_IMAGE_EXTS)
+        if any(variant != image_path and os.path.isfile(variant) for variant in variants):
+            # Already transcoded; the worker or the next sweep removes the original
+            return False
+
+        image_path = os.path.abspath(image_path)
+        for folder in self.folders:
+            if not folder:
+                continue
+            folder = os.path.abspath(folder)
+            try:
+                if os.path.commonpath([folder, image_path]) == folder:
+                    return True
+            except ValueError:
+                continue
+        return False
+
+    def submit(self, image_paths: Iterable[str]) -> int:
+        """
+        Queue cached images for background transcoding.
+
+        Paths outside the cache folders, already transcoded files and missing
+        files are ignored. Nothing is queued while transcoding is disabled.
+
+        Args:
+            image_paths: Image paths, or a single path
+
+        Returns:
+            Number of queued images
+        """
+        if isinstance(image_paths, str):
+            image_paths = [image_paths]
+        if not self.enabled:
+            return 0
+
+        queued = 0
+        for image_path in image_paths:
+            if self.is_candidate(image_path):
+                self._queue.put(image_path)
+                queued += 1
+
+        if queued:
+            self._ensure_worker()
+        return queued
+
+    def wait(self) -> None:
+        """Block until every queued image has been processed."""
+        self._queue.join()
+
+    def transcode_file(self, image_path: str, keep_original: bool = False) -> Optional[str]:
+        """
+        Transcode one cached image to the configured format.
+
+        Args:
+            image_path: Path of the cached image
+            keep_original: Leave the original file next to the transcoded one
+
+        Returns:
+            Path of the transcoded image, or None if it was left unchanged
+        """
+        fmt = self.target_format
+        if not fmt or not os.path.isfile(image_path):
+            self._count('skipped')
+            return None
+
+        try:
+            original_size = os.path.getsize(image_path)
+            result = transcode_image(image_path, fmt, self.quality, keep_original)
+        except Exception as e:
+            logger.warning(f"[ImageTranscoder] Failed to transcode {image_path}: {e}")
+            self._count('failed')
+            return None
+
+        if result is None:
+            self._count('skipped')
+            return None
+
+        self._count('transcoded')
+        self._count('saved_bytes', max(0, original_size - os.path.getsize(result)))
+        logger.debug(f"[ImageTranscoder] Transcoded {image_path} -> {result}")
+        return result
+
+    def sweep(self, progress: Optional[Callable] = None) -> dict:
+        """
+        Transcode every eligible image in the cache folders synchronously.
+
+        Args:
+            progress: Gradio progress tracker called with (fraction, desc=...)
+
+        Returns:
+            Statistics for this sweep with transcoded, skipped, failed and saved_bytes
+        """
+        stats = {'transcoded': 0, 'skipped': 0, 'failed': 0, 'saved_bytes': 0}
+        if not self.enabled:
+            logger.info("[ImageTranscoder] Transcoding is disabled or not supported")
+            return stats
+
+        candidates = []
+        for folder in self.folders:
+            if not folder or not os.path.isdir(folder):
+                continue
+            for root, _, files in os.walk(folder):
+                for filename in files:
+                    image_path = os.path.join(root, filename)
+                    if _remove_transcoded_original(image_path):
+                        continue
+                    if self.is_candidate(image_path):
+                        candidates.append(image_path)
+
+        before = self.get_statistics()
+        for done, image_path in enumerate(candidates, start=1):
+            self.transcode_file(image_path)
+            if progress is not None:
+                progress(
+                    done / len(candidates), desc=f"Transcoding images {done}/{len(candidates)}"
+                )
+
+        after = self.get_statistics()
+        for key in stats:
+            stats[key] = after[key] - before[key]
+        logger.info(
+            f"[ImageTranscoder] Transcoded {stats['transcoded']}, skipped {stats['skipped']}, "
+            f"failed {stats['failed']}, saved {stats['saved_bytes']} bytes"
+        )
+        return stats
+
+    def get_statistics(self) -> dict:
+        """Return transcoding counters."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._worker_loop, name="ImageTranscoder", daemon=True
+                )
+                self._worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            try:
+                image_path = self._queue.get(timeout=self._next_removal_delay())
+            except queue.Empty:
+                self._remove_kept_originals()
+                continue
+            try:
+                # The original path may already be rendered by the UI
+                if self.transcode_file(image_path, keep_original=True):
+                    deadline = time.monotonic() + ORIGINAL_GRACE_SECONDS
+                    self._kept_originals.append((deadline, image_path))
+            finally:
+                self._queue.task_done()
+            self._remove_kept_originals()
+
+    def _next_removal_delay(self) -> Optional[float]:
+        if not self._kept_originals:
+            return None
+        return max(0.0, self._kept_originals[0][0] - time.monotonic())
+
+    def _remove_kept_originals(self) -> None:
+        now = time.monotonic()
+        while self._kept_originals and self._kept_originals[0][0] <= now:
+            _, image_path = self._kept_originals.popleft()
+            _remove_transcoded_original(image_path)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] = self._stats.get(name, 0) + amount
+
+
+_global_image_transcoder = None
+_transcoder_lock = threading.Lock()
+
+
+def get_image_transcoder() -> ImageTranscoder:
+    """Get or create the global image transcoder instance."""
+    global _global_image_transcoder
+
+    if _global_image_transcoder is None:
+        with _transcoder_lock:
+            if _global_image_transcoder is None:
+                _global_image_transcoder = ImageTranscoder()
+    return _global_image_transcoder
@@ -9,6 +9,7 @@ import os
 import gradio as gr
 import datetime
 import shutil
+import time
 
 from .error_handler import with_error_handling
 from .exceptions import (
@@ -224,6 +225,15 @@ def on_ui(refresh_sc_browser, recipe_input):
             )
             model_classification_update_btn = gr.Button(value="Update", variant="primary")
 
+        with gr.Accordion("Related Models", open=False):
+            related_gallery = gr.Gallery(
+                show_label=False,
+                columns=settings.gallery_column,
+                height="auto",
+                object_fit=settings.gallery_thumbnail_image_style,
+                allow_preview=False,
+            )
+
         with gr.Accordion("Downloaded Version", open=True, visible=False) as downloaded_tab:
             downloaded_info = gr.Textbox(interactive=False, show_label=False)
             saved_openfolder = gr.Button(
@@ -329,7 +339,10 @@ def on_ui(refresh_sc_browser, recipe_input):
     )
 
     gallery = refresh_gallery.change(
-        fn=on_file_gallery_loading, inputs=[saved_images_url], outputs=[saved_gallery, saved_images]
+        fn=on_file_gallery_loading,
+        inputs=[saved_images_url, selected_model_id],
+        outputs=[saved_gallery, saved_images],
+        show_progress="minimal",
     )
 
     model_classification_update_btn.click(
@@ -397,6 +410,15 @@ def on_ui(refresh_sc_browser, recipe_input):
         cancels=gallery,
     )
 
+    selected_model_id.change(
+        fn=on_related_models_loading,
+        inputs=[selected_model_id],
+        outputs=[related_gallery],
+        show_progress=False,
+    )
+
+    related_gallery.select(on_related_gallery_select, None, [selected_model_id])
+
     versions_list.select(
         fn=on_versions_list_select,
         inputs=[
@@ -843,16 +865,48 @@ def on_cs_foldername_select(evt: gr.SelectData, is_vsfolder):
 
 def on_model_classification_update_btn_click(model_classification, modelid):
 
-    if modelid:
-        classification.clean_classification_shortcut(str(modelid))
+    with classification.batch():
+        if modelid:
+            classification.clean_classification_shortcut(str(modelid))
 
-    if model_classification and modelid:
-        for name in model_classification:
-            classification.add_classification_shortcut(name, str(modelid))
+        if model_classification and modelid:
+            for name in model_classification:
+                classification.add_classification_shortcut(name, str(modelid))
     current_time = datetime.datetime.now()
     return current_time
 
 
+def on_related_models_loading(modelid):
+    """Load the thumbnails of the shortcuts most similar to a model."""
+    if not modelid:
+        return None
+
+    result = list()
+    for v in ishortcut.shortcutsearchfilter.get_related_shortcuts(str(modelid)):
+        caption = settings.set_shortcutname(v['name'], v['id'])
+        if not (v.get('has_thumbnail') or ishortcut.imageprocessor.is_sc_image(v['id'])):
+            result.append((settings.no_card_preview_image, caption))
+        elif bool(v.get('nsfw')) and settings.nsfw_filter_enable:
+            result.append((settings.get_nsfw_disable_image(), caption))
+        else:
+            result.append((settings.get_shortcut_thumbnail_file(v['id']), caption))
+    return result
+
+
+def on_related_gallery_select(evt: gr.SelectData):
+    """Open the selected related model in the model card."""
+    if isinstance(evt.value, dict) and 'caption' in evt.value:
+        shortcut = evt.value['caption']
+    elif isinstance(evt.value, list) and len(evt.value) > 1:
+        shortcut = evt.value[1]
+    elif isinstance(evt.value, str):
+        shortcut = evt.value
+    else:
+        logger.warning(f"[ishortcut_action] Unexpected evt.value format: {evt.value}")
+        return gr.update()
+    return settings.get_modelid_from_shortcutname(shortcut)
+
+
 def on_open_folder_click(mid, vid):
     path = model.get_default_version_folder(vid)
     if path:
@@ -1171,14 +1225,36 @@ def on_versions_list_select(evt: gr.SelectData, modelid: str):
     return load_saved_model(modelid, evt.index)
 
 
-def on_file_gallery_loading(image_url):
-    chk_image_url = image_url
-    if image_url:
-        chk_image_url = [
-            img if os.path.isfile(img) else settings.no_card_preview_image for img in image_url
-        ]
-        return chk_image_url, chk_image_url
-    return None, None
+def _check_gallery_files(image_url):
+    chk_image_url = []
+    for img in image_url:
+        img = settings.resolve_image_variant(img)
+        chk_image_url.append(img if os.path.isfile(img) else settings.no_card_preview_image)
+    return chk_image_url
+
+
+def on_file_gallery_loading(image_url, modelid=None):
+    if not image_url:
+        yield None, None
+        return
+
+    chk_image_url = _check_gallery_files(image_url)
+    yield chk_image_url, chk_image_url
+
+    # Shortcuts registered with deferred images fetch them on first view
+    hydrator = ishortcut.get_image_hydrator()
+    if settings.no_card_preview_image not in chk_image_url or not hydrator.is_pending(modelid):
+        return
+
+    last_update = 0.0
+    for _ in hydrator.iter_hydrate(modelid):
+        if time.monotonic() - last_update >= 0.2:
+            chk_image_url = _check_gallery_files(image_url)
+            yield chk_image_url, chk_image_url
+            last_update = time.monotonic()
+
+    chk_image_url = _check_gallery_files(image_url)
+    yield chk_image_url, chk_image_url
 
 
 def load_saved_model(modelid=None, ver_index=None):
@@ -1206,7 +1282,7 @@ def load_saved_model(modelid=None, ver_index=None):
             current_time = datetime.datetime.now()
 
             # 다운 받은 모델 정보를 갱신한다.
-            model.update_downloaded_model()
+            model.refresh_downloaded_model()
 
             image_folder = util.get_download_image_folder(model_info['name'])
             if image_folder:
@@ -1322,7 +1398,9 @@ def load_saved_model(modelid=None, ver_index=None):
             model_url = civitai.Url_Page() + str(modelid)
 
             images_url = ishortcut.modelprocessor.get_version_description_gallery(
-                modelid, version_info
+                modelid,
+                version_info,
+                include_missing=ishortcut.get_image_hydrator().is_pending(modelid),
             )
 
             # Add container environment detection for folder button visibility
@@ -1437,12 +1515,8 @@ def upload_shortcut_by_files(files, register_information_only, progress):
                 add_ISC = ishortcut.shortcutcollectionmanager.add_shortcut(
                     add_ISC, model_id, register_information_only, progress
                 )
-        ISC = ishortcut.shortcutcollectionmanager.load_shortcuts()
-        if ISC:
+        with ishortcut.shortcutcollectionmanager.transaction() as ISC:
             ISC.update(add_ISC)
-        else:
-            ISC = add_ISC
-        ishortcut.shortcutcollectionmanager.save_shortcuts(ISC)
 
     return modelids
 
@@ -1580,21 +1654,9 @@ def upload_shortcut_by_urls(urls, register_information_only, progress):
             logger.debug(f"[ishortcut_action] Finished processing URLs, loading ISC...")
 
             try:
-                ISC = ishortcut.shortcutcollectionmanager.load_shortcuts()
-                logger.debug("shortcutcollectionmanager.load_shortcuts() returned")
-                logger.debug(f"[ishortcut_action] ISC type: {type(ISC)}")
-
-                if ISC:
-                    logger.debug(f"[ishortcut_action] ISC exists, updating with add_ISC...")
+                with ishortcut.shortcutcollectionmanager.transaction() as ISC:
+                    logger.debug(f"[ishortcut_action] Merging {len(add_ISC)} shortcuts...")
                     ISC.update(add_ISC)
-                    logger.debug(f"[ishortcut_action] ISC after update: {ISC}")
-                else:
-                    logger.debug(f"[ishortcut_action] ISC is None/empty, using add_ISC directly...")
-                    ISC = add_ISC
-                    logger.debug(f"[ishortcut_action] ISC set to add_ISC: {ISC}")
-
-                logger.debug("Saving ISC...")
-                ishortcut.shortcutcollectionmanager.save_shortcuts(ISC)
                 logger.debug("ISC saved successfully")
 
             except Exception as e:
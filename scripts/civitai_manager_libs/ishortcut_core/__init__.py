@@ -8,6 +8,17 @@ This package provides a clean separation of concerns for the ishortcut functiona
 - metadata_processor: Data validation and metadata handling
 - data_validator: Input validation and data consistency checks
 - model_factory: Model creation and shortcut generation
+- image_hydrator: Deferred download of shortcut version images
+- model_info_format: Plain or gzip-compressed model information files
+- model_info_cache: LRU cache of parsed model information files
+- model_info_index: Persistent digest of the per-model information files
+- shortcut_search_index: Inverted index for shortcut search
+- facet_engine: Boolean facet columns for browser filters
+- result_view_cache: Cached sorted result views for browser paging
+- shortcut_summary_index: Compact persisted shortcut summaries for the browsers
+- related_models_index: MinHash/LSH index of similar shortcuts
+- prompt_model_index: Aho-Corasick resolution of the models a prompt uses
+- model_hash_index: Offline AutoV2 hash lookup of downloaded models
 
 Each module focuses on a single responsibility to improve maintainability
 and testability of the codebase.
@@ -31,6 +42,16 @@ from .model_factory import ModelFactory
 from .shortcut_collection_manager import ShortcutCollectionManager
 from .shortcut_search_filter import ShortcutSearchFilter
 from .preview_image_manager import PreviewImageManager
+from .image_hydrator import ImageHydrator, get_image_hydrator
+from .model_info_cache import ModelInfoCache, get_model_info_cache
+from .model_info_index import ModelInfoIndex, get_model_info_index
+from .shortcut_search_index import ShortcutSearchIndex
+from .facet_engine import FacetEngine
+from .result_view_cache import ResultViewCache
+from .shortcut_summary_index import ShortcutSummary, ShortcutSummaryIndex
+from .related_models_index import RelatedModelsIndex
+from .prompt_model_index import PromptModelIndex, get_prompt_model_index
+from .model_hash_index import ModelHashIndex, get_model_hash_index
 
 # Create global instances for backward compatibility
 _collection_manager = None
@@ -82,6 +103,22 @@ __all__ = [
     "ShortcutCollectionManager",
     "ShortcutSearchFilter",
     "PreviewImageManager",
+    "ImageHydrator",
+    "get_image_hydrator",
+    "ModelInfoCache",
+    "get_model_info_cache",
+    "ModelInfoIndex",
+    "get_model_info_index",
+    "ShortcutSearchIndex",
+    "FacetEngine",
+    "ResultViewCache",
+    "ShortcutSummary",
+    "ShortcutSummaryIndex",
+    "RelatedModelsIndex",
+    "PromptModelIndex",
+    "get_prompt_model_index",
+    "ModelHashIndex",
+    "get_model_hash_index",
     # Global instances for backward compatibility
     "shortcutsearchfilter",
     "imageprocessor",
@@ -0,0 +1,168 @@
+"""
+FacetEngine: Columnar facet masks over the shortcut collection.
+
+This module is responsible for:
+- Assigning every shortcut a dense row position
+- Keeping one NumPy boolean column per facet value (type, base model)
+- Turning ID sets into row masks so filters combine with vectorized AND/OR
+- Counting matches per facet value for the browser
+
+The columns are rebuilt only when the collection or the model information
+index changes; combining filters and counting touch the arrays only.
+"""
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Facets built from the shortcut entries themselves
+SHORTCUT_FACETS = ('type',)
+
+# Facets built from the model information index records
+RECORD_FACETS = ('base_models',)
+
+
+class FacetEngine:
+    """Boolean column store answering faceted shortcut filters."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._key = None
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._columns: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._described = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def ids(self) -> List[str]:
+        """Return the model IDs in row order."""
+        return self._ids
+
+    def build(self, shortcuts: Dict[str, Dict], info_index=None, version=None) -> bool:
+        """
+        Rebuild the facet columns for a shortcut collection.
+
+        Args:
+            shortcuts: Shortcut collection keyed by model ID
+            info_index: ModelInfoIndex providing base models, or None
+            version: Collection version; the columns are reused while both it and
+                the information index generation are unchanged
+
+        Returns:
+            True if the columns were rebuilt
+        """
+        with self._lock:
+            generation = getattr(info_index, 'generation', None)
+            if version is not None and (version, generation) == self._key:
+                return False
+
+            entries = [(str(key), value) for key, value in (shortcuts or {}).items() if value]
+            ids = [model_id for model_id, _ in entries]
+            count = len(ids)
+            rows: Dict[str, Dict[Any, List[int]]] = {
+                facet: {} for facet in SHORTCUT_FACETS + RECORD_FACETS
+            }
+            described = np.zeros(count, dtype=bool)
+
+            for position, (model_id, shortcut) in enumerate(entries):
+                rows['type'].setdefault(shortcut.get('type'), []).append(position)
+
+                record = None
+                if info_index is not None:
+                    # Stored records are kept current by FileProcessor; read only unknown models
+                    record = info_index.get_cached_record(model_id) or info_index.get_record(
+                        model_id
+                    )
+                if record is None:
+                    continue
+                described[position] = True
+                for base_model in record.get('base_models') or []:
+                    rows['base_models'].setdefault(base_model, []).append(position)
+
+            columns = {}
+            for facet, values in rows.items():
+                columns[facet] = {}
+                for value, positions in values.items():
+                    column = np.zeros(count, dtype=bool)
+                    column[positions] = True
+                    columns[facet][value] = column
+
+            self._ids = ids
+            self._positions = {model_id: position for position, model_id in enumerate(ids)}
+            self._columns = columns
+            self._described = described
+            generation = getattr(info_index, 'generation', None)
+            self._key = (version, generation) if version is not None else None
+            logger.debug(f"[FacetEngine] Built facet columns for {count} shortcuts")
+            return True
+
+    def all(self) -> np.ndarray:
+        """Return a mask selecting every row."""
+        return np.ones(len(self._ids), dtype=bool)
+
+    def none(self) -> np.ndarray:
+        """Return a mask selecting no row."""
+        return np.zeros(len(self._ids), dtype=bool)
+
+    def mask_for_ids(self, model_ids: Iterable) -> np.ndarray:
+        """Return a mask selecting the rows of the given model IDs."""
+        mask = self.none()
+        positions = [
+            self._positions[str(mid)] for mid in model_ids or () if str(mid) in self._positions
+        ]
+        if positions:
+            mask[positions] = True
+        return mask
+
+    def column(self, facet: str, values: Iterable) -> np.ndarray:
+        """Return a mask of rows whose facet matches any of the values (OR)."""
+        mask = self.none()
+        value_columns = self._columns.get(facet, {})
+        for value in values or ():
+            column = value_columns.get(value)
+            if column is not None:
+                mask |= column
+        return mask
+
+    def described(self) -> np.ndarray:
+        """Return a mask of rows with a model information record."""
+        return self._described.copy()
+
+    def select(self, mask: np.ndarray) -> List[str]:
+        """Return the model IDs of the selected rows in row order."""
+        return [self._ids[position] for position in np.flatnonzero(mask)]
+
+    def counts(self, facet: str, mask: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """
+        Count the selected rows for every value of a facet.
+
+        Args:
+            facet: Facet name
+            mask: Row selection; all rows if omitted
+
+        Returns:
+            Mapping of facet value to the number of selected rows, without zeros
+        """
+        result = {}
+        for value, column in self._columns.get(facet, {}).items():
+            count = int(np.count_nonzero(column if mask is None else column & mask))
+            if count:
+                result[value] = count
+        return result
+
+    def count_ids(self, model_ids: Iterable, mask: Optional[np.ndarray] = None) -> int:
+        """Count the selected rows among the given model IDs."""
+        positions = [
+            self._positions[str(mid)] for mid in model_ids or () if str(mid) in self._positions
+        ]
+        if mask is None:
+            return len(positions)
+        return int(np.count_nonzero(mask[positions])) if positions else 0
@@ -17,7 +17,6 @@ Extracted from ishortcut.py functions:
 """
 
 import os
-import json
 import shutil
 from typing import Dict, Optional
 
@@ -26,6 +25,9 @@ from .. import settings
 from ..logging_config import get_logger
 from ..error_handler import with_error_handling
 from ..exceptions import NetworkError, FileOperationError, CivitaiShortcutError
+from .model_info_cache import get_model_info_cache
+from .model_info_format import dumps_model_info
+from .model_info_index import get_model_info_index
 
 logger = get_logger(__name__)
 
@@ -153,12 +155,13 @@ class FileProcessor:
             logger.debug(f"[FileProcessor] Final file: {model_info_file}")
 
             # Write to temporary file first for atomic operation
-            with open(tmp_info_file, 'w', encoding='utf-8') as f:
-                json.dump(model_info, f, indent=4, ensure_ascii=False)
+            with open(tmp_info_file, 'wb') as f:
+                f.write(dumps_model_info(model_info))
 
             # Atomically replace the target file
             os.replace(tmp_info_file, model_info_file)
             logger.info("[FileProcessor] Model info saved successfully")
+            self._update_model_info_index(modelid, model_info, model_info_file)
             return True
 
         except Exception as e:
@@ -198,12 +201,35 @@ class FileProcessor:
                 logger.info(f"[FileProcessor] Deleted model information for {modelid}")
             else:
                 logger.debug(f"[FileProcessor] Model directory doesn't exist: {model_path}")
+            self._update_model_info_index(modelid, None)
             return True
 
         except Exception as e:
             logger.error(f"[FileProcessor] Failed to delete model information for {modelid}: {e}")
             return False
 
+    def _update_model_info_index(
+        self, modelid: str, model_info: Optional[Dict], model_info_file: str = None
+    ) -> None:
+        """Refresh the index record and cached information of a written or deleted model."""
+        get_model_info_cache().invalidate(
+            model_info_file
+            or os.path.join(
+                settings.shortcut_info_folder,
+                modelid,
+                f"{modelid}{settings.INFO_SUFFIX}{settings.INFO_EXT}",
+            )
+        )
+        try:
+            index = get_model_info_index()
+            if model_info is None:
+                index.discard(modelid)
+            else:
+                index.update(modelid, model_info, os.stat(model_info_file).st_mtime_ns)
+            index.schedule_flush()
+        except Exception as e:
+            logger.warning(f"[FileProcessor] Failed to update model index for {modelid}: {e}")
+
     def model_info_exists(self, modelid: str) -> bool:
         """
         Check if model information file exists locally.
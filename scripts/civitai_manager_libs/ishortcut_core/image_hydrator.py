@@ -0,0 +1,251 @@
+"""
+ImageHydrator: Deferred download of shortcut version images.
+
+This module is responsible for:
+- Remembering shortcuts registered without their version images
+- Fetching the missing images on first view of the model card
+- Filling in the remaining images from an idle-time background thread
+
+With ``shortcut_lazy_image_hydration`` enabled, registration stores the model
+information and the thumbnail only, so bulk imports do not turn into thousands
+of image downloads up front. The pending model IDs are persisted in
+``shortcut_hydration_queue`` and survive restarts. A model whose images keep
+failing, e.g. because an image was removed from Civitai, is dropped from the
+queue after ``MAX_HYDRATION_ATTEMPTS`` attempts.
+"""
+
+import os
+import threading
+import time
+from typing import Iterator, List
+
+from .. import settings
+from ..http import ParallelImageDownloader
+from ..json_store import get_json_store
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds without foreground hydration before the idle filler resumes
+IDLE_DELAY_SECONDS = 5.0
+
+# Hydration attempts with failed downloads after which a model is given up on
+MAX_HYDRATION_ATTEMPTS = 3
+
+
+class ImageHydrator:
+    """Tracks shortcuts with deferred images and downloads them on demand."""
+
+    def __init__(self, image_processor=None, model_processor=None, queue_file=None):
+        self._image_processor = image_processor
+        self._model_processor = model_processor
+        self._queue_file = queue_file
+        self._pending = None
+        self._lock = threading.RLock()
+        self._model_locks = {}
+        self._failed_attempts = {}
+        self._filler = None
+        self._last_activity = 0.0
+
+    @property
+    def queue_file(self) -> str:
+        """Return the file persisting the pending model IDs."""
+        return self._queue_file or settings.shortcut_hydration_queue
+
+    @property
+    def enabled(self) -> bool:
+        """Return True when new shortcuts are registered without their images."""
+        return bool(settings.shortcut_lazy_image_hydration)
+
+    @property
+    def image_processor(self):
+        if self._image_processor is None:
+            from .image_processor import ImageProcessor
+
+            self._image_processor = ImageProcessor()
+        return self._image_processor
+
+    @property
+    def model_processor(self):
+        if self._model_processor is None:
+            from .model_processor import ModelProcessor
+
+            self._model_processor = ModelProcessor()
+        return self._model_processor
+
+    def get_pending(self) -> List[str]:
+        """Return the model IDs whose version images have not been downloaded yet."""
+        with self._lock:
+            return list(self._load())
+
+    def is_pending(self, model_id) -> bool:
+        """Check whether a model still has deferred images."""
+        if not model_id:
+            return False
+        with self._lock:
+            return str(model_id) in self._load()
+
+    def mark_pending(self, model_id) -> None:
+        """Record that a model was registered without its version images."""
+        if not model_id:
+            return
+        with self._lock:
+            pending = self._load()
+            if str(model_id) not in pending:
+                pending.append(str(model_id))
+                self._save()
+        self._last_activity = time.monotonic()
+
+    def discard(self, model_id) -> None:
+        """Forget a model, e.g. after it was hydrated or its shortcut was deleted."""
+        if not model_id:
+            return
+        with self._lock:
+            self._failed_attempts.pop(str(model_id), None)
+            pending = self._load()
+            if str(model_id) in pending:
+                pending.remove(str(model_id))
+                self._save()
+
+    def iter_hydrate(self, model_id) -> Iterator[str]:
+        """
+        Download the missing version images of a model.
+
+        Args:
+            model_id: Model ID to hydrate
+
+        Yields:
+            Local path of every image as soon as its download completes
+        """
+        model_id = str(model_id)
+        self._last_activity = time.monotonic()
+        with self._get_model_lock(model_id):
+            model_info = self.model_processor.get_model_info(model_id)
+            if not model_info:
+                logger.warning(f"[ImageHydrator] No model information for {model_id}")
+                self.discard(model_id)
+                return
+
+            version_list = self.image_processor.extract_version_images(model_info, model_id)
+            tasks = self.image_processor._collect_images_to_download(version_list, model_id)
+            image_tasks = [(url, filepath) for _, url, filepath in tasks or []]
+
+            failed = 0
+            downloader = ParallelImageDownloader(max_workers=10)
+            for _, filepath, success in downloader.iter_download_images(image_tasks):
+                self._last_activity = time.monotonic()
+                if success:
+                    yield filepath
+                else:
+                    failed += 1
+
+            if not failed:
+                self.discard(model_id)
+                logger.info(f"[ImageHydrator] Hydrated {len(image_tasks)} images for {model_id}")
+                return
+
+            attempts = self._failed_attempts.get(model_id, 0) + 1
+            logger.warning(
+                f"[ImageHydrator] {failed}/{len(image_tasks)} images failed for {model_id} "
+                f"(attempt {attempts}/{MAX_HYDRATION_ATTEMPTS})"
+            )
+            if attempts < MAX_HYDRATION_ATTEMPTS:
+                self._failed_attempts[model_id] = attempts
+                return
+            # Broken URLs would otherwise be retried on every card open and idle pass
+            self.discard(model_id)
+            logger.warning(f"[ImageHydrator] Giving up on the missing images of {model_id}")
+
+    def hydrate(self, model_id) -> int:
+        """
+        Download the missing version images of a model.
+
+        Args:
+            model_id: Model ID to hydrate
+
+        Returns:
+            Number of downloaded images
+        """
+        return sum(1 for _ in self.iter_hydrate(model_id))
+
+    def start_idle_filler(self) -> bool:
+        """
+        Start the background thread hydrating pending models while the UI is idle.
+
+        Returns:
+            True if a filler thread is running afterwards
+        """
+        if not self.get_pending():
+            return False
+
+        with self._lock:
+            if self._filler is None or not self._filler.is_alive():
+                self._filler = threading.Thread(
+                    target=self._fill_pending, name="ImageHydrator", daemon=True
+                )
+                self._filler.start()
+        return True
+
+    def _fill_pending(self) -> None:
+        attempted = set()
+        while True:
+            idle = time.monotonic() - self._last_activity
+            if idle < IDLE_DELAY_SECONDS:
+                time.sleep(IDLE_DELAY_SECONDS - idle)
+                continue
+
+            pending = [mid for mid in self.get_pending() if mid not in attempted]
+            if not pending:
+                return
+
+            model_id = pending[0]
+            attempted.add(model_id)
+            lock = self._get_model_lock(model_id)
+            if not lock.acquire(blocking=False):
+                # A model card is hydrating this model right now
+                continue
+            try:
+                self.hydrate(model_id)
+            except Exception as e:
+                logger.warning(f"[ImageHydrator] Idle hydration failed for {model_id}: {e}")
+            finally:
+                lock.release()
+
+    def _get_model_lock(self, model_id: str) -> threading.RLock:
+        with self._lock:
+            return self._model_locks.setdefault(model_id, threading.RLock())
+
+    def _load(self) -> List[str]:
+        if self._pending is None:
+            self._pending = []
+            try:
+                self._pending = [str(mid) for mid in get_json_store().load(self.queue_file) or []]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"[ImageHydrator] Failed to read {self.queue_file}: {e}")
+        return self._pending
+
+    def _save(self) -> None:
+        try:
+            parent = os.path.dirname(self.queue_file)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            get_json_store().write(self.queue_file, self._pending)
+        except Exception as e:
+            logger.error(f"[ImageHydrator] Failed to write {self.queue_file}: {e}")
+
+
+_global_image_hydrator = None
+_hydrator_lock = threading.Lock()
+
+
+def get_image_hydrator() -> ImageHydrator:
+    """Get or create the global image hydrator instance."""
+    global _global_image_hydrator
+
+    if _global_image_hydrator is None:
+        with _hydrator_lock:
+            if _global_image_hydrator is None:
+                _global_image_hydrator = ImageHydrator()
+    return _global_image_hydrator
@@ -23,12 +23,6 @@ Extracted from ishortcut.py functions:
 import os
 from typing import Dict, List, Optional, Tuple, Callable
 
-# Import PIL only when needed to avoid import errors
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-
 # Import dependencies from parent modules
 from .. import util
 from .. import settings
@@ -37,12 +31,12 @@ from ..http import get_http_client, ParallelImageDownloader
 from ..error_handler import with_error_handling
 from ..exceptions import NetworkError, FileOperationError, CivitaiShortcutError
 from ..image_format_filter import ImageFormatFilter
+from ..image_store import get_image_store
+from ..image_transcoder import get_image_transcoder
+from .thumbnail_engine import THUMBNAIL_MAX_SIZE, render_thumbnail
 
 logger = get_logger(__name__)
 
-# Thumbnail configuration
-THUMBNAIL_MAX_SIZE = (400, 400)
-
 
 class ImageProcessor:
     """Handles image downloading and thumbnail generation operations."""
@@ -160,6 +154,7 @@ class ImageProcessor:
         """
         logger.info(f"[ImageProcessor] Collecting images for {modelid}")
         all_images_to_download = []
+        image_store = get_image_store()
 
         for version_idx, image_list in enumerate(version_list):
             logger.debug(f"[ImageProcessor] Processing version {version_idx+1}/{len(version_list)}")
@@ -179,6 +174,12 @@ class ImageProcessor:
                         logger.debug(
                             f"[ImageProcessor] Valid image already exists: {description_img}"
                         )
+                        if image_store.enabled and description_img.endswith(
+                            settings.PREVIEW_IMAGE_EXT
+                        ):
+                            # Share images downloaded before the store was enabled;
+                            # transcoded files differ from what the URL serves
+                            image_store.adopt(url, description_img)
                         if preview_only:
                             collected_for_version = True
                             break
@@ -308,6 +309,8 @@ class ImageProcessor:
             logger.warning("[ImageProcessor] Invalid parameters for thumbnail creation")
             return False
 
+        # The source may have been transcoded in the background
+        input_image_path = settings.resolve_image_variant(input_image_path)
         if not os.path.exists(input_image_path):
             logger.warning(f"[ImageProcessor] Source image doesn't exist: {input_image_path}")
             return False
@@ -316,22 +319,15 @@ class ImageProcessor:
             self.thumbnail_folder, f"{model_id}{settings.PREVIEW_IMAGE_EXT}"
         )
 
-        try:
-            # Ensure thumbnail directory exists
-            os.makedirs(self.thumbnail_folder, exist_ok=True)
-
-            # Create thumbnail
-            with Image.open(input_image_path) as image:
-                image.thumbnail(self.thumbnail_max_size)
-                image.save(thumbnail_path)
-
-            logger.info(f"[ImageProcessor] Created thumbnail: {thumbnail_path}")
-            return True
-
-        except Exception as e:
-            logger.error(f"[ImageProcessor] Failed to create thumbnail for {model_id}: {e}")
+        # Decode at reduced resolution and replace the thumbnail atomically
+        if not render_thumbnail(input_image_path, thumbnail_path, self.thumbnail_max_size):
+            logger.error(f"[ImageProcessor] Failed to create thumbnail for {model_id}")
             return False
 
+        logger.info(f"[ImageProcessor] Created thumbnail: {thumbnail_path}")
+        get_image_transcoder().submit(thumbnail_path)
+        return True
+
     def create_thumbnail_from_file(self, model_id: str, image_file_path: str) -> bool:
         """
         Create thumbnail from downloaded image file.
@@ -343,20 +339,15 @@ class ImageProcessor:
         Returns:
             True if thumbnail creation was successful
         """
-        try:
-            with Image.open(image_file_path) as image:
-                image.thumbnail(self.thumbnail_max_size)
-                image.save(image_file_path)  # Save thumbnail over original
-
-            logger.info(f"[ImageProcessor] Generated thumbnail for model {model_id}")
-            return True
-
-        except Exception as e:
-            logger.warning(
-                f"[ImageProcessor] Thumbnail generation failed for {image_file_path}: {e}"
-            )
+        # Save thumbnail over original
+        if not render_thumbnail(image_file_path, image_file_path, self.thumbnail_max_size):
+            logger.warning(f"[ImageProcessor] Thumbnail generation failed for {image_file_path}")
             return False
 
+        logger.info(f"[ImageProcessor] Generated thumbnail for model {model_id}")
+        get_image_transcoder().submit(image_file_path)
+        return True
+
     def delete_thumbnail_image(self, model_id: str) -> bool:
         """
         Delete thumbnail image for a model.
@@ -374,12 +365,10 @@ class ImageProcessor:
             logger.debug(f"[ImageProcessor] No thumbnail to delete for model {model_id}")
             return True
 
-        thumbnail_path = os.path.join(
-            self.thumbnail_folder, f"{model_id}{settings.PREVIEW_IMAGE_EXT}"
-        )
-
         try:
-            os.remove(thumbnail_path)
+            for thumbnail_path in self._get_thumbnail_paths(model_id):
+                if os.path.isfile(thumbnail_path):
+                    os.remove(thumbnail_path)
             logger.info(f"[ImageProcessor] Deleted thumbnail for model {model_id}")
             return True
         except Exception as e:
@@ -399,14 +388,17 @@ class ImageProcessor:
         if not model_id:
             return False
 
-        thumbnail_path = os.path.join(
-            self.thumbnail_folder, f"{model_id}{settings.PREVIEW_IMAGE_EXT}"
-        )
-
-        exists = os.path.isfile(thumbnail_path)
+        exists = any(os.path.isfile(path) for path in self._get_thumbnail_paths(model_id))
         logger.debug(f"[ImageProcessor] Thumbnail exists for {model_id}: {exists}")
         return exists
 
+    def _get_thumbnail_paths(self, model_id: str) -> List[str]:
+        """Return the original and transcoded thumbnail paths for a model."""
+        return [
+            os.path.join(self.thumbnail_folder, f"{model_id}{ext}")
+            for ext in (settings.PREVIEW_IMAGE_EXT,) + settings.TRANSCODED_IMAGE_EXTS
+        ]
+
     def get_preview_image_url(self, model_info: Dict) -> Optional[str]:
         """
         Extract preview image URL from model info.
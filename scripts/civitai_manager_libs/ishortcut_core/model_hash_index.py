@@ -0,0 +1,417 @@
+"""
+ModelHashIndex: Offline lookup of the short model hashes in generation info.
+
+This module is responsible for:
+- Parsing ``Model hash``, ``Lora hashes`` and ``TI hashes`` from A1111
+  infotext and Civitai image metadata
+- Indexing the AutoV2 (first 10 hex digits of SHA256) and AutoV1 hashes of
+  downloaded models from their ``.civitai.info`` version files
+- Keeping a persistent cache of locally computed SHA256 hashes so files are
+  not hashed again while their size and modification time are unchanged;
+  new hashes are written shortly after, in one write per burst, and hashes
+  of files that no longer exist are dropped
+- Reporting which referenced models are already owned without calling the
+  by-hash API
+
+Version information files are parsed again only when their modification time
+changes.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .. import model
+from .. import settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Length of an AutoV2 hash, the SHA256 prefix A1111 writes to infotext
+AUTOV2_LENGTH = 10
+
+# Length of a legacy AutoV1 hash
+AUTOV1_LENGTH = 8
+
+# Seconds to wait before persisting recorded hashes after a scheduled flush
+FLUSH_DELAY_SECONDS = 2.0
+
+_MODEL_HASH_PATTERN = re.compile(r'Model hash:\s*([0-9a-fA-F]{8,64})')
+_MODEL_NAME_PATTERN = re.compile(r'Model:\s*("[^"]*"|[^,\n]*)')
+_HASH_LIST_PATTERN = re.compile(
+    r'(Lora|TI) hashes:\s*("[^"]*"|(?:[^,:"\n]+:\s*[0-9a-fA-F]{8,64}\b(?:,\s*)?)+)'
+)
+
+
+def parse_infotext_hashes(text: str) -> List[Tuple[str, str, str]]:
+    """
+    Extract the model hashes referenced by generation info.
+
+    Args:
+        text: A1111 infotext or Civitai metadata formatted as infotext
+
+    Returns:
+        (kind, name, hash) tuples where kind is 'checkpoint', 'lora' or
+        'embedding'; hashes are lowercase
+    """
+    if not text:
+        return []
+
+    references = []
+    model_hash = _MODEL_HASH_PATTERN.search(text)
+    if model_hash:
+        model_name = _MODEL_NAME_PATTERN.search(text)
+        name = model_name.group(1).strip().strip('"') if model_name else ""
+        references.append(('checkpoint', name, model_hash.group(1).lower()))
+
+    for label, value in _HASH_LIST_PATTERN.findall(text):
+        kind = 'lora' if label == 'Lora' else 'embedding'
+        for item in value.strip().strip('"').split(','):
+            name, _, short_hash = item.rpartition(':')
+            short_hash = short_hash.strip().lower()
+            if name.strip() and re.fullmatch(r'[0-9a-f]{8,64}', short_hash):
+                references.append((kind, name.strip(), short_hash))
+    return references
+
+
+def extract_file_hashes(info: Dict, info_file: str) -> List[Tuple[str, Dict]]:
+    """
+    Extract the hashes of the files of a downloaded version information file.
+
+    Args:
+        info: Version information as written next to a downloaded model
+        info_file: Path of the version information file
+
+    Returns:
+        (hash, entry) pairs keyed by lowercase AutoV2 and AutoV1 hashes
+    """
+    base = os.path.basename(info_file)
+    suffix = f"{settings.INFO_SUFFIX}{settings.INFO_EXT}"
+    local_name = base[: -len(suffix)] if base.endswith(suffix) else base
+    entry = {
+        'model_id': str(info.get('modelId') or ""),
+        'version_id': str(info.get('id') or ""),
+        'name': (info.get('model') or {}).get('name') or local_name,
+        'file': local_name,
+    }
+
+    pairs = []
+    for file_info in info.get('files') or []:
+        hashes = {
+            str(k).lower(): str(v).lower() for k, v in (file_info.get('hashes') or {}).items()
+        }
+        autov2 = hashes.get('sha256', "")[:AUTOV2_LENGTH] or hashes.get('autov2', "")
+        if autov2:
+            pairs.append((autov2[:AUTOV2_LENGTH], entry))
+        if hashes.get('autov1'):
+            pairs.append((hashes['autov1'][:AUTOV1_LENGTH], entry))
+    return pairs
+
+
+class ModelHashIndex:
+    """Resolves short model hashes to downloaded models."""
+
+    def __init__(
+        self,
+        cache_file: Optional[str] = None,
+        sources: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        self._cache_file = cache_file
+        self._list_sources = sources
+        self._lock = threading.RLock()
+        self._sources: Dict[str, Tuple[int, List[Tuple[str, Dict]]]] = {}
+        self._hashes: Optional[Dict[str, List[Dict]]] = None
+        self._key = None
+        self._file_hashes: Optional[Dict[str, list]] = None
+        self._cache_stamp = None
+        self._dirty = False
+        self._flush_timer = None
+
+    @property
+    def cache_file(self) -> str:
+        """Return the file persisting the local hash cache."""
+        return self._cache_file or settings.model_hash_cache
+
+    def get_cached_hash(self, path: str) -> Optional[str]:
+        """
+        Get the SHA256 recorded for a file if it has not changed since.
+
+        Args:
+            path: Path of a local model file
+
+        Returns:
+            Lowercase SHA256, or None if unknown or outdated
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._load_file_hashes().get(os.path.abspath(path))
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        return None
+
+    def record_file_hash(self, path: str, sha256: str) -> None:
+        """
+        Record the SHA256 computed for a local model file.
+
+        Args:
+            path: Path of the hashed file
+            sha256: Its SHA256 hex digest
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            file_hashes = self._load_file_hashes()
+            file_hashes[os.path.abspath(path)] = [stat.st_mtime_ns, stat.st_size, sha256.lower()]
+            self._dirty = True
+            self._hashes = None
+        self.schedule_flush()
+
+    def schedule_flush(self) -> None:
+        """Persist the hash cache shortly, coalescing bursts of recorded hashes into one write."""
+        with self._lock:
+            if self._flush_timer is not None and self._flush_timer.is_alive():
+                return
+            self._flush_timer = threading.Timer(FLUSH_DELAY_SECONDS, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> bool:
+        """
+        Persist the hash cache if it changed since the last write.
+
+        Returns:
+            True if the cache file was written
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            return self._write_file_hashes()
+
+    def lookup(self, short_hash: str) -> List[Dict]:
+        """
+        Find the owned models matching a hash.
+
+        Args:
+            short_hash: AutoV1, AutoV2 or full SHA256 hash
+
+        Returns:
+            Entries with ``model_id``, ``version_id``, ``name`` and ``file``;
+            empty if no downloaded model matches
+        """
+        short_hash = (short_hash or "").strip().lower()
+        if len(short_hash) < AUTOV1_LENGTH:
+            return []
+        key = short_hash if len(short_hash) == AUTOV1_LENGTH else short_hash[:AUTOV2_LENGTH]
+        self.refresh()
+        with self._lock:
+            return list(self._hashes.get(key, ()))
+
+    def resolve(self, text: str) -> List[Dict]:
+        """
+        Resolve the hashes referenced by generation info.
+
+        Args:
+            text: A1111 infotext
+
+        Returns:
+            One dict per reference with ``kind``, ``name``, ``hash``, ``owned``
+            and the ``matches`` found by lookup()
+        """
+        results = []
+        for kind, name, short_hash in parse_infotext_hashes(text):
+            matches = self.lookup(short_hash)
+            results.append(
+                {
+                    'kind': kind,
+                    'name': name,
+                    'hash': short_hash,
+                    'owned': bool(matches),
+                    'matches': matches,
+                }
+            )
+        return results
+
+    def refresh(self) -> bool:
+        """
+        Re-read changed version information files and the hash cache.
+
+        Without a ``sources`` callable the downloaded model information files
+        are indexed, and only re-checked after the downloaded model list or
+        the hash cache changed.
+
+        Returns:
+            True if the hash table was rebuilt
+        """
+        with self._lock:
+            cache_stamp = self._get_cache_stamp()
+            if self._list_sources is None:
+                key = (model.get_downloaded_version(), cache_stamp)
+                if self._hashes is not None and key == self._key:
+                    return False
+                info_files = list(model.Downloaded_InfoPath or {})
+            else:
+                key = None
+                info_files = list(self._list_sources())
+
+            changed = cache_stamp != self._cache_stamp
+            if changed and not self._dirty:
+                # Unsaved hashes are kept; the next flush replaces the file
+                self._file_hashes = None
+            seen = set()
+            for info_file in info_files:
+                seen.add(info_file)
+                try:
+                    mtime = os.stat(info_file).st_mtime_ns
+                except OSError:
+                    continue
+                source = self._sources.get(info_file)
+                if source and source[0] == mtime:
+                    continue
+                try:
+                    with open(info_file, 'r', encoding='utf-8') as f:
+                        info = json.load(f)
+                except Exception as e:
+                    logger.debug(f"[ModelHashIndex] Skipping {info_file}: {e}")
+                    continue
+                self._sources[info_file] = (mtime, extract_file_hashes(info, info_file))
+                changed = True
+
+            for info_file in set(self._sources) - seen:
+                del self._sources[info_file]
+                changed = True
+
+            self._key = key
+            if not changed and self._hashes is not None:
+                return False
+            self._rebuild()
+            return True
+
+    def _rebuild(self) -> None:
+        hashes: Dict[str, List[Dict]] = {}
+        for _, pairs in self._sources.values():
+            for short_hash, entry in pairs:
+                entries = hashes.setdefault(short_hash, [])
+                if entry not in entries:
+                    entries.append(entry)
+
+        # Hashes of deleted or moved files would report models that are gone
+        file_hashes = self._load_file_hashes()
+        removed = [path for path in file_hashes if not os.path.isfile(path)]
+        if removed:
+            for path in removed:
+                del file_hashes[path]
+            self._dirty = True
+            self.schedule_flush()
+            logger.debug(f"[ModelHashIndex] Dropped {len(removed)} hashes of missing files")
+
+        # Locally hashed files without version information are owned but unidentified
+        for path, (_, _, sha256) in file_hashes.items():
+            local_name = os.path.splitext(os.path.basename(path))[0]
+            entries = hashes.setdefault(sha256[:AUTOV2_LENGTH], [])
+            if not any(entry['file'] == local_name for entry in entries):
+                entries.append(
+                    {
+                        'model_id': "",
+                        'version_id': "",
+                        'name': os.path.basename(path),
+                        'file': local_name,
+                    }
+                )
+        self._hashes = hashes
+        logger.debug(f"[ModelHashIndex] Indexed {len(hashes)} model hashes")
+
+    def _get_cache_stamp(self):
+        try:
+            stat = os.stat(self.cache_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_file_hashes(self) -> Dict[str, list]:
+        if self._file_hashes is not None:
+            return self._file_hashes
+        self._cache_stamp = self._get_cache_stamp()
+        file_hashes = {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            file_hashes = {
+                path: list(value)
+                for path, value in data.items()
+                if isinstance(value, list) and len(value) == 3
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"[ModelHashIndex] Failed to read {self.cache_file}: {e}")
+        self._file_hashes = file_hashes
+        return file_hashes
+
+    def _write_file_hashes(self) -> bool:
+        tmp_path = f"{self.cache_file}.tmp"
+        try:
+            parent = os.path.dirname(self.cache_file)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._file_hashes, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+            self._cache_stamp = self._get_cache_stamp()
+        except Exception as e:
+            logger.error(f"[ModelHashIndex] Failed to write {self.cache_file}: {e}")
+            return False
+        self._dirty = False
+        return True
+
+
+_global_model_hash_index = None
+_model_hash_index_lock = threading.Lock()
+
+
+def get_model_hash_index() -> ModelHashIndex:
+    """Get or create the global model hash index."""
+    global _global_model_hash_index
+
+    if _global_model_hash_index is None:
+        with _model_hash_index_lock:
+            if _global_model_hash_index is None:
+                _global_model_hash_index = ModelHashIndex()
+    return _global_model_hash_index
+
+
+_KIND_LABELS = {'checkpoint': "Checkpoint", 'lora': "LoRA", 'embedding': "Embedding"}
+
+
+def format_hash_references(text: str) -> str:
+    """
+    Describe which models referenced by generation info are downloaded.
+
+    Args:
+        text: A1111 infotext
+
+    Returns:
+        Markdown list with one line per referenced model, or an empty string
+    """
+    try:
+        references = get_model_hash_index().resolve(text)
+    except Exception as e:
+        logger.debug(f"[ModelHashIndex] Failed to resolve hashes: {e}")
+        return ""
+
+    lines = []
+    for reference in references:
+        label = _KIND_LABELS.get(reference['kind'], reference['kind'])
+        name = reference['name'] or reference['hash']
+        if reference['owned']:
+            status = f"downloaded as `{reference['matches'][0]['file']}`"
+        else:
+            status = "not downloaded"
+        lines.append(f"- {label} **{name}** (`{reference['hash']}`): {status}")
+    return "\n".join(lines)
@@ -0,0 +1,149 @@
+"""
+ModelInfoCache: Bounded LRU cache of parsed model information files.
+
+This module is responsible for:
+- Keeping the most recently used ``sc_infos`` model information parsed in
+  memory, bounded by entry count and total file size
+- Validating every hit against the file's modification time and size, so
+  files replaced outside this process are parsed again
+- Dropping entries when FileProcessor writes or deletes a model's information
+- Counting hits, misses and evictions
+
+Rendering one model card reads the same information file several times, so
+most reads after the first are served without parsing JSON.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from ..logging_config import get_logger
+from .model_info_format import read_model_info_file
+
+logger = get_logger(__name__)
+
+# Parsed model information files kept in memory
+MAX_ENTRIES = 64
+
+# Total size of the cached files; a few models have multi-megabyte information
+MAX_BYTES = 64 * 1024 * 1024
+
+
+class ModelInfoCache:
+    """LRU cache of parsed information files validated by modification time and size."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, path: str) -> Dict:
+        """
+        Return the parsed contents of a plain or compressed JSON file.
+
+        The returned object is shared with later callers and must not be
+        modified.
+
+        Args:
+            path: Path of the JSON file
+
+        Returns:
+            Parsed file contents
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not valid JSON
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.invalidate(path)
+            raise
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(path)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        contents = read_model_info_file(path)
+        logger.debug(f"[ModelInfoCache] Parsed {path} ({stat.st_size} bytes)")
+
+        with self._lock:
+            self._discard(path)
+            if stat.st_size <= self.max_bytes:
+                self._entries[path] = (stamp, contents)
+                self._bytes += stat.st_size
+                self._evict()
+        return contents
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached contents of a file."""
+        with self._lock:
+            self._discard(path)
+
+    def clear(self) -> None:
+        """Drop all cached contents and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> Dict:
+        """
+        Return the cache statistics.
+
+        Returns:
+            Dict with ``hits``, ``misses``, ``evictions``, ``hit_rate``,
+            ``entries`` and ``bytes``
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _discard(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry[0][1]
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (stamp, _) = self._entries.popitem(last=False)
+            self._bytes -= stamp[1]
+            self._evictions += 1
+
+
+_global_model_info_cache = None
+_model_info_cache_lock = threading.Lock()
+
+
+def get_model_info_cache() -> ModelInfoCache:
+    """Get or create the global model information cache."""
+    global _global_model_info_cache
+
+    if _global_model_info_cache is None:
+        with _model_info_cache_lock:
+            if _global_model_info_cache is None:
+                _global_model_info_cache = ModelInfoCache()
+    return _global_model_info_cache
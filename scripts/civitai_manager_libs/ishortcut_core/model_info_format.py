@@ -0,0 +1,207 @@
+"""
+Model information file format: pretty-printed or gzip-compressed compact JSON.
+
+This module is responsible for:
+- Reading ``sc_infos`` model information files in either format, detected by
+  the gzip magic bytes, so both can coexist while a library is converted
+- Serializing model information in the format selected by the
+  ``shortcut_info_compression`` setting
+- Converting existing information files between the formats
+- Measuring the size and parse time of both formats on a sample of files
+
+The file name stays ``<id>.civitai.info`` in both formats, so paths computed
+elsewhere keep working.
+"""
+
+import gzip
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from .. import settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Fast levels compress model JSON nearly as well as level 9
+COMPRESSION_LEVEL = 6
+
+# Files parsed per format by benchmark_model_info_files()
+BENCHMARK_SAMPLE = 50
+
+
+def is_compression_enabled() -> bool:
+    """Return True if model information is written compressed."""
+    return bool(settings.shortcut_info_compression)
+
+
+def is_compressed(path: str) -> bool:
+    """Return True if a file starts with the gzip magic bytes."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(2) == GZIP_MAGIC
+    except OSError:
+        return False
+
+
+def loads_model_info(data: bytes):
+    """Parse model information serialized in either format."""
+    if data[:2] == GZIP_MAGIC:
+        data = gzip.decompress(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def dumps_model_info(model_info: Dict, compress: Optional[bool] = None) -> bytes:
+    """
+    Serialize model information.
+
+    Args:
+        model_info: Model information dictionary
+        compress: Write compact gzip-compressed JSON; the setting if omitted
+
+    Returns:
+        File contents
+    """
+    if compress is None:
+        compress = is_compression_enabled()
+    if compress:
+        text = json.dumps(model_info, separators=(',', ':'), ensure_ascii=False)
+        # mtime=0 keeps the output identical for identical information
+        return gzip.compress(text.encode('utf-8'), COMPRESSION_LEVEL, mtime=0)
+    return json.dumps(model_info, indent=4, ensure_ascii=False).encode('utf-8')
+
+
+def read_model_info_file(path: str):
+    """
+    Read a model information file in either format.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not valid (compressed) JSON
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return loads_model_info(data)
+    except (OSError, EOFError) as e:
+        raise ValueError(f"Corrupt compressed model information: {path}") from e
+
+
+def list_model_info_files(folder: Optional[str] = None) -> List[str]:
+    """Return the model information files of the ``sc_infos`` folder."""
+    folder = folder or settings.shortcut_info_folder
+    info_files = []
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                info_file = os.path.join(
+                    entry.path, f"{entry.name}{settings.INFO_SUFFIX}{settings.INFO_EXT}"
+                )
+                if os.path.isfile(info_file):
+                    info_files.append(info_file)
+    except OSError as e:
+        logger.warning(f"[ModelInfoFormat] Cannot list {folder}: {e}")
+    return info_files
+
+
+def convert_model_info_files(
+    compress: Optional[bool] = None, folder: Optional[str] = None, progress=None
+) -> Dict:
+    """
+    Rewrite existing model information files in one format.
+
+    Files already in the requested format are left untouched. Each file is
+    replaced atomically, so readers never see a partial file.
+
+    Args:
+        compress: Target compressed files; the setting if omitted
+        folder: Information folder; ``sc_infos`` if omitted
+        progress: Optional Gradio progress with ``tqdm``
+
+    Returns:
+        Dict with ``converted``, ``skipped`` and ``failed`` counts and the
+        ``bytes_before`` and ``bytes_after`` of the converted files
+    """
+    if compress is None:
+        compress = is_compression_enabled()
+    info_files = list_model_info_files(folder)
+    if progress is not None:
+        info_files = progress.tqdm(info_files, desc="Converting model information")
+
+    # Imported here: the cache reads files through this module
+    from .model_info_cache import get_model_info_cache
+
+    stats = {'converted': 0, 'skipped': 0, 'failed': 0, 'bytes_before': 0, 'bytes_after': 0}
+    for info_file in info_files:
+        try:
+            with open(info_file, 'rb') as f:
+                data = f.read()
+            if (data[:2] == GZIP_MAGIC) == bool(compress):
+                stats['skipped'] += 1
+                continue
+            converted = dumps_model_info(loads_model_info(data), compress)
+            tmp_file = f"{info_file}.tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(converted)
+            os.replace(tmp_file, info_file)
+            get_model_info_cache().invalidate(info_file)
+        except Exception as e:
+            logger.warning(f"[ModelInfoFormat] Failed to convert {info_file}: {e}")
+            stats['failed'] += 1
+            continue
+        stats['converted'] += 1
+        stats['bytes_before'] += len(data)
+        stats['bytes_after'] += len(converted)
+
+    logger.info(
+        f"[ModelInfoFormat] Converted {stats['converted']} information files "
+        f"({stats['bytes_before']} -> {stats['bytes_after']} bytes)"
+    )
+    return stats
+
+
+def benchmark_model_info_files(
+    folder: Optional[str] = None, sample: int = BENCHMARK_SAMPLE
+) -> Dict:
+    """
+    Compare the size and parse time of both formats on existing files.
+
+    Args:
+        folder: Information folder; ``sc_infos`` if omitted
+        sample: Maximum number of files measured
+
+    Returns:
+        Dict with the number of ``files`` measured, ``total_files``, and the
+        ``json_bytes``, ``compressed_bytes``, ``json_parse_seconds`` and
+        ``compressed_parse_seconds`` of the sample
+    """
+    info_files = list_model_info_files(folder)
+    result = {
+        'files': 0,
+        'total_files': len(info_files),
+        'json_bytes': 0,
+        'compressed_bytes': 0,
+        'json_parse_seconds': 0.0,
+        'compressed_parse_seconds': 0.0,
+    }
+    for info_file in info_files[:sample]:
+        try:
+            model_info = read_model_info_file(info_file)
+        except Exception:
+            continue
+        encoded = {
+            'json': dumps_model_info(model_info, compress=False),
+            'compressed': dumps_model_info(model_info, compress=True),
+        }
+        for fmt, data in encoded.items():
+            start = time.perf_counter()
+            loads_model_info(data)
+            result[f"{fmt}_parse_seconds"] += time.perf_counter() - start
+            result[f"{fmt}_bytes"] += len(data)
+        result['files'] += 1
+    return result
@@ -0,0 +1,312 @@
+"""
+ModelInfoIndex: Persistent digest of the per-model information files.
+
+This module is responsible for:
+- Extracting the searchable fields of ``sc_infos/<id>/<id>.civitai.info``
+- Keeping the extracted records keyed by the info file modification time
+- Maintaining facet maps (base model, type, nsfw, creator) -> model IDs
+- Persisting the records so searches do not re-parse every model on start-up
+
+A record is refreshed only when its info file changed since it was extracted,
+and ``FileProcessor`` updates it whenever it writes model information.
+Models without an information file are never recorded.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, Optional, Set
+
+from .. import settings
+from ..logging_config import get_logger
+from .model_info_format import read_model_info_file
+
+logger = get_logger(__name__)
+
+# Descriptions are indexed up to this many characters
+MAX_DESCRIPTION_CHARS = 4000
+
+# Record fields that can be looked up by value
+FACETS = ('base_models', 'type', 'nsfw', 'creator')
+
+# Seconds to wait before persisting records after a scheduled flush
+FLUSH_DELAY_SECONDS = 2.0
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def extract_model_record(model_info: Dict) -> Dict:
+    """
+    Extract the searchable fields of a model information dictionary.
+
+    Args:
+        model_info: Model information as saved from the Civitai API
+
+    Returns:
+        Record with base_models, type, nsfw, creator, trained_words and
+        description text
+    """
+    creator = model_info.get('creator') or {}
+    base_models = []
+    trained_words = []
+    for version in model_info.get('modelVersions') or []:
+        base_model = version.get('baseModel')
+        if base_model and base_model not in base_models:
+            base_models.append(base_model)
+        for word in version.get('trainedWords') or []:
+            word = str(word).strip()
+            if word and word not in trained_words:
+                trained_words.append(word)
+
+    description = _HTML_TAG.sub(" ", str(model_info.get('description') or ""))
+    description = " ".join(description.split())[:MAX_DESCRIPTION_CHARS]
+
+    return {
+        'base_models': base_models,
+        'type': str(model_info.get('type') or ""),
+        'nsfw': bool(model_info.get('nsfw')),
+        'creator': str(creator.get('username') or "") if isinstance(creator, dict) else "",
+        'trained_words': trained_words,
+        'description': description,
+    }
+
+
+class ModelInfoIndex:
+    """Caches extracted model information records keyed by info file mtime."""
+
+    def __init__(self, index_file: Optional[str] = None):
+        self._index_file = index_file
+        self._records = None
+        self._facets = None
+        self._generation = 0
+        self._dirty = False
+        self._flush_timer = None
+        self._lock = threading.RLock()
+
+    @property
+    def index_file(self) -> str:
+        """Return the file persisting the extracted records."""
+        return self._index_file or settings.shortcut_model_index
+
+    @property
+    def generation(self) -> int:
+        """Return a counter that changes whenever a record is added, changed or removed."""
+        return self._generation
+
+    @staticmethod
+    def get_info_file(model_id) -> str:
+        """Return the information file path of a model."""
+        model_id = str(model_id)
+        return os.path.join(
+            settings.shortcut_info_folder,
+            model_id,
+            f"{model_id}{settings.INFO_SUFFIX}{settings.INFO_EXT}",
+        )
+
+    def get_record(self, model_id) -> Optional[Dict]:
+        """
+        Get the extracted record of a model, re-reading its info file if it changed.
+
+        Args:
+            model_id: Model ID to look up
+
+        Returns:
+            Record dictionary including the info file ``mtime``, or None if the
+            model has no readable information file
+        """
+        if not model_id:
+            return None
+        model_id = str(model_id)
+        info_file = self.get_info_file(model_id)
+        try:
+            mtime = os.stat(info_file).st_mtime_ns
+        except OSError:
+            self.discard(model_id)
+            return None
+
+        with self._lock:
+            record = self._load().get(model_id)
+            if record and record.get('mtime') == mtime:
+                return record
+
+        try:
+            model_info = read_model_info_file(info_file)
+        except Exception as e:
+            logger.warning(f"[ModelInfoIndex] Failed to read {info_file}: {e}")
+            return None
+
+        return self.update(model_id, model_info, mtime)
+
+    def update(self, model_id, model_info: Dict, mtime: Optional[int] = None) -> Dict:
+        """
+        Store the record of freshly written model information.
+
+        Args:
+            model_id: Model ID of the information
+            model_info: Model information dictionary
+            mtime: Info file modification time in ns; read from disk if omitted
+
+        Returns:
+            The stored record
+        """
+        model_id = str(model_id)
+        if mtime is None:
+            try:
+                mtime = os.stat(self.get_info_file(model_id)).st_mtime_ns
+            except OSError:
+                mtime = 0
+
+        record = extract_model_record(model_info or {})
+        record['mtime'] = mtime
+        with self._lock:
+            records = self._load()
+            self._unlink_facets(model_id, records.get(model_id))
+            records[model_id] = record
+            self._link_facets(model_id, record)
+            self._generation += 1
+            self._dirty = True
+        return record
+
+    def discard(self, model_id) -> None:
+        """Forget the record of a model."""
+        model_id = str(model_id)
+        with self._lock:
+            record = self._load().pop(model_id, None)
+            if record is not None:
+                self._unlink_facets(model_id, record)
+                self._generation += 1
+                self._dirty = True
+
+    def get_cached_record(self, model_id) -> Optional[Dict]:
+        """Get the stored record of a model without checking its info file."""
+        with self._lock:
+            return self._load().get(str(model_id))
+
+    def has_record(self, model_id) -> bool:
+        """Check whether a model has an extracted record."""
+        with self._lock:
+            return str(model_id) in self._load()
+
+    def find(self, facet: str, values: Iterable) -> Set[str]:
+        """
+        Find models whose facet matches any of the given values.
+
+        Args:
+            facet: One of ``FACETS``
+            values: Facet values to match
+
+        Returns:
+            Matching model IDs
+        """
+        with self._lock:
+            value_map = self._get_facets().get(facet, {})
+            result = set()
+            for value in values:
+                result |= value_map.get(value, set())
+            return result
+
+    def get_facet_counts(self, facet: str) -> Dict:
+        """Return the number of recorded models for every value of a facet."""
+        with self._lock:
+            return {value: len(ids) for value, ids in self._get_facets().get(facet, {}).items()}
+
+    def schedule_flush(self) -> None:
+        """Persist the records shortly, coalescing bursts of updates into one write."""
+        with self._lock:
+            if self._flush_timer is not None and self._flush_timer.is_alive():
+                return
+            # Bind the file now; the configured path may change before the timer fires
+            self._flush_timer = threading.Timer(
+                FLUSH_DELAY_SECONDS, self.flush, args=(self.index_file,)
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self, index_file: Optional[str] = None) -> bool:
+        """
+        Persist the records if they changed since the last flush.
+
+        Args:
+            index_file: File to write; ``index_file`` if omitted
+
+        Returns:
+            True if the index file was written
+        """
+        index_file = index_file or self.index_file
+        with self._lock:
+            if not self._dirty:
+                return False
+            tmp_path = f"{index_file}.tmp"
+            try:
+                parent = os.path.dirname(index_file)
+                if parent:
+                    os.makedirs(parent, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._records, f)
+                os.replace(tmp_path, index_file)
+            except Exception as e:
+                logger.error(f"[ModelInfoIndex] Failed to write {index_file}: {e}")
+                return False
+            self._dirty = False
+            return True
+
+    def _get_facets(self) -> Dict[str, Dict]:
+        if self._facets is None:
+            self._facets = {facet: {} for facet in FACETS}
+            for model_id, record in self._load().items():
+                self._link_facets(model_id, record)
+        return self._facets
+
+    @staticmethod
+    def _facet_values(record: Dict, facet: str) -> list:
+        value = record.get(facet)
+        if isinstance(value, list):
+            return value
+        return [] if value is None or value == "" else [value]
+
+    def _link_facets(self, model_id: str, record: Optional[Dict]) -> None:
+        if self._facets is None or not record:
+            return
+        for facet in FACETS:
+            for value in self._facet_values(record, facet):
+                self._facets[facet].setdefault(value, set()).add(model_id)
+
+    def _unlink_facets(self, model_id: str, record: Optional[Dict]) -> None:
+        if self._facets is None or not record:
+            return
+        for facet in FACETS:
+            value_map = self._facets[facet]
+            for value in self._facet_values(record, facet):
+                ids = value_map.get(value)
+                if ids is not None:
+                    ids.discard(model_id)
+                    if not ids:
+                        del value_map[value]
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._records is None:
+            self._records = {}
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self._records = json.load(f) or {}
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"[ModelInfoIndex] Failed to read {self.index_file}: {e}")
+        return self._records
+
+
+_global_model_info_index = None
+_model_info_index_lock = threading.Lock()
+
+
+def get_model_info_index() -> ModelInfoIndex:
+    """Get or create the global model information index."""
+    global _global_model_info_index
+
+    if _global_model_info_index is None:
+        with _model_info_index_lock:
+            if _global_model_info_index is None:
+                _global_model_info_index = ModelInfoIndex()
+    return _global_model_info_index
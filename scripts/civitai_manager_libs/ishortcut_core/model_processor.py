@@ -20,7 +20,6 @@ Extracted from ishortcut.py functions:
 """
 
 import os
-import json
 from typing import Dict, List, Optional, Tuple
 
 # Import dependencies from parent modules
@@ -29,6 +28,7 @@ from .. import civitai
 from ..logging_config import get_logger
 from ..error_handler import with_error_handling
 from ..exceptions import NetworkError, FileOperationError, CivitaiShortcutError
+from .model_info_cache import get_model_info_cache
 
 logger = get_logger(__name__)
 
@@ -248,7 +248,7 @@ class ModelProcessor:
         user_message="Failed to get version description for gallery",
     )
     def get_version_description_gallery(
-        self, modelid: str, version_info: Dict
+        self, modelid: str, version_info: Dict, include_missing: bool = False
     ) -> Optional[List[str]]:
         """
         Get image URLs for gallery display with NSFW filtering.
@@ -256,6 +256,7 @@ class ModelProcessor:
         Args:
             modelid: Model ID
             version_info: Version information dictionary
+            include_missing: Also return paths of images that are not downloaded yet
 
         Returns:
             List of local image file paths for gallery display
@@ -288,10 +289,10 @@ class ModelProcessor:
                 user_nsfw_level = settings.NSFW_LEVELS.index(settings.nsfw_level)
 
                 if img_nsfw_level > user_nsfw_level:
-                    description_img = settings.get_nsfw_disable_image
+                    description_img = settings.get_nsfw_disable_image()
 
             # Check if file exists locally
-            if os.path.isfile(description_img):
+            if include_missing or os.path.isfile(description_img):
                 images_url.append(description_img)
 
         logger.debug(f"[ModelProcessor] Found {len(images_url)} local images for gallery")
@@ -317,6 +318,9 @@ class ModelProcessor:
         """
         Load model information from local storage.
 
+        Parsed files are kept in the shared model information cache until they
+        change, so the returned dictionary must not be modified.
+
         Args:
             modelid: Model ID to load
 
@@ -333,8 +337,7 @@ class ModelProcessor:
         )
 
         try:
-            with open(model_path, 'r', encoding='utf-8') as f:
-                contents = json.load(f)
+            contents = get_model_info_cache().load(model_path)
 
             if 'id' not in contents:
                 logger.warning(f"[ModelProcessor] Model info missing ID: {model_path}")
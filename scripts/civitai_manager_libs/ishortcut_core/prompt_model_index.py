@@ -0,0 +1,330 @@
+"""
+PromptModelIndex: Resolves the models a prompt uses.
+
+This module is responsible for:
+- Collecting model file basenames and trained words from ``sc_infos`` model
+  information and downloaded ``.civitai.info`` version files
+- Compiling them into one Aho-Corasick automaton
+- Finding every ``<lora:...>``, ``<lyco:...>``, ``<hypernet:...>`` name,
+  embedding name and trigger word of a prompt in a single pass
+- Mapping each match back to its (model ID, version ID)
+
+Information files are parsed again only when their modification time changes.
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .. import model
+from .. import settings
+from ..logging_config import get_logger
+from .model_info_format import read_model_info_file
+from .model_info_index import get_model_info_index
+
+logger = get_logger(__name__)
+
+# Trained words shorter than this are too ambiguous to resolve
+MIN_TRIGGER_LENGTH = 3
+
+# Prompt syntax prefixes naming an extra network file
+NETWORK_PREFIXES = {'<lora:': 'lora', '<lyco:': 'lyco', '<hypernet:': 'hypernet'}
+
+# Match kinds that name a model file rather than a trigger word
+FILE_KINDS = ('lora', 'lyco', 'hypernet', 'embedding')
+
+
+class AhoCorasick:
+    """Multi-pattern matcher reporting every pattern occurrence in one pass."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str) -> None:
+        """Add a pattern; call build() before matching."""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        if pattern not in self._out[state]:
+            self._out[state].append(pattern)
+        self._built = False
+
+    def build(self) -> None:
+        """Compute the failure links."""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, pattern) for every occurrence in the text."""
+        if not self._built:
+            self.build()
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern in self._out[state]:
+                yield position + 1 - len(pattern), position + 1, pattern
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def extract_prompt_patterns(info: Dict, info_file: Optional[str] = None) -> List[Tuple]:
+    """
+    Extract the prompt patterns of a model or version information file.
+
+    Args:
+        info: Model information (with ``modelVersions``) or version information
+            (with ``modelId``)
+        info_file: Path of a downloaded version info file; its basename is the
+            local model file name
+
+    Returns:
+        (pattern, is_file, model type, model ID, version ID) tuples with
+        lowercase patterns
+    """
+    if 'modelVersions' in info:
+        model_id = info.get('id')
+        model_type = info.get('type')
+        versions = info.get('modelVersions') or []
+    else:
+        model_id = info.get('modelId')
+        model_type = (info.get('model') or {}).get('type')
+        versions = [info]
+
+    patterns = []
+    for version in versions:
+        version_id = str(version.get('id') or "")
+        target = (model_type, str(model_id or ""), version_id)
+        for file_info in version.get('files') or []:
+            name = os.path.splitext(str(file_info.get('name') or ""))[0].strip().lower()
+            if name:
+                patterns.append((name, True) + target)
+        for word in version.get('trainedWords') or []:
+            for trigger in str(word).split(','):
+                trigger = trigger.strip().lower()
+                if len(trigger) >= MIN_TRIGGER_LENGTH:
+                    patterns.append((trigger, False) + target)
+
+    if info_file and versions:
+        base = os.path.basename(info_file)
+        suffix = f"{settings.INFO_SUFFIX}{settings.INFO_EXT}"
+        if base.endswith(suffix):
+            name = base[: -len(suffix)].strip().lower()
+            if name:
+                patterns.append((name, True, model_type, str(model_id or ""), str(info.get('id'))))
+    return patterns
+
+
+class PromptModelIndex:
+    """Maps file basenames and trained words in prompts to models."""
+
+    def __init__(self, sources: Optional[Callable[[], Iterable[str]]] = None):
+        self._list_sources = sources
+        self._lock = threading.RLock()
+        self._sources: Dict[str, Tuple[int, List[Tuple]]] = {}
+        self._targets: Dict[str, List[Tuple]] = {}
+        self._matcher: Optional[AhoCorasick] = None
+        self._key = None
+
+    def refresh(self) -> bool:
+        """
+        Re-read changed information files and rebuild the matcher if needed.
+
+        Without a ``sources`` callable the index covers all shortcut model
+        information and downloaded version information files, and is only
+        re-checked after the information index or the downloaded model list
+        changed.
+
+        Returns:
+            True if the matcher was rebuilt
+        """
+        with self._lock:
+            if self._list_sources is None:
+                key = (get_model_info_index().generation, model.get_downloaded_version())
+                if self._matcher is not None and key == self._key:
+                    return False
+                info_files = self._default_sources()
+            else:
+                key = None
+                info_files = self._list_sources()
+
+            changed = False
+            seen = set()
+            for info_file in info_files:
+                seen.add(info_file)
+                try:
+                    mtime = os.stat(info_file).st_mtime_ns
+                except OSError:
+                    continue
+                source = self._sources.get(info_file)
+                if source and source[0] == mtime:
+                    continue
+                try:
+                    info = read_model_info_file(info_file)
+                except Exception as e:
+                    logger.debug(f"[PromptModelIndex] Skipping {info_file}: {e}")
+                    continue
+                downloaded = 'modelVersions' not in info
+                patterns = extract_prompt_patterns(info, info_file if downloaded else None)
+                self._sources[info_file] = (mtime, patterns)
+                changed = True
+
+            for info_file in set(self._sources) - seen:
+                del self._sources[info_file]
+                changed = True
+
+            self._key = key
+            if not changed and self._matcher is not None:
+                return False
+            self._rebuild()
+            return True
+
+    def resolve(self, prompt: str) -> List[Dict]:
+        """
+        Resolve the models used by a prompt.
+
+        Args:
+            prompt: Prompt text
+
+        Returns:
+            One dict per match and model with ``kind`` ('lora', 'lyco',
+            'hypernet', 'embedding' or 'trigger'), ``text``, ``model_id``,
+            ``version_id``, ``start`` and ``end``, in prompt order
+        """
+        if not prompt:
+            return []
+        self.refresh()
+        text = prompt.lower()
+        with self._lock:
+            matches = [
+                (start, end, pattern)
+                for start, end, pattern in self._matcher.iter_matches(text)
+                if (start == 0 or not _is_word_char(text[start - 1]))
+                and (end == len(text) or not _is_word_char(text[end]))
+            ]
+
+            # Keep the leftmost longest match where matches overlap
+            matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+            results = []
+            covered = 0
+            for start, end, pattern in matches:
+                if start < covered:
+                    continue
+                covered = end
+                network = self._network_prefix(text, start)
+                seen = set()
+                for is_file, model_type, model_id, version_id in self._targets[pattern]:
+                    if network and not is_file:
+                        continue
+                    if network:
+                        kind = network
+                    elif is_file and model_type == 'TextualInversion':
+                        kind = 'embedding'
+                    elif not is_file:
+                        kind = 'trigger'
+                    else:
+                        continue
+                    if (model_id, version_id, kind) in seen:
+                        continue
+                    seen.add((model_id, version_id, kind))
+                    results.append(
+                        {
+                            'kind': kind,
+                            'text': pattern,
+                            'model_id': model_id,
+                            'version_id': version_id,
+                            'start': start,
+                            'end': end,
+                        }
+                    )
+            return results
+
+    def resolve_model_ids(self, prompt: str, kinds: Iterable[str] = FILE_KINDS) -> List[str]:
+        """Return the IDs of the models a prompt references, in prompt order."""
+        kinds = set(kinds)
+        model_ids = []
+        for match in self.resolve(prompt):
+            if match['kind'] in kinds and match['model_id'] not in model_ids:
+                model_ids.append(match['model_id'])
+        return model_ids
+
+    @staticmethod
+    def _network_prefix(text: str, start: int) -> Optional[str]:
+        for prefix, kind in NETWORK_PREFIXES.items():
+            if text.startswith(prefix, start - len(prefix)) and start >= len(prefix):
+                return kind
+        return None
+
+    @staticmethod
+    def _default_sources() -> List[str]:
+        info_files = []
+        try:
+            with os.scandir(settings.shortcut_info_folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        info_files.append(
+                            os.path.join(
+                                entry.path,
+                                f"{entry.name}{settings.INFO_SUFFIX}{settings.INFO_EXT}",
+                            )
+                        )
+        except OSError:
+            pass
+        info_files.extend(model.Downloaded_InfoPath or {})
+        return info_files
+
+    def _rebuild(self) -> None:
+        matcher = AhoCorasick()
+        targets: Dict[str, List[Tuple]] = {}
+        for _, patterns in self._sources.values():
+            for pattern, is_file, model_type, model_id, version_id in patterns:
+                target = (is_file, model_type, model_id, version_id)
+                entries = targets.setdefault(pattern, [])
+                if target not in entries:
+                    entries.append(target)
+                    matcher.add(pattern)
+        matcher.build()
+        self._matcher = matcher
+        self._targets = targets
+        logger.debug(f"[PromptModelIndex] Indexed {len(targets)} prompt patterns")
+
+
+_global_prompt_model_index = None
+_prompt_model_index_lock = threading.Lock()
+
+
+def get_prompt_model_index() -> PromptModelIndex:
+    """Get or create the global prompt model index."""
+    global _global_prompt_model_index
+
+    if _global_prompt_model_index is None:
+        with _prompt_model_index_lock:
+            if _global_prompt_model_index is None:
+                _global_prompt_model_index = PromptModelIndex()
+    return _global_prompt_model_index
@@ -0,0 +1,232 @@
+"""
+RelatedModelsIndex: MinHash/LSH index of similar shortcuts.
+
+This module is responsible for:
+- Describing every shortcut as a set of features (tags, type, base models,
+  creator and trained words)
+- Computing MinHash signatures of those sets with NumPy
+- Bucketing signature bands (locality sensitive hashing) so similar shortcuts
+  are found without comparing every pair
+- Ranking the bucket candidates by the Jaccard similarity of their features
+
+Signatures are recomputed only for shortcuts whose features changed since the
+last sync, so keeping the index current costs little after the first build.
+"""
+
+import threading
+import zlib
+from collections import Counter
+from itertools import islice
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from ..logging_config import get_logger
+from .shortcut_search_index import tokenize
+
+logger = get_logger(__name__)
+
+# Number of MinHash permutations; split into BANDS bands of equal rows
+NUM_PERM = 64
+BANDS = 16
+
+# Related shortcuts returned by default
+MAX_RELATED = 12
+
+# Members read from one bucket per query; very common feature sets form huge buckets
+MAX_BUCKET_SCAN = 200
+
+# Candidates scored exactly per requested result, picked by shared bands
+CANDIDATE_FACTOR = 8
+
+# Feature hashes permuted at once while computing signatures
+HASH_CHUNK = 65536
+
+# Mersenne prime used by the universal hash family
+_PRIME = (1 << 31) - 1
+
+
+def extract_features(shortcut: Dict, record: Optional[Dict] = None) -> FrozenSet[str]:
+    """
+    Build the feature set of a shortcut.
+
+    Args:
+        shortcut: Shortcut entry or summary providing tags and type
+        record: Model information record providing base models, creator and
+            trained words, or None
+
+    Returns:
+        Prefixed, lowercase feature strings
+    """
+    features = set()
+    for tag in shortcut.get('tags') or ():
+        if isinstance(tag, dict):
+            tag = tag.get('name')
+        if tag:
+            features.add(f"t:{str(tag).lower()}")
+    if shortcut.get('type'):
+        features.add(f"y:{shortcut['type']}")
+    for base_model in shortcut.get('base_models') or ():
+        features.add(f"b:{base_model}")
+
+    if record:
+        for base_model in record.get('base_models') or ():
+            features.add(f"b:{base_model}")
+        if record.get('creator'):
+            features.add(f"c:{str(record['creator']).lower()}")
+        for word in record.get('trained_words') or ():
+            features.update(f"w:{token}" for token in tokenize(word))
+    return frozenset(features)
+
+
+class RelatedModelsIndex:
+    """Finds shortcuts with similar features through MinHash LSH buckets."""
+
+    def __init__(self, info_index=None, num_perm: int = NUM_PERM, bands: int = BANDS, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self._info_index = info_index
+        self._bands = bands
+        self._rows = num_perm // bands
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=(num_perm, 1), dtype=np.int64).astype(np.uint64)
+        self._row_weights = rng.randint(1, _PRIME, size=self._rows, dtype=np.int64).astype(
+            np.uint64
+        )
+        self._lock = threading.RLock()
+        self._key = None
+        self._features: Dict[str, FrozenSet[str]] = {}
+        self._band_keys: Dict[str, List[int]] = {}
+        self._buckets: List[Dict[int, set]] = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def sync(self, shortcuts: Dict[str, Dict], version=None) -> int:
+        """
+        Bring the index up to date with the shortcut collection.
+
+        Args:
+            shortcuts: Shortcut entries or summaries keyed by model ID
+            version: Collection version; when it and the information index
+                generation are unchanged the collection is not compared
+
+        Returns:
+            Number of shortcuts (re-)hashed or removed
+        """
+        with self._lock:
+            key = (version, getattr(self._info_index, 'generation', None))
+            if version is not None and key == self._key:
+                return 0
+
+            shortcuts = shortcuts or {}
+            changed = 0
+            for model_id in set(self._features) - {str(k) for k in shortcuts}:
+                self._remove(model_id)
+                changed += 1
+
+            pending = {}
+            for key_id, shortcut in shortcuts.items():
+                if not shortcut:
+                    continue
+                model_id = str(key_id)
+                record = None
+                if self._info_index is not None:
+                    record = self._info_index.get_cached_record(model_id)
+                features = extract_features(shortcut, record)
+                if self._features.get(model_id) != features:
+                    pending[model_id] = features
+
+            for model_id in pending:
+                self._remove(model_id)
+            self._add_all(pending)
+            changed += len(pending)
+
+            self._key = key if version is not None else None
+            if changed:
+                logger.debug(f"[RelatedModelsIndex] Re-hashed {changed} shortcuts")
+            return changed
+
+    def related(self, model_id, limit: int = MAX_RELATED) -> List[Tuple[str, float]]:
+        """
+        Find the shortcuts most similar to a model.
+
+        Args:
+            model_id: Model ID to find related shortcuts for
+            limit: Maximum number of results
+
+        Returns:
+            (model ID, Jaccard similarity) pairs, most similar first
+        """
+        model_id = str(model_id)
+        with self._lock:
+            features = self._features.get(model_id)
+            if not features:
+                return []
+
+            collisions = Counter()
+            for band, band_key in enumerate(self._band_keys.get(model_id, ())):
+                bucket = self._buckets[band].get(band_key, ())
+                collisions.update(islice(bucket, MAX_BUCKET_SCAN))
+            collisions.pop(model_id, None)
+
+            # More shared bands means a higher estimated similarity
+            scored = []
+            for candidate, _ in collisions.most_common(limit * CANDIDATE_FACTOR):
+                other = self._features[candidate]
+                similarity = len(features & other) / len(features | other)
+                scored.append((candidate, similarity))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def _signatures(self, feature_sets: List[FrozenSet[str]]) -> np.ndarray:
+        """Compute the MinHash signatures of non-empty feature sets, one row per set."""
+        hashes = np.fromiter(
+            (
+                zlib.crc32(feature.encode('utf-8')) % _PRIME
+                for features in feature_sets
+                for feature in features
+            ),
+            dtype=np.uint64,
+        )
+        offsets = np.cumsum([0] + [len(features) for features in feature_sets[:-1]])
+        signatures = np.empty((len(feature_sets), len(self._a)), dtype=np.uint64)
+        # Hash in chunks to bound the size of the permutation matrix
+        for start in range(0, len(hashes), HASH_CHUNK):
+            chunk = (self._a * hashes[start : start + HASH_CHUNK] + self._b) % _PRIME
+            first = np.searchsorted(offsets, start, side='right') - 1
+            last = np.searchsorted(offsets, start + chunk.shape[1], side='left')
+            bounds = np.clip(offsets[first:last], start, None) - start
+            partial = np.minimum.reduceat(chunk, bounds, axis=1).T
+            if start and offsets[first] < start:
+                # The first set continues from the previous chunk
+                partial[0] = np.minimum(partial[0], signatures[first])
+            signatures[first:last] = partial
+        return signatures
+
+    def _add_all(self, pending: Dict[str, FrozenSet[str]]) -> None:
+        hashed = [(model_id, features) for model_id, features in pending.items() if features]
+        for model_id, features in pending.items():
+            self._features[model_id] = features
+        if not hashed:
+            return
+
+        signatures = self._signatures([features for _, features in hashed])
+        # Fold the rows of every band into one 64-bit bucket key
+        bands = signatures.reshape(len(hashed), self._bands, self._rows)
+        keys = (bands * self._row_weights).sum(axis=2).tolist()
+        for (model_id, _), band_keys in zip(hashed, keys):
+            for band, band_key in enumerate(band_keys):
+                self._buckets[band].setdefault(band_key, set()).add(model_id)
+            self._band_keys[model_id] = band_keys
+
+    def _remove(self, model_id: str) -> None:
+        self._features.pop(model_id, None)
+        for band, band_key in enumerate(self._band_keys.pop(model_id, ())):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is not None:
+                bucket.discard(model_id)
+                if not bucket:
+                    del self._buckets[band][band_key]
@@ -0,0 +1,108 @@
+"""
+ResultViewCache: Sorted shortcut ID lists shared by browser page flips.
+
+This module is responsible for:
+- Sorting filtered shortcut IDs by name, registration date or model ID
+- Keeping recently used sorted views keyed by the filter signature
+- Dropping views that belong to an older collection version
+
+A browser page flip with unchanged filters only slices a cached view instead
+of filtering and sorting the whole collection again.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Supported sort orders; 'date' and 'id' list the newest shortcuts first
+SORT_ORDERS = ('name', 'date', 'id')
+
+# Number of views kept per cache
+MAX_VIEWS = 32
+
+
+def _id_sort_key(model_id: str):
+    try:
+        return (0, int(model_id))
+    except (TypeError, ValueError):
+        return (1, str(model_id))
+
+
+def sort_shortcut_ids(
+    shortcuts: Dict[str, Dict], model_ids: List[str], sort_by: str = 'name'
+) -> List[str]:
+    """
+    Sort shortcut IDs for display.
+
+    Args:
+        shortcuts: Shortcut collection keyed by model ID
+        model_ids: IDs to sort
+        sort_by: 'name' (A-Z), 'date' (newest registration first) or 'id'
+            (highest model ID first)
+
+    Returns:
+        Sorted model IDs
+    """
+    if sort_by == 'date':
+        # Ties keep name order
+        by_name = sort_shortcut_ids(shortcuts, model_ids, 'name')
+        return sorted(by_name, key=lambda mid: str(shortcuts[mid].get('date') or ""), reverse=True)
+    if sort_by == 'id':
+        return sorted(model_ids, key=_id_sort_key, reverse=True)
+    return sorted(model_ids, key=lambda mid: str(shortcuts[mid].get('name') or "").lower().strip())
+
+
+class ResultViewCache:
+    """LRU cache of sorted result views for one collection version."""
+
+    def __init__(self, max_views: int = MAX_VIEWS):
+        self.max_views = max_views
+        self._views: "OrderedDict[Hashable, List[str]]" = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version) -> Optional[List[str]]:
+        """
+        Get a cached view.
+
+        Args:
+            key: Filter signature including the sort order
+            version: Current collection version; older views are discarded
+
+        Returns:
+            The sorted model IDs, or None if the view is not cached
+        """
+        with self._lock:
+            if version != self._version:
+                self._views.clear()
+                self._version = version
+            view = self._views.get(key)
+            if view is None:
+                self.misses += 1
+                return None
+            self._views.move_to_end(key)
+            self.hits += 1
+            return view
+
+    def put(self, key: Hashable, version, model_ids: List[str]) -> None:
+        """Store a sorted view computed for the given collection version."""
+        with self._lock:
+            if version != self._version:
+                self._views.clear()
+                self._version = version
+            self._views[key] = model_ids
+            self._views.move_to_end(key)
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached view."""
+        with self._lock:
+            self._views.clear()
+            self._version = None
@@ -6,11 +6,12 @@ and cleanup of shortcut data and URL mappings.
 """
 
 import os
-import json
 import datetime
 
 from ..logging_config import get_logger
 from .. import settings
+from .. import document_store
+from ..json_store import get_json_store
 
 logger = get_logger(__name__)
 
@@ -33,8 +34,7 @@ class ShortcutBackupManager:
             os.makedirs(backup_dir, exist_ok=True)
             timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
             backup_file = os.path.join(backup_dir, f"{model_id}_{timestamp}.json")
-            with open(backup_file, "w") as f:
-                json.dump(shortcut_data, f, indent=4)
+            get_json_store().write(backup_file, shortcut_data)
             logger.info(f"Shortcut backup created: {backup_file}")
             return True
         except Exception:
@@ -47,16 +47,7 @@ class ShortcutBackupManager:
             return False
 
         try:
-            mapping_file = settings.shortcut_civitai_internet_shortcut_url
-            try:
-                with open(mapping_file, "r") as f:
-                    mapping = json.load(f)
-            except Exception:
-                mapping = {}
-
-            mapping[f"url={url}"] = name
-            with open(mapping_file, "w") as f:
-                json.dump(mapping, f, indent=4)
+            document_store.get_document(document_store.URL_BACKUP).update({f"url={url}": name})
             logger.info(f"URL mapping backed up: {url}")
             return True
         except Exception:
@@ -78,8 +69,7 @@ class ShortcutBackupManager:
             files.sort(reverse=True)
             latest = files[0]
             path = os.path.join(backup_dir, latest)
-            with open(path, "r") as f:
-                data = json.load(f)
+            data = dict(get_json_store().load(path))
             logger.info(f"Restored shortcut from backup: {path}")
             return data
         except Exception:
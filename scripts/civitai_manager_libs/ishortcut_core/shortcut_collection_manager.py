@@ -5,9 +5,10 @@ This module provides collection management for shortcuts, including loading,
 saving, adding, deleting, and updating shortcuts with proper cleanup and backup.
 """
 
-import os
-import json
 import datetime
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 try:
     from tqdm import tqdm
@@ -19,9 +20,14 @@ except ImportError:
 
 from ..logging_config import get_logger
 from .. import settings
+from .. import document_store
+from ..exceptions import FileOperationError, StorageConflictError
 from .model_factory import ModelFactory
 from .file_processor import FileProcessor
 from .image_processor import ImageProcessor
+from .image_hydrator import get_image_hydrator
+from .model_info_index import get_model_info_index
+from .shortcut_summary_index import ShortcutSummaryIndex
 from ..civitai import Url_Page
 
 logger = get_logger(__name__)
@@ -34,29 +40,174 @@ class ShortcutCollectionManager:
         self._model_factory = ModelFactory()
         self._file_processor = FileProcessor()
         self._image_processor = ImageProcessor()
+        self._cache = None
+        self._cache_stamp = None
+        self._seen_stamp = None
+        self._version = 0
+        self._local = threading.local()
+        self._summary_index = ShortcutSummaryIndex(info_index=get_model_info_index())
+
+    @property
+    def version(self) -> int:
+        """Return a counter that changes whenever the collection changes.
+
+        Only the shortcut file is stat'ed, so edits made outside this manager
+        are noticed without parsing the collection.
+        """
+        self._note_stamp(self._get_file_stamp())
+        return self._version
+
+    def load_summaries(self) -> dict:
+        """Load the compact browser summaries of all shortcuts.
+
+        The summaries come from their own index file while it matches the
+        shortcut file, so the full collection is not parsed for browsing.
+        The returned dictionary is shared and must not be modified.
+        """
+        stamp = self._get_file_stamp()
+        self._note_stamp(stamp)
+        source = stamp[1:] if stamp else None
+        return self._summary_index.get(source, lambda: self._get_cached() or {})
+
+    def get_summaries(self, model_ids: list) -> list:
+        """Get the summaries of the given shortcuts in order, skipping unknown IDs."""
+        summaries = self.load_summaries()
+        return [summaries[str(mid)] for mid in model_ids if str(mid) in summaries]
 
     def load_shortcuts(self) -> dict:
-        """Load shortcuts from persistent storage."""
-        if not os.path.isfile(settings.shortcut):
-            logger.debug("Shortcut file not found, initializing empty collection.")
-            return {}
-        try:
-            with open(settings.shortcut, 'r') as f:
-                data = json.load(f)
-        except Exception:
-            logger.error(f"Error loading shortcut file: {settings.shortcut}", exc_info=True)
-            return {}
-        return data or {}
+        """Load shortcuts from persistent storage.
+
+        The parsed collection is cached until the shortcut file changes on disk.
+        Every call returns a fresh copy of the entries, so callers may modify it.
+        """
+        cached = self._get_cached()
+        return self._copy_shortcuts(cached) if cached else {}
+
+    def get_shortcuts(self, model_ids: list) -> list:
+        """Get copies of the given shortcuts in order, skipping unknown IDs."""
+        cached = self._get_cached() or {}
+        return [dict(cached[str(mid)]) for mid in model_ids if cached.get(str(mid))]
 
     def save_shortcuts(self, shortcuts: dict) -> str:
-        """Save shortcuts to persistent storage with error handling."""
+        """Save shortcuts to persistent storage with error handling.
+
+        This replaces the whole collection; prefer transaction() to change
+        entries without overwriting concurrent updates.
+        """
+        document = document_store.get_document(document_store.SHORTCUTS)
         try:
-            with open(settings.shortcut, 'w') as f:
-                json.dump(shortcuts, f, indent=4)
+            with document_store.get_lock(document_store.SHORTCUTS):
+                document.write(shortcuts)
         except Exception:
-            logger.error(f"Error writing shortcut file: {settings.shortcut}", exc_info=True)
+            logger.error(f"Error writing shortcut file: {document.location}", exc_info=True)
+            self._cache = None
             return ""
-        return f"Civitai Internet Shortcut saved to: {settings.shortcut}"
+        stamp = document.stamp()
+        previous, previous_stamp = self._cache or {}, self._cache_stamp
+        changed_ids = [
+            key for key, value in (shortcuts or {}).items() if previous.get(key) != value
+        ]
+        self._set_cache(self._copy_shortcuts(shortcuts or {}), stamp)
+        self._seen_stamp = stamp
+        self._version += 1
+        self._summary_index.update(
+            self._cache,
+            stamp[1:] if stamp else None,
+            previous_stamp[1:] if previous_stamp else None,
+            changed_ids,
+        )
+        return f"Civitai Internet Shortcut saved to: {document.location}"
+
+    @contextmanager
+    def transaction(self, expected_version: Optional[int] = None) -> Iterator[dict]:
+        """Modify the collection atomically across threads and processes.
+
+        The collection lock is held for the whole block, which receives a
+        fresh copy of the shortcuts and may modify it freely; the copy is saved
+        when the block exits normally and discarded if it raises. A
+        transaction opened inside another one in the same thread joins it.
+        Slow work such as API calls should be done before entering the block.
+        Journal compaction takes the same lock, so it never changes the file
+        stamp checked at the end of the block.
+
+        Args:
+            expected_version: ``version`` the caller based its changes on;
+                the transaction fails if the collection changed since
+
+        Raises:
+            StorageConflictError: If the collection changed since
+                ``expected_version``, was modified by a writer not using the
+                lock during the block, or the lock could not be acquired
+            FileOperationError: If saving the collection failed
+        """
+        active = getattr(self._local, 'shortcuts', None)
+        if active is not None:
+            if expected_version is not None and expected_version != self.version:
+                raise StorageConflictError(
+                    "Shortcuts changed since they were read", collection=document_store.SHORTCUTS
+                )
+            yield active
+            return
+
+        with document_store.get_lock(document_store.SHORTCUTS):
+            if expected_version is not None and expected_version != self.version:
+                raise StorageConflictError(
+                    "Shortcuts changed since they were read", collection=document_store.SHORTCUTS
+                )
+            stamp = self._get_file_stamp()
+            shortcuts = self.load_shortcuts()
+            self._local.shortcuts = shortcuts
+            try:
+                yield shortcuts
+            finally:
+                self._local.shortcuts = None
+
+            if self._get_file_stamp() != stamp:
+                logger.warning(
+                    "[ShortcutCollectionManager] Shortcut file changed during transaction"
+                )
+                raise StorageConflictError(
+                    "Shortcuts were modified during the transaction",
+                    collection=document_store.SHORTCUTS,
+                )
+            if not self.save_shortcuts(shortcuts):
+                raise FileOperationError("Failed to save shortcuts")
+
+    def _get_cached(self) -> Optional[dict]:
+        """Return the cached collection, re-reading the shortcut file if it changed."""
+        stamp = self._get_file_stamp()
+        self._note_stamp(stamp)
+        if stamp is None:
+            logger.debug("Shortcut file not found, initializing empty collection.")
+            self._set_cache({}, None)
+            return {}
+
+        if self._cache is None or stamp != self._cache_stamp:
+            document = document_store.get_document(document_store.SHORTCUTS)
+            try:
+                data = document.read()
+            except Exception:
+                logger.error(f"Error loading shortcut file: {document.location}", exc_info=True)
+                return None
+            self._set_cache(data or {}, stamp)
+        return self._cache
+
+    def _get_file_stamp(self):
+        """Return (location, change marker, size) of the stored shortcuts, or None if missing."""
+        return document_store.get_document(document_store.SHORTCUTS).stamp()
+
+    def _note_stamp(self, stamp) -> None:
+        if stamp != self._seen_stamp:
+            self._seen_stamp = stamp
+            self._version += 1
+
+    def _set_cache(self, shortcuts: dict, stamp) -> None:
+        self._cache = shortcuts
+        self._cache_stamp = stamp
+
+    @staticmethod
+    def _copy_shortcuts(shortcuts: dict) -> dict:
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in shortcuts.items()}
 
     def add_shortcut(
         self, shortcuts: dict, model_id: str, register_information_only: bool = False, progress=None
@@ -69,12 +220,18 @@ class ShortcutCollectionManager:
         # Create or update the shortcut via ModelFactory
         # Note: register_information_only controls whether to download images
         download_images = not register_information_only
+        hydrator = get_image_hydrator()
+        defer_images = download_images and hydrator.enabled
         new_shortcut = self._model_factory.create_model_shortcut(
-            str(model_id), progress=progress, download_images=download_images
+            str(model_id), progress=progress, download_images=download_images and not defer_images
         )
         if new_shortcut:
             # ModelFactory returns a single shortcut object, not a dict of shortcuts
             shortcuts[str(model_id)] = new_shortcut
+            if defer_images:
+                # Version images are fetched on first view or while the UI is idle
+                hydrator.mark_pending(model_id)
+                hydrator.start_idle_filler()
         return shortcuts
 
     def delete_shortcut(self, shortcuts: dict, model_id: str) -> dict:
@@ -85,21 +242,16 @@ class ShortcutCollectionManager:
         # Backup URL mapping for deleted shortcut
         if entry and 'name' in entry and 'id' in entry:
             try:
-                backup = None
-                try:
-                    with open(settings.shortcut_civitai_internet_shortcut_url, 'r') as f:
-                        backup = json.load(f)
-                except Exception:
-                    backup = {}
-                backup[f"url={Url_Page()}{entry['id']}"] = entry['name']
-                with open(settings.shortcut_civitai_internet_shortcut_url, 'w') as f:
-                    json.dump(backup, f, indent=4)
+                document_store.get_document(document_store.URL_BACKUP).update(
+                    {f"url={Url_Page()}{entry['id']}": entry['name']}
+                )
             except Exception:
                 err_file = settings.shortcut_civitai_internet_shortcut_url
                 logger.error(
                     f"Error backing up URL mapping: {err_file}",
                     exc_info=True,
                 )
+        get_image_hydrator().discard(model_id)
         # Cleanup associated files
         try:
             self._image_processor.delete_thumbnail_image(model_id)
@@ -117,20 +269,21 @@ class ShortcutCollectionManager:
         """Delete a shortcut model and save changes."""
         if not model_id:
             return
-        shortcuts = self.load_shortcuts()
-        shortcuts = self.delete_shortcut(shortcuts, model_id)
-        self.save_shortcuts(shortcuts)
+        with self.transaction() as shortcuts:
+            self.delete_shortcut(shortcuts, model_id)
 
     def update_shortcut(self, model_id: str, progress=None):
         """Update existing shortcut preserving user data."""
         if not model_id:
             return
-        shortcuts = self.load_shortcuts()
-        existing = shortcuts.get(str(model_id), {})
         entry = self._model_factory.create_model_shortcut(
             str(model_id), progress=progress, preview_only=True
         )
-        if entry:
+        if not entry:
+            return
+        # Merge into the current entry, which may have been edited meanwhile
+        with self.transaction() as shortcuts:
+            existing = shortcuts.get(str(model_id), {})
             # Preserve note and date
             if 'note' in existing:
                 entry['note'] = existing['note']
@@ -141,7 +294,6 @@ class ShortcutCollectionManager:
             # Ensure nsfw field
             entry.setdefault('nsfw', False)
             shortcuts[str(model_id)] = entry
-            self.save_shortcuts(shortcuts)
 
     def update_multiple_shortcuts(self, model_ids: list, progress):
         """Batch update multiple shortcuts."""
@@ -169,11 +321,10 @@ class ShortcutCollectionManager:
         """Update note for specific shortcut."""
         if not model_id:
             return
-        shortcuts = self.load_shortcuts()
-        entry = shortcuts.get(str(model_id))
-        if entry is not None:
-            entry['note'] = str(note)
-            self.save_shortcuts(shortcuts)
+        with self.transaction() as shortcuts:
+            entry = shortcuts.get(str(model_id))
+            if entry is not None:
+                entry['note'] = str(note)
 
     def get_shortcut_note(self, model_id: str) -> str:
         """Get note for specific shortcut."""
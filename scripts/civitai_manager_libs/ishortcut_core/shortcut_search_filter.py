@@ -6,16 +6,25 @@ search, filtering, and sorting operations on shortcut collections managed by
 ShortcutCollectionManager.
 """
 
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
 
 from ..logging_config import get_logger
 
+from .facet_engine import FacetEngine
+from .model_info_index import get_model_info_index
 from .model_processor import ModelProcessor
+from .related_models_index import MAX_RELATED, RelatedModelsIndex
+from .result_view_cache import SORT_ORDERS, ResultViewCache, sort_shortcut_ids
 from .shortcut_collection_manager import ShortcutCollectionManager
+from .shortcut_search_index import ShortcutSearchIndex
 
 from .. import settings
 from .. import util
 from .. import classification
+from .. import document_store
 
 logger = get_logger(__name__)
 
@@ -30,10 +39,16 @@ class ShortcutSearchFilter:
     ):
         self._collection_manager = collection_manager
         self._model_processor = model_processor
+        self._info_index = get_model_info_index()
+        self._search_index = ShortcutSearchIndex(self._info_index)
+        self._facet_engine = FacetEngine()
+        self._view_cache = ResultViewCache()
+        self._related_index = RelatedModelsIndex(self._info_index)
+        self._lock = threading.RLock()
 
     def get_shortcuts_list(self, shortcut_types: Optional[List[str]] = None) -> List[str]:
         """Get basic list of shortcuts with type filtering."""
-        ISC = self._collection_manager.load_shortcuts()
+        ISC = self._load_summaries()
         if not ISC:
             return []
 
@@ -47,30 +62,219 @@ class ShortcutSearchFilter:
         search: Optional[str] = None,
         base_models: Optional[List[str]] = None,
         classifications: Optional[List[str]] = None,
+        downloaded: Optional[bool] = None,
+        downloaded_ids: Optional[Iterable] = None,
     ) -> List[Dict[str, Any]]:
-        """Advanced filtering with multiple criteria."""
-        ISC = self._collection_manager.load_shortcuts()
+        """
+        Advanced filtering with multiple criteria.
+
+        Every criterion becomes a row mask of the facet engine; the masks are
+        combined with a vectorized AND.
+
+        Args:
+            shortcut_types: UI type names, matched with OR
+            search: Search text in ``util.get_search_keyword`` syntax
+            base_models: Base model names, matched with OR
+            classifications: Classification names, matched with AND
+            downloaded: True/False to keep only downloaded/not downloaded models
+            downloaded_ids: Model IDs of downloaded models, used with ``downloaded``
+
+        Returns:
+            Matching shortcuts in collection order
+        """
+        ISC = self._load_summaries()
         if not ISC:
             return []
 
-        result = list(ISC.values())
-
-        # Classification filtering with AND logic
-        result = self._apply_classification_filter(result, classifications)
-
-        # Type filtering
-        result = self._apply_type_filter(result, shortcut_types)
-
-        # Keyword, tag, and note filtering
-        keys, tags, notes = util.get_search_keyword(search)
-        result = self._apply_keyword_filter(result, keys)
-        result = self._apply_tag_filter(result, tags)
-        result = self._apply_note_filter(result, notes)
+        with self._lock:
+            masks = self._get_filter_masks(
+                ISC,
+                shortcut_types,
+                search,
+                base_models,
+                classifications,
+                downloaded,
+                downloaded_ids,
+            )
+            mask = self._facet_engine.all()
+            for facet_mask in masks.values():
+                mask &= facet_mask
+            model_ids = self._facet_engine.select(mask)
+        return self.get_shortcuts_by_ids(model_ids)
+
+    def get_result_view(
+        self,
+        shortcut_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        base_models: Optional[List[str]] = None,
+        classifications: Optional[List[str]] = None,
+        downloaded: Optional[bool] = None,
+        downloaded_ids: Optional[Iterable] = None,
+        sort_by: str = 'name',
+    ) -> List[str]:
+        """
+        Get the sorted model IDs matching the filters.
+
+        Views are cached by filter signature until the collection, the model
+        information index or the classifications change, so paging through
+        the same result only slices the cached list.
+
+        Args:
+            sort_by: One of ``SORT_ORDERS``; unknown values sort by name
+
+        Returns:
+            Sorted model IDs; the list is shared with the cache and must not be modified
+        """
+        if sort_by not in SORT_ORDERS:
+            sort_by = 'name'
+        downloaded_key = None
+        if downloaded is not None:
+            downloaded_key = frozenset(str(mid) for mid in downloaded_ids or ())
+        key = (
+            tuple(shortcut_types or ()),
+            search or "",
+            tuple(base_models or ()),
+            tuple(classifications or ()),
+            downloaded,
+            downloaded_key,
+            sort_by,
+        )
+
+        collection_version = getattr(self._collection_manager, 'version', None)
+        version = None
+        if collection_version is not None:
+            version = (
+                collection_version,
+                self._info_index.generation,
+                self._get_classification_stamp(),
+            )
+            view = self._view_cache.get(key, version)
+            if view is not None:
+                return view
+
+        ISC = self._load_summaries()
+        if not ISC:
+            return []
+        with self._lock:
+            masks = self._get_filter_masks(
+                ISC,
+                shortcut_types,
+                search,
+                base_models,
+                classifications,
+                downloaded,
+                downloaded_ids,
+            )
+            mask = self._facet_engine.all()
+            for facet_mask in masks.values():
+                mask &= facet_mask
+            view = sort_shortcut_ids(ISC, self._facet_engine.select(mask), sort_by)
+
+        if version is not None:
+            self._view_cache.put(key, version, view)
+        return view
+
+    def get_shortcuts_by_ids(self, model_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the full shortcuts of the given model IDs in order."""
+        if hasattr(self._collection_manager, 'get_shortcuts'):
+            return self._collection_manager.get_shortcuts(model_ids)
+        ISC = self._collection_manager.load_shortcuts() or {}
+        return [ISC[str(mid)] for mid in model_ids if ISC.get(str(mid))]
+
+    def get_summaries_by_ids(self, model_ids: List[str]) -> List[Any]:
+        """Get the browser summaries of the given model IDs in order.
+
+        Summaries answer ``v['id']``, ``v['name']`` and ``v.get()`` like full
+        shortcuts but carry only the fields the galleries display.
+        """
+        if hasattr(self._collection_manager, 'get_summaries'):
+            return self._collection_manager.get_summaries(model_ids)
+        return self.get_shortcuts_by_ids(model_ids)
+
+    def get_related_shortcuts(self, model_id: str, limit: int = MAX_RELATED) -> List[Any]:
+        """
+        Get the shortcuts most similar to a model by tags, base model, creator
+        and trained words.
+
+        Args:
+            model_id: Model ID to find related shortcuts for
+            limit: Maximum number of results
+
+        Returns:
+            Summaries of the related shortcuts, most similar first
+        """
+        ISC = self._load_summaries()
+        if not ISC or not model_id:
+            return []
 
-        # Base model filtering
-        result = self._apply_base_model_filter(result, base_models)
+        version = getattr(self._collection_manager, 'version', None)
+        with self._lock:
+            self._related_index.sync(ISC, version)
+            related = self._related_index.related(model_id, limit)
+        return self.get_summaries_by_ids([mid for mid, _ in related])
 
-        return result
+    def get_facet_counts(
+        self,
+        shortcut_types: Optional[List[str]] = None,
+        search: Optional[str] = None,
+        base_models: Optional[List[str]] = None,
+        classifications: Optional[List[str]] = None,
+        downloaded: Optional[bool] = None,
+        downloaded_ids: Optional[Iterable] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Count matching shortcuts per type, base model and classification.
+
+        The counts of a facet apply every other active filter, so they tell how
+        many shortcuts selecting that value would show.
+
+        Returns:
+            Mapping of facet ('types', 'base_models', 'classifications') to
+            value -> count, without zero counts
+        """
+        ISC = self._load_summaries()
+        if not ISC:
+            return {'types': {}, 'base_models': {}, 'classifications': {}}
+
+        with self._lock:
+            engine = self._facet_engine
+            masks = self._get_filter_masks(
+                ISC,
+                shortcut_types,
+                search,
+                base_models,
+                classifications,
+                downloaded,
+                downloaded_ids,
+            )
+
+            def others(excluded: str):
+                mask = engine.all()
+                for name, facet_mask in masks.items():
+                    if name != excluded:
+                        mask &= facet_mask
+                return mask
+
+            type_counts = engine.counts('type', others('types'))
+            types = {}
+            for ui_name, type_name in settings.UI_TYPENAMES.items():
+                if type_counts.get(type_name):
+                    types[ui_name] = type_counts[type_name]
+
+            classification_counts = {}
+            CISC = classification.load()
+            if CISC:
+                mask = others('classifications')
+                for name in CISC:
+                    count = engine.count_ids(classification.get_shortcut_list(CISC, name), mask)
+                    if count:
+                        classification_counts[name] = count
+
+            return {
+                'types': types,
+                'base_models': engine.counts('base_models', others('base_models')),
+                'classifications': classification_counts,
+            }
 
     def sort_shortcuts_by_value(
         self,
@@ -93,13 +297,13 @@ class ShortcutSearchFilter:
 
     def extract_all_tags(self) -> List[str]:
         """Extract unique tags from all shortcuts."""
-        ISC = self._collection_manager.load_shortcuts()
+        ISC = self._load_summaries()
         if not ISC:
             return []
 
         tags_set = set()
         for item in ISC.values():
-            if 'tags' in item and isinstance(item['tags'], list):
+            if 'tags' in item and isinstance(item['tags'], (list, tuple)):
                 for tag in item['tags']:
                     if isinstance(tag, dict) and 'name' in tag:
                         tags_set.add(tag['name'])
@@ -108,6 +312,12 @@ class ShortcutSearchFilter:
 
         return list(tags_set)
 
+    def _load_summaries(self) -> Dict[str, Any]:
+        """Load the shortcut summaries, or the full shortcuts if the manager has none."""
+        if hasattr(self._collection_manager, 'load_summaries'):
+            return self._collection_manager.load_summaries()
+        return self._collection_manager.load_shortcuts()
+
     def _apply_type_filter(
         self,
         shortcuts: List[Dict[str, Any]],
@@ -126,125 +336,96 @@ class ShortcutSearchFilter:
 
         return [v for v in shortcuts if v and v.get('type') in tmp_types]
 
-    def _apply_keyword_filter(
-        self,
-        shortcuts: List[Dict[str, Any]],
-        keywords: Optional[List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Apply keyword search filtering."""
-        if not keywords:
-            return shortcuts
-
-        result = []
-        for v in shortcuts:
-            if not v:
-                continue
-            name = v.get('name', '').lower()
-            for key in keywords:
-                if key in name:
-                    result.append(v)
-                    break
-
-        return result
-
-    def _apply_tag_filter(
-        self,
-        shortcuts: List[Dict[str, Any]],
-        tags: Optional[List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Apply tag-based filtering."""
-        if not tags:
-            return shortcuts
-
-        result = []
-        for v in shortcuts:
-            if not v or 'tags' not in v or not v['tags']:
-                continue
-
-            v_tags = []
-            for tag in v['tags']:
-                if isinstance(tag, dict) and 'name' in tag:
-                    v_tags.append(tag['name'].lower())
-                else:
-                    v_tags.append(str(tag).lower())
-
-            if set(v_tags) & set(tags):
-                result.append(v)
-
-        return result
-
-    def _apply_note_filter(
-        self,
-        shortcuts: List[Dict[str, Any]],
-        notes: Optional[List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Apply note content filtering."""
-        if not notes:
-            return shortcuts
-
-        result = []
-        for v in shortcuts:
-            note_field = v.get('note')
-            if not note_field:
-                continue
-
-            note_lower = str(note_field).lower()
-            for note in notes:
-                if note in note_lower:
-                    result.append(v)
-                    break
-
-        return result
-
-    def _apply_base_model_filter(
+    def _get_filter_masks(
         self,
-        shortcuts: List[Dict[str, Any]],
+        shortcuts: Dict[str, Dict[str, Any]],
+        shortcut_types: Optional[List[str]],
+        search: Optional[str],
         base_models: Optional[List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Apply base model filtering."""
-        if not base_models:
-            return shortcuts
+        classifications: Optional[List[str]],
+        downloaded: Optional[bool],
+        downloaded_ids: Optional[Iterable],
+    ) -> Dict[str, np.ndarray]:
+        """Build one row mask per active filter."""
+        version = getattr(self._collection_manager, 'version', None)
+        engine = self._facet_engine
+        if engine.build(shortcuts, self._info_index, version):
+            self._info_index.schedule_flush()
+
+        masks = {}
+        if classifications:
+            masks['classifications'] = self._get_classification_mask(classifications)
+
+        if shortcut_types:
+            type_names = [
+                settings.UI_TYPENAMES[sc_type]
+                for sc_type in shortcut_types
+                if sc_type in settings.UI_TYPENAMES
+            ]
+            masks['types'] = engine.column('type', type_names)
 
-        result = []
-        for v in shortcuts:
-            model_id = str(v.get('id'))
+        keys, tags, notes = util.get_search_keyword(search)
+        if keys or tags or notes:
+            self._search_index.sync(shortcuts, version)
+            mask = engine.all()
+            if keys:
+                mask &= engine.mask_for_ids(self._search_index.search_keywords(keys))
+            if tags:
+                mask &= engine.mask_for_ids(self._search_index.search_tags(tags))
+            if notes:
+                mask &= engine.mask_for_ids(self._search_index.search_notes(notes))
+            masks['search'] = mask
+
+        if downloaded is not None:
+            mask = engine.mask_for_ids(downloaded_ids)
+            masks['downloaded'] = mask if downloaded else ~mask
+
+        if base_models:
+            masks['base_models'] = self._get_base_model_mask(base_models, masks)
+
+        return masks
+
+    def _get_base_model_mask(
+        self, base_models: List[str], masks: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """Match base models through the facet columns.
+
+        Shortcuts without model information are asked of the model processor,
+        limited to the rows the other filters still select.
+        """
+        engine = self._facet_engine
+        mask = engine.column('base_models', base_models)
+
+        candidates = ~engine.described()
+        for facet_mask in masks.values():
+            candidates &= facet_mask
+        for position in np.flatnonzero(candidates):
             try:
-                is_base = self._model_processor.is_baseModel(model_id, base_models)
+                is_base = self._model_processor.is_baseModel(engine.ids[position], base_models)
             except Exception:
                 is_base = False
-
             if is_base:
-                result.append(v)
+                mask[position] = True
 
-        return result
+        return mask
 
-    def _apply_classification_filter(
-        self,
-        shortcuts: List[Dict[str, Any]],
-        classifications: Optional[List[str]],
-    ) -> List[Dict[str, Any]]:
-        """Apply classification-based filtering with AND logic."""
-        if not classifications:
-            return shortcuts
+    @staticmethod
+    def _get_classification_stamp():
+        """Return the storage stamp of the classifications, or None if missing."""
+        stamp = document_store.get_document(document_store.CLASSIFICATIONS).stamp()
+        return stamp[1:] if stamp else None
 
-        clfs: List[Any] = []
+    def _get_classification_mask(self, classifications: List[str]) -> np.ndarray:
+        """Match classifications with AND logic."""
+        engine = self._facet_engine
         CISC = classification.load()
-        if CISC:
-            for name in classifications:
-                name_list = classification.get_shortcut_list(CISC, name)
-                if name_list:
-                    if clfs:
-                        clfs = list(set(clfs) & set(name_list))
-                    else:
-                        clfs = name_list
-                else:
-                    clfs = []
-                    break
-
-            clfs = list(set(clfs))
-
-        if not clfs:
-            return []
-
-        key_set = set(str(mid) for mid in clfs)
-        return [v for v in shortcuts if v and str(v.get('id')) in key_set]
+        if not CISC:
+            return engine.none()
+
+        mask = engine.all()
+        for name in classifications:
+            name_list = classification.get_shortcut_list(CISC, name)
+            if not name_list:
+                return engine.none()
+            mask &= engine.mask_for_ids(name_list)
+        return mask
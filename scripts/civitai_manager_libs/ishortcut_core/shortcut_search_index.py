@@ -0,0 +1,288 @@
+"""
+ShortcutSearchIndex: In-memory inverted index over the shortcut collection.
+
+This module is responsible for:
+- Tokenizing shortcut names, tags, notes, trained words, creators and descriptions
+- Answering keyword, ``#tag`` and ``@note`` queries without scanning every shortcut
+- Prefix matching through a sorted vocabulary and optional fuzzy matching
+- Substring matching on names and notes through character n-grams
+- Re-indexing only the shortcuts that changed since the last sync
+
+Keywords follow ``util.get_search_keyword``: comma separated terms are ORed,
+the words inside one term must all match (as a word or word prefix).
+"""
+
+import bisect
+import difflib
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from .. import settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Maximum vocabulary entries considered per fuzzy-matched word
+FUZZY_MAX_MATCHES = 5
+FUZZY_CUTOFF = 0.8
+
+# Longest character n-gram indexed for substring matching on names and notes
+NGRAM_SIZE = 3
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text) -> List[str]:
+    """Split text into lowercase word tokens."""
+    if not text:
+        return []
+    return _TOKEN.findall(str(text).lower())
+
+
+def ngrams(text: str) -> Set[str]:
+    """Return every substring of text up to ``NGRAM_SIZE`` characters long."""
+    return {
+        text[start : start + size]
+        for size in range(1, NGRAM_SIZE + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+def _tag_names(shortcut: Dict) -> List[str]:
+    names = []
+    for tag in shortcut.get('tags') or []:
+        if isinstance(tag, dict):
+            if 'name' in tag:
+                names.append(str(tag['name']).lower())
+        else:
+            names.append(str(tag).lower())
+    return names
+
+
+class ShortcutSearchIndex:
+    """Inverted index answering shortcut search queries."""
+
+    def __init__(self, info_index=None):
+        self._info_index = info_index
+        self._lock = threading.RLock()
+        self._version = None
+        self._signatures: Dict[str, tuple] = {}
+        self._doc_tokens: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._doc_tags: Dict[str, Set[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._notes: Dict[str, str] = {}
+        self._name_grams: Dict[str, Set[str]] = {}
+        self._note_grams: Dict[str, Set[str]] = {}
+        self._vocabulary: Optional[List[str]] = None
+
+    @property
+    def fuzzy(self) -> bool:
+        """Return True when unmatched words fall back to fuzzy vocabulary matches."""
+        return bool(settings.shortcut_search_fuzzy)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def sync(self, shortcuts: Dict[str, Dict], version=None) -> int:
+        """
+        Bring the index up to date with the shortcut collection.
+
+        Args:
+            shortcuts: Shortcut collection keyed by model ID
+            version: Collection version; when unchanged since the last sync the
+                collection is not compared at all
+
+        Returns:
+            Number of shortcuts (re-)indexed or removed
+        """
+        with self._lock:
+            if version is not None and version == self._version:
+                return 0
+
+            shortcuts = shortcuts or {}
+            changed = 0
+            for model_id in set(self._signatures) - {str(k) for k in shortcuts}:
+                self._remove(model_id)
+                changed += 1
+
+            for key, shortcut in shortcuts.items():
+                if not shortcut:
+                    continue
+                model_id = str(key)
+                record = self._get_record(model_id)
+                signature = (
+                    shortcut.get('name'),
+                    tuple(_tag_names(shortcut)),
+                    shortcut.get('note'),
+                    record.get('mtime') if record else None,
+                )
+                if self._signatures.get(model_id) == signature:
+                    continue
+                self._remove(model_id)
+                self._add(model_id, shortcut, record, signature)
+                changed += 1
+
+            self._version = version
+            if self._info_index is not None:
+                self._info_index.schedule_flush()
+            if changed:
+                logger.debug(f"[ShortcutSearchIndex] Re-indexed {changed} shortcuts")
+            return changed
+
+    def search_keywords(self, keywords: Iterable[str]) -> Set[str]:
+        """
+        Find shortcuts matching any of the keyword terms.
+
+        A term matches when all of its words match an indexed word or word
+        prefix, or when the term is a substring of the shortcut name.
+
+        Args:
+            keywords: Lowercase keyword terms
+
+        Returns:
+            Matching model IDs
+        """
+        result = set()
+        with self._lock:
+            for term in keywords:
+                term = str(term).strip().lower()
+                if not term:
+                    continue
+                matched = None
+                for word in tokenize(term):
+                    ids = self._match_word(word)
+                    matched = ids if matched is None else matched & ids
+                    if not matched:
+                        break
+                if matched:
+                    result |= matched
+                result |= self._match_substring(term, self._name_grams, self._names)
+        return result
+
+    def search_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Find shortcuts carrying any of the given lowercase tag names."""
+        result = set()
+        with self._lock:
+            for tag in tags:
+                result |= self._tags.get(str(tag).lower(), set())
+        return result
+
+    def search_notes(self, notes: Iterable[str]) -> Set[str]:
+        """Find shortcuts whose note contains any of the given lowercase strings."""
+        result = set()
+        with self._lock:
+            for note in notes:
+                if note:
+                    result |= self._match_substring(
+                        str(note).lower(), self._note_grams, self._notes
+                    )
+        return result
+
+    @staticmethod
+    def _match_substring(term: str, grams: Dict[str, Set[str]], texts: Dict[str, str]) -> Set[str]:
+        if len(term) <= NGRAM_SIZE:
+            return set(grams.get(term, ()))
+        postings = []
+        for start in range(len(term) - NGRAM_SIZE + 1):
+            ids = grams.get(term[start : start + NGRAM_SIZE])
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return {mid for mid in candidates if term in texts[mid]}
+
+    def _match_word(self, word: str) -> Set[str]:
+        vocabulary = self._get_vocabulary()
+        ids = set()
+        position = bisect.bisect_left(vocabulary, word)
+        while position < len(vocabulary) and vocabulary[position].startswith(word):
+            ids |= self._postings[vocabulary[position]]
+            position += 1
+
+        if not ids and self.fuzzy and len(word) > 2:
+            for token in difflib.get_close_matches(
+                word, vocabulary, n=FUZZY_MAX_MATCHES, cutoff=FUZZY_CUTOFF
+            ):
+                ids |= self._postings[token]
+        return ids
+
+    def _get_vocabulary(self) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        return self._vocabulary
+
+    def _get_record(self, model_id: str) -> Optional[Dict]:
+        if self._info_index is None:
+            return None
+        try:
+            return self._info_index.get_record(model_id)
+        except Exception as e:
+            logger.debug(f"[ShortcutSearchIndex] No model record for {model_id}: {e}")
+            return None
+
+    def _add(self, model_id: str, shortcut: Dict, record: Optional[Dict], signature) -> None:
+        tags = set(signature[1])
+        texts = [shortcut.get('name'), shortcut.get('note')]
+        texts.extend(tags)
+        if record:
+            texts.append(record.get('creator'))
+            texts.extend(record.get('trained_words') or [])
+            texts.append(record.get('description'))
+
+        tokens = set()
+        for text in texts:
+            tokens.update(tokenize(text))
+
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._vocabulary = None
+            self._postings[token].add(model_id)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(model_id)
+
+        self._doc_tokens[model_id] = tokens
+        self._doc_tags[model_id] = tags
+        self._names[model_id] = str(shortcut.get('name') or "").lower()
+        self._link_grams(self._name_grams, model_id, self._names[model_id])
+        if shortcut.get('note'):
+            self._notes[model_id] = str(shortcut['note']).lower()
+            self._link_grams(self._note_grams, model_id, self._notes[model_id])
+        self._signatures[model_id] = signature
+
+    def _remove(self, model_id: str) -> None:
+        for token in self._doc_tokens.pop(model_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(model_id)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+        for tag in self._doc_tags.pop(model_id, ()):
+            ids = self._tags.get(tag)
+            if ids is not None:
+                ids.discard(model_id)
+                if not ids:
+                    del self._tags[tag]
+        self._unlink_grams(self._name_grams, model_id, self._names.pop(model_id, ""))
+        self._unlink_grams(self._note_grams, model_id, self._notes.pop(model_id, ""))
+        self._signatures.pop(model_id, None)
+
+    @staticmethod
+    def _link_grams(grams: Dict[str, Set[str]], model_id: str, text: str) -> None:
+        for gram in ngrams(text):
+            grams.setdefault(gram, set()).add(model_id)
+
+    @staticmethod
+    def _unlink_grams(grams: Dict[str, Set[str]], model_id: str, text: str) -> None:
+        for gram in ngrams(text):
+            ids = grams.get(gram)
+            if ids is not None:
+                ids.discard(model_id)
+                if not ids:
+                    del grams[gram]
@@ -0,0 +1,315 @@
+"""
+ShortcutSummaryIndex: Compact per-shortcut records for the browser pages.
+
+This module is responsible for:
+- Reducing shortcut entries to the fields the browsers display and filter on
+- Storing them as ``__slots__`` records instead of full JSON dictionaries
+- Persisting the records column by column in a compact JSON file
+- Loading that file on start-up instead of the full shortcut collection
+
+The summary file remembers the modification time and size of
+``CivitaiShortCut.json`` it was built from and is rebuilt when they differ.
+Saving the collection only rebuilds the summaries of changed shortcuts and
+persists them shortly after, coalescing bursts of saves into one write.
+Full shortcut entries are only read when a model card needs them.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .. import settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Version of the persisted column layout
+SUMMARY_FORMAT = 1
+
+# Seconds to wait before persisting summaries after a scheduled flush
+FLUSH_DELAY_SECONDS = 2.0
+
+
+class ShortcutSummary:
+    """Display and filter fields of one shortcut.
+
+    Supports the read-only dictionary access (``v['name']``, ``v.get()``,
+    ``keys()``) the browser pages use on full shortcut entries.
+    """
+
+    __slots__ = (
+        'id',
+        'name',
+        'type',
+        'nsfw',
+        'date',
+        'tags',
+        'base_models',
+        'note',
+        'has_thumbnail',
+    )
+
+    def __init__(
+        self,
+        id=None,
+        name="",
+        type=None,
+        nsfw=False,
+        date=None,
+        tags=(),
+        base_models=(),
+        note="",
+        has_thumbnail=False,
+    ):
+        self.id = id
+        self.name = name
+        self.type = type
+        self.nsfw = nsfw
+        self.date = date
+        self.tags = tuple(tags or ())
+        self.base_models = tuple(base_models or ())
+        self.note = note
+        self.has_thumbnail = has_thumbnail
+
+    @classmethod
+    def from_shortcut(
+        cls, shortcut: Dict, base_models: Iterable[str] = (), has_thumbnail: bool = False
+    ) -> "ShortcutSummary":
+        """Create a summary from a full shortcut entry."""
+        tags = []
+        for tag in shortcut.get('tags') or []:
+            if isinstance(tag, dict):
+                if 'name' in tag:
+                    tags.append(str(tag['name']))
+            else:
+                tags.append(str(tag))
+        return cls(
+            id=shortcut.get('id'),
+            name=shortcut.get('name') or "",
+            type=shortcut.get('type'),
+            nsfw=bool(shortcut.get('nsfw')),
+            date=shortcut.get('date'),
+            tags=tags,
+            base_models=base_models,
+            note=shortcut.get('note') or "",
+            has_thumbnail=has_thumbnail,
+        )
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def keys(self):
+        return self.__slots__
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.__slots__
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ShortcutSummary):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"ShortcutSummary(id={self.id!r}, name={self.name!r})"
+
+
+class ShortcutSummaryIndex:
+    """Keeps the shortcut summaries in sync with the shortcut file."""
+
+    def __init__(self, summary_file: Optional[str] = None, info_index=None):
+        self._summary_file = summary_file
+        self._info_index = info_index
+        self._summaries: Optional[Dict[str, ShortcutSummary]] = None
+        self._source = None
+        self._dirty = False
+        self._flush_timer = None
+        self._lock = threading.RLock()
+
+    @property
+    def summary_file(self) -> str:
+        """Return the file persisting the summaries."""
+        return self._summary_file or settings.shortcut_summary_index
+
+    def get(self, source, load_shortcuts) -> Dict[str, ShortcutSummary]:
+        """
+        Get the summaries for the current shortcut file.
+
+        Args:
+            source: (mtime_ns, size) of the shortcut file, or None if it is missing
+            load_shortcuts: Callable returning the full collection; called only
+                when neither memory nor the summary file match ``source``
+
+        Returns:
+            Summaries keyed by model ID; shared, do not modify
+        """
+        with self._lock:
+            if source is None:
+                self._summaries, self._source = {}, None
+                return self._summaries
+            source = list(source)
+            if self._summaries is not None and source == self._source:
+                return self._summaries
+
+            if self._summaries is None and self._read(source):
+                logger.debug(f"[ShortcutSummaryIndex] Loaded {len(self._summaries)} summaries")
+                return self._summaries
+
+            self._rebuild(load_shortcuts() or {}, source)
+            self._write(self.summary_file)
+            return self._summaries
+
+    def invalidate(self) -> None:
+        """Rebuild the summaries on the next get(), ignoring the summary file.
+
+        Used when the summaries were never loaded, since a file rewritten
+        within the timestamp resolution may keep its modification time and size.
+        """
+        with self._lock:
+            if self._summaries is None:
+                self._summaries = {}
+            self._source = None
+
+    def update(self, shortcuts: Dict[str, Dict], source, base_source, changed_ids) -> None:
+        """
+        Follow a saved collection, rebuilding only the changed summaries.
+
+        Args:
+            shortcuts: The saved collection
+            source: (mtime_ns, size) of the saved shortcut file
+            base_source: (mtime_ns, size) of the file the changes were made to
+            changed_ids: Model IDs added or modified by the save
+        """
+        with self._lock:
+            if (
+                not self._summaries
+                or source is None
+                or base_source is None
+                or list(base_source) != self._source
+            ):
+                self.invalidate()
+                return
+            changed_ids = {str(model_id) for model_id in changed_ids}
+            summaries = {}
+            for key, shortcut in shortcuts.items():
+                if not shortcut:
+                    continue
+                model_id = str(key)
+                summary = self._summaries.get(model_id)
+                if summary is None or model_id in changed_ids:
+                    summary = self._summarize(model_id, shortcut)
+                summaries[model_id] = summary
+            self._summaries = summaries
+            self._source = list(source)
+            self._dirty = True
+        self.schedule_flush()
+
+    def schedule_flush(self) -> None:
+        """Persist the summaries shortly, coalescing bursts of saves into one write."""
+        with self._lock:
+            if self._flush_timer is not None and self._flush_timer.is_alive():
+                return
+            # Bind the file now; the configured path may change before the timer fires
+            self._flush_timer = threading.Timer(
+                FLUSH_DELAY_SECONDS, self.flush, args=(self.summary_file,)
+            )
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self, summary_file: Optional[str] = None) -> bool:
+        """
+        Persist the summaries if they changed since the last write.
+
+        Args:
+            summary_file: File to write; ``summary_file`` if omitted
+
+        Returns:
+            True if the summary file was written
+        """
+        with self._lock:
+            if not self._dirty or self._source is None:
+                return False
+            return self._write(summary_file or self.summary_file)
+
+    def _rebuild(self, shortcuts: Dict[str, Dict], source: list) -> None:
+        summaries = {}
+        for key, shortcut in shortcuts.items():
+            if shortcut:
+                summaries[str(key)] = self._summarize(str(key), shortcut)
+        self._summaries = summaries
+        self._source = source
+        logger.debug(f"[ShortcutSummaryIndex] Rebuilt {len(summaries)} summaries")
+
+    def _summarize(self, model_id: str, shortcut: Dict) -> ShortcutSummary:
+        has_thumbnail = os.path.isfile(
+            settings.get_shortcut_thumbnail_file(shortcut.get('id', model_id))
+        )
+        return ShortcutSummary.from_shortcut(
+            shortcut, self._get_base_models(model_id), has_thumbnail
+        )
+
+    def _get_base_models(self, model_id: str) -> List[str]:
+        if self._info_index is None:
+            return []
+        record = self._info_index.get_cached_record(model_id)
+        return list(record.get('base_models') or []) if record else []
+
+    def _read(self, source: list) -> bool:
+        try:
+            with open(self.summary_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"[ShortcutSummaryIndex] Failed to read {self.summary_file}: {e}")
+            return False
+
+        if data.get('format') != SUMMARY_FORMAT or data.get('source') != source:
+            return False
+
+        columns = data.get('columns') or {}
+        keys = data.get('keys') or []
+        try:
+            summaries = {}
+            for row, model_id in enumerate(keys):
+                summaries[model_id] = ShortcutSummary(
+                    **{field: columns[field][row] for field in ShortcutSummary.__slots__}
+                )
+        except (KeyError, IndexError, TypeError) as e:
+            logger.warning(f"[ShortcutSummaryIndex] Ignoring malformed summary file: {e}")
+            return False
+
+        self._summaries = summaries
+        self._source = source
+        return True
+
+    def _write(self, summary_file: str) -> bool:
+        keys = list(self._summaries)
+        columns = {
+            field: [getattr(self._summaries[key], field) for key in keys]
+            for field in ShortcutSummary.__slots__
+        }
+        data = {
+            'format': SUMMARY_FORMAT,
+            'source': self._source,
+            'keys': keys,
+            'columns': columns,
+        }
+        tmp_path = f"{summary_file}.tmp"
+        try:
+            parent = os.path.dirname(summary_file)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+            os.replace(tmp_path, summary_file)
+        except Exception as e:
+            logger.error(f"[ShortcutSummaryIndex] Failed to write {summary_file}: {e}")
+            return False
+        self._dirty = False
+        return True
@@ -5,13 +5,17 @@ This module provides the ShortcutThumbnailManager class to handle batch thumbnai
 updates and NSFW level management for shortcut collections.
 """
 
-from typing import Dict, Any
+import os
+from typing import Any, Dict, Optional, Tuple
 
 from ..logging_config import get_logger
 from ..image_format_filter import ImageFormatFilter
+from ..image_transcoder import get_image_transcoder
 
 from .image_processor import ImageProcessor
+from .model_processor import ModelProcessor
 from .shortcut_collection_manager import ShortcutCollectionManager
+from .thumbnail_engine import BatchThumbnailGenerator
 
 from .. import civitai
 from .. import settings
@@ -26,31 +30,84 @@ class ShortcutThumbnailManager:
         self,
         image_processor: ImageProcessor,
         collection_manager: ShortcutCollectionManager,
+        model_processor: Optional[ModelProcessor] = None,
     ):
         self._image_processor = image_processor
         self._collection_manager = collection_manager
+        self._model_processor = model_processor
 
-    def update_all_thumbnails(self, progress: Any) -> None:
-        """Batch update thumbnails for all shortcuts."""
+    @property
+    def model_processor(self) -> ModelProcessor:
+        if self._model_processor is None:
+            self._model_processor = ModelProcessor()
+        return self._model_processor
+
+    def update_all_thumbnails(self, progress: Any) -> dict:
+        """
+        Batch update thumbnails for all shortcuts.
+
+        Thumbnails whose source image is already cached in ``sc_infos`` are
+        rendered by the batch thumbnail engine; the rest are downloaded.
+
+        Returns:
+            Thumbnail engine statistics with the number of downloaded thumbnails
+        """
         shortcuts = self._collection_manager.load_shortcuts()
         if not shortcuts:
-            return
+            return {}
 
+        local_sources = {}
+        image_urls = {}
+        changed_ids = []
+        downloaded = 0
         for shortcut_id, shortcut_data in progress.tqdm(
             shortcuts.items(), desc="Update Shortcut's Thumbnails"
         ):
             if not shortcut_data:
                 continue
             try:
-                self._update_shortcut_thumbnail(shortcut_data)
+                source = self._select_thumbnail_source(shortcut_data)
+                if source is None:
+                    continue
+                url, source_path = source
+                if url != shortcut_data.get("imageurl"):
+                    changed_ids.append(str(shortcut_data.get("id")))
+                image_urls[shortcut_id] = url
+                if source_path and os.path.isfile(source_path):
+                    local_sources[str(shortcut_data.get("id"))] = source_path
+                else:
+                    # Download and generate thumbnail
+                    self._image_processor.download_thumbnail_image(shortcut_data.get("id"), url)
+                    downloaded += 1
             except Exception:
                 logger.error(
                     f"Failed to update thumbnail for shortcut {shortcut_id}",
                     exc_info=True,
                 )
 
-        # Save all updates
-        self._collection_manager.save_shortcuts(shortcuts)
+        stats = self._generate_local_thumbnails(local_sources, changed_ids)
+        stats['downloaded'] = downloaded
+
+        # Apply the new image URLs to the current entries; others may have changed meanwhile
+        with self._collection_manager.transaction() as current:
+            for shortcut_id, url in image_urls.items():
+                if current.get(shortcut_id):
+                    current[shortcut_id]["imageurl"] = url
+        return stats
+
+    def _generate_local_thumbnails(self, local_sources: Dict[str, str], force_ids: list) -> dict:
+        """Render thumbnails from cached source images with the batch engine."""
+        if not local_sources:
+            return {}
+
+        generator = BatchThumbnailGenerator(
+            self._image_processor.thumbnail_folder,
+            settings.PREVIEW_IMAGE_EXT,
+            self._image_processor.thumbnail_max_size,
+        )
+        stats = generator.generate(local_sources, force_ids=force_ids)
+        get_image_transcoder().submit(generator.get_thumbnail_path(mid) for mid in local_sources)
+        return stats
 
     def select_optimal_image(self, images: list) -> str:
         """Select best static image based on NSFW level preferences."""
@@ -96,19 +153,28 @@ class ShortcutThumbnailManager:
 
         return len(settings.NSFW_LEVELS)
 
-    def _update_shortcut_thumbnail(self, shortcut_data: Dict[str, Any]) -> None:
-        """Update thumbnail for single shortcut."""
-        version_info = civitai.get_latest_version_info_by_model_id(shortcut_data.get("id"))
+    def _select_thumbnail_source(self, shortcut_data: Dict[str, Any]) -> Optional[Tuple]:
+        """Return the preferred thumbnail URL and its cached image path, if any."""
+        model_id = shortcut_data.get("id")
+        # The local sc_infos copy avoids an API round trip per shortcut
+        version_info = None
+        if model_id:
+            version_info = self.model_processor.get_latest_version_info_by_model_id(str(model_id))
+        if not version_info:
+            version_info = civitai.get_latest_version_info_by_model_id(model_id)
         if not version_info or "images" not in version_info:
-            return
+            return None
 
         url = self.select_optimal_image(version_info["images"])
         if not url:
-            return
-
-        shortcut_data["imageurl"] = url
-        # Download and generate thumbnail
-        self._image_processor.download_thumbnail_image(shortcut_data.get("id"), url)
+            return None
+
+        source_path = None
+        if version_info.get("id"):
+            source_path = settings.get_image_url_to_shortcut_file(
+                shortcut_data.get("id"), version_info["id"], url
+            )
+        return url, source_path
 
     def batch_download_thumbnails(self, shortcuts: Dict[str, Any], progress: Any) -> None:
         """Batch download thumbnails with progress tracking."""
@@ -0,0 +1,189 @@
+"""
+ThumbnailEngine: Batch thumbnail generation with cheap downscaled decoding.
+
+This module is responsible for:
+- Decoding source images at reduced resolution (JPEG draft mode, reduce())
+- Writing thumbnails atomically so linked or cached files are never truncated
+- Skipping thumbnails that are newer than their source image
+- Generating many thumbnails in a process pool and reporting throughput
+"""
+
+import os
+import time
+import concurrent.futures
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from .. import settings
+from ..logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Thumbnail configuration
+THUMBNAIL_MAX_SIZE = (400, 400)
+
+# Below this many jobs the process pool start-up costs more than it saves
+MIN_POOL_JOBS = 8
+
+_JPEG_SAVE_EXTS = ('.jpg', '.jpeg')
+
+
+def render_thumbnail(source_path: str, dest_path: str, max_size=THUMBNAIL_MAX_SIZE) -> bool:
+    """
+    Render a thumbnail of source_path into dest_path.
+
+    JPEG sources are decoded with ``Image.draft`` so only a downscaled image is
+    produced by the decoder; other formats are shrunk with ``Image.reduce``
+    before the final ``thumbnail()`` resample. The result is written to a
+    temporary file and moved into place, which also makes it safe to render a
+    file onto itself.
+
+    Args:
+        source_path: Path of the source image
+        dest_path: Path of the thumbnail to write
+        max_size: Maximum (width, height) of the thumbnail
+
+    Returns:
+        True if the thumbnail was written
+    """
+    if Image is None:
+        logger.error("[ThumbnailEngine] Pillow is not available")
+        return False
+
+    root, ext = os.path.splitext(dest_path)
+    tmp_path = f"{root}.{os.getpid()}.tmp{ext}"
+    try:
+        with Image.open(source_path) as image:
+            if image.format == 'JPEG':
+                image.draft('RGB', tuple(max_size))
+            else:
+                factor = min(image.width // max_size[0], image.height // max_size[1])
+                if factor >= 2:
+                    image = image.reduce(factor)
+            image.thumbnail(max_size)
+            if ext.lower() in _JPEG_SAVE_EXTS and image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+
+            parent = os.path.dirname(dest_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            image.save(tmp_path)
+
+        os.replace(tmp_path, dest_path)
+        settings.discard_image_variants(dest_path)
+        return True
+    except Exception as e:
+        logger.warning(f"[ThumbnailEngine] Failed to render {source_path}: {e}")
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return False
+
+
+def is_thumbnail_current(source_path: str, thumbnail_path: str) -> bool:
+    """Return True if the thumbnail exists and is not older than its source."""
+    try:
+        return os.path.getmtime(thumbnail_path) >= os.path.getmtime(source_path)
+    except OSError:
+        return False
+
+
+def _render_job(job: Tuple[str, str, str, Tuple[int, int]]) -> Tuple[str, bool]:
+    """Process pool entry point; returns the model ID with the render result."""
+    model_id, source_path, dest_path, max_size = job
+    return model_id, render_thumbnail(source_path, dest_path, max_size)
+
+
+class BatchThumbnailGenerator:
+    """Generates thumbnails for many shortcuts in a process pool."""
+
+    def __init__(
+        self,
+        thumbnail_folder: str,
+        thumbnail_ext: str,
+        max_size=THUMBNAIL_MAX_SIZE,
+        max_workers: Optional[int] = None,
+    ):
+        self.thumbnail_folder = thumbnail_folder
+        self.thumbnail_ext = thumbnail_ext
+        self.max_size = tuple(max_size)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def get_thumbnail_path(self, model_id: str) -> str:
+        """Return the thumbnail path for a model ID."""
+        return os.path.join(self.thumbnail_folder, f"{model_id}{self.thumbnail_ext}")
+
+    def generate(
+        self,
+        sources: Dict[str, str],
+        force_ids: Optional[Iterable[str]] = None,
+        progress: Optional[Callable] = None,
+    ) -> dict:
+        """
+        Generate thumbnails for a mapping of model ID to source image path.
+
+        Args:
+            sources: Mapping of model ID to local source image
+            force_ids: Model IDs rendered even if their thumbnail is current
+            progress: Callback receiving (done, total, desc)
+
+        Returns:
+            Statistics with generated, skipped, failed, elapsed and per_second
+        """
+        started = time.perf_counter()
+        force = {str(mid) for mid in force_ids or ()}
+        stats = {'generated': 0, 'skipped': 0, 'failed': 0}
+
+        jobs = []
+        for model_id, source_path in sources.items():
+            dest_path = self.get_thumbnail_path(model_id)
+            if not source_path or not os.path.isfile(source_path):
+                stats['failed'] += 1
+                continue
+            current_path = settings.resolve_image_variant(dest_path)
+            if str(model_id) not in force and is_thumbnail_current(source_path, current_path):
+                stats['skipped'] += 1
+                continue
+            jobs.append((str(model_id), source_path, dest_path, self.max_size))
+
+        if jobs:
+            os.makedirs(self.thumbnail_folder, exist_ok=True)
+            for done, (model_id, success) in enumerate(self._run(jobs), start=1):
+                stats['generated' if success else 'failed'] += 1
+                if progress is not None:
+                    progress(done, len(jobs), f"Generating thumbnails {done}/{len(jobs)}")
+
+        elapsed = time.perf_counter() - started
+        stats['elapsed'] = elapsed
+        stats['per_second'] = stats['generated'] / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"[ThumbnailEngine] Generated {stats['generated']}, skipped {stats['skipped']}, "
+            f"failed {stats['failed']} in {elapsed:.2f}s "
+            f"({stats['per_second']:.1f} thumbnails/s)"
+        )
+        return stats
+
+    def _run(self, jobs):
+        """Yield (model_id, success) for every job, using a process pool when worthwhile."""
+        if len(jobs) < MIN_POOL_JOBS or self.max_workers <= 1:
+            for job in jobs:
+                yield _render_job(job)
+            return
+
+        completed = 0
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                chunksize = max(1, len(jobs) // (self.max_workers * 4))
+                for result in executor.map(_render_job, jobs, chunksize=chunksize):
+                    completed += 1
+                    yield result
+        except (OSError, concurrent.futures.process.BrokenProcessPool) as e:
+            logger.warning(f"[ThumbnailEngine] Process pool unavailable, rendering inline: {e}")
+            for job in jobs[completed:]:
+                yield _render_job(job)
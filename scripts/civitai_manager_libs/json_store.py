@@ -0,0 +1,205 @@
+"""
+Shared I/O layer for standalone JSON files.
+
+Version information files, LoRA metadata, shortcut backups and similar JSON
+files are read and written through ``get_json_store()``, which provides:
+
+- A bounded LRU cache of parsed files, validated by modification time and
+  size, so repeated scans do not parse unchanged files again
+- Atomic writes through a temporary file in the same folder and a rename, so
+  an interrupted write never leaves a truncated file behind
+- Optional compact encoding, selected per write or by the
+  ``shortcut_compact_json`` setting
+- Read and write counters for diagnostics
+
+Parsed documents are shared between callers and must not be modified.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from . import settings
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Parsed files kept in memory; version information files are mostly small
+MAX_ENTRIES = 2048
+
+# Total size of the cached files
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def is_compact_enabled() -> bool:
+    """Return True if JSON files are written without indentation by default."""
+    return bool(settings.shortcut_compact_json)
+
+
+class JsonFileStore:
+    """Reads JSON files through an LRU cache and writes them atomically."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._counters = {'reads': 0, 'hits': 0, 'writes': 0, 'bytes_written': 0, 'errors': 0}
+
+    def load(self, path: str):
+        """
+        Return the parsed contents of a JSON file.
+
+        Args:
+            path: Path of the JSON file
+
+        Returns:
+            Parsed contents, shared with other callers
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not valid JSON
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            self._counters['reads'] += 1
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry[1]
+
+        with open(key, 'rb') as f:
+            contents = json.loads(f.read().decode('utf-8'))
+
+        with self._lock:
+            self._discard(key)
+            if stat.st_size <= self.max_bytes:
+                self._entries[key] = (stamp, contents)
+                self._bytes += stat.st_size
+                self._evict()
+        return contents
+
+    def read(self, path: str, default=None):
+        """
+        Return the parsed contents of a JSON file, or a default if unreadable.
+
+        Args:
+            path: Path of the JSON file
+            default: Value returned if the file is missing or malformed
+
+        Returns:
+            Parsed contents, shared with other callers, or ``default``
+        """
+        if not path:
+            return default
+        try:
+            return self.load(path)
+        except FileNotFoundError:
+            return default
+        except Exception as e:
+            logger.debug(f"[JsonFileStore] Failed to read {path}: {e}")
+            with self._lock:
+                self._counters['errors'] += 1
+            return default
+
+    def write(self, path: str, contents, compact: Optional[bool] = None) -> None:
+        """
+        Atomically replace a JSON file.
+
+        Args:
+            path: Path of the JSON file
+            contents: JSON-serializable contents
+            compact: Write without indentation; the setting if omitted
+
+        Raises:
+            OSError: If the file cannot be written
+            TypeError: If the contents are not serializable
+        """
+        if compact is None:
+            compact = is_compact_enabled()
+
+        key = os.path.abspath(path)
+        # Unique per writer, so concurrent writes of one file do not share a temp file
+        tmp_path = f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if compact:
+                data = json.dumps(contents, separators=(',', ':')).encode('utf-8')
+            else:
+                data = json.dumps(contents, indent=4).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, key)
+        except BaseException:
+            with self._lock:
+                self._counters['errors'] += 1
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            with self._lock:
+                self._discard(key)
+
+        with self._lock:
+            self._counters['writes'] += 1
+            self._counters['bytes_written'] += len(data)
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached contents of a file."""
+        with self._lock:
+            self._discard(os.path.abspath(path))
+
+    def clear(self) -> None:
+        """Drop all cached contents."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Return the I/O counters.
+
+        Returns:
+            Dict with ``reads``, ``hits``, ``hit_rate``, ``writes``,
+            ``bytes_written``, ``errors``, ``entries`` and ``bytes``
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats['hit_rate'] = stats['hits'] / stats['reads'] if stats['reads'] else 0.0
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+        return stats
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0][1]
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (stamp, _) = self._entries.popitem(last=False)
+            self._bytes -= stamp[1]
+
+
+_global_json_store = None
+_json_store_lock = threading.Lock()
+
+
+def get_json_store() -> JsonFileStore:
+    """Get or create the global JSON file store."""
+    global _global_json_store
+
+    if _global_json_store is None:
+        with _json_store_lock:
+            if _global_json_store is None:
+                _global_json_store = JsonFileStore()
+    return _global_json_store
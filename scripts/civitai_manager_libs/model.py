@@ -1,6 +1,9 @@
 import os
-import json
+import threading
+from typing import Iterable
+
 from .logging_config import get_logger
+from .json_store import get_json_store
 
 logger = get_logger(__name__)
 
@@ -17,6 +20,10 @@ Downloaded_InfoPath = (
     dict()
 )  # infoPath : vid          #경로를 기준으로 저장한다. info 파일 하나당 버전 하나 / 버전 아이디로 저장된 경로파일을 찾을수 있다.
 # get_infopaths 해당버전의 중복된 모든 경로를 구할수 있다
+Downloaded_Version = 0  # Incremented whenever the two registries above are replaced
+
+_registry_lock = threading.Lock()
+_registry_watched = False
 
 
 def Test_Models():
@@ -30,8 +37,102 @@ def Test_Models():
 def update_downloaded_model():
     global Downloaded_Models
     global Downloaded_InfoPath
+    global Downloaded_Version
+
+    models, infopaths = get_model_path()
+    with _registry_lock:
+        Downloaded_Models, Downloaded_InfoPath = models, infopaths
+        Downloaded_Version += 1
+
+
+def refresh_downloaded_model():
+    """Rescan the model folders unless the model folder watcher keeps the registry current."""
+    if not _registry_watched:
+        update_downloaded_model()
+
+
+def get_downloaded_version() -> int:
+    """Return a counter that changes whenever the downloaded model registry changes."""
+    return Downloaded_Version
+
+
+def is_downloaded_model_watched() -> bool:
+    """Return True if the model folder watcher keeps the registry current."""
+    return _registry_watched
+
 
-    Downloaded_Models, Downloaded_InfoPath = get_model_path()
+def set_downloaded_model_watched(watched: bool):
+    """Record whether the model folder watcher is applying changes to the registry."""
+    global _registry_watched
+    _registry_watched = bool(watched)
+
+
+def apply_downloaded_model_changes(
+    updated: Iterable[str] = (), removed: Iterable[str] = ()
+) -> bool:
+    """
+    Apply added, changed and removed version info files to the registry.
+
+    The registries are replaced rather than modified, so readers iterating
+    the previous dictionaries are not affected.
+
+    Args:
+        updated: Version info files that were added or rewritten
+        removed: Version info files that no longer exist
+
+    Returns:
+        True if the registry changed
+    """
+    global Downloaded_Models
+    global Downloaded_InfoPath
+    global Downloaded_Version
+
+    parsed = dict()
+    for file_path in updated:
+        json_data = get_json_store().read(file_path)
+        if isinstance(json_data, dict) and "modelId" in json_data.keys():
+            parsed[file_path] = (
+                str(json_data['modelId']).strip(),
+                str(json_data['id']).strip(),
+            )
+    # Files that stopped being version info are dropped like removed ones
+    stale = set(removed) | (set(updated) - parsed.keys())
+
+    with _registry_lock:
+        models = {mid: list(paths) for mid, paths in (Downloaded_Models or {}).items()}
+        infopaths = dict(Downloaded_InfoPath or {})
+        owners = {path: mid for mid, paths in models.items() for _, path in paths}
+
+        for file_path, (mid, vid) in list(parsed.items()):
+            if owners.get(file_path) == mid and infopaths.get(file_path) == vid:
+                del parsed[file_path]
+            elif file_path in infopaths:
+                stale.add(file_path)
+        stale &= infopaths.keys()
+        if not stale and not parsed:
+            return False
+
+        for file_path in stale:
+            del infopaths[file_path]
+            mid = owners.get(file_path)
+            if mid in models:
+                models[mid] = [entry for entry in models[mid] if entry[1] != file_path]
+                if not models[mid]:
+                    del models[mid]
+
+        for file_path, (mid, vid) in parsed.items():
+            infopaths[file_path] = vid
+            models.setdefault(mid, list()).append([vid, file_path])
+
+        # get_model_path() reports an empty registry as None
+        Downloaded_Models = models or None
+        Downloaded_InfoPath = infopaths or None
+        Downloaded_Version += 1
+
+    logger.debug(
+        f"[model] Applied {len(parsed)} updated and {len(stale)} removed version info files"
+    )
+    return True
 
 
 def get_default_model_folder(mid):
@@ -107,28 +208,22 @@ def get_infopaths(versionid):
 # modelid를 키로 modelid가 같은 version_info의 File Path를 list로 묶어 반환한다.
 def get_model_path() -> dict:
     root_dirs = list(set(settings.get_model_folders()))
-    file_list = util.search_file(root_dirs, None, [settings.INFO_EXT])
-
     models = dict()
     infopaths = dict()
 
-    if not file_list:
-        return None, None
-
-    for file_path in file_list:
+    for file_path in util.iter_files(root_dirs, None, [settings.INFO_EXT]):
         try:
-            with open(file_path, 'r') as f:
-                json_data = json.load(f)
-                if "modelId" in json_data.keys():
-                    mid = str(json_data['modelId']).strip()
-                    vid = str(json_data['id']).strip()
+            json_data = get_json_store().load(file_path)
+            if "modelId" in json_data.keys():
+                mid = str(json_data['modelId']).strip()
+                vid = str(json_data['id']).strip()
 
-                    infopaths[file_path] = vid
+                infopaths[file_path] = vid
 
-                    if mid not in models.keys():
-                        models[mid] = list()
+                if mid not in models.keys():
+                    models[mid] = list()
 
-                    models[mid].append([vid, file_path])
+                models[mid].append([vid, file_path])
         except Exception:
             pass
 
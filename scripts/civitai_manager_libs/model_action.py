@@ -254,7 +254,7 @@ def on_load_model(modelid=None):
     data_list = list()
 
     if modelid:
-        model.update_downloaded_model()
+        model.refresh_downloaded_model()
         title_name, data_list = get_model_information(modelid)
 
     return (
@@ -0,0 +1,429 @@
+"""
+Background watcher that keeps the downloaded model registry current.
+
+``model.Downloaded_Models`` and ``model.Downloaded_InfoPath`` are built by a
+full scan of the model folders. With ``shortcut_watch_model_folders`` enabled,
+``ModelFolderWatcher``:
+
+- Scans the model folders once, then follows version info files being added,
+  rewritten, moved and deleted
+- Uses inotify on Linux, so only directories that reported a change are
+  listed again, and otherwise polls the folders; unchanged directories cost
+  one ``stat`` per poll through the ``FileWalker`` listing cache
+- Waits for a burst of changes, such as a download, to settle before applying
+  it through ``model.apply_downloaded_model_changes()``
+- Marks the registry as watched, so ``model.refresh_downloaded_model()`` no
+  longer rescans the folders
+
+Handlers that derive data from the registry can compare
+``model.get_downloaded_version()`` with the version they last saw.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import model
+from . import settings
+from .file_walker import get_file_walker
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds between polls, and between checks for changed model folder settings
+POLL_INTERVAL = 5.0
+
+# Seconds without further events before a burst of changes is applied
+SETTLE_DELAY = 0.5
+
+# Longest a continuous burst of changes is held back
+MAX_SETTLE = 10.0
+
+# inotify event flags, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def is_watcher_enabled() -> bool:
+    """Return True if the model folders are watched for changes."""
+    return bool(settings.shortcut_watch_model_folders)
+
+
+class Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify is not supported by the C library")
+        self._libc = libc
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watch a directory and return its watch descriptor."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def remove_watch(self, wd: int) -> None:
+        """Stop watching a directory; already removed watches are ignored."""
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """
+        Wait for events.
+
+        Args:
+            timeout: Seconds to wait for the first event
+
+        Returns:
+            List of ``(watch descriptor, mask, name)``, empty on timeout
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class ModelFolderWatcher:
+    """Applies changes of the version info files in the model folders to the registry."""
+
+    def __init__(
+        self,
+        interval: float = POLL_INTERVAL,
+        use_inotify: bool = True,
+        roots: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        """
+        Args:
+            interval: Seconds between polls
+            use_inotify: Use inotify where available instead of polling
+            roots: Callable returning the folders to watch; the model folders
+                from the settings if omitted
+        """
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        self._roots_provider = roots or settings.get_model_folders
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._synced = False
+        self._watches: Dict[int, str] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """
+        Start watching in a background thread.
+
+        Returns:
+            True if a watcher thread was started
+        """
+        with self._lock:
+            if self.is_running:
+                return False
+            self._stop.clear()
+            # The registry may have been rescanned while not watching
+            self._snapshot.clear()
+            self._synced = False
+            self._thread = threading.Thread(
+                target=self._run, name="ModelFolderWatcher", daemon=True
+            )
+            self._thread.start()
+        logger.info("[ModelFolderWatcher] Watching the model folders for changes")
+        return True
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop watching; the registry is rescanned on demand again."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def sync(self) -> bool:
+        """
+        Compare all version info files with the last scan and apply the difference.
+
+        Returns:
+            True if the registry changed
+        """
+        roots = self._get_roots()
+        files = get_file_walker().walk(roots, [settings.INFO_EXT])
+        return self._apply(self._stat(files), lambda path: True)
+
+    def sync_directory(self, directory: str, recursive: bool = False) -> bool:
+        """
+        Compare the version info files of one directory with the last scan.
+
+        Args:
+            directory: Directory that reported a change
+            recursive: Include the subdirectories, e.g. after a folder was moved
+
+        Returns:
+            True if the registry changed
+        """
+        directory = os.path.abspath(directory)
+        if recursive:
+            get_file_walker().invalidate(directory)
+            files = get_file_walker().walk([directory], [settings.INFO_EXT])
+            prefix = os.path.join(directory, '')
+            return self._apply(self._stat(files), lambda path: path.startswith(prefix))
+
+        files = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(settings.INFO_EXT) and entry.is_file():
+                        files.append(entry.path)
+        except OSError:
+            pass
+        return self._apply(self._stat(files), lambda path: os.path.dirname(path) == directory)
+
+    def _get_roots(self) -> List[str]:
+        return sorted({os.path.abspath(root) for root in self._roots_provider() or () if root})
+
+    @staticmethod
+    def _stat(files: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        stamps = {}
+        for path in files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _apply(self, current: Dict[str, Tuple[int, int]], in_scope: Callable[[str], bool]) -> bool:
+        with self._lock:
+            known = {path: stamp for path, stamp in self._snapshot.items() if in_scope(path)}
+            if not self._synced:
+                # Drop files registered by an earlier full scan that are gone since
+                for path in model.Downloaded_InfoPath or {}:
+                    if in_scope(path):
+                        known.setdefault(path, None)
+                self._synced = True
+
+            updated = [path for path, stamp in current.items() if known.get(path) != stamp]
+            removed = [path for path in known if path not in current]
+            for path in removed:
+                self._snapshot.pop(path, None)
+            self._snapshot.update(current)
+
+        if not updated and not removed:
+            return False
+        return model.apply_downloaded_model_changes(updated, removed)
+
+    def _run(self) -> None:
+        inotify = None
+        try:
+            roots = self._get_roots()
+            if self.use_inotify:
+                inotify = self._open_inotify(roots)
+            # Watches are in place before the scan, so nothing falls between them
+            self.sync()
+            model.set_downloaded_model_watched(True)
+
+            if inotify is not None:
+                self.backend = 'inotify'
+                self._run_inotify(inotify, roots)
+            if not self._stop.is_set():
+                self.backend = 'poll'
+                self._run_poll()
+        except Exception as e:
+            logger.error(f"[ModelFolderWatcher] Stopped watching the model folders: {e}")
+        finally:
+            if inotify is not None:
+                inotify.close()
+            self._watches.clear()
+            self.backend = None
+            model.set_downloaded_model_watched(False)
+
+    def _run_poll(self) -> None:
+        logger.debug(f"[ModelFolderWatcher] Polling the model folders every {self.interval}s")
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"[ModelFolderWatcher] Poll failed: {e}")
+
+    def _open_inotify(self, roots: List[str]) -> Optional[Inotify]:
+        try:
+            inotify = Inotify()
+        except OSError as e:
+            logger.debug(f"[ModelFolderWatcher] inotify unavailable, polling instead: {e}")
+            return None
+        try:
+            for root in roots:
+                self._add_watches(inotify, root)
+        except OSError as e:
+            # Typically the fs.inotify.max_user_watches limit
+            logger.warning(f"[ModelFolderWatcher] Cannot watch {e.filename}, polling instead: {e}")
+            inotify.close()
+            self._watches.clear()
+            return None
+        return inotify
+
+    def _add_watches(self, inotify: Inotify, top: str) -> None:
+        """Watch a directory and its subdirectories, not following symbolic links."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                wd = inotify.add_watch(directory)
+            except OSError as e:
+                if e.errno in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                    continue
+                raise
+            self._watches[wd] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _remove_watches(self, inotify: Inotify, top: Optional[str] = None) -> None:
+        """Stop watching a directory and its subdirectories, or all directories."""
+        prefix = os.path.join(top, '') if top else ''
+        for wd, directory in list(self._watches.items()):
+            if directory == top or directory.startswith(prefix):
+                inotify.remove_watch(wd)
+                del self._watches[wd]
+
+    def _run_inotify(self, inotify: Inotify, roots: List[str]) -> None:
+        """Apply inotify events until stopped; returns early to fall back to polling."""
+        logger.debug(f"[ModelFolderWatcher] Watching {len(self._watches)} directories")
+        try:
+            self._follow_events(inotify, roots)
+        except OSError as e:
+            logger.warning(f"[ModelFolderWatcher] inotify failed, polling instead: {e}")
+            self._remove_watches(inotify)
+
+    def _follow_events(self, inotify: Inotify, roots: List[str]) -> None:
+        while not self._stop.is_set():
+            events = inotify.read(self.interval)
+            if not events:
+                current_roots = self._get_roots()
+                if current_roots != roots:
+                    logger.info("[ModelFolderWatcher] Model folders changed, rescanning")
+                    self._remove_watches(inotify)
+                    roots = current_roots
+                    for root in roots:
+                        self._add_watches(inotify, root)
+                    self.sync()
+                continue
+
+            # Let a download or a folder move finish before applying it
+            deadline = time.monotonic() + MAX_SETTLE
+            while not self._stop.is_set() and time.monotonic() < deadline:
+                more = inotify.read(SETTLE_DELAY)
+                if not more:
+                    break
+                events.extend(more)
+
+            full_sync = False
+            dirty: Dict[str, bool] = {}
+            for wd, mask, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    full_sync = True
+                    continue
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self._watches[wd]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    if directory in roots:
+                        full_sync = True
+                    continue
+
+                path = os.path.join(directory, name)
+                if mask & IN_ISDIR:
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._add_watches(inotify, path)
+                    elif mask & IN_MOVED_FROM:
+                        self._remove_watches(inotify, path)
+                    dirty[path] = True
+                elif name.endswith(settings.INFO_EXT):
+                    dirty.setdefault(directory, False)
+
+            if full_sync:
+                self.sync()
+                continue
+            for directory, recursive in dirty.items():
+                self.sync_directory(directory, recursive)
+
+
+_global_model_watcher = None
+_model_watcher_lock = threading.Lock()
+
+
+def get_model_watcher() -> ModelFolderWatcher:
+    """Get or create the global model folder watcher."""
+    global _global_model_watcher
+
+    if _global_model_watcher is None:
+        with _model_watcher_lock:
+            if _global_model_watcher is None:
+                _global_model_watcher = ModelFolderWatcher()
+    return _global_model_watcher
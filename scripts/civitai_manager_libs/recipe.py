@@ -1,5 +1,5 @@
 import os
-import json
+import threading
 
 from .logging_config import get_logger
 
@@ -7,114 +7,205 @@ logger = get_logger(__name__)
 
 from . import util
 from . import settings
+from . import document_store
+
+
+class RecipeStore:
+    """In-memory recipe collection with classification and shortcut indexes.
+
+    The stored recipes are re-read only when their storage stamp changes.
+    Keywords match anywhere in the recipe name and ``#`` terms anywhere in the
+    description; the lowercase texts are kept so searches only compare strings
+    of the recipes left by the other criteria.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data = {}
+        self._by_classification = {}
+        self._by_shortcut = {}
+        self._references = []
+        self._names = {}
+        self._descriptions = {}
+        self._stamp = None
+        self._loaded = False
+
+    def load(self) -> dict:
+        """Return a copy of the recipe collection, or None if it is empty."""
+        with self._lock:
+            self._refresh()
+            if not self._data:
+                return None
+            return {name: self._copy(rc) for name, rc in self._data.items()}
+
+    def save(self, RecipeCollection: dict) -> str:
+        """Replace the recipe collection and write it to the recipe file."""
+        with self._lock:
+            data = {name: self._copy(rc) for name, rc in (RecipeCollection or {}).items()}
+            document = document_store.get_document(document_store.RECIPES)
+            try:
+                document.write(data)
+            except Exception:
+                logger.error(f"Error when writing file: {document.location}")
+                self._loaded = False
+                return ""
+            self._set_data(data, document.stamp())
+            self._loaded = True
+
+        output = f"Recipe saved to: {document.location}"
+        logger.info(output)
+        return output
 
-
-def get_list(search=None, classification=None, shortcuts=None):
-
-    RecipeCollection = load()
-    if not RecipeCollection:
-        return
-
-    result_list = dict()
-
-    keys, descs, notes = util.get_search_keyword(search)
-
-    # filtering classification
-    for name, v in RecipeCollection.items():
-        if classification:
-            if v['classification'] and classification == v['classification']:
-                result_list[name] = v
-        else:
-            result_list[name] = v
-
-    # filtering shortcuts
-    if shortcuts:
-        shortcut_list = dict()
-        for name, v in result_list.items():
-            if 'shortcuts' in v.keys():
-                different_shortcuts = set(shortcuts) - set(v["shortcuts"])
-                if not different_shortcuts:
-                    shortcut_list[name] = v
-
-        result_list = shortcut_list
-
-    # filtering key
-    if keys:
-        key_list = dict()
-        for name, v in result_list.items():
-            for key in keys:
-                if key in name.lower():
-                    key_list[name] = v
-                    break
-        result_list = key_list
-
-    # filtering descs
-    if descs:
-        desc_list = dict()
-        for name, v in result_list.items():
-            if not v['description']:
+    def get(self, name) -> dict:
+        with self._lock:
+            self._refresh()
+            rc = self._data.get(name)
+            return self._copy(rc) if rc is not None else None
+
+    def get_classifications(self) -> list:
+        with self._lock:
+            self._refresh()
+            return list(self._by_classification)
+
+    def get_reference_shortcuts(self) -> list:
+        with self._lock:
+            self._refresh()
+            return list(self._references)
+
+    def get_recipes_by_shortcut(self, modelid) -> list:
+        """Return the recipes referencing a model, in collection order."""
+        with self._lock:
+            self._refresh()
+            return self._ordered(self._by_shortcut.get(str(modelid), ()))
+
+    def find(self, search=None, classification=None, shortcuts=None) -> list:
+        """
+        Find recipes matching every given criterion.
+
+        Args:
+            search: Search text in ``util.get_search_keyword`` syntax; keywords
+                match recipe names, ``#`` terms match descriptions
+            classification: Recipe classification
+            shortcuts: Model IDs that must all be referenced by the recipe
+
+        Returns:
+            Matching recipe names in collection order, or None if there are no recipes
+        """
+        with self._lock:
+            self._refresh()
+            if not self._data:
+                return None
+
+            keys, descs, notes = util.get_search_keyword(search)
+
+            candidates = None
+            if classification:
+                candidates = set(self._by_classification.get(classification, ()))
+            for modelid in shortcuts or ():
+                recipes = self._by_shortcut.get(str(modelid), set())
+                candidates = set(recipes) if candidates is None else candidates & recipes
+            if keys:
+                candidates = self._match(self._names, keys, candidates)
+            if descs:
+                candidates = self._match(self._descriptions, descs, candidates)
+
+            if candidates is None:
+                return list(self._data)
+            return self._ordered(candidates)
+
+    @staticmethod
+    def _match(texts, terms, candidates=None) -> set:
+        """Return the candidate recipes whose text contains any of the terms."""
+        if candidates is not None:
+            texts = {name: texts[name] for name in candidates if name in texts}
+        return {name for name, text in texts.items() if any(term in text for term in terms)}
+
+    def _ordered(self, names) -> list:
+        return [name for name in self._data if name in names]
+
+    @staticmethod
+    def _copy(rc):
+        if not isinstance(rc, dict):
+            return rc
+        rc = dict(rc)
+        if isinstance(rc.get('shortcuts'), list):
+            rc['shortcuts'] = list(rc['shortcuts'])
+        return rc
+
+    @staticmethod
+    def _file_stamp():
+        return document_store.get_document(document_store.RECIPES).stamp()
+
+    def _refresh(self) -> None:
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+
+        if stamp is None:
+            self.save({})
+            return
+
+        json_data = None
+        document = document_store.get_document(document_store.RECIPES)
+        try:
+            json_data = document.read()
+        except Exception:
+            logger.debug(f"Unable to read recipe file: {document.location}")
+        self._set_data(json_data if isinstance(json_data, dict) else {}, stamp)
+        self._loaded = True
+
+    def _set_data(self, data: dict, stamp) -> None:
+        by_classification = {}
+        by_shortcut = {}
+        references = {}
+        names = {}
+        descriptions = {}
+
+        for name, rc in data.items():
+            names[name] = str(name).lower()
+            if not isinstance(rc, dict):
                 continue
+            if rc.get('description'):
+                descriptions[name] = str(rc['description']).lower()
+            if rc.get('classification'):
+                by_classification.setdefault(rc['classification'], set()).add(name)
+            for modelid in rc.get('shortcuts') or []:
+                by_shortcut.setdefault(str(modelid), set()).add(name)
+                references.setdefault(modelid, None)
 
-            for desc in descs:
-                if desc in v['description'].lower():
-                    desc_list[name] = v
-                    break
-        result_list = desc_list
-
-    # 필요한것으로 변환
-    recipelist = list()
-    for name in result_list.keys():
-        recipelist.append(name)
+        self._data = data
+        self._by_classification = by_classification
+        self._by_shortcut = by_shortcut
+        self._references = list(references)
+        self._names = names
+        self._descriptions = descriptions
+        self._stamp = stamp
 
-    return recipelist
 
+_store = RecipeStore()
 
-def get_reference_shortcuts():
-    RecipeCollection = load()
-    reference_shortcuts = list()
-
-    if not RecipeCollection:
-        return reference_shortcuts
 
-    for v in RecipeCollection.values():
-        if 'shortcuts' in v.keys():
-            reference_shortcuts.extend(v['shortcuts'])
+def get_list(search=None, classification=None, shortcuts=None):
+    return _store.find(search, classification, shortcuts)
 
-    reference_shortcuts = list(set(reference_shortcuts))
 
-    return reference_shortcuts
+def get_reference_shortcuts():
+    return _store.get_reference_shortcuts()
 
 
 def get_classifications():
-    RecipeCollection = load()
-    classifications = list()
-
-    if not RecipeCollection:
-        return classifications
+    return _store.get_classifications()
 
-    for v in RecipeCollection.values():
-        if v['classification']:
-            classifications.append(v['classification'])
 
-    classifications = list(set(classifications))
-
-    return classifications
+def get_recipes_by_shortcut(modelid):
+    """Return the names of the recipes that reference a model."""
+    if not modelid:
+        return []
+    return _store.get_recipes_by_shortcut(modelid)
 
 
 def is_classifications(classification):
-    RecipeCollection = load()
-
-    if not RecipeCollection:
-        return False
-
-    try:
-        for v in RecipeCollection.values():
-            if v['classification'] == classification:
-                return True
-    except Exception:
-        pass
-
-    return False
+    return classification in _store.get_classifications()
 
 
 def get_recipe_shortcuts(recipe):
@@ -126,10 +217,9 @@ def get_recipe_shortcuts(recipe):
         logger.warning(f"get_recipe_shortcuts received list instead of string: {recipe}")
         return None
 
-    RecipeCollection = load()
-    if RecipeCollection and recipe in RecipeCollection:
-        if 'shortcuts' in RecipeCollection[recipe]:
-            return RecipeCollection[recipe]['shortcuts']
+    rc = _store.get(recipe)
+    if rc and 'shortcuts' in rc:
+        return rc['shortcuts']
 
     return None
 
@@ -225,12 +315,11 @@ def get_recipe(s_name):
         return None
 
     logger.debug(f"[RECIPE] get_recipe: Looking for recipe '{s_name}'")
-    RecipeCollection = load()
-    logger.debug(f"[RECIPE] get_recipe: RecipeCollection loaded: {RecipeCollection is not None}")
+    rc = _store.get(s_name)
 
-    if RecipeCollection and s_name in RecipeCollection:
+    if rc is not None:
         logger.debug(f"[RECIPE] get_recipe: Found recipe '{s_name}'")
-        return RecipeCollection[s_name]
+        return rc
 
     logger.debug(f"[RECIPE] get_recipe: Recipe '{s_name}' not found")
     return None
@@ -402,39 +491,11 @@ def update(RecipeCollection: dict, recipe, name, desc, prompt=None, classificati
 
 
 def save(RecipeCollection: dict):
-    output = ""
-
-    # write to file
-    try:
-        with open(settings.shortcut_recipe, 'w') as f:
-            json.dump(RecipeCollection, f, indent=4)
-    except Exception:
-        logger.error(f"Error when writing file: {settings.shortcut_recipe}")
-        return output
-
-    output = f"Recipe saved to: {settings.shortcut_recipe}"
-    logger.info(output)
-    return output
+    return _store.save(RecipeCollection)
 
 
 def load() -> dict:
-    if not os.path.isfile(settings.shortcut_recipe):
-        save({})
-        return
-
-    json_data = None
-    try:
-        with open(settings.shortcut_recipe, 'r') as f:
-            json_data = json.load(f)
-    except Exception:
-        return None
-
-    # check error
-    if not json_data:
-        return None
-
-    # check for new key
-    return json_data
+    return _store.load()
 
 
 # =========================================================================
@@ -226,6 +226,7 @@ class RecipeBrowser:
                                     container=True,
                                     show_copy_button=True,
                                 )
+                                recipe_hash_references = gr.Markdown()
 
         with gr.Row(visible=False):
             selected_recipe_name = gr.Textbox()
@@ -267,6 +268,7 @@ class RecipeBrowser:
             'recipe_delete_btn': recipe_delete_btn,
             'recipe_image': recipe_image,
             'recipe_output': recipe_output,
+            'recipe_hash_references': recipe_hash_references,
             'recipe_prompt_tabs': recipe_prompt_tabs,
             'recipe_reference_tabs': recipe_reference_tabs,
             'reference_sc_gallery': reference_sc_gallery,
@@ -409,7 +411,9 @@ class RecipeBrowser:
                 logger.debug(f"   options: {repr(options)}")
                 logger.debug(f"   gen_string: {repr(gen_string)}")
 
-                shortcuts = [shortcutid]
+                shortcuts = [shortcutid] + self._resolve_prompt_shortcuts(
+                    positivePrompt, shortcutid
+                )
             else:
                 logger.debug(
                     "[RECIPE] No newline found, using get_imagefn_and_shortcutid_from_recipe_image"
@@ -466,6 +470,34 @@ class RecipeBrowser:
             return gr.update(selected="reference_model")
         return gr.update(selected=None)
 
+    def _resolve_prompt_shortcuts(self, prompt: str, shortcutid: str) -> list:
+        """
+        Find the registered shortcuts of the networks and embeddings a prompt uses.
+
+        Args:
+            prompt: Positive prompt of the recipe
+            shortcutid: Shortcut the recipe image came from, excluded from the result
+
+        Returns:
+            Model IDs of registered shortcuts in prompt order
+        """
+        from ..ishortcut_core import shortcutcollectionmanager
+        from ..ishortcut_core.prompt_model_index import get_prompt_model_index
+
+        if not prompt:
+            return []
+        try:
+            registered = shortcutcollectionmanager.load_summaries()
+            model_ids = get_prompt_model_index().resolve_model_ids(prompt)
+        except Exception as e:
+            self._logger.debug(f"[RecipeBrowser] Failed to resolve prompt models: {e}")
+            return []
+        return [
+            model_id
+            for model_id in model_ids
+            if model_id in registered and model_id != str(shortcutid)
+        ]
+
     def _is_valid_recipe_input_data(self, recipe_input: str) -> bool:
         """
         Check if recipe_input contains valid data that should trigger UI updates.
@@ -94,6 +94,13 @@ class RecipeEventWiring:
             outputs=[components['recipe_output']],
         )
 
+        components['recipe_output'].change(
+            fn=self.recipe_utilities.describe_hash_references,
+            inputs=[components['recipe_output']],
+            outputs=[components['recipe_hash_references']],
+            show_progress=False,
+        )
+
         # Image handling
         recipe_drop_image_upload = components['recipe_drop_image'].upload(
             fn=self.recipe_gallery.on_recipe_drop_image_upload,
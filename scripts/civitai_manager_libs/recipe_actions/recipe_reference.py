@@ -253,7 +253,10 @@ class RecipeReferenceManager:
             shortcut_manager = getattr(ishortcut, 'shortcutcollectionmanager', None)
             if not shortcut_manager or not hasattr(shortcut_manager, 'load_shortcuts'):
                 return None
-            ISC = shortcut_manager.load_shortcuts()
+            if hasattr(shortcut_manager, 'load_summaries'):
+                ISC = shortcut_manager.load_summaries()
+            else:
+                ISC = shortcut_manager.load_shortcuts()
         except (AttributeError, TypeError):
             return None
 
@@ -288,10 +291,7 @@ class RecipeReferenceManager:
                         else:
                             result_list.append(
                                 (
-                                    os.path.join(
-                                        settings.shortcut_thumbnail_folder,
-                                        f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                    ),
+                                    settings.get_shortcut_thumbnail_file(v['id']),
                                     settings.set_shortcutname(v['name'], v['id']),
                                 )
                             )
@@ -153,6 +153,13 @@ class RecipeUtilities:
 
         return meta_string
 
+    @staticmethod
+    def describe_hash_references(generate_data):
+        """Describe which models hashed in the generate information are downloaded."""
+        from ..ishortcut_core.model_hash_index import format_hash_references
+
+        return format_hash_references(generate_data)
+
     @staticmethod
     def analyze_prompt(generate_data):
         """
@@ -329,7 +329,7 @@ def get_recipe_reference_list(page=0):
 
     if shortlist:
         result = list()
-        ISC = ishortcut.shortcutcollectionmanager.load_shortcuts()
+        ISC = ishortcut.shortcutcollectionmanager.load_summaries()
         for shortcut in shortlist:
             # v = ishortcut.get_shortcut_model(str(shortcut))
             v = get_shortcut_by_modelid(ISC, str(shortcut))
@@ -345,10 +345,7 @@ def get_recipe_reference_list(page=0):
                     else:
                         result.append(
                             (
-                                os.path.join(
-                                    settings.shortcut_thumbnail_folder,
-                                    f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                ),
+                                settings.get_shortcut_thumbnail_file(v['id']),
                                 settings.set_shortcutname(v['name'], v['id']),
                             )
                         )
@@ -369,20 +366,6 @@ def get_recipe_reference_list(page=0):
     return result, total, max_page
 
 
-def get_recipe(RC, s_name):
-
-    if not RC:
-        return None
-
-    if not s_name:
-        return None
-
-    if s_name in RC:
-        return RC[s_name]
-
-    return None
-
-
 def get_recipe_list(search=None, classification=None, shortcut=None, page=0):
 
     total = 0
@@ -424,10 +407,8 @@ def get_recipe_list(search=None, classification=None, shortcut=None, page=0):
 
     if shortlist:
         result = list()
-        RecipeCollection = recipe.load()
         for shortcut in shortlist:
-            # re = recipe.get_recipe(shortcut)
-            re = get_recipe(RecipeCollection, shortcut)
+            re = recipe.get_recipe(shortcut)
             if re:
                 if re["image"]:
                     dpimage = os.path.join(settings.shortcut_recipe_folder, f"{re['image']}")
@@ -520,7 +501,7 @@ def on_recipe_reference_select_gallery_select(evt: gr.SelectData, shortcuts):
 
 
 def on_recipe_reference_select_gallery_loading(shortcuts):
-    ISC = ishortcut.shortcutcollectionmanager.load_shortcuts()
+    ISC = ishortcut.shortcutcollectionmanager.load_summaries()
     if not ISC:
         return None, gr.update(visible=False)
 
@@ -542,10 +523,7 @@ def on_recipe_reference_select_gallery_loading(shortcuts):
                     else:
                         result_list.append(
                             (
-                                os.path.join(
-                                    settings.shortcut_thumbnail_folder,
-                                    f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                ),
+                                settings.get_shortcut_thumbnail_file(v['id']),
                                 settings.set_shortcutname(v['name'], v['id']),
                             )
                         )
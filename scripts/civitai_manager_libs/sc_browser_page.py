@@ -1,6 +1,5 @@
 import gradio as gr
 import math
-import os
 import datetime
 
 from . import util
@@ -81,6 +80,7 @@ def on_ui(
                 interactive=True,
             )
             reset_filter_btn = gr.Button(value="Reset Filter", variant="primary")
+            sc_facet_summary = gr.Markdown(value=get_facet_summary())
 
         sc_gallery_page = gr.Slider(
             minimum=1,
@@ -162,6 +162,7 @@ def on_ui(
                 interactive=True,
             )
             reset_filter_btn = gr.Button(value="Reset Filter", variant="primary")
+            sc_facet_summary = gr.Markdown(value=get_facet_summary())
 
     with gr.Row(visible=False):
         refresh_sc_browser = gr.Textbox()
@@ -200,7 +201,13 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_classification_list, sc_gallery_page, sc_gallery_result],
+        outputs=[
+            sc_gallery,
+            sc_classification_list,
+            sc_gallery_page,
+            sc_gallery_result,
+            sc_facet_summary,
+        ],
         show_progress=False,
     )
 
@@ -215,7 +222,7 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result],
+        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result, sc_facet_summary],
     )
 
     sc_search.submit(
@@ -229,7 +236,7 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result],
+        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result, sc_facet_summary],
     )
 
     shortcut_basemodel.change(
@@ -243,7 +250,7 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result],
+        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result, sc_facet_summary],
     )
 
     show_downloaded_sc.change(
@@ -257,7 +264,7 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result],
+        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result, sc_facet_summary],
     )
 
     sc_classification_list.change(
@@ -271,7 +278,7 @@ def on_ui(
             sc_shortcut_column,
             sc_shortcut_rows_per_page,
         ],
-        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result],
+        outputs=[sc_gallery, sc_gallery_page, sc_gallery_result, sc_facet_summary],
     )
 
     reset_filter_btn.click(
@@ -337,6 +344,38 @@ def on_reset_filter_btn_click():
     )
 
 
+def get_downloaded_filter(downloaded_sc):
+    """Translate the downloaded dropdown value into (downloaded, downloaded_ids)."""
+    if downloaded_sc == DOWNLOADED_MODEL:
+        return True, list(model.Downloaded_Models.keys()) if model.Downloaded_Models else []
+    if downloaded_sc == NOT_DOWNLOADED_MODEL and model.Downloaded_Models:
+        return False, list(model.Downloaded_Models.keys())
+    return None, None
+
+
+def get_facet_summary(
+    shortcut_types=None,
+    downloaded_sc=False,
+    search=None,
+    shortcut_basemodels=None,
+    sc_classifications=None,
+):
+    """Return a Markdown line with the number of matches per type and base model."""
+    counts = ishortcut.shortcutsearchfilter.get_facet_counts(
+        shortcut_types,
+        search,
+        shortcut_basemodels,
+        sc_classifications,
+        *get_downloaded_filter(downloaded_sc),
+    )
+    parts = []
+    for facet in ('types', 'base_models'):
+        values = sorted(counts.get(facet, {}).items(), key=lambda x: (-x[1], str(x[0])))
+        if values:
+            parts.append(" · ".join(f"{name} ({count})" for name, count in values))
+    return "  \n".join(parts)
+
+
 def get_thumbnail_list(
     shortcut_types=None,
     downloaded_sc=False,
@@ -350,68 +389,21 @@ def get_thumbnail_list(
 
     total = 0
     max_page = 1
-    shortcut_list = ishortcut.shortcutsearchfilter.get_filtered_shortcuts(
-        shortcut_types, search, shortcut_basemodels, sc_classifications
+    shortcut_ids = ishortcut.shortcutsearchfilter.get_result_view(
+        shortcut_types,
+        search,
+        shortcut_basemodels,
+        sc_classifications,
+        *get_downloaded_filter(downloaded_sc),
+        sort_by=settings.shortcut_browser_sort,
     )
-    if not shortcut_list:
-        shortcut_list = []
     shortlist = None
     result = None
 
-    if downloaded_sc == DOWNLOADED_MODEL:
-        if model.Downloaded_Models:
-            downloaded_list = list()
-            for short in shortcut_list:
-                mid = short['id']
-                if str(mid) in model.Downloaded_Models.keys():
-                    downloaded_list.append(short)
-            shortcut_list = downloaded_list
-        else:
-            shortcut_list = None
-    elif downloaded_sc == NOT_DOWNLOADED_MODEL:
-        if model.Downloaded_Models:
-            downloaded_list = list()
-            for short in shortcut_list:
-                mid = short['id']
-                if str(mid) not in model.Downloaded_Models.keys():
-                    downloaded_list.append(short)
-            shortcut_list = downloaded_list
-
-    # if downloaded_sc:
-    #     if model.Downloaded_Models:
-    #         downloaded_list = list()
-    #         for short in shortcut_list:
-    #             mid = short['id']
-    #             if str(mid) in model.Downloaded_Models.keys():
-    #                 downloaded_list.append(short)
-    #         shortcut_list = downloaded_list
-    #     else:
-    #         shortcut_list = None
-
-    if shortcut_list:
-        total = len(shortcut_list)
-
-        # name 기준으로 정렬
-        shortcut_list = sorted(
-            shortcut_list, key=lambda x: x["name"].lower().strip(), reverse=False
-        )
+    if shortcut_ids:
+        total = len(shortcut_ids)
+        page_ids = shortcut_ids
 
-        # 등록일 기준으로 정렬
-        # strptime str을 datetime 형식으로 변환(스트링과 형식일치해야함)
-        # strftime datetime 형식을 str로 변환(스트링과 형식이 일치할필요는 없다.)
-        # shortcut_list = sorted(
-        #     shortcut_list,
-        #     key=lambda x: datetime.datetime.strptime(
-        #         x["date"], '%Y-%m-%d %H:%M:%S'
-        #     ).strftime('%Y-%m-%d'),
-        #     reverse=True,
-        # )
-        # shortcut_list = sorted(shortcut_list, key=lambda x: x["date"], reverse=True)
-        # shortcut_list = sorted(shortcut_list, key=lambda x: (x["date"], x['name']) , reverse=True)
-
-        shortlist = shortcut_list
-
-    if total > 0:
         # page 즉 페이징이 아닌 전체가 필요할때도 총페이지 수를 구할때도 있으므로..
         # page == 0 은 전체 리스트를 반환한다
         shortcut_count_per_page = columns * rows
@@ -424,16 +416,16 @@ def get_thumbnail_list(
         if page > 0 and shortcut_count_per_page > 0:
             item_start = shortcut_count_per_page * (page - 1)
             item_end = shortcut_count_per_page * page
-            if total < item_end:
-                item_end = total
-            shortlist = shortcut_list[item_start:item_end] if shortcut_list else []
+            page_ids = shortcut_ids[item_start:item_end]
+
+        shortlist = ishortcut.shortcutsearchfilter.get_summaries_by_ids(page_ids)
 
     if shortlist:
         result = list()
         # 썸네일이 있는지 판단해서 대체 이미지 작업
         for v in shortlist:
             if v:
-                if ishortcut.imageprocessor.is_sc_image(v['id']):
+                if v.get('has_thumbnail') or ishortcut.imageprocessor.is_sc_image(v['id']):
                     if (
                         'nsfw' in v.keys()
                         and bool(v['nsfw'])
@@ -448,10 +440,7 @@ def get_thumbnail_list(
                     else:
                         result.append(
                             (
-                                os.path.join(
-                                    settings.shortcut_thumbnail_folder,
-                                    f"{v['id']}{settings.PREVIEW_IMAGE_EXT}",
-                                ),
+                                settings.get_shortcut_thumbnail_file(v['id']),
                                 settings.set_shortcutname(v['name'], v['id']),
                             )
                         )
@@ -513,6 +502,9 @@ def on_refresh_sc_list_change(
             label=f"Total {thumb_max_page} Pages",
         ),
         thumb_list,
+        get_facet_summary(
+            sc_types, show_downloaded_sc, sc_search, sc_basemodels, sc_classifications
+        ),
     )
 
 
@@ -532,6 +524,9 @@ def on_shortcut_gallery_refresh(
             label=f"Total {thumb_max_page} Pages",
         ),
         thumb_list,
+        get_facet_summary(
+            sc_types, show_downloaded_sc, sc_search, sc_basemodels, sc_classifications
+        ),
     )
 
 
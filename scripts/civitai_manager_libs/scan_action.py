@@ -1,6 +1,5 @@
 import os
 import gradio as gr
-import json
 
 from .logging_config import get_logger
 
@@ -11,7 +10,15 @@ from . import model
 from . import settings
 from . import civitai
 import scripts.civitai_manager_libs.ishortcut_core as ishortcut
+from .ishortcut_core.shortcut_thumbnail_manager import ShortcutThumbnailManager
+from .ishortcut_core.model_hash_index import get_model_hash_index
+from .ishortcut_core import model_info_format
+from .image_store import get_image_store
+from .image_transcoder import get_image_transcoder
+from .json_store import get_json_store
 from . import ishortcut_action
+from . import scan_job
+from .scan_job import get_scan_job
 from .http import get_http_client
 from .image_format_filter import ImageFormatFilter
 
@@ -27,6 +34,10 @@ from .exceptions import (  # noqa: F401
     APIError,  # noqa: F401
 )  # noqa: F401
 
+# Why a model information job skipped a file
+REASON_NOT_ON_CIVITAI = 'not_on_civitai'
+REASON_MISSING = 'missing'
+
 
 @with_error_handling(
     fallback_value=False,
@@ -61,6 +72,21 @@ def on_scan_ui():
                             value="This feature targets models that do not have information files available in the saved models. It calculates the hash value and searches for the model in Civitai, registering it as a shortcut. Calculating the hash value can take a significant amount of time.",
                             visible=True,
                         )
+                        job = get_scan_job()
+                        with gr.Group(
+                            elem_classes="cs_box", visible=job.has_unfinished()
+                        ) as scan_job_box:
+                            with gr.Column():
+                                scan_job_status = gr.Markdown(
+                                    value=scan_job.format_status(job.get_status())
+                                )
+                                with gr.Row():
+                                    resume_scan_job_btn = gr.Button(
+                                        value="Resume Model Information Job", variant="primary"
+                                    )
+                                    cancel_scan_job_btn = gr.Button(
+                                        value="Cancel Model Information Job"
+                                    )
                         with gr.Group(elem_classes="cs_box", visible=False) as scanned_result:
                             with gr.Column():
                                 scan_models_result = gr.CheckboxGroup(
@@ -119,6 +145,63 @@ def on_scan_ui():
                             value="This feature updates registered shortcuts with the latest information and downloads any new images if available.",
                             visible=True,
                         )
+
+                with gr.Row():
+                    with gr.Column():
+                        update_all_thumbnails_btn = gr.Button(
+                            value="Rebuild the shortcut thumbnails", variant="primary"
+                        )
+                        update_thumbnails_progress = gr.Markdown(
+                            value=(
+                                "This feature regenerates outdated shortcut thumbnails from "
+                                "cached model images and downloads the ones that are missing."
+                            ),
+                            visible=True,
+                        )
+
+                with gr.Row():
+                    with gr.Column():
+                        transcode_images_btn = gr.Button(
+                            value="Transcode the cached images", variant="primary"
+                        )
+                        transcode_images_progress = gr.Markdown(
+                            value=(
+                                "This feature re-encodes cached previews, thumbnails and "
+                                "gallery images to the format set in 'image_transcode_format' "
+                                "(webp or avif)."
+                            ),
+                            visible=True,
+                        )
+
+                with gr.Row():
+                    with gr.Column():
+                        prune_image_store_btn = gr.Button(
+                            value="Reclaim unused image store entries", variant="primary"
+                        )
+                        prune_image_store_progress = gr.Markdown(
+                            value=(
+                                "This feature removes images from the shared image store "
+                                "that no cached preview, gallery image or downloaded model "
+                                "uses any more, e.g. after shortcuts were deleted or images "
+                                "were transcoded."
+                            ),
+                            visible=True,
+                        )
+
+                with gr.Row():
+                    with gr.Column():
+                        convert_model_infos_btn = gr.Button(
+                            value="Convert the model information files", variant="primary"
+                        )
+                        convert_model_infos_progress = gr.Markdown(
+                            value=(
+                                "This feature rewrites the model information of the shortcuts "
+                                "as compressed compact JSON when 'shortcut_info_compression' "
+                                "is enabled, or back to plain JSON when it is disabled, and "
+                                "reports the size and parse time of both formats."
+                            ),
+                            visible=True,
+                        )
         with gr.Row():
             with gr.Accordion("Update Downloaded Model", open=True):
                 with gr.Row():
@@ -152,6 +235,13 @@ def on_scan_ui():
         outputs=[scan_save_vsfolder],
     )
 
+    # Shows the job status and the cancel button while the job runs
+    create_models_info_btn.click(
+        fn=on_scan_job_started,
+        inputs=None,
+        outputs=[scan_job_box, scan_job_status],
+    )
+
     create_models_info_btn.click(
         fn=on_create_models_info_btn_click,
         inputs=[
@@ -160,7 +250,37 @@ def on_scan_ui():
             scan_save_vsfolder,
             scan_register_shortcut,
         ],
-        outputs=[scan_models_result, scanned_result, update_information],
+        outputs=[
+            scan_models_result,
+            scanned_result,
+            update_information,
+            scan_job_box,
+            scan_job_status,
+        ],
+    )
+
+    resume_scan_job_btn.click(
+        fn=on_scan_job_started,
+        inputs=None,
+        outputs=[scan_job_box, scan_job_status],
+    )
+
+    resume_scan_job_btn.click(
+        fn=on_resume_scan_job_btn_click,
+        inputs=None,
+        outputs=[
+            scan_models_result,
+            scanned_result,
+            update_information,
+            scan_job_box,
+            scan_job_status,
+        ],
+    )
+
+    cancel_scan_job_btn.click(
+        fn=on_cancel_scan_job_btn_click,
+        inputs=None,
+        outputs=[scan_job_status],
     )
 
     scan_models_btn.click(
@@ -183,6 +303,38 @@ def on_scan_ui():
         ],
     )
 
+    update_all_thumbnails_btn.click(
+        fn=on_update_all_thumbnails_btn_click,
+        inputs=None,
+        outputs=[
+            update_thumbnails_progress,
+        ],
+    )
+
+    transcode_images_btn.click(
+        fn=on_transcode_images_btn_click,
+        inputs=None,
+        outputs=[
+            transcode_images_progress,
+        ],
+    )
+
+    prune_image_store_btn.click(
+        fn=on_prune_image_store_btn_click,
+        inputs=None,
+        outputs=[
+            prune_image_store_progress,
+        ],
+    )
+
+    convert_model_infos_btn.click(
+        fn=on_convert_model_infos_btn_click,
+        inputs=None,
+        outputs=[
+            convert_model_infos_progress,
+        ],
+    )
+
     scan_to_shortcut_btn.click(
         fn=on_scan_to_shortcut_click,
         inputs=None,
@@ -211,116 +363,217 @@ def on_clear_scan_models_result_btn_click():
 
 
 def create_models_information(files, mfolder, vs_folder, register_shortcut, progress=gr.Progress()):
-
-    non_list = list()
+    """Start a model information job for the files and return those unknown to Civitai."""
     if not files:
         return None
 
-    for file_path in progress.tqdm(files, desc="Create Models Information"):
-        if os.path.isfile(file_path):
-            logger.debug(f"Generate SHA256: {file_path}")
-            hash = util.calculate_sha256(file_path)
-            version_info = civitai.get_version_info_by_hash(hash)
-
-            if not version_info:
-                # These models are not registered with Civitai.
-                non_list.append(file_path)
-                continue
-
-            vfolder, vfile = os.path.split(file_path)
-            basename, ext = os.path.splitext(vfile)
-
-            # 저장할 폴더 생성
-            if mfolder:
-                model_folder = util.make_download_model_folder(version_info, True, vs_folder)
-                # 다정하면 임의의 분류뒤에 모델폴더를 생성하고 그뒤에 버전까지 생성가능
-                # model_folder = make_download_model_folder(version_info, ms_folder=True, vs_folder=True, vs_foldername=None, cs_foldername=None):
-                # model_folder = util.make_version_folder(version_info, vs_folder)
-            else:
-                model_folder = vfolder
-
-            # version info file name 으로 교체시
-            # savefile_base = downloader.get_save_base_name(version_info)
-            # basename = savefile_base
-            # destination = os.path.join(model_folder, f"{basename}{ext}")
-
-            # save info
-            info_path = os.path.join(
-                model_folder, f"{basename}{settings.INFO_SUFFIX}{settings.INFO_EXT}"
-            )
-            result = civitai.write_version_info(info_path, version_info)
-            if result:
-                logger.info(f"Wrote version info: {info_path}")
-
-            # save preview
-            if "images" in version_info.keys():
-                # Pick the first static image from version images
-                img_dict = None
-                for candidate in version_info["images"]:
-                    if isinstance(candidate, dict) and ImageFormatFilter.is_static_image_dict(
-                        candidate
-                    ):
-                        img_dict = candidate
-                        break
-                if img_dict:
-                    img_url = img_dict.get("url")
-                    if img_url:
-                        if img_dict.get("width"):
-                            img_url = util.change_width_from_image_url(img_url, img_dict["width"])
-                        description_img = os.path.join(
-                            model_folder,
-                            f"{basename}{settings.PREVIEW_IMAGE_SUFFIX}{settings.PREVIEW_IMAGE_EXT}",
-                        )
-                        download_scan_image(img_url, description_img)
-
-            # 파일 이동
-            if mfolder:
-                destination = os.path.join(model_folder, vfile)
-                if file_path != destination:
-                    if not os.path.isfile(destination):
-                        os.rename(file_path, destination)
-                    else:
-                        logger.warning(f"The target file already exists: {destination}")
-
-            # 숏컷 추가
-            if register_shortcut:
-                if version_info['modelId']:
-                    ishortcut.shortcutcollectionmanager.update_shortcut(
-                        version_info['modelId'], progress
-                    )
-                    model.update_downloaded_model()
+    job = get_scan_job()
+    if job.is_running:
+        logger.warning("[scan_action] A model information job is already running")
+        return None
+    job.create(
+        files,
+        {
+            'mfolder': bool(mfolder),
+            'vs_folder': bool(vs_folder),
+            'register_shortcut': bool(register_shortcut),
+        },
+    )
+    return run_models_information_job(job, progress)
 
-    return non_list
 
+def run_models_information_job(job, progress=gr.Progress(), retry_failed=False):
+    """Process the pending files of a model information job and return those unknown to Civitai."""
+    options = job.get_options()
 
-def is_filename_in_version_info_in_directory(directory, filename):
+    def process(entry, checkpoint):
+        return create_model_information(
+            entry,
+            checkpoint,
+            options.get('mfolder'),
+            options.get('vs_folder'),
+            options.get('register_shortcut'),
+            progress,
+        )
 
-    file_list = []
-    for file in os.listdir(directory):
-        if file.endswith(f"{settings.INFO_SUFFIX}{settings.INFO_EXT}"):
-            file_list.append(os.path.join(directory, file))
+    try:
+        job.run(process, progress, retry_failed)
+    finally:
+        # Hashes computed by the job are written once it stops
+        get_model_hash_index().flush()
+    return job.get_files(scan_job.STATUS_SKIPPED, REASON_NOT_ON_CIVITAI)
 
-    if not file_list:
-        return False
 
-    for file in file_list:
+def create_model_information(
+    entry, checkpoint, mfolder, vs_folder, register_shortcut, progress=gr.Progress()
+):
+    """
+    Create the model information of one file of a model information job.
+
+    Args:
+        entry: Job entry of the file; ``hash`` and ``path`` are checkpointed
+            once computed or moved, so a resumed job does not repeat them
+        checkpoint: Persists the entry
+        mfolder: Move the file to a folder for its model type
+        vs_folder: Create a folder per model version
+        register_shortcut: Register a shortcut for the model
+
+    Returns:
+        Job status of the file
+    """
+    file_path = entry['path']
+    if not os.path.isfile(file_path):
+        logger.warning(f"Model file not found: {file_path}")
+        entry['reason'] = REASON_MISSING
+        return scan_job.STATUS_SKIPPED
+
+    hash = entry.get('hash')
+    if not hash:
+        hash_index = get_model_hash_index()
+        hash = hash_index.get_cached_hash(file_path)
+        if not hash:
+            logger.debug(f"Generate SHA256: {file_path}")
+            hash = util.calculate_sha256(file_path)
+            hash_index.record_file_hash(file_path, hash)
+        entry['hash'] = hash
+        checkpoint()
+    version_info = civitai.get_version_info_by_hash(hash)
+
+    if not version_info:
+        # These models are not registered with Civitai.
+        entry['reason'] = REASON_NOT_ON_CIVITAI
+        return scan_job.STATUS_SKIPPED
+
+    vfolder, vfile = os.path.split(file_path)
+    basename, ext = os.path.splitext(vfile)
+
+    # 저장할 폴더 생성
+    if mfolder:
+        model_folder = util.make_download_model_folder(version_info, True, vs_folder)
+        # 다정하면 임의의 분류뒤에 모델폴더를 생성하고 그뒤에 버전까지 생성가능
+        # model_folder = make_download_model_folder(version_info, ms_folder=True, vs_folder=True, vs_foldername=None, cs_foldername=None):
+        # model_folder = util.make_version_folder(version_info, vs_folder)
+    else:
+        model_folder = vfolder
+
+    # version info file name 으로 교체시
+    # savefile_base = downloader.get_save_base_name(version_info)
+    # basename = savefile_base
+    # destination = os.path.join(model_folder, f"{basename}{ext}")
+
+    # save info
+    info_path = os.path.join(model_folder, f"{basename}{settings.INFO_SUFFIX}{settings.INFO_EXT}")
+    result = civitai.write_version_info(info_path, version_info)
+    if result:
+        logger.info(f"Wrote version info: {info_path}")
+
+    # save preview
+    if "images" in version_info.keys():
+        # Pick the first static image from version images
+        img_dict = None
+        for candidate in version_info["images"]:
+            if isinstance(candidate, dict) and ImageFormatFilter.is_static_image_dict(candidate):
+                img_dict = candidate
+                break
+        if img_dict:
+            img_url = img_dict.get("url")
+            if img_url:
+                if img_dict.get("width"):
+                    img_url = util.change_width_from_image_url(img_url, img_dict["width"])
+                description_img = os.path.join(
+                    model_folder,
+                    f"{basename}{settings.PREVIEW_IMAGE_SUFFIX}{settings.PREVIEW_IMAGE_EXT}",
+                )
+                download_scan_image(img_url, description_img)
+
+    # 파일 이동
+    if mfolder:
+        destination = os.path.join(model_folder, vfile)
+        if file_path != destination:
+            if not os.path.isfile(destination):
+                os.rename(file_path, destination)
+                entry['path'] = destination
+                checkpoint()
+            else:
+                logger.warning(f"The target file already exists: {destination}")
+
+    # 숏컷 추가
+    if register_shortcut:
+        if version_info['modelId']:
+            ishortcut.shortcutcollectionmanager.update_shortcut(version_info['modelId'], progress)
+            model.update_downloaded_model()
+
+    return scan_job.STATUS_COMPLETED
+
+
+class VersionInfoDirectoryIndex:
+    """Model file names covered by the version info files of each directory.
+
+    Every directory is listed once. Its info files are only parsed, once, when
+    a model file without a sibling info file is checked, so checking all model
+    files of a folder is linear in the number of files.
+    """
+
+    def __init__(self):
+        self._info_files = {}
+        self._listed = {}
+
+    def covers(self, directory, filename) -> bool:
+        """Check whether a model file has a sibling info file or is listed in another one."""
+        basename = os.path.splitext(filename)[0]
+        sibling = f"{basename}{settings.INFO_SUFFIX}{settings.INFO_EXT}"
+        if sibling in self._get_info_files(directory):
+            return True
+        return filename in self.listed_names(directory)
+
+    def listed_names(self, directory) -> set:
+        """Return the file names listed in the info files of a directory."""
+        listed = self._listed.get(directory)
+        if listed is None:
+            listed = self._listed[directory] = self._parse(
+                directory, self._get_info_files(directory)
+            )
+        return listed
+
+    def _get_info_files(self, directory) -> set:
+        info_files = self._info_files.get(directory)
+        if info_files is None:
+            info_files = self._info_files[directory] = self._list(directory)
+        return info_files
+
+    @staticmethod
+    def _list(directory) -> set:
+        suffix = f"{settings.INFO_SUFFIX}{settings.INFO_EXT}"
+        info_files = set()
         try:
-            with open(file, 'r') as f:
-                json_data = json.load(f)
-                if "files" in json_data.keys():
-                    files = json_data['files']
-                    for file in files:
-                        if file['name'] == filename:
-                            return True
-        except Exception:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(suffix) and entry.is_file():
+                        info_files.add(entry.name)
+        except OSError:
             pass
+        return info_files
+
+    @staticmethod
+    def _parse(directory, info_files) -> set:
+        listed = set()
+        for info_file in info_files:
+            json_data = get_json_store().read(os.path.join(directory, info_file))
+            if not isinstance(json_data, dict):
+                continue
+            for file in json_data.get('files') or ():
+                if isinstance(file, dict) and file.get('name'):
+                    listed.add(file['name'])
+        return listed
+
 
-    return False
+def is_filename_in_version_info_in_directory(directory, filename):
+    return filename in VersionInfoDirectoryIndex().listed_names(directory)
 
 
 def scan_models(fix_information_filename, progress=gr.Progress()):
     root_dirs = list(set(settings.model_folders.values()))
-    file_list = util.search_file(root_dirs, None, settings.MODEL_EXTS)
+    file_list = util.search_file(root_dirs, None, settings.MODEL_EXTS) or []
 
     result = list()
 
@@ -328,17 +581,13 @@ def scan_models(fix_information_filename, progress=gr.Progress()):
         # fix_version_information_filename()
         pass
 
+    info_index = VersionInfoDirectoryIndex()
     for file_path in progress.tqdm(file_list, desc="Scan Models for Civitai"):
 
         vfolder, vfile = os.path.split(file_path)
-        basename, ext = os.path.splitext(vfile)
-        info = os.path.join(vfolder, f"{basename}{settings.INFO_SUFFIX}{settings.INFO_EXT}")
-
-        if not os.path.isfile(info):
-            # result.append(file_path)
-            if not is_filename_in_version_info_in_directory(vfolder, vfile):
-                # logger.debug(f"{file_path} : {vfile}: no info")
-                result.append(file_path)
+        if not info_index.covers(vfolder, vfile):
+            # logger.debug(f"{file_path} : {vfile}: no info")
+            result.append(file_path)
 
     return result
 
@@ -373,20 +622,13 @@ def scan_models(fix_information_filename, progress=gr.Progress()):
 #             pass
 
 
-@with_error_handling(
-    fallback_value=(
-        gr.update(choices=[], value=[]),
-        gr.update(visible=False),
-        gr.update(visible=False),
-    ),
-    exception_types=(NetworkError, FileOperationError),
-    retry_count=1,
-    user_message="Failed to create model information",
-)
-def on_create_models_info_btn_click(
-    files, mfolder, vsfolder, register_shortcut, progress=gr.Progress()
-):
-    remain_files = create_models_information(files, mfolder, vsfolder, register_shortcut, progress)
+def get_models_information_updates(remain_files):
+    """Return the scan result and job status updates after a model information job."""
+    job = get_scan_job()
+    job_updates = (
+        gr.update(visible=job.has_unfinished() or job.get_status()['total'] > 0),
+        gr.update(value=scan_job.format_status(job.get_status())),
+    )
     if remain_files and len(remain_files) > 0:
         return (
             gr.update(
@@ -397,14 +639,75 @@ def on_create_models_info_btn_click(
             ),
             gr.update(visible=True),
             gr.update(visible=True),
-        )
+        ) + job_updates
     return (
         gr.update(choices=[], value=[], interactive=True),
         gr.update(visible=False),
         gr.update(visible=False),
+    ) + job_updates
+
+
+def get_scan_in_progress_updates():
+    """Return updates keeping the scan result while another model information job runs."""
+    message = "A model information job is already in progress."
+    gr.Warning(message)
+    return (
+        gr.update(),
+        gr.update(),
+        gr.update(),
+        gr.update(visible=True),
+        gr.update(value=f"{message} {scan_job.format_status(get_scan_job().get_status())}"),
     )
 
 
+@with_error_handling(
+    fallback_value=(
+        gr.update(choices=[], value=[]),
+        gr.update(visible=False),
+        gr.update(visible=False),
+        gr.update(visible=True),
+        gr.update(value="The model information job stopped; it can be resumed."),
+    ),
+    exception_types=(NetworkError, FileOperationError),
+    user_message="Failed to create model information",
+)
+def on_create_models_info_btn_click(
+    files, mfolder, vsfolder, register_shortcut, progress=gr.Progress()
+):
+    if get_scan_job().is_running:
+        return get_scan_in_progress_updates()
+    remain_files = create_models_information(files, mfolder, vsfolder, register_shortcut, progress)
+    return get_models_information_updates(remain_files)
+
+
+@with_error_handling(
+    fallback_value=(
+        gr.update(choices=[], value=[]),
+        gr.update(visible=False),
+        gr.update(visible=False),
+        gr.update(visible=True),
+        gr.update(value="The model information job stopped; it can be resumed."),
+    ),
+    exception_types=(NetworkError, FileOperationError),
+    user_message="Failed to resume model information",
+)
+def on_resume_scan_job_btn_click(progress=gr.Progress()):
+    if get_scan_job().is_running:
+        return get_scan_in_progress_updates()
+    remain_files = run_models_information_job(get_scan_job(), progress, retry_failed=True)
+    return get_models_information_updates(remain_files)
+
+
+def on_scan_job_started():
+    return gr.update(visible=True), gr.update(value="Running the model information job...")
+
+
+def on_cancel_scan_job_btn_click():
+    if get_scan_job().cancel():
+        return gr.update(value="Cancelling after the current file...")
+    return gr.update(value=scan_job.format_status(get_scan_job().get_status()))
+
+
 @with_error_handling(
     fallback_value=(
         gr.update(choices=[], value=[]),
@@ -434,7 +737,7 @@ def on_scan_models_btn_click(fix_information_filename, progress=gr.Progress()):
     user_message="Failed to scan shortcuts",
 )
 def on_scan_to_shortcut_click(progress=gr.Progress()):
-    model.update_downloaded_model()
+    model.refresh_downloaded_model()
     ishortcut_action.scan_downloadedmodel_to_shortcut(progress)
     repair_missing_preview_images(progress)
     return gr.update(visible=True)
@@ -509,6 +812,97 @@ def on_update_all_shortcuts_btn_click(progress=gr.Progress()):
     return gr.update(visible=True)
 
 
+@with_error_handling(
+    fallback_value=gr.update(value="Thumbnail update failed"),
+    exception_types=(NetworkError, FileOperationError),
+    retry_count=0,
+    user_message="Failed to update thumbnails",
+)
+def on_update_all_thumbnails_btn_click(progress=gr.Progress()):
+    manager = ShortcutThumbnailManager(
+        ishortcut.imageprocessor, ishortcut.shortcutcollectionmanager, ishortcut.modelprocessor
+    )
+    stats = manager.update_all_thumbnails(progress)
+    if not stats:
+        return gr.update(visible=True)
+    return gr.update(
+        value=(
+            f"Generated {stats.get('generated', 0)}, skipped {stats.get('skipped', 0)}, "
+            f"failed {stats.get('failed', 0)} and downloaded {stats.get('downloaded', 0)} "
+            f"thumbnails ({stats.get('per_second', 0.0):.1f} thumbnails/s)."
+        ),
+        visible=True,
+    )
+
+
+@with_error_handling(
+    fallback_value=gr.update(value="Image transcoding failed"),
+    exception_types=(FileOperationError,),
+    retry_count=0,
+    user_message="Failed to transcode cached images",
+)
+def on_transcode_images_btn_click(progress=gr.Progress()):
+    transcoder = get_image_transcoder()
+    if not transcoder.enabled:
+        return gr.update(
+            value="Image transcoding is disabled or the selected format is not supported.",
+            visible=True,
+        )
+
+    stats = transcoder.sweep(progress)
+    return gr.update(
+        value=(
+            f"Transcoded {stats['transcoded']} images to {transcoder.target_format}, "
+            f"skipped {stats['skipped']}, failed {stats['failed']}, "
+            f"saved {stats['saved_bytes'] / (1024 * 1024):.1f} MB."
+        ),
+        visible=True,
+    )
+
+
+@with_error_handling(
+    fallback_value=gr.update(value="Image store cleanup failed"),
+    exception_types=(FileOperationError,),
+    retry_count=0,
+    user_message="Failed to clean up the image store",
+)
+def on_prune_image_store_btn_click():
+    removed = get_image_store().prune_orphans()
+    return gr.update(
+        value=f"Removed {removed} image store entries that are no longer used.",
+        visible=True,
+    )
+
+
+@with_error_handling(
+    fallback_value=gr.update(value="Model information conversion failed"),
+    exception_types=(FileOperationError,),
+    retry_count=0,
+    user_message="Failed to convert model information files",
+)
+def on_convert_model_infos_btn_click(progress=gr.Progress()):
+    benchmark = model_info_format.benchmark_model_info_files()
+    compress = model_info_format.is_compression_enabled()
+    stats = model_info_format.convert_model_info_files(compress, progress=progress)
+
+    target = "compressed JSON" if compress else "plain JSON"
+    lines = [
+        f"Converted {stats['converted']} model information files to {target}, "
+        f"skipped {stats['skipped']}, failed {stats['failed']} "
+        f"({stats['bytes_before'] / (1024 * 1024):.1f} MB -> "
+        f"{stats['bytes_after'] / (1024 * 1024):.1f} MB)."
+    ]
+    if benchmark['files']:
+        lines.append(
+            f"Sample of {benchmark['files']} files: plain JSON "
+            f"{benchmark['json_bytes'] / 1024:.0f} KB parsed in "
+            f"{benchmark['json_parse_seconds'] * 1000:.1f} ms, compressed "
+            f"{benchmark['compressed_bytes'] / 1024:.0f} KB parsed in "
+            f"{benchmark['compressed_parse_seconds'] * 1000:.1f} ms."
+        )
+    return gr.update(value="\n\n".join(lines), visible=True)
+
+
 def on_scan_save_modelfolder_change(scan_save_modelfolder):
     if scan_save_modelfolder:
         return gr.update(interactive=True)
@@ -516,7 +910,7 @@ def on_scan_save_modelfolder_change(scan_save_modelfolder):
 
 
 def on_update_lora_meta_for_downloaded_model_btn_click(progress=gr.Progress()):
-    model.update_downloaded_model()
+    model.refresh_downloaded_model()
     update_lora_meta(progress)
     return gr.update(visible=True)
 
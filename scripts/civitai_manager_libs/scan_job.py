@@ -0,0 +1,301 @@
+"""
+Persistent, resumable job for "Create Model Information".
+
+Creating model information hashes every selected file, looks it up on
+Civitai, writes the information and preview, and optionally moves the file
+and registers a shortcut. ``ScanJob``:
+
+- Stores the file list, the options and the state of every file in
+  ``shortcut_scan_job``, rewritten atomically after each step
+- Records each file's SHA256 as soon as it is computed, so a resumed job does
+  not hash it again even if the file was moved meanwhile
+- Continues with the remaining files after a crash, a restart or a
+  cancellation, optionally retrying the failed ones
+- Counts completed, skipped and failed files
+
+Only one job is kept; starting a new job replaces a finished or abandoned one.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from . import settings
+from .json_store import get_json_store
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+JOB_FORMAT_VERSION = 1
+
+STATUS_PENDING = 'pending'
+STATUS_COMPLETED = 'completed'
+STATUS_SKIPPED = 'skipped'
+STATUS_FAILED = 'failed'
+
+
+class ScanJob:
+    """Runs a per-file processing function over a checkpointed file list."""
+
+    def __init__(self, job_file: Optional[str] = None):
+        self._job_file = job_file
+        self._lock = threading.RLock()
+        self._cancel = threading.Event()
+        self._state = None
+        self._running = False
+
+    @property
+    def job_file(self) -> str:
+        """Return the file persisting the job."""
+        return self._job_file or settings.shortcut_scan_job
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def create(self, files: Iterable[str], options: Optional[Dict] = None) -> None:
+        """
+        Start a new job, replacing the previous one.
+
+        Args:
+            files: Model files to process, in order; duplicates are dropped
+            options: JSON-serializable options passed back by get_options()
+
+        Raises:
+            RuntimeError: If a job is running
+        """
+        entries = []
+        seen = set()
+        for file_path in files or ():
+            if file_path and file_path not in seen:
+                seen.add(file_path)
+                entries.append({'path': file_path, 'status': STATUS_PENDING})
+
+        with self._lock:
+            if self._running:
+                raise RuntimeError("A scan job is already running")
+            self._state = {
+                'version': JOB_FORMAT_VERSION,
+                'created': time.time(),
+                'options': dict(options or {}),
+                'files': entries,
+                'finished': False,
+            }
+            self._save()
+
+    def has_unfinished(self) -> bool:
+        """Return True if a job stopped before processing every file, or some files failed."""
+        with self._lock:
+            state = self._load()
+            if not state or self._running:
+                return False
+            return not state.get('finished') or any(
+                entry['status'] == STATUS_FAILED for entry in state['files']
+            )
+
+    def get_options(self) -> Dict:
+        """Return the options the job was created with."""
+        with self._lock:
+            return dict((self._load() or {}).get('options') or {})
+
+    def get_files(self, status: Optional[str] = None, reason: Optional[str] = None) -> List[str]:
+        """
+        Return the files of the job.
+
+        Args:
+            status: Only files in this state; all files if omitted
+            reason: Only files skipped or failed for this reason
+
+        Returns:
+            File paths, updated for files moved while processing
+        """
+        with self._lock:
+            return [
+                entry['path']
+                for entry in (self._load() or {}).get('files', ())
+                if (status is None or entry['status'] == status)
+                and (reason is None or entry.get('reason') == reason)
+            ]
+
+    def get_status(self) -> Dict:
+        """
+        Return the progress of the job.
+
+        Returns:
+            Dict with ``total``, ``completed``, ``skipped``, ``failed`` and
+            ``pending`` counts, and ``running`` and ``finished`` flags
+        """
+        with self._lock:
+            state = self._load() or {}
+            status = {
+                'total': 0,
+                STATUS_COMPLETED: 0,
+                STATUS_SKIPPED: 0,
+                STATUS_FAILED: 0,
+                STATUS_PENDING: 0,
+            }
+            for entry in state.get('files', ()):
+                status['total'] += 1
+                status[entry['status']] = status.get(entry['status'], 0) + 1
+            status['running'] = self._running
+            status['finished'] = bool(state.get('finished'))
+            return status
+
+    def run(
+        self,
+        process: Callable[[Dict, Callable[[], None]], str],
+        progress=None,
+        retry_failed: bool = False,
+    ) -> Dict:
+        """
+        Process the pending files of the job.
+
+        ``process`` receives the file's entry and a ``checkpoint`` callable.
+        It may store ``hash``, ``path`` (after moving the file) and
+        ``reason`` in the entry and call ``checkpoint()`` to persist them
+        before a later step. It returns the file's new status; an exception
+        marks the file as failed.
+
+        Args:
+            process: Function processing one file
+            progress: Optional Gradio progress with ``tqdm``
+            retry_failed: Process the files that failed in an earlier run again
+
+        Returns:
+            get_status() after the run
+        """
+        with self._lock:
+            if self._running:
+                logger.warning("[ScanJob] A scan job is already running")
+                return self.get_status()
+            state = self._load()
+            if not state:
+                return self.get_status()
+            self._running = True
+            self._cancel.clear()
+            if retry_failed:
+                for entry in state['files']:
+                    if entry['status'] == STATUS_FAILED:
+                        entry['status'] = STATUS_PENDING
+                        entry.pop('reason', None)
+            pending = [entry for entry in state['files'] if entry['status'] == STATUS_PENDING]
+
+        logger.info(f"[ScanJob] Processing {len(pending)} of {len(state['files'])} files")
+        try:
+            items = pending
+            if progress is not None:
+                items = progress.tqdm(pending, desc="Create Models Information")
+            for entry in items:
+                if self._cancel.is_set():
+                    logger.info("[ScanJob] Cancelled; the remaining files can be resumed")
+                    break
+                try:
+                    result = process(entry, self.checkpoint)
+                except Exception as e:
+                    logger.error(f"[ScanJob] Failed to process {entry['path']}: {e}")
+                    result = STATUS_FAILED
+                    entry['reason'] = str(e)
+                with self._lock:
+                    entry['status'] = result or STATUS_COMPLETED
+                    self._save()
+            else:
+                with self._lock:
+                    state['finished'] = not any(
+                        entry['status'] == STATUS_PENDING for entry in state['files']
+                    )
+                    self._save()
+        finally:
+            with self._lock:
+                self._running = False
+
+        status = self.get_status()
+        logger.info(
+            f"[ScanJob] {status[STATUS_COMPLETED]} completed, {status[STATUS_SKIPPED]} skipped, "
+            f"{status[STATUS_FAILED]} failed, {status[STATUS_PENDING]} remaining"
+        )
+        return status
+
+    def checkpoint(self) -> None:
+        """Persist the entries changed by the running process function."""
+        with self._lock:
+            self._save()
+
+    def cancel(self) -> bool:
+        """
+        Stop the running job after the current file.
+
+        Returns:
+            True if a job was running
+        """
+        if not self._running:
+            return False
+        self._cancel.set()
+        return True
+
+    def discard(self) -> None:
+        """Forget the job and delete its file."""
+        with self._lock:
+            if self._running:
+                raise RuntimeError("A scan job is running")
+            self._state = {}
+            try:
+                os.remove(self.job_file)
+            except FileNotFoundError:
+                pass
+            get_json_store().invalidate(self.job_file)
+
+    def _load(self) -> Dict:
+        if self._state is None:
+            self._state = {}
+            try:
+                stored = get_json_store().load(self.job_file)
+                if isinstance(stored, dict) and stored.get('version') == JOB_FORMAT_VERSION:
+                    # Copied: documents from the store are shared and read-only
+                    self._state = dict(stored)
+                    self._state['files'] = [dict(entry) for entry in stored.get('files', ())]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"[ScanJob] Failed to read {self.job_file}: {e}")
+        return self._state
+
+    def _save(self) -> None:
+        try:
+            parent = os.path.dirname(self.job_file)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            self._state['updated'] = time.time()
+            get_json_store().write(self.job_file, self._state, compact=True)
+        except Exception as e:
+            logger.error(f"[ScanJob] Failed to write {self.job_file}: {e}")
+
+
+def format_status(status: Dict) -> str:
+    """Describe get_status() for the UI."""
+    if not status.get('total'):
+        return "No model information job."
+    text = (
+        f"{status[STATUS_COMPLETED]} completed, {status[STATUS_SKIPPED]} skipped, "
+        f"{status[STATUS_FAILED]} failed of {status['total']} files"
+    )
+    if status.get('running'):
+        return f"Running: {text}, {status[STATUS_PENDING]} remaining."
+    if status[STATUS_PENDING]:
+        return f"Interrupted: {text}, {status[STATUS_PENDING]} remaining."
+    return f"Finished: {text}."
+
+
+_global_scan_job = None
+_scan_job_lock = threading.Lock()
+
+
+def get_scan_job() -> ScanJob:
+    """Get or create the global model information job."""
+    global _global_scan_job
+
+    if _global_scan_job is None:
+        with _scan_job_lock:
+            if _global_scan_job is None:
+                _global_scan_job = ScanJob()
+    return _global_scan_job
@@ -17,6 +17,10 @@ from .path_manager import (
     get_model_folders,
     get_image_url_to_shortcut_file,
     get_image_url_to_gallery_file,
+    get_shortcut_thumbnail_file,
+    resolve_image_variant,
+    discard_image_variants,
+    is_image_transcoding_enabled,
     get_no_card_preview_image,
     get_nsfw_disable_image,
     shortcut,
@@ -24,10 +28,17 @@ from .path_manager import (
     shortcut_classification,
     shortcut_civitai_internet_shortcut_url,
     shortcut_recipe,
+    shortcut_hydration_queue,
+    shortcut_scan_job,
+    shortcut_model_index,
+    shortcut_summary_index,
+    model_hash_cache,
+    shortcut_database,
     shortcut_thumbnail_folder,
     shortcut_recipe_folder,
     shortcut_info_folder,
     shortcut_gallery_folder,
+    shortcut_image_store_folder,
     extension_base,
     root_path,
     model_folders,
@@ -140,6 +151,10 @@ __all__ = [
     "get_model_folders",
     "get_image_url_to_shortcut_file",
     "get_image_url_to_gallery_file",
+    "get_shortcut_thumbnail_file",
+    "resolve_image_variant",
+    "discard_image_variants",
+    "is_image_transcoding_enabled",
     "get_no_card_preview_image",
     "get_nsfw_disable_image",
     "shortcut",
@@ -147,10 +162,17 @@ __all__ = [
     "shortcut_classification",
     "shortcut_civitai_internet_shortcut_url",
     "shortcut_recipe",
+    "shortcut_hydration_queue",
+    "shortcut_scan_job",
+    "shortcut_model_index",
+    "shortcut_summary_index",
+    "model_hash_cache",
+    "shortcut_database",
     "shortcut_thumbnail_folder",
     "shortcut_recipe_folder",
     "shortcut_info_folder",
     "shortcut_gallery_folder",
+    "shortcut_image_store_folder",
     "extension_base",
     "root_path",
     "model_folders",
@@ -22,6 +22,8 @@ TRIGER_EXT = ".txt"
 TRIGER_SUFFIX = ".triger"
 PREVIEW_IMAGE_EXT = ".png"
 PREVIEW_IMAGE_SUFFIX = ".preview"
+# Extensions cached images may carry after background transcoding
+TRANSCODED_IMAGE_EXTS = (".webp", ".avif", ".jpg")
 
 # NSFW levels
 NSFW_LEVELS = ("None", "Soft", "Mature", "X", "XX")
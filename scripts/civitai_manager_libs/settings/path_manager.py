@@ -6,7 +6,12 @@ import shutil
 from ..compat.compat_layer import CompatibilityLayer
 from ..conditional_imports import import_manager
 from ..logging_config import get_logger
-from .constants import SC_DATA_ROOT, DEFAULT_MODEL_FOLDERS, PREVIEW_IMAGE_EXT
+from .constants import (
+    SC_DATA_ROOT,
+    DEFAULT_MODEL_FOLDERS,
+    PREVIEW_IMAGE_EXT,
+    TRANSCODED_IMAGE_EXTS,
+)
 
 logger = get_logger(__name__)
 
@@ -21,11 +26,18 @@ shortcut_setting = ""
 shortcut_classification = ""
 shortcut_civitai_internet_shortcut_url = ""
 shortcut_recipe = ""
+shortcut_hydration_queue = ""
+shortcut_scan_job = ""
+shortcut_model_index = ""
+shortcut_summary_index = ""
+model_hash_cache = ""
+shortcut_database = ""
 
 shortcut_thumbnail_folder = ""
 shortcut_recipe_folder = ""
 shortcut_info_folder = ""
 shortcut_gallery_folder = ""
+shortcut_image_store_folder = ""
 
 
 def get_extension_base():
@@ -43,9 +55,15 @@ def set_extension_base(path):
 def _update_data_paths():
     """Update all data file paths based on current extension_base."""
     global shortcut, shortcut_setting, shortcut_classification
-    global shortcut_civitai_internet_shortcut_url, shortcut_recipe
+    global shortcut_civitai_internet_shortcut_url, shortcut_recipe, shortcut_hydration_queue
+    global shortcut_scan_job
+    global shortcut_model_index
+    global shortcut_summary_index
+    global model_hash_cache
+    global shortcut_database
     global shortcut_thumbnail_folder, shortcut_recipe_folder
     global shortcut_info_folder, shortcut_gallery_folder
+    global shortcut_image_store_folder
 
     if not extension_base:
         logger.warning("Extension base not set, using relative paths")
@@ -61,11 +79,18 @@ def _update_data_paths():
         data_root, "CivitaiShortCutBackupUrl.json"
     )
     shortcut_recipe = os.path.join(data_root, "CivitaiShortCutRecipeCollection.json")
+    shortcut_hydration_queue = os.path.join(data_root, "CivitaiShortCutHydration.json")
+    shortcut_scan_job = os.path.join(data_root, "CivitaiShortCutScanJob.json")
+    shortcut_model_index = os.path.join(data_root, "CivitaiShortCutModelIndex.json")
+    shortcut_summary_index = os.path.join(data_root, "CivitaiShortCutSummary.json")
+    model_hash_cache = os.path.join(data_root, "CivitaiShortCutHashCache.json")
+    shortcut_database = os.path.join(data_root, "CivitaiShortCut.sqlite3")
 
     shortcut_thumbnail_folder = os.path.join(data_root, "sc_thumb_images")
     shortcut_recipe_folder = os.path.join(data_root, "sc_recipes")
     shortcut_info_folder = os.path.join(data_root, "sc_infos")
     shortcut_gallery_folder = os.path.join(data_root, "sc_gallery")
+    shortcut_image_store_folder = os.path.join(data_root, "sc_image_store")
 
     logger.debug(f"Updated data paths with extension_base: {extension_base}")
     logger.debug(f"Shortcut file path: {shortcut}")
@@ -230,13 +255,73 @@ def get_model_folders():
     return list(model_folders.values())
 
 
+def is_image_transcoding_enabled():
+    """Returns True when cached images are transcoded in the background."""
+    from .. import settings
+
+    fmt = str(settings.image_transcode_format or '').strip().lower()
+    return fmt in ('webp', 'avif')
+
+
+def resolve_image_variant(image_path):
+    """
+    Returns the transcoded variant of a cached image if one exists.
+
+    Variants are preferred only while transcoding is enabled. Otherwise they are
+    looked up only when the original is gone, so previously transcoded images
+    stay visible without extra lookups for every other image.
+    """
+    if not image_path:
+        return image_path
+    root, ext = os.path.splitext(image_path)
+    if ext.lower() in TRANSCODED_IMAGE_EXTS:
+        return image_path
+    if not is_image_transcoding_enabled() and os.path.isfile(image_path):
+        return image_path
+    for variant_ext in TRANSCODED_IMAGE_EXTS:
+        variant = f"{root}{variant_ext}"
+        if os.path.isfile(variant):
+            return variant
+    return image_path
+
+
+def discard_image_variants(image_path):
+    """
+    Removes transcoded variants of an image whose original was just written.
+
+    Without this a stale variant would hide the new original.
+    """
+    if not image_path:
+        return
+    root, _ = os.path.splitext(image_path)
+    for variant_ext in TRANSCODED_IMAGE_EXTS:
+        variant = f"{root}{variant_ext}"
+        if variant == image_path:
+            continue
+        try:
+            os.remove(variant)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Could not remove stale image variant {variant}: {e}")
+
+
+def get_shortcut_thumbnail_file(modelid):
+    """Generates the local file path for a shortcut thumbnail."""
+    return resolve_image_variant(
+        os.path.join(shortcut_thumbnail_folder, f"{modelid}{PREVIEW_IMAGE_EXT}")
+    )
+
+
 def get_image_url_to_shortcut_file(modelid, versionid, image_url):
     """Generates the local file path for a shortcut image from a URL."""
     if image_url:
         version_image_prefix = f"{versionid}-"
         model_path = os.path.join(shortcut_info_folder, str(modelid))
         image_id, _ = os.path.splitext(os.path.basename(image_url))
-        return os.path.join(model_path, f"{version_image_prefix}{image_id}{PREVIEW_IMAGE_EXT}")
+        return resolve_image_variant(
+            os.path.join(model_path, f"{version_image_prefix}{image_id}{PREVIEW_IMAGE_EXT}")
+        )
     return None
 
 
@@ -244,7 +329,9 @@ def get_image_url_to_gallery_file(image_url):
     """Generates the local file path for a gallery image from a URL."""
     if image_url:
         image_id, _ = os.path.splitext(os.path.basename(image_url))
-        return os.path.join(shortcut_gallery_folder, f"{image_id}{PREVIEW_IMAGE_EXT}")
+        return resolve_image_variant(
+            os.path.join(shortcut_gallery_folder, f"{image_id}{PREVIEW_IMAGE_EXT}")
+        )
     return None
 
 
@@ -30,6 +30,7 @@ class SettingCategories:
         'shortcut_browser_screen_split_ratio': 'integer',
         'shortcut_browser_screen_split_ratio_max': 'integer',
         'shortcut_browser_search_up': 'boolean',
+        'shortcut_browser_sort': 'string',
         'gallery_thumbnail_image_style': 'string',
     }
 
@@ -51,6 +52,9 @@ class SettingCategories:
         'gallery_download_batch_size': 'integer',
         'gallery_download_timeout': 'integer',
         'gallery_max_concurrent_downloads': 'integer',
+        'image_store_enabled': 'boolean',
+        'image_transcode_format': 'string',
+        'image_transcode_quality': 'integer',
     }
 
     # API related settings
@@ -80,6 +84,13 @@ class SettingCategories:
     # Application related settings
     APPLICATION_SETTINGS = {
         'shortcut_update_when_start': 'boolean',
+        'shortcut_lazy_image_hydration': 'boolean',
+        'shortcut_storage_backend': 'string',
+        'shortcut_storage_journal': 'boolean',
+        'shortcut_info_compression': 'boolean',
+        'shortcut_compact_json': 'boolean',
+        'shortcut_watch_model_folders': 'boolean',
+        'shortcut_search_fuzzy': 'boolean',
         'usergallery_preloading': 'boolean',
     }
 
@@ -111,6 +122,7 @@ class SettingCategories:
             'shortcut_browser_screen_split_ratio': 3,
             'shortcut_browser_screen_split_ratio_max': 10,
             'shortcut_browser_search_up': False,
+            'shortcut_browser_sort': "name",
             'gallery_thumbnail_image_style': "scale-down",
         },
         'download': {
@@ -130,6 +142,9 @@ class SettingCategories:
             'gallery_download_batch_size': 5,
             'gallery_download_timeout': 30,
             'gallery_max_concurrent_downloads': 3,
+            'image_store_enabled': False,
+            'image_transcode_format': "none",
+            'image_transcode_quality': 80,
         },
         'api': {
             'civitai_api_key': "",
@@ -153,6 +168,13 @@ class SettingCategories:
         },
         'application': {
             'shortcut_update_when_start': True,
+            'shortcut_lazy_image_hydration': False,
+            'shortcut_storage_backend': "json",
+            'shortcut_storage_journal': False,
+            'shortcut_info_compression': False,
+            'shortcut_compact_json': False,
+            'shortcut_watch_model_folders': False,
+            'shortcut_search_fuzzy': False,
             'usergallery_preloading': False,
         },
         'nsfw_filter': {
@@ -1,6 +1,5 @@
 import re
 import os
-import json
 import hashlib
 import platform
 import subprocess
@@ -10,6 +9,8 @@ from . import settings
 
 import logging
 from .logging_config import get_logger
+from .file_walker import get_file_walker
+from .json_store import get_json_store
 
 # Module logger for standardized debug output (deprecated printD wrapper)
 logger = get_logger(__name__)
@@ -299,19 +300,12 @@ def get_search_keyword(search: str):
 
 
 def read_json(path) -> dict:
-    contents = None
-    if not path:
-        return None
-    try:
-        with open(path, 'r') as f:
-            contents = json.load(f)
-    except Exception:
-        return None
-
-    return contents
+    """Read a JSON file through the shared cache; the result must not be modified."""
+    return get_json_store().read(path)
 
 
 def write_json(contents, path):
+    """Atomically write non-empty JSON contents, ignoring errors."""
     if not path:
         return
 
@@ -319,8 +313,7 @@ def write_json(contents, path):
         return
 
     try:
-        with open(path, 'w') as f:
-            f.write(json.dumps(contents, indent=4))
+        get_json_store().write(path, contents)
     except Exception:
         return
 
@@ -510,27 +503,13 @@ def get_model_id_from_url(url):
     return ""
 
 
-def search_file(root_dirs: list, base: list, exts: list) -> list:
-    file_list = list()
-    root_path = os.getcwd()
-
-    for root_dir in root_dirs:
-        for root, dirs, files in os.walk(os.path.join(root_path, root_dir)):
-            if len(files) > 0:
-                for file_name in files:
-                    b, e = os.path.splitext(file_name)
-                    if base and exts:
-                        if e in exts and b in base:
-                            file_list.append(os.path.join(root, file_name))
-                    elif base:
-                        if b in base:
-                            file_list.append(os.path.join(root, file_name))
-                    elif exts:
-                        if e in exts:
-                            file_list.append(os.path.join(root, file_name))
-                    else:
-                        file_list.append(os.path.join(root, file_name))
+def iter_files(root_dirs: list, base: list = None, exts: list = None, exclude: list = None):
+    """Lazily yield the files below root_dirs matching base names and extensions."""
+    return get_file_walker().walk(root_dirs, exts=exts, bases=base, exclude=exclude)
 
+
+def search_file(root_dirs: list, base: list, exts: list) -> list:
+    file_list = list(iter_files(root_dirs, base, exts))
     return file_list if len(file_list) > 0 else None
 
 
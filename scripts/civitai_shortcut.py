@@ -13,6 +13,7 @@ except ImportError:
 
 from scripts.civitai_manager_libs import model
 from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs import model_watcher
 from scripts.civitai_manager_libs import classification_action
 from scripts.civitai_manager_libs import civitai_shortcut_action
 from scripts.civitai_manager_libs import setting_action
@@ -216,6 +217,12 @@ def init_civitai_shortcut():
     if settings.shortcut_update_when_start:
         update_all_shortcut_informations_thread()
 
+    # Resume downloading images deferred at registration
+    ishortcut.get_image_hydrator().start_idle_filler()
+
+    if model_watcher.is_watcher_enabled():
+        model_watcher.get_model_watcher().start()
+
 
 def on_ui_tabs():
     # init
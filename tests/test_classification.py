@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from scripts.civitai_manager_libs import classification, settings
+
+
+@pytest.fixture
+def classification_file(tmp_path, monkeypatch):
+    path = tmp_path / 'classification.json'
+    path.write_text(
+        json.dumps(
+            {
+                'anime': {'info': 'Anime', 'shortcuts': ['1', '2']},
+                'style': {'info': None, 'shortcuts': ['2']},
+            }
+        )
+    )
+    monkeypatch.setattr(settings, 'shortcut_classification', str(path))
+    monkeypatch.setattr(classification, '_store', classification.ClassificationStore())
+    return path
+
+
+def test_names_by_modelid_use_reverse_index(classification_file):
+    assert classification.get_classification_names_by_modelid('2') == ['anime', 'style']
+    assert classification.get_classification_names_by_modelid(1) == ['anime']
+    assert classification.get_classification_names_by_modelid('3') == []
+
+
+def test_changes_are_written_and_reindexed(classification_file):
+    assert classification.clean_classification_shortcut('2')
+    assert classification.add_classification_shortcut('style', '3')
+    assert classification.get_classification_names_by_modelid('3') == ['style']
+
+    data = json.loads(classification_file.read_text())
+    assert data['anime']['shortcuts'] == ['1']
+    assert data['style']['shortcuts'] == ['3']
+
+
+def test_file_changes_are_reloaded(classification_file):
+    assert classification.get_list() == ['anime', 'style']
+    classification_file.write_text(json.dumps({'new': {'info': None, 'shortcuts': ['1', '5']}}))
+    assert classification.get_list() == ['new']
+    assert classification.get_classification_names_by_modelid('5') == ['new']
+
+
+def test_batch_writes_once(classification_file, monkeypatch):
+    writes = []
+    store = classification._store
+    original = store._write
+    monkeypatch.setattr(store, '_write', lambda: writes.append(1) or original())
+
+    with classification.batch():
+        classification.clean_classification_shortcut('1')
+        classification.add_classification_shortcut('style', '1')
+        assert classification.get_classification_shortcuts('style') == ['2', '1']
+    assert len(writes) == 1
+    assert json.loads(classification_file.read_text())['style']['shortcuts'] == ['2', '1']
@@ -0,0 +1,241 @@
+import json
+import threading
+
+import pytest
+
+from scripts.civitai_manager_libs import classification, document_store, recipe, settings
+from scripts.civitai_manager_libs.document_store import SQLiteStorage
+from scripts.civitai_manager_libs.exceptions import StorageConflictError
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / 'store.sqlite3'))
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path, monkeypatch):
+    for collection, attr in document_store._COLLECTION_FILES.items():
+        monkeypatch.setattr(settings, attr, str(tmp_path / f'{collection}.json'))
+    monkeypatch.setattr(settings, 'shortcut_database', str(tmp_path / 'store.sqlite3'))
+    monkeypatch.setattr(settings, 'shortcut_storage_backend', 'sqlite', raising=False)
+    monkeypatch.setattr(document_store, '_storages', {})
+    monkeypatch.setattr(document_store, '_opened_backends', {})
+    return tmp_path
+
+
+def test_write_only_touches_changed_entries(storage):
+    data = {str(i): {'name': f'model {i}'} for i in range(100)}
+    assert storage.write('shortcuts', data) == 100
+    assert storage.write('shortcuts', data) == 0
+
+    data['5'] = {'name': 'renamed'}
+    del data['0']
+    assert storage.write('shortcuts', data) == 2
+    assert storage.read('shortcuts') == data
+    assert storage.get('shortcuts', 5) == {'name': 'renamed'}
+
+
+def test_write_keeps_key_order(storage):
+    storage.write('recipes', {'a': 1, 'b': 2, 'c': 3})
+    assert storage.write('recipes', {'a': 1, 'x': 0, 'b': 2, 'c': 3}) == 1
+    assert list(storage.read('recipes')) == ['a', 'x', 'b', 'c']
+
+    storage.write('recipes', {'c': 3, 'a': 1, 'x': 0, 'b': 2})
+    assert list(storage.read('recipes')) == ['c', 'a', 'x', 'b']
+
+
+def test_update_and_version(storage):
+    assert storage.version('url_backup') is None
+    storage.update('url_backup', {'url=a': 'A'})
+    storage.update('url_backup', {'url=b': 'B', 'url=a': 'A2'}, removed=['missing'])
+    assert storage.read('url_backup') == {'url=a': 'A2', 'url=b': 'B'}
+    assert storage.version('url_backup') == 2
+
+
+def test_concurrent_reader_sees_committed_data(storage):
+    storage.write('shortcuts', {'1': {'name': 'one'}})
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(storage.read('shortcuts')))
+    reader.start()
+    reader.join()
+    assert seen == [{'1': {'name': 'one'}}]
+    assert storage.connection().execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+def test_migrate_and_export(storage, tmp_path):
+    source = tmp_path / 'shortcuts.json'
+    source.write_text(json.dumps({'2': {'name': 'two'}, '1': {'name': 'one'}}))
+    assert storage.migrate('shortcuts', str(source))
+    assert not storage.migrate('shortcuts', str(source))
+    assert list(storage.read('shortcuts')) == ['2', '1']
+
+    storage.update('shortcuts', {'3': {'name': 'three'}})
+    target = tmp_path / 'export.json'
+    assert storage.export('shortcuts', str(target)) == 3
+    assert json.loads(target.read_text()) == storage.read('shortcuts')
+
+
+def test_stores_use_sqlite_backend(sqlite_backend, monkeypatch):
+    (sqlite_backend / 'classifications.json').write_text(
+        json.dumps({'anime': {'info': None, 'shortcuts': ['1']}})
+    )
+    monkeypatch.setattr(classification, '_store', classification.ClassificationStore())
+    monkeypatch.setattr(recipe, '_store', recipe.RecipeStore())
+
+    assert classification.get_classification_shortcuts('anime') == ['1']
+    classification.add_classification_shortcut('anime', '2')
+    recipe.create_recipe('portrait', 'desc', classification='anime')
+
+    storage = document_store.get_sqlite_storage()
+    assert storage.read('classifications')['anime']['shortcuts'] == ['1', '2']
+    assert 'portrait' in storage.read('recipes')
+    assert not (sqlite_backend / 'recipes.json').exists()
+
+    exported = document_store.export_to_json()
+    assert exported == {'classifications': 1, 'recipes': 1}
+    assert 'portrait' in json.loads((sqlite_backend / 'recipes.json').read_text())
+    storage.close()
+
+
+def test_switching_backends_carries_the_changes_over(sqlite_backend, monkeypatch):
+    (sqlite_backend / 'recipes.json').write_text(json.dumps({'old': {'note': 'json'}}))
+    document_store.get_document('recipes').update({'new': {'note': 'sqlite'}})
+
+    monkeypatch.setattr(settings, 'shortcut_storage_backend', 'json')
+    document = document_store.get_document('recipes')
+    assert set(document.read()) == {'old', 'new'}
+    document.update({'edited': {'note': 'json'}}, removed=['old'])
+
+    monkeypatch.setattr(settings, 'shortcut_storage_backend', 'sqlite')
+    assert set(document_store.get_document('recipes').read()) == {'new', 'edited'}
+
+    # Nothing changed since the last sync: the file is left alone
+    stamp = document_store.JsonDocument('recipes').stamp()
+    monkeypatch.setattr(settings, 'shortcut_storage_backend', 'json')
+    document_store.get_document('recipes')
+    assert document_store.JsonDocument('recipes').stamp() == stamp
+    document_store.get_sqlite_storage().close()
+
+
+@pytest.fixture
+def journal_backend(tmp_path, monkeypatch):
+    for collection, attr in document_store._COLLECTION_FILES.items():
+        monkeypatch.setattr(settings, attr, str(tmp_path / f'{collection}.json'))
+    monkeypatch.setattr(settings, 'shortcut_storage_backend', 'json', raising=False)
+    monkeypatch.setattr(settings, 'shortcut_storage_journal', True, raising=False)
+    monkeypatch.setattr(document_store, '_journals', {})
+    return tmp_path
+
+
+def test_journal_appends_changes(journal_backend):
+    snapshot = journal_backend / 'shortcuts.json'
+    snapshot.write_text(json.dumps({'1': {'name': 'one'}, '2': {'name': 'two'}}))
+    document = document_store.get_document(document_store.SHORTCUTS)
+
+    data = document.read()
+    data['1']['note'] = 'hello'
+    del data['2']
+    document.write(data)
+
+    journal = journal_backend / 'shortcuts.json.journal'
+    assert len(journal.read_text().splitlines()) == 2
+    assert json.loads(snapshot.read_text())['1'] == {'name': 'one'}
+
+    document_store._journals.clear()
+    assert document_store.get_document(document_store.SHORTCUTS).read() == {
+        '1': {'name': 'one', 'note': 'hello'}
+    }
+
+
+def test_journal_drops_torn_record(journal_backend):
+    document = document_store.get_document(document_store.URL_BACKUP)
+    document.update({'url=a': 'A'})
+    journal = journal_backend / 'url_backup.json.journal'
+    with open(journal, 'a') as f:
+        f.write('{"op":"set","key":"url=b","val')
+
+    document_store._journals.clear()
+    assert document.read() == {'url=a': 'A'}
+    # Only writers holding the collection lock cut the torn record off
+    assert journal.read_text().endswith('"val')
+    document.update({'url=c': 'C'})
+    assert journal.read_text().endswith('\n')
+    document_store._journals.clear()
+    assert document.read() == {'url=a': 'A', 'url=c': 'C'}
+
+
+def test_journal_compaction(journal_backend):
+    path = str(journal_backend / 'shortcuts.json')
+    journal = document_store.JsonJournal(path, compact_bytes=10**9)
+    journal.write({'1': 'one', '2': 'two'})
+    journal.write({'1': 'uno', '2': 'two', '3': 'three'})
+    records = open(journal.journal_path).read()
+
+    journal.compact()
+    assert not journal.has_journal()
+    assert json.loads(open(path).read()) == {'1': 'uno', '2': 'two', '3': 'three'}
+
+    # A crash after the snapshot was replaced leaves the old journal behind
+    with open(journal.journal_path, 'w') as f:
+        f.write(records)
+    assert document_store.JsonJournal(path).read() == {'1': 'uno', '2': 'two', '3': 'three'}
+
+
+def test_journal_compaction_waits_for_collection_lock(journal_backend):
+    path = str(journal_backend / 'shortcuts.json')
+    journal = document_store.JsonJournal(path, compact_bytes=10**9)
+    journal.write({'1': 'one'})
+
+    with document_store.get_lock(document_store.SHORTCUTS):
+        journal.compact(wait=False)
+        journal._compactor.join(0.2)
+        assert journal._compactor.is_alive()
+        # Stands in for an append by another process while the lock is held
+        with open(journal.journal_path, 'a') as f:
+            f.write('{"op":"set","key":"2","value":"two"}\n')
+    journal._compactor.join()
+
+    assert not journal.has_journal()
+    assert json.loads(open(path).read()) == {'1': 'one', '2': 'two'}
+
+
+def test_leftover_journal_is_folded_when_disabled(journal_backend, monkeypatch):
+    document = document_store.get_document(document_store.RECIPES)
+    document.write({'a': {'description': 'x'}})
+
+    monkeypatch.setattr(settings, 'shortcut_storage_journal', False, raising=False)
+    assert document.read() == {'a': {'description': 'x'}}
+    document.write({'a': {'description': 'y'}})
+    assert not (journal_backend / 'recipes.json.journal').exists()
+    assert json.loads((journal_backend / 'recipes.json').read_text()) == {'a': {'description': 'y'}}
+
+
+def test_file_lock_excludes_other_holders(tmp_path):
+    path = str(tmp_path / 'locks' / 'shortcuts.json.lock')
+    lock = document_store.FileLock(path)
+    with lock:
+        with lock:  # re-entrant in the owning thread
+            pass
+        # Another open of the lock file behaves like another process
+        with pytest.raises(StorageConflictError):
+            document_store.FileLock(path, timeout=0.1).acquire()
+
+        errors = []
+
+        def acquire_in_thread():
+            try:
+                lock.acquire(timeout=0.1)
+            except StorageConflictError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=acquire_in_thread)
+        thread.start()
+        thread.join()
+        assert len(errors) == 1
+
+    other = document_store.FileLock(path, timeout=0.1)
+    other.acquire()
+    other.release()
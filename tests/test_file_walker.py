@@ -0,0 +1,76 @@
+import os
+
+from scripts.civitai_manager_libs import file_walker, util
+from scripts.civitai_manager_libs.file_walker import FileWalker
+
+
+def make_tree(root):
+    for rel in (
+        'a/model.safetensors',
+        'a/model.civitai.info',
+        'a/b/other.ckpt',
+        'a/b/readme.txt',
+        '.cache/skip.safetensors',
+        'top.safetensors',
+    ):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x')
+
+
+def test_filters_by_extension_base_and_exclusion(tmp_path):
+    make_tree(tmp_path)
+    walker = FileWalker()
+    exts = ['.safetensors', '.ckpt']
+
+    found = {os.path.relpath(p, tmp_path) for p in walker.walk([str(tmp_path)], exts=exts)}
+    assert found == {
+        os.path.join('a', 'model.safetensors'),
+        os.path.join('a', 'b', 'other.ckpt'),
+        os.path.join('.cache', 'skip.safetensors'),
+        'top.safetensors',
+    }
+
+    found = set(walker.walk([str(tmp_path)], exts=exts, bases=['model'], exclude=['.*']))
+    assert found == {str(tmp_path / 'a' / 'model.safetensors')}
+    # Nested roots do not report files twice
+    assert len(list(walker.walk([str(tmp_path), str(tmp_path / 'a')], exts=['.ckpt']))) == 1
+
+
+def test_listings_are_cached_until_the_directory_changes(tmp_path, monkeypatch):
+    make_tree(tmp_path)
+    walker = FileWalker()
+    calls = []
+    scandir = os.scandir
+    monkeypatch.setattr(file_walker.os, 'scandir', lambda p: calls.append(p) or scandir(p))
+
+    assert len(list(walker.walk([str(tmp_path)]))) == 6
+    listed = len(calls)
+    assert listed == 4
+    assert len(list(walker.walk([str(tmp_path)]))) == 6
+    assert len(calls) == listed
+
+    (tmp_path / 'a' / 'new.safetensors').write_text('x')
+    assert len(list(walker.walk([str(tmp_path)]))) == 7
+    assert calls[listed:] == [str(tmp_path / 'a')]
+
+
+def test_results_are_lazy_and_symlinked_dirs_are_not_followed(tmp_path):
+    make_tree(tmp_path)
+    os.symlink(tmp_path / 'a', tmp_path / 'link')
+    walker = FileWalker()
+
+    generator = walker.walk([str(tmp_path)], exts=['.safetensors'])
+    first = next(generator)
+    assert first.endswith('.safetensors')
+    generator.close()
+
+    assert not any('link' in p for p in walker.walk([str(tmp_path)]))
+
+
+def test_search_file_keeps_its_contract(tmp_path):
+    make_tree(tmp_path)
+    assert util.search_file([str(tmp_path)], None, ['.txt']) == [
+        str(tmp_path / 'a' / 'b' / 'readme.txt')
+    ]
+    assert util.search_file([str(tmp_path)], None, ['.bin']) is None
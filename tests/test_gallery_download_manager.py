@@ -337,3 +337,42 @@ def test_download_images_parallel_success(download_manager: GalleryDownloadManag
         # Assert
         assert result == 2
         mock_downloader.return_value.download_images.assert_called_once()
+
+
+def test_stream_gallery_images_yields_placeholders_then_images(
+    download_manager: GalleryDownloadManager, tmp_path, monkeypatch
+):
+    """Pending images are shown as placeholders until their download finishes."""
+    from scripts.civitai_manager_libs.settings import path_manager
+
+    monkeypatch.setattr(path_manager, 'shortcut_gallery_folder', str(tmp_path))
+    monkeypatch.setattr(settings, 'shortcut_gallery_folder', str(tmp_path))
+    cached = tmp_path / 'cached.png'
+    cached.write_bytes(b'x')
+    urls = ['http://example.com/cached.jpeg', 'http://example.com/new.jpeg']
+
+    def fake_iter(self, tasks, client=None):
+        for url, path in tasks:
+            open(path, 'wb').close()
+            yield url, path, True
+
+    with patch(
+        'scripts.civitai_manager_libs.gallery.download_manager.ParallelImageDownloader.'
+        'iter_download_images',
+        fake_iter,
+    ):
+        updates = list(download_manager.stream_gallery_images(urls, min_interval=0))
+
+    placeholder = settings.get_no_card_preview_image()
+    first_images, _, first_trigger = updates[0]
+    assert first_images == [str(cached), placeholder]
+    assert first_trigger == {"__type__": "update"}
+    final_images, _, final_trigger = updates[-1]
+    assert final_images == [str(cached), str(tmp_path / 'new.png')]
+    assert not isinstance(final_trigger, dict)
+
+
+def test_stream_gallery_images_empty(download_manager: GalleryDownloadManager):
+    """An empty page yields a single hidden update."""
+    updates = list(download_manager.stream_gallery_images([]))
+    assert updates == [(None, None, {"__type__": "update", "visible": False})]
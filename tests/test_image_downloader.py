@@ -43,3 +43,38 @@ def test_download_images_auth_error(monkeypatch):
     assert result == 0
     # ensure auth error notified
     assert svc.errors
+
+
+def test_iter_download_images_yields_in_completion_order():
+    def dl(self, u, p):
+        if u == 'slow':
+            time.sleep(0.2)
+        return u != 'bad'
+
+    stub_client = type('C', (), {'download_file': dl})()
+    d = ParallelImageDownloader(max_workers=3)
+    results = list(
+        d.iter_download_images([('slow', 'p1'), ('fast', 'p2'), ('bad', 'p3')], stub_client)
+    )
+    assert results[-1] == ('slow', 'p1', True)
+    assert ('bad', 'p3', False) in results
+    assert list(d.iter_download_images([], stub_client)) == []
+
+
+def test_iter_download_images_reports_auth_errors(monkeypatch):
+    def dl_fail(self, u, p):
+        raise AuthenticationError('auth fail', status_code=401)
+
+    errors = []
+    svc = type('Svc', (), {'show_error': lambda self, msg: errors.append(msg)})()
+    monkeypatch.setattr(
+        'scripts.civitai_manager_libs.http.image_downloader.get_notification_service',
+        lambda: svc,
+    )
+    stub_client = type('C', (), {'download_file': dl_fail})()
+    d = ParallelImageDownloader(max_workers=2)
+
+    results = list(d.iter_download_images([('u1', 'p1'), ('u2', 'p2')], stub_client))
+
+    assert [success for _, _, success in results] == [False, False]
+    assert errors == ['auth fail']
@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from scripts.civitai_manager_libs.image_store import ImageStore, get_image_key
+from scripts.civitai_manager_libs.http.image_downloader import ParallelImageDownloader
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+UUID = '0b1c2d3e-4f50-6172-8394-a5b6c7d8e9f0'
+URL = f'https://image.civitai.com/abc/{UUID}/width=512/{UUID}.jpeg'
+
+
+class StubClient:
+    def __init__(self, payload=PNG_BYTES):
+        self.payload = payload
+        self.calls = []
+
+    def download_file(self, url, path):
+        self.calls.append((url, path))
+        with open(path, 'wb') as f:
+            f.write(self.payload)
+        return True
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(ImageStore, 'enabled', True)
+    return ImageStore(str(tmp_path / 'store'))
+
+
+def test_get_image_key_uses_uuid_and_width():
+    assert get_image_key(URL) == f'{UUID}-w512'
+    assert get_image_key(URL.replace('width=512', 'width=128')) == f'{UUID}-w128'
+    assert get_image_key('https://example.com/a.png') is not None
+    assert get_image_key('/local/file.png') is None
+    assert get_image_key('') is None
+
+
+def test_fetch_downloads_once_and_links_every_destination(store, tmp_path):
+    client = StubClient()
+    first = tmp_path / 'sc_infos' / '1' / 'a.png'
+    second = tmp_path / 'sc_gallery' / 'b.png'
+
+    assert store.fetch(URL, str(first), client) is True
+    assert store.fetch(URL, str(second), client) is True
+
+    assert len(client.calls) == 1
+    assert first.read_bytes() == PNG_BYTES
+    assert second.read_bytes() == PNG_BYTES
+    assert os.path.samefile(first, second)
+    stats = store.get_statistics()
+    assert stats['downloads'] == 1
+    assert stats['hits'] == 2
+
+
+def test_fetch_does_not_store_non_static_content(store, tmp_path):
+    client = StubClient(payload=b'GIF89a' + b'\x00' * 16)
+    dest = tmp_path / 'out.png'
+
+    assert store.fetch(URL, str(dest), client) is True
+    assert dest.exists()
+    assert not store.contains(URL)
+
+
+def test_fetch_failure_leaves_no_entry(store, tmp_path):
+    client = type('C', (), {'download_file': lambda self, u, p: False})()
+    assert store.fetch(URL, str(tmp_path / 'x.png'), client) is False
+    assert not store.contains(URL)
+
+
+def test_adopt_and_prune_orphans(store, tmp_path):
+    existing = tmp_path / 'existing.png'
+    existing.write_bytes(PNG_BYTES)
+
+    assert store.adopt(URL, str(existing)) is True
+    assert store.contains(URL)
+    assert store.prune_orphans() == 0
+
+    existing.unlink()
+    assert store.prune_orphans() == 1
+    assert not store.contains(URL)
+
+
+def test_parallel_downloader_routes_through_store(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        'scripts.civitai_manager_libs.http.image_downloader.get_image_store', lambda: store
+    )
+    client = StubClient()
+    tasks = [(URL, str(tmp_path / 'a.png')), (URL, str(tmp_path / 'b.png'))]
+
+    result = ParallelImageDownloader(max_workers=2).download_images(tasks, None, client)
+
+    assert result == 2
+    assert len(client.calls) == 1
+
+
+def test_scan_action_reclaims_orphaned_entries(store, tmp_path, monkeypatch):
+    from scripts.civitai_manager_libs import scan_action
+
+    monkeypatch.setattr(scan_action, 'get_image_store', lambda: store)
+    existing = tmp_path / 'existing.png'
+    existing.write_bytes(PNG_BYTES)
+    store.adopt(URL, str(existing))
+    existing.unlink()
+
+    result = scan_action.on_prune_image_store_btn_click()
+
+    assert 'Removed 1 ' in result['value']
+    assert not store.contains(URL)
@@ -0,0 +1,176 @@
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from scripts.civitai_manager_libs import image_transcoder
+from scripts.civitai_manager_libs.image_format_filter import ImageFormatFilter
+from scripts.civitai_manager_libs.image_transcoder import ImageTranscoder, transcode_image
+from scripts.civitai_manager_libs.settings import path_manager
+
+
+def _make_image(path, size=(256, 256)):
+    image = Image.effect_noise(size, 64).convert('RGB')
+    image.save(str(path), format='PNG')
+    return str(path)
+
+
+@pytest.fixture
+def transcoder(tmp_path, monkeypatch):
+    monkeypatch.setattr(ImageTranscoder, 'target_format', 'webp')
+    monkeypatch.setattr(ImageTranscoder, 'quality', 70)
+    return ImageTranscoder([str(tmp_path / 'cache')])
+
+
+def test_transcode_image_replaces_original_with_valid_webp(tmp_path):
+    source = _make_image(tmp_path / 'a.png')
+
+    result = transcode_image(source, 'webp', 70)
+
+    assert result == str(tmp_path / 'a.webp')
+    assert not os.path.exists(source)
+    assert ImageFormatFilter.is_valid_static_image_file(result)
+    assert os.listdir(tmp_path) == ['a.webp']
+
+
+def test_transcode_image_skips_invalid_and_target_format(tmp_path):
+    gif = tmp_path / 'anim.png'
+    gif.write_bytes(b'GIF89a' + b'\x00' * 32)
+    assert transcode_image(str(gif), 'webp') is None
+    assert gif.exists()
+
+    source = _make_image(tmp_path / 'b.png')
+    webp = transcode_image(source, 'webp')
+    assert transcode_image(webp, 'webp') is None
+    assert transcode_image(webp, 'unknown') is None
+
+
+def test_submit_only_queues_cached_images(transcoder, tmp_path, monkeypatch):
+    cache = tmp_path / 'cache' / '1'
+    cache.mkdir(parents=True)
+    inside = _make_image(cache / '1-img.png')
+    outside = _make_image(tmp_path / 'model.preview.png')
+
+    assert transcoder.submit([inside, outside, str(cache / 'missing.png')]) == 1
+    transcoder.wait()
+
+    assert os.path.isfile(cache / '1-img.webp')
+    assert os.path.isfile(outside)
+    assert transcoder.get_statistics()['transcoded'] == 1
+    # The original stays valid for paths already handed out, lookups don't remove it
+    assert os.path.isfile(inside)
+    assert transcoder.submit(inside) == 0
+    monkeypatch.setattr(path_manager, 'is_image_transcoding_enabled', lambda: True)
+    assert path_manager.resolve_image_variant(inside) == str(cache / '1-img.webp')
+    assert os.path.isfile(inside)
+
+
+def test_worker_removes_kept_original_after_grace_period(transcoder, tmp_path, monkeypatch):
+    monkeypatch.setattr(image_transcoder, 'ORIGINAL_GRACE_SECONDS', 0.0)
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    source = _make_image(cache / 'a.png')
+
+    assert transcoder.submit(source) == 1
+    transcoder.wait()
+    for _ in range(100):
+        if not os.path.exists(source):
+            break
+        time.sleep(0.01)
+
+    assert os.listdir(cache) == ['a.webp']
+
+
+def test_sweep_removes_kept_originals_but_not_rewritten_ones(transcoder, tmp_path):
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    kept = _make_image(cache / 'a.png')
+    transcode_image(kept, 'webp', keep_original=True)
+    rewritten = _make_image(cache / 'b.png')
+    transcode_image(rewritten, 'webp', keep_original=True)
+    os.utime(cache / 'b.webp', (1, 1))
+
+    transcoder.sweep()
+
+    assert not os.path.exists(kept)
+    assert os.path.isfile(rewritten)
+
+
+def test_written_original_replaces_stale_variant(tmp_path, monkeypatch):
+    monkeypatch.setattr(path_manager, 'is_image_transcoding_enabled', lambda: True)
+    source = _make_image(tmp_path / 'a.png')
+    transcode_image(source, 'webp')
+
+    _make_image(tmp_path / 'a.png')
+    path_manager.discard_image_variants(source)
+
+    assert os.listdir(tmp_path) == ['a.png']
+    assert path_manager.resolve_image_variant(source) == source
+
+
+def test_variants_are_only_preferred_while_transcoding_is_enabled(tmp_path, monkeypatch):
+    source = _make_image(tmp_path / 'a.png')
+    transcode_image(source, 'webp', keep_original=True)
+
+    monkeypatch.setattr(path_manager, 'is_image_transcoding_enabled', lambda: False)
+    assert path_manager.resolve_image_variant(source) == source
+    monkeypatch.setattr(path_manager, 'is_image_transcoding_enabled', lambda: True)
+    assert path_manager.resolve_image_variant(source) == str(tmp_path / 'a.webp')
+    assert os.path.isfile(source)
+
+
+def test_submit_is_noop_when_disabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(ImageTranscoder, 'target_format', None)
+    transcoder = ImageTranscoder([str(tmp_path)])
+    source = _make_image(tmp_path / 'a.png')
+
+    assert transcoder.submit(source) == 0
+    assert transcoder.sweep()['transcoded'] == 0
+    assert os.path.isfile(source)
+
+
+def test_sweep_transcodes_folders_and_reports_progress(transcoder, tmp_path):
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    for name in ('a.png', 'b.jpg'):
+        _make_image(cache / name)
+    calls = []
+
+    stats = transcoder.sweep(progress=lambda value, desc=None: calls.append(value))
+
+    assert stats['transcoded'] == 2
+    assert stats['saved_bytes'] > 0
+    assert calls[-1] == 1.0
+    assert sorted(os.listdir(cache)) == ['a.webp', 'b.webp']
+
+
+def test_path_resolution_finds_transcoded_variant(tmp_path, monkeypatch):
+    monkeypatch.setattr(path_manager, 'shortcut_gallery_folder', str(tmp_path))
+    monkeypatch.setattr(path_manager, 'shortcut_thumbnail_folder', str(tmp_path))
+    url = 'https://image.civitai.com/x/width=512/12345.jpeg'
+
+    assert path_manager.get_image_url_to_gallery_file(url) == str(tmp_path / '12345.png')
+    _make_image(tmp_path / '12345.png')
+    _make_image(tmp_path / '77.png')
+    transcode_image(str(tmp_path / '12345.png'), 'webp')
+    transcode_image(str(tmp_path / '77.png'), 'webp')
+
+    assert path_manager.get_image_url_to_gallery_file(url) == str(tmp_path / '12345.webp')
+    assert path_manager.get_shortcut_thumbnail_file(77) == str(tmp_path / '77.webp')
+
+
+def test_images_that_do_not_shrink_get_their_real_extension(tmp_path):
+    source = tmp_path / 'flat.png'
+    Image.effect_noise((128, 128), 64).convert('RGB').save(str(source), 'JPEG', quality=5)
+
+    result = transcode_image(str(source), 'webp', 100)
+
+    assert result == str(tmp_path / 'flat.jpg')
+    assert ImageFormatFilter.get_static_image_file_extension(result) == '.jpg'
+    assert not source.exists()
+
+
+def test_format_support_requires_pillow(monkeypatch):
+    monkeypatch.setattr(image_transcoder, 'Image', None)
+    assert image_transcoder.is_format_supported('webp') is False
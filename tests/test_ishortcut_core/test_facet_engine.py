@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from scripts.civitai_manager_libs.ishortcut_core.facet_engine import FacetEngine
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
+
+
+@pytest.fixture
+def shortcuts():
+    return {
+        '1': {'id': 1, 'type': 'LORA', 'nsfw': False},
+        '2': {'id': 2, 'type': 'Checkpoint', 'nsfw': True},
+        '3': {'id': 3, 'type': 'LORA'},
+        '4': None,
+    }
+
+
+@pytest.fixture
+def info_index(tmp_path):
+    index = ModelInfoIndex(str(tmp_path / 'index.json'))
+    index.update('1', {'modelVersions': [{'baseModel': 'SDXL 1.0'}]}, mtime=1)
+    index.update('2', {'modelVersions': [{'baseModel': 'SD 1.5'}, {'baseModel': 'Pony'}]}, mtime=1)
+    return index
+
+
+def test_build_columns_and_combine(shortcuts, info_index):
+    engine = FacetEngine()
+    assert engine.build(shortcuts, info_index) is True
+
+    assert engine.ids == ['1', '2', '3']
+    assert engine.select(engine.column('type', ['LORA'])) == ['1', '3']
+    assert engine.select(engine.column('base_models', ['Pony', 'SDXL 1.0'])) == ['1', '2']
+    assert engine.column('nsfw', [True]).tolist() == [False, False, False]
+    assert engine.select(engine.column('type', ['LORA']) & engine.mask_for_ids(['3', '9'])) == [
+        '3'
+    ]
+    assert engine.described().tolist() == [True, True, False]
+
+
+def test_counts_respect_mask(shortcuts, info_index):
+    engine = FacetEngine()
+    engine.build(shortcuts, info_index)
+
+    assert engine.counts('type') == {'LORA': 2, 'Checkpoint': 1}
+    mask = np.array([True, False, True])
+    assert engine.counts('type', mask) == {'LORA': 2}
+    assert engine.counts('base_models', mask) == {'SDXL 1.0': 1}
+    assert engine.count_ids(['1', '2', 'x'], mask) == 1
+    assert engine.count_ids(['1', '2']) == 2
+
+
+def test_build_is_skipped_until_version_or_index_changes(shortcuts, info_index):
+    engine = FacetEngine()
+    assert engine.build(shortcuts, info_index, version=1) is True
+    assert engine.build(shortcuts, info_index, version=1) is False
+
+    info_index.update('3', {'modelVersions': [{'baseModel': 'Pony'}]}, mtime=1)
+    assert engine.build(shortcuts, info_index, version=1) is True
+    assert engine.select(engine.column('base_models', ['Pony'])) == ['2', '3']
+
+    assert engine.build(shortcuts, info_index, version=2) is True
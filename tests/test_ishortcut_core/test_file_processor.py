@@ -3,6 +3,7 @@ import pytest
 
 import scripts.civitai_manager_libs.ishortcut_core.file_processor as fp_mod
 from scripts.civitai_manager_libs.ishortcut_core.file_processor import FileProcessor
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
 
 
 @pytest.fixture(autouse=True)
@@ -12,6 +13,14 @@ def tmp_setting_folder(monkeypatch, tmp_path):
     yield
 
 
+@pytest.fixture(autouse=True)
+def model_index(monkeypatch, tmp_path):
+    index = ModelInfoIndex(str(tmp_path / 'index.json'))
+    monkeypatch.setattr(index, 'schedule_flush', index.flush)
+    monkeypatch.setattr(fp_mod, 'get_model_info_index', lambda: index)
+    return index
+
+
 def test_create_and_delete_model_directory(tmp_path):
     processor = FileProcessor()
     # Invalid modelid should return None
@@ -67,3 +76,18 @@ def test_get_paths_and_ensure_and_size_and_cleanup(tmp_path):
     # Clean up temp files
     cleaned = processor.cleanup_temp_files(modelid)
     assert cleaned == 2
+
+
+def test_save_and_delete_maintain_model_index(tmp_path, model_index):
+    processor = FileProcessor()
+    model_dir = processor.create_model_directory('789')
+    info = {'id': 789, 'type': 'LORA', 'modelVersions': [{'baseModel': 'SDXL 1.0'}]}
+
+    assert processor.save_model_information(info, model_dir, '789') is True
+    assert model_index.find('base_models', ['SDXL 1.0']) == {'789'}
+    assert model_index.find('type', ['LORA']) == {'789'}
+    assert os.path.isfile(model_index.index_file)
+
+    assert processor.delete_model_information('789') is True
+    assert model_index.find('base_models', ['SDXL 1.0']) == set()
+    assert not model_index.has_record('789')
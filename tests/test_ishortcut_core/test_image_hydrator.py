@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+from scripts.civitai_manager_libs.ishortcut_core import image_hydrator
+from scripts.civitai_manager_libs.ishortcut_core import shortcut_collection_manager
+from scripts.civitai_manager_libs.ishortcut_core.image_hydrator import ImageHydrator
+from scripts.civitai_manager_libs.ishortcut_core.shortcut_collection_manager import (
+    ShortcutCollectionManager,
+)
+
+
+class StubModelProcessor:
+    def get_model_info(self, model_id):
+        return {'id': model_id} if model_id != 'gone' else None
+
+
+class StubImageProcessor:
+    def __init__(self, tmp_path):
+        self.tmp_path = tmp_path
+
+    def extract_version_images(self, model_info, model_id):
+        return [[('v1', 'https://x/a.jpeg'), ('v1', 'https://x/b.jpeg')]]
+
+    def _collect_images_to_download(self, version_list, model_id):
+        return [
+            (vid, url, str(self.tmp_path / url.rsplit('/', 1)[1]))
+            for image_list in version_list
+            for vid, url in image_list
+        ]
+
+
+@pytest.fixture
+def hydrator(tmp_path, monkeypatch):
+    def fake_iter(self, tasks, client=None):
+        for url, path in tasks:
+            ok = not url.endswith('fail.jpeg')
+            yield url, path, ok
+
+    monkeypatch.setattr(
+        image_hydrator.ParallelImageDownloader, 'iter_download_images', fake_iter
+    )
+    return ImageHydrator(
+        StubImageProcessor(tmp_path), StubModelProcessor(), str(tmp_path / 'queue.json')
+    )
+
+
+def test_pending_queue_is_persisted(hydrator, tmp_path):
+    hydrator.mark_pending(1)
+    hydrator.mark_pending('1')
+    hydrator.mark_pending('2')
+
+    assert json.loads((tmp_path / 'queue.json').read_text()) == ['1', '2']
+    reloaded = ImageHydrator(queue_file=str(tmp_path / 'queue.json'))
+    assert reloaded.is_pending('2')
+
+    hydrator.discard('2')
+    assert hydrator.get_pending() == ['1']
+
+
+def test_iter_hydrate_yields_images_and_clears_pending(hydrator, tmp_path):
+    hydrator.mark_pending('5')
+
+    paths = list(hydrator.iter_hydrate('5'))
+
+    assert paths == [str(tmp_path / 'a.jpeg'), str(tmp_path / 'b.jpeg')]
+    assert not hydrator.is_pending('5')
+
+
+def test_failed_images_keep_model_pending(hydrator, monkeypatch):
+    monkeypatch.setattr(
+        StubImageProcessor,
+        'extract_version_images',
+        lambda self, info, mid: [[('v1', 'https://x/fail.jpeg')]],
+    )
+    hydrator.mark_pending('6')
+    assert hydrator.hydrate('6') == 0
+    assert hydrator.is_pending('6')
+
+    # Images that keep failing are given up on instead of being retried forever
+    for _ in range(image_hydrator.MAX_HYDRATION_ATTEMPTS - 1):
+        hydrator.hydrate('6')
+    assert not hydrator.is_pending('6')
+
+    hydrator.mark_pending('gone')
+    assert hydrator.hydrate('gone') == 0
+    assert not hydrator.is_pending('gone')
+
+
+def test_idle_filler_hydrates_pending_models(hydrator, monkeypatch):
+    monkeypatch.setattr(image_hydrator, 'IDLE_DELAY_SECONDS', 0)
+    hydrator.mark_pending('7')
+
+    assert hydrator.start_idle_filler() is True
+    hydrator._filler.join(timeout=5)
+
+    assert hydrator.get_pending() == []
+    assert hydrator.start_idle_filler() is False
+
+
+def test_add_shortcut_defers_images_when_enabled(hydrator, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ImageHydrator, 'enabled', True)
+    monkeypatch.setattr(ImageHydrator, 'start_idle_filler', lambda self: True)
+    monkeypatch.setattr(shortcut_collection_manager, 'get_image_hydrator', lambda: hydrator)
+    scm = ShortcutCollectionManager()
+    monkeypatch.setattr(
+        scm,
+        '_model_factory',
+        type(
+            'F',
+            (),
+            {'create_model_shortcut': lambda self, mid, **kw: calls.append(kw) or {'id': mid}},
+        )(),
+    )
+
+    scm.add_shortcut({}, '42', False, None)
+    assert calls[-1]['download_images'] is False
+    assert hydrator.is_pending('42')
+
+    scm.add_shortcut({}, '43', True, None)
+    assert not hydrator.is_pending('43')
@@ -0,0 +1,127 @@
+import json
+import os
+
+from scripts.civitai_manager_libs.ishortcut_core.model_hash_index import (
+    ModelHashIndex,
+    extract_file_hashes,
+    parse_infotext_hashes,
+)
+
+INFOTEXT = (
+    "1girl, <lora:add_detail:1>\n"
+    "Negative prompt: easynegative\n"
+    "Steps: 20, Model hash: 31e35c80fc, Model: sd_xl_base, "
+    'Lora hashes: "add_detail: 7c6bad76eb, Style Two: 0123456789", '
+    'TI hashes: "easynegative: c74b4e810b", Version: v1.9.0'
+)
+
+LORA_INFO = {
+    'id': 100,
+    'modelId': 10,
+    'model': {'name': 'Detail Tweaker', 'type': 'LORA'},
+    'files': [
+        {
+            'name': 'add_detail.safetensors',
+            'hashes': {
+                'AutoV1': '3CE8A5C6',
+                'AutoV2': '7C6BAD76EB',
+                'SHA256': '7C6BAD76EB' + 'A' * 54,
+            },
+        }
+    ],
+}
+
+
+def write_info(path, info):
+    path.write_text(json.dumps(info), encoding='utf-8')
+    return str(path)
+
+
+def test_parse_infotext_hashes():
+    assert parse_infotext_hashes(INFOTEXT) == [
+        ('checkpoint', 'sd_xl_base', '31e35c80fc'),
+        ('lora', 'add_detail', '7c6bad76eb'),
+        ('lora', 'Style Two', '0123456789'),
+        ('embedding', 'easynegative', 'c74b4e810b'),
+    ]
+
+
+def test_parse_unquoted_hash_list():
+    text = "Steps: 5, Lora hashes: add_detail: 7c6bad76eb, Foo: 0123456789, Version: v1"
+    assert parse_infotext_hashes(text) == [
+        ('lora', 'add_detail', '7c6bad76eb'),
+        ('lora', 'Foo', '0123456789'),
+    ]
+
+
+def test_extract_file_hashes(tmp_path):
+    pairs = extract_file_hashes(LORA_INFO, str(tmp_path / 'add_detail.civitai.info'))
+    assert [short_hash for short_hash, _ in pairs] == ['7c6bad76eb', '3ce8a5c6']
+    assert pairs[0][1] == {
+        'model_id': '10',
+        'version_id': '100',
+        'name': 'Detail Tweaker',
+        'file': 'add_detail',
+    }
+
+
+def test_resolve_marks_owned_models(tmp_path):
+    files = [write_info(tmp_path / 'add_detail.civitai.info', LORA_INFO)]
+    index = ModelHashIndex(str(tmp_path / 'cache.json'), lambda: files)
+
+    references = {ref['name']: ref for ref in index.resolve(INFOTEXT)}
+    assert references['add_detail']['owned']
+    assert references['add_detail']['matches'][0]['model_id'] == '10'
+    assert not references['Style Two']['owned']
+    assert not references['sd_xl_base']['owned']
+    assert index.lookup('3CE8A5C6')[0]['version_id'] == '100'
+    assert index.lookup('7c6bad76eb' + 'a' * 54)[0]['file'] == 'add_detail'
+
+
+def test_file_hash_cache(tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    model_file = tmp_path / 'sd_xl_base.safetensors'
+    model_file.write_bytes(b'weights')
+    sha256 = '31E35C80FC' + 'b' * 54
+
+    index = ModelHashIndex(cache_file, lambda: [])
+    assert index.lookup('31e35c80fc') == []
+    index.record_file_hash(str(model_file), sha256)
+    assert index.get_cached_hash(str(model_file)) == sha256.lower()
+    assert index.lookup('31e35c80fc')[0]['file'] == 'sd_xl_base'
+    assert not os.path.exists(cache_file)
+    assert index.flush() and not index.flush()
+
+    reloaded = ModelHashIndex(cache_file, lambda: [])
+    assert reloaded.get_cached_hash(str(model_file)) == sha256.lower()
+
+    model_file.write_bytes(b'new weights')
+    os.utime(model_file, ns=(1, 1))
+    assert reloaded.get_cached_hash(str(model_file)) is None
+
+
+def test_refresh_drops_removed_info_files(tmp_path):
+    files = [write_info(tmp_path / 'add_detail.civitai.info', LORA_INFO)]
+    index = ModelHashIndex(str(tmp_path / 'cache.json'), lambda: files)
+    assert index.lookup('7c6bad76eb')
+    assert not index.refresh()
+
+    files.clear()
+    assert index.refresh()
+    assert index.lookup('7c6bad76eb') == []
+
+
+def test_rebuild_drops_hashes_of_missing_files(tmp_path):
+    cache_file = str(tmp_path / 'cache.json')
+    model_file = tmp_path / 'sd_xl_base.safetensors'
+    model_file.write_bytes(b'weights')
+    index = ModelHashIndex(cache_file, lambda: [])
+    index.record_file_hash(str(model_file), '31e35c80fc' + 'b' * 54)
+    index.flush()
+
+    model_file.unlink()
+    reloaded = ModelHashIndex(cache_file, lambda: [])
+    assert reloaded.lookup('31e35c80fc') == []
+    assert reloaded.flush()
+    with open(cache_file, encoding='utf-8') as f:
+        assert json.load(f) == {}
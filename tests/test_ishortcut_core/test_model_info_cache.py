@@ -0,0 +1,81 @@
+import json
+import os
+
+from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs.ishortcut_core import model_info_cache, model_info_index
+from scripts.civitai_manager_libs.ishortcut_core.file_processor import FileProcessor
+from scripts.civitai_manager_libs.ishortcut_core.model_info_cache import ModelInfoCache
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
+from scripts.civitai_manager_libs.ishortcut_core.model_processor import ModelProcessor
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def test_hits_are_validated_by_mtime_and_size(tmp_path):
+    cache = ModelInfoCache()
+    path = str(tmp_path / 'info.json')
+    write_json(path, {'id': 1})
+
+    first = cache.load(path)
+    assert cache.load(path) is first
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    write_json(path, {'id': 1, 'name': 'changed'})
+    assert cache.load(path)['name'] == 'changed'
+    assert cache.stats()['misses'] == 2
+    assert cache.stats()['hit_rate'] == 1 / 3
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ModelInfoCache(max_entries=2)
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f'{i}.json'))
+        write_json(paths[-1], {'id': i})
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+    cache.load(paths[0])
+    assert cache.stats()['hits'] == 2
+    cache.load(paths[1])
+    assert cache.stats()['misses'] == 4
+
+    small = ModelInfoCache(max_bytes=os.path.getsize(paths[0]))
+    small.load(paths[0])
+    small.load(paths[1])
+    assert len(small) == 1
+
+
+def test_model_processor_reads_through_cache(tmp_path, monkeypatch):
+    cache = ModelInfoCache()
+    monkeypatch.setattr(model_info_cache, '_global_model_info_cache', cache)
+    monkeypatch.setattr(settings, 'shortcut_info_folder', str(tmp_path))
+    index_file = str(tmp_path / 'model_index.json')
+    monkeypatch.setattr(settings, 'shortcut_model_index', index_file)
+    monkeypatch.setattr(model_info_index, '_global_model_info_index', ModelInfoIndex(index_file))
+    info = {'id': 7, 'modelVersions': [{'id': 70, 'files': [{'name': 'a.safetensors'}]}]}
+    os.makedirs(tmp_path / '7')
+    FileProcessor().save_model_information(info, str(tmp_path / '7'), '7')
+
+    processor = ModelProcessor()
+    assert processor.get_version_info('7', '70')['id'] == 70
+    assert processor.get_model_filenames('7') == ['a.safetensors']
+    assert processor.is_baseModel('7', ['SDXL']) is False
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 2
+
+    # Writes through FileProcessor drop the cached copy
+    info['modelVersions'][0]['baseModel'] = 'SDXL'
+    FileProcessor().save_model_information(info, str(tmp_path / '7'), '7')
+    assert processor.is_baseModel('7', ['SDXL']) is True
+    FileProcessor().delete_model_information('7')
+    assert processor.get_model_info('7') is None
+    assert len(cache) == 0
@@ -0,0 +1,74 @@
+import json
+import os
+
+from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs.ishortcut_core import (
+    model_info_cache,
+    model_info_format,
+    model_info_index,
+)
+from scripts.civitai_manager_libs.ishortcut_core.file_processor import FileProcessor
+from scripts.civitai_manager_libs.ishortcut_core.model_info_cache import ModelInfoCache
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
+from scripts.civitai_manager_libs.ishortcut_core.model_processor import ModelProcessor
+
+INFO = {
+    'id': 3,
+    'name': 'Model',
+    'modelVersions': [
+        {'id': 30, 'description': '<p>text</p>' * 50, 'images': [{'url': 'u'}] * 20},
+    ],
+}
+
+
+def info_path(folder, modelid):
+    return os.path.join(folder, modelid, f"{modelid}{settings.INFO_SUFFIX}{settings.INFO_EXT}")
+
+
+def test_both_formats_round_trip(tmp_path):
+    plain = model_info_format.dumps_model_info(INFO, compress=False)
+    compressed = model_info_format.dumps_model_info(INFO, compress=True)
+    assert compressed[:2] == model_info_format.GZIP_MAGIC
+    assert len(compressed) < len(plain) / 4
+    assert model_info_format.loads_model_info(plain) == INFO
+    assert model_info_format.loads_model_info(compressed) == INFO
+
+
+def test_written_compressed_and_read_transparently(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'shortcut_info_folder', str(tmp_path))
+    monkeypatch.setattr(settings, 'shortcut_info_compression', True, raising=False)
+    monkeypatch.setattr(model_info_cache, '_global_model_info_cache', ModelInfoCache())
+    index_file = str(tmp_path / 'model_index.json')
+    monkeypatch.setattr(settings, 'shortcut_model_index', index_file)
+    monkeypatch.setattr(model_info_index, '_global_model_info_index', ModelInfoIndex(index_file))
+    os.makedirs(tmp_path / '3')
+
+    FileProcessor().save_model_information(INFO, str(tmp_path / '3'), '3')
+    assert model_info_format.is_compressed(info_path(str(tmp_path), '3'))
+    assert ModelProcessor().get_version_info('3', '30')['id'] == 30
+
+
+def test_convert_and_benchmark(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'shortcut_info_folder', str(tmp_path))
+    monkeypatch.setattr(model_info_cache, '_global_model_info_cache', ModelInfoCache())
+    for modelid in ('1', '2'):
+        os.makedirs(tmp_path / modelid)
+        with open(info_path(str(tmp_path), modelid), 'w', encoding='utf-8') as f:
+            json.dump(dict(INFO, id=int(modelid)), f, indent=4)
+    # Cached while plain; conversion must not leave a stale entry behind
+    assert ModelProcessor().get_model_info('1')['id'] == 1
+
+    stats = model_info_format.convert_model_info_files(compress=True)
+    assert stats['converted'] == 2
+    assert stats['bytes_after'] < stats['bytes_before']
+    assert model_info_format.convert_model_info_files(compress=True)['skipped'] == 2
+    assert model_info_format.is_compressed(info_path(str(tmp_path), '1'))
+    assert ModelProcessor().get_model_info('1')['id'] == 1
+
+    bench = model_info_format.benchmark_model_info_files()
+    assert bench['files'] == 2
+    assert bench['compressed_bytes'] < bench['json_bytes']
+
+    assert model_info_format.convert_model_info_files(compress=False)['converted'] == 2
+    with open(info_path(str(tmp_path), '2'), 'r', encoding='utf-8') as f:
+        assert json.load(f)['id'] == 2
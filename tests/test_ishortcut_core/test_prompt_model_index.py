@@ -0,0 +1,112 @@
+import json
+import os
+
+from scripts.civitai_manager_libs.ishortcut_core.prompt_model_index import (
+    AhoCorasick,
+    PromptModelIndex,
+    extract_prompt_patterns,
+)
+
+LORA_INFO = {
+    'id': 10,
+    'type': 'LORA',
+    'modelVersions': [
+        {
+            'id': 100,
+            'files': [{'name': 'pastelStyle_v1.safetensors'}],
+            'trainedWords': ['pastel style, soft colours'],
+        }
+    ],
+}
+
+EMBEDDING_INFO = {
+    'id': 20,
+    'type': 'TextualInversion',
+    'modelVersions': [
+        {'id': 200, 'files': [{'name': 'easynegative.pt'}], 'trainedWords': ['easynegative']}
+    ],
+}
+
+DOWNLOADED_INFO = {
+    'id': 300,
+    'modelId': 30,
+    'model': {'type': 'LORA'},
+    'files': [{'name': 'detail_tweaker.safetensors'}],
+    'trainedWords': [],
+}
+
+
+def write_info(path, info):
+    path.write_text(json.dumps(info), encoding='utf-8')
+    return str(path)
+
+
+def build_index(tmp_path):
+    files = [
+        write_info(tmp_path / '10.civitai.info', LORA_INFO),
+        write_info(tmp_path / '20.civitai.info', EMBEDDING_INFO),
+        write_info(tmp_path / 'addDetail.civitai.info', DOWNLOADED_INFO),
+    ]
+    index = PromptModelIndex(lambda: files)
+    index.refresh()
+    return index, files
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick()
+    for pattern in ('he', 'she', 'his', 'hers'):
+        matcher.add(pattern)
+    matches = sorted(matcher.iter_matches('ushers'))
+    assert matches == [(1, 4, 'she'), (2, 4, 'he'), (2, 6, 'hers')]
+
+
+def test_extract_prompt_patterns_reads_files_and_trained_words():
+    patterns = extract_prompt_patterns(LORA_INFO)
+    assert ('pastelstyle_v1', True, 'LORA', '10', '100') in patterns
+    assert ('pastel style', False, 'LORA', '10', '100') in patterns
+    assert ('soft colours', False, 'LORA', '10', '100') in patterns
+
+
+def test_extract_prompt_patterns_uses_local_file_name(tmp_path):
+    patterns = extract_prompt_patterns(DOWNLOADED_INFO, str(tmp_path / 'addDetail.civitai.info'))
+    assert ('adddetail', True, 'LORA', '30', '300') in patterns
+    assert ('detail_tweaker', True, 'LORA', '30', '300') in patterns
+
+
+def test_resolve_classifies_matches(tmp_path):
+    index, _ = build_index(tmp_path)
+    prompt = '1girl, Pastel Style, <lora:pastelStyle_v1:0.8>, <lora:addDetail:1>, easynegative'
+    matches = [(m['kind'], m['text'], m['model_id']) for m in index.resolve(prompt)]
+    assert matches == [
+        ('trigger', 'pastel style', '10'),
+        ('lora', 'pastelstyle_v1', '10'),
+        ('lora', 'adddetail', '30'),
+        ('embedding', 'easynegative', '20'),
+        ('trigger', 'easynegative', '20'),
+    ]
+
+
+def test_resolve_respects_word_boundaries(tmp_path):
+    index, _ = build_index(tmp_path)
+    assert index.resolve('noteasynegatives, pastel styles') == []
+
+
+def test_resolve_model_ids_skips_triggers(tmp_path):
+    index, _ = build_index(tmp_path)
+    prompt = 'pastel style, <lora:addDetail:0.5>, easynegative, <lora:addDetail:1>'
+    assert index.resolve_model_ids(prompt) == ['30', '20']
+
+
+def test_refresh_reparses_changed_and_removed_files(tmp_path):
+    index, files = build_index(tmp_path)
+    assert not index.refresh()
+
+    info = dict(LORA_INFO, modelVersions=[dict(LORA_INFO['modelVersions'][0], trainedWords=[])])
+    write_info(tmp_path / '10.civitai.info', info)
+    os.utime(files[0], ns=(1, 1))
+    assert index.refresh()
+    assert index.resolve('pastel style') == []
+
+    del files[1:]
+    assert index.refresh()
+    assert index.resolve('easynegative') == []
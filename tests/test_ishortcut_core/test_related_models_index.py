@@ -0,0 +1,57 @@
+from scripts.civitai_manager_libs.ishortcut_core.related_models_index import (
+    RelatedModelsIndex,
+    extract_features,
+)
+
+
+class RecordIndex:
+    generation = 0
+
+    def __init__(self, records):
+        self.records = records
+
+    def get_cached_record(self, model_id):
+        return self.records.get(model_id)
+
+
+TAGS = ['anime', 'girl', 'portrait', 'pastel', 'soft', 'illustration', 'style', 'colour']
+
+SHORTCUTS = {
+    '1': {'type': 'LORA', 'tags': TAGS},
+    '2': {'type': 'LORA', 'tags': TAGS[:-1]},
+    '3': {'type': 'LORA', 'tags': TAGS[:-2] + ['watercolor']},
+    '4': {'type': 'Checkpoint', 'tags': ['car', 'vehicle', 'photo', 'realistic']},
+}
+
+RECORDS = {
+    '1': {'base_models': ['SDXL 1.0'], 'creator': 'Alice', 'trained_words': ['pastel style']},
+    '2': {'base_models': ['SDXL 1.0'], 'creator': 'alice', 'trained_words': ['pastel style']},
+}
+
+
+def test_extract_features():
+    features = extract_features(SHORTCUTS['1'], RECORDS['1'])
+    assert {'t:anime', 'y:LORA', 'b:SDXL 1.0', 'c:alice', 'w:pastel', 'w:style'} <= features
+
+
+def test_related_ranks_similar_models():
+    index = RelatedModelsIndex(RecordIndex(RECORDS))
+    assert index.sync(SHORTCUTS, version=1) == 4
+    related = index.related('1')
+    assert [mid for mid, _ in related][:2] == ['2', '3']
+    assert related[0][1] > related[1][1]
+    assert '4' not in [mid for mid, _ in related]
+    assert index.related('unknown') == []
+
+
+def test_sync_is_incremental():
+    index = RelatedModelsIndex(RecordIndex(RECORDS))
+    index.sync(SHORTCUTS, version=1)
+    assert index.sync(SHORTCUTS, version=1) == 0
+
+    shortcuts = dict(SHORTCUTS)
+    del shortcuts['2']
+    shortcuts['5'] = {'type': 'LORA', 'tags': TAGS}
+    assert index.sync(shortcuts, version=2) == 2
+    assert '1' in [mid for mid, _ in index.related('5')]
+    assert '2' not in [mid for mid, _ in index.related('1')]
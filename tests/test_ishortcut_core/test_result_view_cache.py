@@ -0,0 +1,42 @@
+from scripts.civitai_manager_libs.ishortcut_core.result_view_cache import (
+    ResultViewCache,
+    sort_shortcut_ids,
+)
+
+
+SHORTCUTS = {
+    '10': {'name': 'beta', 'date': '2024-01-02 10:00:00'},
+    '9': {'name': ' Alpha', 'date': '2024-03-01 09:00:00'},
+    '100': {'name': 'gamma', 'date': '2024-01-02 10:00:00'},
+}
+
+
+def test_sort_orders():
+    ids = list(SHORTCUTS)
+    assert sort_shortcut_ids(SHORTCUTS, ids, 'name') == ['9', '10', '100']
+    assert sort_shortcut_ids(SHORTCUTS, ids, 'date') == ['9', '10', '100']
+    assert sort_shortcut_ids(SHORTCUTS, ids, 'id') == ['100', '10', '9']
+
+
+def test_cache_hits_and_version_invalidation():
+    cache = ResultViewCache()
+    assert cache.get('a', 1) is None
+    cache.put('a', 1, ['1', '2'])
+    assert cache.get('a', 1) == ['1', '2']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert cache.get('a', 2) is None
+    cache.put('a', 2, ['3'])
+    assert cache.get('a', 2) == ['3']
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultViewCache(max_views=2)
+    cache.put('a', 1, ['1'])
+    cache.put('b', 1, ['2'])
+    cache.get('a', 1)
+    cache.put('c', 1, ['3'])
+
+    assert cache.get('b', 1) is None
+    assert cache.get('a', 1) == ['1']
+    assert cache.get('c', 1) == ['3']
@@ -1,8 +1,11 @@
 import os
 import json
+import threading
+
 import pytest
 
-from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs import document_store, settings
+from scripts.civitai_manager_libs.exceptions import StorageConflictError
 from scripts.civitai_manager_libs.ishortcut_core.shortcut_collection_manager import (
     ShortcutCollectionManager,
 )
@@ -105,3 +108,99 @@ def test_batch_update_and_all(monkeypatch, isolate_settings):
     calls.clear()
     scm.update_all_shortcuts(DummyProgress())
     assert set(calls) == {'1', '2'}
+
+
+def test_load_shortcuts_is_cached_until_the_file_changes(isolate_settings):
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts({'1': {'id': '1', 'name': 'Test'}})
+    version = scm.version
+
+    loaded = scm.load_shortcuts()
+    loaded['1']['name'] = 'Changed'
+    assert scm.load_shortcuts()['1']['name'] == 'Test'
+    assert scm.version == version
+
+    with open(settings.shortcut, 'w') as f:
+        json.dump({'2': {'id': '2', 'name': 'Other'}}, f)
+    assert list(scm.load_shortcuts()) == ['2']
+    assert scm.version > version
+
+
+def test_concurrent_transactions_keep_every_update(isolate_settings):
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts({str(i): {'id': str(i)} for i in range(8)})
+
+    def add_notes(mid):
+        for n in range(10):
+            with scm.transaction() as shortcuts:
+                shortcuts[mid]['note'] = shortcuts[mid].get('note', '') + str(n)
+
+    threads = [threading.Thread(target=add_notes, args=(str(i),)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # A second manager (another process) reads every update from the file
+    shortcuts = ShortcutCollectionManager().load_shortcuts()
+    assert all(shortcuts[str(i)]['note'] == '0123456789' for i in range(8))
+
+
+def test_transaction_discards_changes_on_error(isolate_settings):
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts({'1': {'id': '1'}})
+
+    with pytest.raises(RuntimeError):
+        with scm.transaction() as shortcuts:
+            shortcuts['1']['note'] = 'lost'
+            raise RuntimeError('boom')
+    assert 'note' not in scm.load_shortcuts()['1']
+
+    # Nested transactions join the outer one
+    with scm.transaction() as outer:
+        outer['2'] = {'id': '2'}
+        with scm.transaction() as inner:
+            assert inner is outer
+            inner['3'] = {'id': '3'}
+    assert list(scm.load_shortcuts()) == ['1', '2', '3']
+
+
+def test_transaction_detects_conflicting_writers(isolate_settings):
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts({'1': {'id': '1'}})
+    version = scm.version
+
+    ShortcutCollectionManager().save_shortcuts({'1': {'id': '1', 'note': 'other'}})
+    with pytest.raises(StorageConflictError):
+        with scm.transaction(expected_version=version):
+            pass
+
+    # A writer bypassing the lock during the block
+    with pytest.raises(StorageConflictError):
+        with scm.transaction() as shortcuts:
+            shortcuts['2'] = {'id': '2'}
+            with open(settings.shortcut, 'w') as f:
+                json.dump({'9': {'id': '9'}}, f)
+    assert list(scm.load_shortcuts()) == ['9']
+
+
+def test_transaction_is_not_broken_by_journal_compaction(isolate_settings, monkeypatch):
+    monkeypatch.setattr(settings, 'shortcut_storage_journal', True, raising=False)
+    monkeypatch.setattr(document_store, '_journals', {})
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts({'1': {'id': '1'}})
+    scm.save_shortcuts({'1': {'id': '1', 'note': 'journaled'}})
+    journal = document_store.get_journal(settings.shortcut)
+    assert journal.has_journal()
+
+    with scm.transaction() as shortcuts:
+        journal.compact(wait=False)
+        journal._compactor.join(0.2)
+        shortcuts['2'] = {'id': '2'}
+    journal._compactor.join()
+
+    assert not journal.has_journal()
+    assert ShortcutCollectionManager().load_shortcuts() == {
+        '1': {'id': '1', 'note': 'journaled'},
+        '2': {'id': '2'},
+    }
@@ -0,0 +1,163 @@
+import json
+import os
+
+import pytest
+
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
+from scripts.civitai_manager_libs.ishortcut_core.shortcut_search_index import (
+    ShortcutSearchIndex,
+    tokenize,
+)
+from scripts.civitai_manager_libs import settings
+
+
+@pytest.fixture
+def shortcuts():
+    return {
+        '1': {'id': 1, 'name': 'Alpha Portrait', 'tags': ['Style', 'anime'], 'note': 'keep'},
+        '2': {'id': 2, 'name': 'Beta Landscape', 'tags': [{'name': 'scenery'}], 'note': ''},
+        '3': {'id': 3, 'name': 'Gamma-Portrait v1.5', 'tags': ['style'], 'note': 'Second try'},
+    }
+
+
+@pytest.fixture
+def info_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'shortcut_info_folder', str(tmp_path / 'sc_infos'))
+    return ModelInfoIndex(str(tmp_path / 'index.json'))
+
+
+def _write_info(model_id, info):
+    path = ModelInfoIndex.get_info_file(model_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(info, f)
+    return path
+
+
+def test_tokenize_splits_words():
+    assert tokenize('Gamma-Portrait v1.5') == ['gamma', 'portrait', 'v1', '5']
+    assert tokenize(None) == []
+
+
+def test_keywords_match_tokens_prefixes_and_name_substrings(shortcuts):
+    index = ShortcutSearchIndex()
+    index.sync(shortcuts)
+
+    assert index.search_keywords(['portrait']) == {'1', '3'}
+    assert index.search_keywords(['port']) == {'1', '3'}
+    assert index.search_keywords(['alpha portrait']) == {'1'}
+    assert index.search_keywords(['alpha', 'beta']) == {'1', '2'}
+    assert index.search_keywords(['v1.5']) == {'3'}
+    assert index.search_keywords(['ortra']) == {'1', '3'}
+    assert index.search_keywords(['scenery']) == {'2'}
+    assert index.search_keywords(['nothing']) == set()
+
+
+def test_tags_and_notes(shortcuts):
+    index = ShortcutSearchIndex()
+    index.sync(shortcuts)
+
+    assert index.search_tags(['style']) == {'1', '3'}
+    assert index.search_tags(['scenery', 'anime']) == {'1', '2'}
+    assert index.search_tags(['sty']) == set()
+    assert index.search_notes(['second']) == {'3'}
+    assert index.search_notes(['e']) == {'1', '3'}
+    assert index.search_notes(['cond t', 'eep']) == {'1', '3'}
+    assert index.search_notes(['second  try']) == set()
+
+
+def test_fuzzy_matching_is_optional(shortcuts, monkeypatch):
+    index = ShortcutSearchIndex()
+    index.sync(shortcuts)
+
+    monkeypatch.setattr(ShortcutSearchIndex, 'fuzzy', False)
+    assert index.search_keywords(['landscpe']) == set()
+    monkeypatch.setattr(ShortcutSearchIndex, 'fuzzy', True)
+    assert index.search_keywords(['landscpe']) == {'2'}
+
+
+def test_sync_updates_incrementally(shortcuts):
+    index = ShortcutSearchIndex()
+    assert index.sync(shortcuts, version=1) == 3
+    assert index.sync(shortcuts, version=1) == 0
+    assert index.sync(shortcuts, version=2) == 0
+
+    shortcuts['2'] = dict(shortcuts['2'], name='Delta Landscape')
+    del shortcuts['3']
+    assert index.sync(shortcuts, version=3) == 2
+
+    assert index.search_keywords(['beta']) == set()
+    assert index.search_keywords(['delta']) == {'2'}
+    assert index.search_keywords(['lta land']) == {'2'}
+    assert index.search_notes(['second']) == set()
+    assert 'amm' not in index._name_grams
+    assert index.search_tags(['style']) == {'1'}
+    assert len(index) == 2
+    assert 'gamma' not in index._postings
+
+
+def test_model_information_is_searchable(shortcuts, info_index):
+    info_file = _write_info(
+        2,
+        {
+            'id': 2,
+            'creator': {'username': 'Painter'},
+            'description': '<p>Soft <b>watercolor</b> look</p>',
+            'modelVersions': [{'trainedWords': ['wtrclr style']}],
+        },
+    )
+    index = ShortcutSearchIndex(info_index)
+    index.sync(shortcuts, version=1)
+
+    assert index.search_keywords(['painter']) == {'2'}
+    assert index.search_keywords(['watercolor']) == {'2'}
+    assert index.search_keywords(['wtrclr']) == {'2'}
+    # The records are persisted in the background, not on the search path
+    assert not os.path.isfile(info_index.index_file)
+    assert info_index.flush() is True
+
+    _write_info(2, {'id': 2, 'creator': {'username': 'Sketcher'}})
+    os.utime(info_file, ns=(1, 1))
+    index.sync(shortcuts, version=2)
+
+    assert index.search_keywords(['painter']) == set()
+    assert index.search_keywords(['sketcher']) == {'2'}
+
+
+def test_model_info_index_persists_and_skips_missing(info_index):
+    _write_info(5, {'id': 5, 'creator': {'username': 'Maker'}})
+
+    assert info_index.get_record(4) is None
+    record = info_index.get_record(5)
+    assert record['creator'] == 'Maker'
+    assert info_index.flush() is True
+    assert info_index.flush() is False
+
+    reloaded = ModelInfoIndex(info_index.index_file)
+    assert reloaded.get_record(5) == record
+    assert reloaded.flush() is False
+
+
+def test_vocabulary_rebuilds_after_changes(shortcuts):
+    index = ShortcutSearchIndex()
+    index.sync(shortcuts)
+    assert index.search_keywords(['beta']) == {'2'}
+
+    index.sync(dict(shortcuts, **{'4': {'id': 4, 'name': 'Betamax', 'tags': []}}))
+    assert index.search_keywords(['beta']) == {'2', '4'}
+
+
+def test_model_info_index_facets_follow_updates(info_index):
+    info_index.update(1, {'type': 'LORA', 'modelVersions': [{'baseModel': 'SD 1.5'}]})
+    info_index.update(2, {'type': 'Checkpoint', 'nsfw': True, 'modelVersions': [
+        {'baseModel': 'SDXL 1.0'}, {'baseModel': 'Pony'}]})
+
+    assert info_index.find('base_models', ['SD 1.5', 'Pony']) == {'1', '2'}
+    assert info_index.find('nsfw', [True]) == {'2'}
+    assert info_index.get_facet_counts('type') == {'LORA': 1, 'Checkpoint': 1}
+
+    info_index.update(1, {'type': 'LORA', 'modelVersions': [{'baseModel': 'Pony'}]})
+    info_index.discard(2)
+    assert info_index.find('base_models', ['SD 1.5']) == set()
+    assert info_index.find('base_models', ['Pony']) == {'1'}
+    assert info_index.get_facet_counts('type') == {'LORA': 1}
@@ -0,0 +1,148 @@
+import json
+import os
+
+import pytest
+
+from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs.ishortcut_core import shortcut_summary_index
+from scripts.civitai_manager_libs.ishortcut_core.shortcut_collection_manager import (
+    ShortcutCollectionManager,
+)
+from scripts.civitai_manager_libs.ishortcut_core.shortcut_summary_index import (
+    ShortcutSummary,
+    ShortcutSummaryIndex,
+)
+
+
+SHORTCUTS = {
+    '1': {
+        'id': 1,
+        'name': 'Alpha',
+        'type': 'LORA',
+        'nsfw': True,
+        'date': '2024-01-01 10:00:00',
+        'tags': [{'name': 'anime'}, 'style'],
+        'note': 'favourite',
+        'description': 'x' * 1000,
+        'versionIds': [11, 12],
+    },
+    '2': {'id': 2, 'name': 'Beta', 'type': 'Checkpoint'},
+}
+
+
+class RecordIndex:
+    def get_cached_record(self, model_id):
+        return {'base_models': ['SDXL 1.0']} if model_id == '1' else None
+
+
+@pytest.fixture
+def summary_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        settings, 'get_shortcut_thumbnail_file', lambda mid: str(tmp_path / str(mid))
+    )
+    (tmp_path / '1').write_text('png')
+    return str(tmp_path / 'summary.json')
+
+
+def test_summary_supports_dictionary_access():
+    summary = ShortcutSummary.from_shortcut(SHORTCUTS['1'], ['SDXL 1.0'], True)
+    assert summary['name'] == 'Alpha'
+    assert summary.get('tags') == ('anime', 'style')
+    assert summary.get('description', 'missing') == 'missing'
+    assert 'nsfw' in summary.keys() and bool(summary['nsfw'])
+    with pytest.raises(KeyError):
+        summary['versionIds']
+
+
+def test_summaries_are_persisted_and_reused(summary_file):
+    index = ShortcutSummaryIndex(summary_file, RecordIndex())
+    calls = []
+
+    def load():
+        calls.append(1)
+        return SHORTCUTS
+
+    summaries = index.get((10, 20), load)
+    assert summaries['1'].base_models == ('SDXL 1.0',)
+    assert summaries['1'].has_thumbnail and not summaries['2'].has_thumbnail
+    assert index.get((10, 20), load) is summaries
+    assert len(calls) == 1
+
+    # A fresh index reads the summary file instead of the collection
+    restored = ShortcutSummaryIndex(summary_file).get((10, 20), load)
+    assert restored == summaries
+    assert len(calls) == 1
+
+    # A changed shortcut file rebuilds the summaries
+    ShortcutSummaryIndex(summary_file).get((11, 20), load)
+    assert len(calls) == 2
+    with open(summary_file, encoding='utf-8') as f:
+        assert json.load(f)['source'] == [11, 20]
+
+
+def test_rebuild_checks_thumbnails_again(summary_file, tmp_path):
+    index = ShortcutSummaryIndex(summary_file)
+    assert index.get((10, 20), lambda: SHORTCUTS)['1'].has_thumbnail
+
+    (tmp_path / '1').unlink()
+    assert not index.get((11, 20), lambda: SHORTCUTS)['1'].has_thumbnail
+
+
+def test_update_rebuilds_only_changed_summaries(summary_file, tmp_path):
+    index = ShortcutSummaryIndex(summary_file)
+    summaries = index.get((10, 20), lambda: SHORTCUTS)
+
+    (tmp_path / '2').write_text('png')
+    changed = {'2': dict(SHORTCUTS['2'], name='Gamma'), '3': {'id': 3, 'name': 'Delta'}}
+    index.update(changed, (11, 30), (10, 20), ['2', '3'])
+    updated = index.get((11, 30), lambda: pytest.fail('collection parsed'))
+    assert list(updated) == ['2', '3']
+    assert updated['2'].name == 'Gamma' and updated['2'].has_thumbnail
+    assert summaries['2'].name == 'Beta'
+
+    # Summaries are persisted by the scheduled flush
+    assert index.flush() and not index.flush()
+    restored = ShortcutSummaryIndex(summary_file).get((11, 30), lambda: pytest.fail('parsed'))
+    assert restored == updated
+
+    # Changes made to another version of the file fall back to a rebuild
+    index.update(SHORTCUTS, (12, 40), (99, 99), ['1'])
+    assert list(index.get((12, 40), lambda: SHORTCUTS)) == ['1', '2']
+
+
+def test_manager_serves_summaries_without_full_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'shortcut', str(tmp_path / 'shortcuts.json'))
+    monkeypatch.setattr(settings, 'shortcut_summary_index', str(tmp_path / 'summary.json'))
+    scm = ShortcutCollectionManager()
+    scm.save_shortcuts(SHORTCUTS)
+    assert [s['name'] for s in scm.get_summaries(['2', '1', '3'])] == ['Beta', 'Alpha']
+
+    scm.save_shortcuts(dict(SHORTCUTS, **{'3': {'id': 3, 'name': 'Gamma'}}))
+    assert [s['name'] for s in scm.get_summaries(['3'])] == ['Gamma']
+    scm._summary_index.flush()
+
+    fresh = ShortcutCollectionManager()
+    monkeypatch.setattr(fresh, '_get_cached', lambda: pytest.fail('collection parsed'))
+    assert set(fresh.load_summaries()) == {'1', '2', '3'}
+
+    version = scm.version
+    scm.save_shortcuts({'2': SHORTCUTS['2']})
+    assert scm.version > version
+    assert list(scm.load_summaries()) == ['2']
+    # Write the pending summaries now, not after monkeypatch restored the settings
+    assert scm._summary_index.flush() is True
+
+
+def test_scheduled_flush_writes_the_file_configured_when_scheduled(summary_file, monkeypatch):
+    monkeypatch.setattr(shortcut_summary_index, 'FLUSH_DELAY_SECONDS', 0.05)
+    monkeypatch.setattr(settings, 'shortcut_summary_index', summary_file)
+    index = ShortcutSummaryIndex(info_index=RecordIndex())
+    index.get([1, 2], lambda: SHORTCUTS)
+
+    index.update(dict(SHORTCUTS, **{'3': {'id': 3, 'name': 'Gamma'}}), [3, 4], [1, 2], ['3'])
+    monkeypatch.setattr(settings, 'shortcut_summary_index', f"{summary_file}.other")
+    index._flush_timer.join()
+
+    with open(summary_file, encoding='utf-8') as f:
+        assert json.load(f)['keys'] == ['1', '2', '3']
+    assert not os.path.exists(f"{summary_file}.other")
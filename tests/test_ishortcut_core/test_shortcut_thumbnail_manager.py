@@ -1,3 +1,6 @@
+import contextlib
+import os
+
 import pytest
 
 from scripts.civitai_manager_libs import settings
@@ -26,6 +29,11 @@ class DummyCollectionManager:
     def save_shortcuts(self, shortcuts):
         self.saved = shortcuts
 
+    @contextlib.contextmanager
+    def transaction(self):
+        yield self._data
+        self.save_shortcuts(self._data)
+
 
 @pytest.fixture
 def sample_images():
@@ -71,3 +79,60 @@ def test_update_and_batch(monkeypatch):
     shortcuts = {'b': {'imageurl': 'ub'}}
     ShortcutThumbnailManager(imgp2, coll).batch_download_thumbnails(shortcuts, DummyProgress())
     assert imgp2.called == ('b', 'ub')
+
+
+def test_update_all_renders_cached_sources(monkeypatch, tmp_path):
+    from PIL import Image
+    from scripts.civitai_manager_libs import civitai
+
+    url = 'https://example.com/img/cached.jpeg'
+    from scripts.civitai_manager_libs.settings import path_manager
+
+    monkeypatch.setattr(path_manager, 'shortcut_info_folder', str(tmp_path / 'infos'))
+    monkeypatch.setattr(settings, 'PREVIEW_IMAGE_EXT', '.png')
+    monkeypatch.setattr(
+        civitai,
+        'get_latest_version_info_by_model_id',
+        lambda mid: {'id': 10, 'images': [{'url': url, 'type': 'image'}]},
+    )
+    source = settings.get_image_url_to_shortcut_file('7', 10, url)
+    os.makedirs(os.path.dirname(source))
+    Image.new('RGB', (900, 900)).save(source, format='PNG')
+
+    imgp = DummyImageProcessor()
+    imgp.thumbnail_folder = str(tmp_path / 'thumbs')
+    imgp.thumbnail_max_size = (400, 400)
+    coll = DummyCollectionManager({'7': {'id': '7'}})
+
+    stats = ShortcutThumbnailManager(imgp, coll).update_all_thumbnails(DummyProgress())
+
+    assert stats['generated'] == 1
+    assert stats['downloaded'] == 0
+    assert not hasattr(imgp, 'called')
+    assert (tmp_path / 'thumbs' / '7.png').exists()
+    assert coll.saved['7']['imageurl'] == url
+
+
+def test_thumbnail_source_prefers_local_model_information(monkeypatch):
+    from scripts.civitai_manager_libs import civitai
+
+    class LocalModelProcessor:
+        def get_latest_version_info_by_model_id(self, mid):
+            if mid == 'local':
+                return {'id': 1, 'images': [{'url': 'https://example.com/l.jpeg'}]}
+            return None
+
+    requested = []
+    monkeypatch.setattr(
+        civitai,
+        'get_latest_version_info_by_model_id',
+        lambda mid: requested.append(mid) or {'images': [{'url': 'https://example.com/r.jpeg'}]},
+    )
+    manager = ShortcutThumbnailManager(
+        DummyImageProcessor(), DummyCollectionManager({}), LocalModelProcessor()
+    )
+
+    assert manager._select_thumbnail_source({'id': 'local'})[0] == 'https://example.com/l.jpeg'
+    assert requested == []
+    assert manager._select_thumbnail_source({'id': 'remote'})[0] == 'https://example.com/r.jpeg'
+    assert requested == ['remote']
@@ -0,0 +1,72 @@
+import os
+
+from PIL import Image
+
+from scripts.civitai_manager_libs.ishortcut_core import thumbnail_engine
+from scripts.civitai_manager_libs.ishortcut_core.thumbnail_engine import (
+    BatchThumbnailGenerator,
+    is_thumbnail_current,
+    render_thumbnail,
+)
+
+
+def _make_image(path, size=(1600, 1200), fmt=None):
+    Image.new('RGB', size, color='red').save(str(path), format=fmt)
+    return str(path)
+
+
+def test_render_thumbnail_downscales_jpeg_and_png(tmp_path):
+    jpeg = _make_image(tmp_path / 'src.jpg', fmt='JPEG')
+    png = _make_image(tmp_path / 'src.png', fmt='PNG')
+
+    for source in (jpeg, png):
+        dest = tmp_path / f"thumb_{os.path.basename(source)}.png"
+        assert render_thumbnail(source, str(dest), (400, 400)) is True
+        with Image.open(dest) as thumb:
+            assert max(thumb.size) <= 400
+
+
+def test_render_thumbnail_in_place_and_failure(tmp_path):
+    source = _make_image(tmp_path / 'inplace.png')
+    assert render_thumbnail(source, source, (100, 100)) is True
+    with Image.open(source) as thumb:
+        assert max(thumb.size) <= 100
+
+    broken = tmp_path / 'broken.png'
+    broken.write_bytes(b'not an image')
+    assert render_thumbnail(str(broken), str(tmp_path / 'out.png')) is False
+    assert not any(name.endswith('.tmp.png') for name in os.listdir(tmp_path))
+
+
+def test_generate_skips_current_thumbnails(tmp_path):
+    source = _make_image(tmp_path / 'a.jpg', fmt='JPEG')
+    generator = BatchThumbnailGenerator(str(tmp_path / 'thumbs'), '.png', max_workers=1)
+
+    stats = generator.generate({'1': source, '2': str(tmp_path / 'missing.jpg')})
+    assert stats['generated'] == 1
+    assert stats['failed'] == 1
+    assert is_thumbnail_current(source, generator.get_thumbnail_path('1'))
+
+    stats = generator.generate({'1': source})
+    assert stats['generated'] == 0
+    assert stats['skipped'] == 1
+
+    stats = generator.generate({'1': source}, force_ids=['1'])
+    assert stats['generated'] == 1
+
+
+def test_generate_uses_process_pool_for_large_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnail_engine, 'MIN_POOL_JOBS', 2)
+    sources = {
+        str(i): _make_image(tmp_path / f'{i}.jpg', size=(800, 600), fmt='JPEG') for i in range(4)
+    }
+    progress_calls = []
+    generator = BatchThumbnailGenerator(str(tmp_path / 'thumbs'), '.png', max_workers=2)
+
+    stats = generator.generate(sources, progress=lambda *args: progress_calls.append(args))
+
+    assert stats['generated'] == 4
+    assert stats['per_second'] > 0
+    assert progress_calls[-1][:2] == (4, 4)
+    for model_id in sources:
+        assert os.path.isfile(generator.get_thumbnail_path(model_id))
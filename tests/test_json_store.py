@@ -0,0 +1,60 @@
+import json
+import os
+
+import pytest
+
+from scripts.civitai_manager_libs import civitai, json_store, model, settings, util
+from scripts.civitai_manager_libs.json_store import JsonFileStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = JsonFileStore()
+    monkeypatch.setattr(json_store, '_global_json_store', store)
+    monkeypatch.setattr(settings, 'shortcut_compact_json', False, raising=False)
+    return store
+
+
+def test_reads_are_cached_until_the_file_changes(store, tmp_path):
+    path = str(tmp_path / 'a.json')
+    store.write(path, {'id': 1})
+
+    first = store.load(path)
+    assert store.load(path) is first
+    store.write(path, {'id': 1, 'name': 'changed'})
+    assert store.load(path)['name'] == 'changed'
+
+    stats = store.stats()
+    assert stats['reads'] == 3 and stats['hits'] == 1 and stats['writes'] == 2
+    assert store.read(str(tmp_path / 'missing.json'), default={}) == {}
+
+
+def test_writes_are_atomic_and_optionally_compact(store, tmp_path, monkeypatch):
+    path = str(tmp_path / 'b.json')
+    store.write(path, {'id': 1})
+    assert '\n    "id"' in open(path).read()
+
+    with pytest.raises(TypeError):
+        store.write(path, {'id': object()})
+    # The failed write left the previous file and no temp files behind
+    assert json.loads(open(path).read()) == {'id': 1}
+    assert os.listdir(tmp_path) == ['b.json']
+    assert store.stats()['errors'] == 1
+
+    monkeypatch.setattr(settings, 'shortcut_compact_json', True, raising=False)
+    store.write(path, {'id': 2, 'tags': ['a']})
+    assert open(path).read() == '{"id":2,"tags":["a"]}'
+
+
+def test_util_and_version_info_files_use_the_store(store, tmp_path, monkeypatch):
+    folder = tmp_path / 'models'
+    folder.mkdir()
+    info_path = str(folder / f"m{settings.INFO_SUFFIX}{settings.INFO_EXT}")
+    assert civitai.write_version_info(info_path, {'id': 10, 'modelId': 5, 'name': 'v1'})
+    assert util.read_json(info_path)['name'] == 'v1'
+
+    monkeypatch.setattr(settings, 'get_model_folders', lambda: [str(folder)])
+    models, infopaths = model.get_model_path()
+    assert models == {'5': [['10', info_path]]}
+    assert infopaths == {info_path: '10'}
+    assert store.stats()['hits'] == 1
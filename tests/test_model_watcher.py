@@ -0,0 +1,121 @@
+import json
+import os
+import time
+
+import pytest
+
+from scripts.civitai_manager_libs import model
+from scripts.civitai_manager_libs.model_watcher import Inotify, ModelFolderWatcher
+
+
+@pytest.fixture(autouse=True)
+def empty_registry(monkeypatch):
+    monkeypatch.setattr(model, 'Downloaded_Models', None)
+    monkeypatch.setattr(model, 'Downloaded_InfoPath', None)
+    monkeypatch.setattr(model, '_registry_watched', False)
+
+
+def write_info(path, mid, vid):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'modelId': mid, 'id': vid, 'name': f"v{vid}"}))
+    return str(path)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_apply_changes_replaces_the_registry(tmp_path):
+    first = write_info(tmp_path / 'a.civitai.info', 1, 10)
+    second = write_info(tmp_path / 'b.civitai.info', 1, 11)
+    version = model.get_downloaded_version()
+
+    assert model.apply_downloaded_model_changes(updated=[first, second])
+    registry = model.Downloaded_InfoPath
+    assert registry == {first: '10', second: '11'}
+    assert model.Downloaded_Models == {'1': [['10', first], ['11', second]]}
+    assert model.get_downloaded_version() > version
+
+    # Unchanged files leave the registry alone
+    assert not model.apply_downloaded_model_changes(updated=[first])
+
+    write_info(tmp_path / 'a.civitai.info', 2, 20)
+    assert model.apply_downloaded_model_changes(updated=[first], removed=[second])
+    assert model.Downloaded_InfoPath == {first: '20'}
+    assert model.Downloaded_Models == {'2': [['20', first]]}
+    # Earlier registries are replaced, not modified
+    assert registry == {first: '10', second: '11'}
+
+    assert model.apply_downloaded_model_changes(removed=[first])
+    assert model.Downloaded_Models is None and model.Downloaded_InfoPath is None
+
+
+def test_sync_applies_adds_moves_and_deletes(tmp_path):
+    watcher = ModelFolderWatcher(use_inotify=False, roots=lambda: [str(tmp_path)])
+    info = write_info(tmp_path / 'lora' / 'a.civitai.info', 1, 10)
+
+    assert watcher.sync()
+    assert model.Downloaded_InfoPath == {info: '10'}
+    assert not watcher.sync()
+
+    moved = str(tmp_path / 'lora' / 'sub' / 'a.civitai.info')
+    os.makedirs(os.path.dirname(moved))
+    os.replace(info, moved)
+    assert watcher.sync()
+    assert model.Downloaded_InfoPath == {moved: '10'}
+
+    os.remove(moved)
+    assert watcher.sync()
+    assert model.Downloaded_InfoPath is None
+
+
+def test_first_sync_drops_files_deleted_before_watching(tmp_path):
+    kept = write_info(tmp_path / 'a.civitai.info', 1, 10)
+    gone = write_info(tmp_path / 'b.civitai.info', 2, 20)
+    model.apply_downloaded_model_changes(updated=[kept, gone])
+    os.remove(gone)
+
+    ModelFolderWatcher(use_inotify=False, roots=lambda: [str(tmp_path)]).sync()
+    assert model.Downloaded_InfoPath == {kept: '10'}
+
+
+def test_refresh_skips_the_rescan_while_watched(monkeypatch):
+    calls = []
+    monkeypatch.setattr(model, 'get_model_path', lambda: calls.append(1) or (None, None))
+
+    model.refresh_downloaded_model()
+    model.set_downloaded_model_watched(True)
+    model.refresh_downloaded_model()
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('use_inotify', [True, False])
+def test_background_watcher_follows_changes(tmp_path, use_inotify):
+    if use_inotify:
+        try:
+            Inotify().close()
+        except OSError:
+            pytest.skip("inotify is not available")
+
+    watcher = ModelFolderWatcher(
+        interval=0.1, use_inotify=use_inotify, roots=lambda: [str(tmp_path)]
+    )
+    watcher.start()
+    try:
+        assert wait_for(lambda: watcher.backend is not None)
+        assert watcher.backend == ('inotify' if use_inotify else 'poll')
+        assert model.is_downloaded_model_watched()
+
+        info = write_info(tmp_path / 'new' / 'a.civitai.info', 1, 10)
+        assert wait_for(lambda: (model.Downloaded_InfoPath or {}).get(info) == '10')
+
+        os.remove(info)
+        assert wait_for(lambda: model.Downloaded_InfoPath is None)
+    finally:
+        watcher.stop(timeout=5)
+    assert not model.is_downloaded_model_watched()
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from scripts.civitai_manager_libs import recipe, settings
+
+
+RECIPES = {
+    'Anime portrait': {
+        'description': 'Soft lighting, pastel colours',
+        'generate': '',
+        'classification': 'portrait',
+        'image': None,
+        'shortcuts': ['1', '2'],
+    },
+    'City night': {
+        'description': 'Neon streets',
+        'generate': '',
+        'classification': 'landscape',
+        'image': None,
+        'shortcuts': ['2'],
+    },
+    'Draft': {
+        'description': None,
+        'generate': '',
+        'classification': None,
+        'image': None,
+        'shortcuts': [],
+    },
+}
+
+
+@pytest.fixture
+def recipe_file(tmp_path, monkeypatch):
+    path = tmp_path / 'recipes.json'
+    path.write_text(json.dumps(RECIPES))
+    monkeypatch.setattr(settings, 'shortcut_recipe', str(path))
+    monkeypatch.setattr(recipe, '_store', recipe.RecipeStore())
+    return path
+
+
+def test_filters_use_indexes(recipe_file):
+    assert recipe.get_list() == list(RECIPES)
+    assert recipe.get_list(classification='portrait') == ['Anime portrait']
+    assert recipe.get_list(shortcuts=['2']) == ['Anime portrait', 'City night']
+    assert recipe.get_list(shortcuts=['1', '2']) == ['Anime portrait']
+    assert recipe.get_list(search='nigh') == ['City night']
+    assert recipe.get_list(search='ty ni') == ['City night']
+    assert recipe.get_list(search='#pastel') == ['Anime portrait']
+    assert recipe.get_list(search='#eets') == ['City night']
+    assert recipe.get_list(search='#light, #streets') == ['Anime portrait', 'City night']
+    assert recipe.get_list(search='#soft lighting') == ['Anime portrait']
+    assert recipe.get_list(search='#lighting soft') == []
+    assert recipe.get_list(search='draft, #neon') == []
+
+
+def test_reference_lookups(recipe_file):
+    assert recipe.get_reference_shortcuts() == ['1', '2']
+    assert sorted(recipe.get_classifications()) == ['landscape', 'portrait']
+    assert recipe.get_recipes_by_shortcut(2) == ['Anime portrait', 'City night']
+    assert recipe.is_classifications('landscape')
+    assert not recipe.is_classifications('missing')
+
+
+def test_store_follows_saves_and_file_changes(recipe_file):
+    assert recipe.update_recipe_shortcuts('Draft', ['3'])
+    assert recipe.get_recipes_by_shortcut('3') == ['Draft']
+    assert json.loads(recipe_file.read_text())['Draft']['shortcuts'] == ['3']
+
+    recipe_file.write_text(json.dumps({'Only': dict(RECIPES['Draft'], shortcuts=['9'])}))
+    assert recipe.get_list() == ['Only']
+    assert recipe.get_reference_shortcuts() == ['9']
+
+
+def test_returned_recipes_do_not_alias_the_store(recipe_file):
+    recipe.get_recipe('Draft')['shortcuts'].append('5')
+    assert recipe.get_recipe_shortcuts('Draft') == []
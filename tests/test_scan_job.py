@@ -0,0 +1,135 @@
+"""Tests for the checkpointed model information job."""
+
+import pytest
+
+from scripts.civitai_manager_libs import scan_action, scan_job
+from scripts.civitai_manager_libs.scan_job import ScanJob
+
+
+class FakeProgress:
+    def tqdm(self, iterable, **kwargs):
+        return iterable
+
+
+@pytest.fixture
+def job_file(tmp_path):
+    return str(tmp_path / "job.json")
+
+
+def test_run_records_status_and_survives_restart(job_file):
+    job = ScanJob(job_file)
+    job.create(['a', 'b', 'c', 'a'], {'mfolder': True})
+
+    def process(entry, checkpoint):
+        if entry['path'] == 'b':
+            entry['reason'] = 'not_on_civitai'
+            return scan_job.STATUS_SKIPPED
+        if entry['path'] == 'c':
+            raise OSError("disk error")
+        return scan_job.STATUS_COMPLETED
+
+    status = job.run(process, FakeProgress())
+    counts = (status['total'], status['completed'], status['skipped'], status['failed'])
+    assert counts == (3, 1, 1, 1)
+    assert status['finished']
+
+    restarted = ScanJob(job_file)
+    assert restarted.get_options() == {'mfolder': True}
+    assert restarted.get_files(scan_job.STATUS_SKIPPED, 'not_on_civitai') == ['b']
+    # Failed files keep the job resumable
+    assert restarted.has_unfinished()
+
+    retried = []
+    status = restarted.run(
+        lambda entry, checkpoint: retried.append(entry['path']), retry_failed=True
+    )
+    assert retried == ['c']
+    assert status['failed'] == 0 and not restarted.has_unfinished()
+
+
+def test_cancelled_job_resumes_with_checkpointed_entries(job_file):
+    job = ScanJob(job_file)
+    job.create(['a', 'b', 'c'])
+
+    def process(entry, checkpoint):
+        entry['hash'] = f"hash-{entry['path']}"
+        checkpoint()
+        if entry['path'] == 'b':
+            # A crash after the checkpoint leaves the file pending with its hash
+            raise KeyboardInterrupt
+        job.cancel()
+        return scan_job.STATUS_COMPLETED
+
+    status = job.run(process)
+    assert (status['completed'], status['pending'], status['finished']) == (1, 2, False)
+    with pytest.raises(KeyboardInterrupt):
+        job.run(process)
+    assert not job.is_running
+
+    resumed = ScanJob(job_file)
+    assert resumed.has_unfinished()
+    seen = {}
+    status = resumed.run(lambda entry, checkpoint: seen.update({entry['path']: entry.get('hash')}))
+    assert seen == {'b': 'hash-b', 'c': None}
+    assert status['finished'] and status['completed'] == 3
+
+
+def test_create_model_information_reuses_the_checkpointed_hash(tmp_path, monkeypatch):
+    model_file = tmp_path / "model.safetensors"
+    model_file.write_text('x')
+    monkeypatch.setattr(
+        scan_action.util, 'calculate_sha256', lambda path: pytest.fail("hashed again")
+    )
+    lookups = []
+    monkeypatch.setattr(
+        scan_action.civitai, 'get_version_info_by_hash', lambda h: lookups.append(h) or None
+    )
+
+    entry = {'path': str(model_file), 'status': scan_job.STATUS_PENDING, 'hash': 'abc'}
+    status = scan_action.create_model_information(entry, lambda: None, False, False, False)
+    assert status == scan_job.STATUS_SKIPPED
+    assert entry['reason'] == scan_action.REASON_NOT_ON_CIVITAI
+    assert lookups == ['abc']
+
+    entry = {'path': str(tmp_path / "gone.safetensors"), 'status': scan_job.STATUS_PENDING}
+    status = scan_action.create_model_information(entry, lambda: None, False, False, False)
+    assert (status, entry['reason']) == (scan_job.STATUS_SKIPPED, scan_action.REASON_MISSING)
+
+
+def test_create_models_information_returns_models_unknown_to_civitai(tmp_path, monkeypatch):
+    files = []
+    for name in ('known', 'unknown'):
+        path = tmp_path / f"{name}.safetensors"
+        path.write_text(name)
+        files.append(str(path))
+    monkeypatch.setattr(scan_action, 'get_scan_job', lambda: job)
+    monkeypatch.setattr(scan_action.settings, 'model_hash_cache', str(tmp_path / "hashes.json"))
+    monkeypatch.setattr(scan_action.util, 'calculate_sha256', lambda path: path)
+    monkeypatch.setattr(
+        scan_action.civitai,
+        'get_version_info_by_hash',
+        lambda h: {'id': 1, 'modelId': 2} if 'unknown' not in h else None,
+    )
+    monkeypatch.setattr(scan_action.civitai, 'write_version_info', lambda path, info: True)
+    job = ScanJob(str(tmp_path / "job.json"))
+
+    remain = scan_action.create_models_information(files, False, False, False, FakeProgress())
+    assert remain == [files[1]]
+    assert job.get_status()['completed'] == 1
+    assert (tmp_path / "hashes.json").exists()
+
+
+def test_create_button_reports_a_running_job(tmp_path, monkeypatch):
+    job = ScanJob(str(tmp_path / "job.json"))
+    job.create(['a'])
+    monkeypatch.setattr(scan_action, 'get_scan_job', lambda: job)
+    monkeypatch.setattr(
+        scan_action, 'create_models_information', lambda *args: pytest.fail("started")
+    )
+    monkeypatch.setattr(job, '_running', True)
+
+    with pytest.warns(UserWarning, match="already in progress"):
+        updates = scan_action.on_create_models_info_btn_click(['b'], False, False, False)
+    # The scanned file list is left as it is
+    assert updates[0] == scan_action.gr.update()
+    assert updates[4]['value'].startswith("A model information job is already in progress.")
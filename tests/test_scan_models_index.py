@@ -0,0 +1,70 @@
+"""Tests for the per-directory version info index used by scan_models."""
+
+import json
+
+from scripts.civitai_manager_libs import scan_action, settings
+from scripts.civitai_manager_libs.scan_action import VersionInfoDirectoryIndex
+
+
+class FakeProgress:
+    def tqdm(self, iterable, **kwargs):
+        return iterable
+
+
+def _write_info(path, names):
+    with open(path, "w") as f:
+        json.dump({"id": 1, "modelId": 2, "files": [{"name": n} for n in names]}, f)
+
+
+def test_scan_models_reports_only_uncovered_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'INFO_EXT', '.info')
+    monkeypatch.setattr(settings, 'INFO_SUFFIX', '.civitai')
+    monkeypatch.setattr(settings, 'MODEL_EXTS', ['.safetensors'])
+    monkeypatch.setattr(settings, 'model_folders', {'lora': str(tmp_path)})
+    for name in ('sibling', 'renamed', 'orphan'):
+        (tmp_path / f"{name}.safetensors").write_text('x')
+    _write_info(str(tmp_path / "sibling.civitai.info"), ['sibling.safetensors'])
+    _write_info(str(tmp_path / "other.civitai.info"), ['renamed.safetensors'])
+
+    parsed = []
+    load = scan_action.get_json_store().read
+    monkeypatch.setattr(
+        scan_action.get_json_store(), 'read', lambda path: parsed.append(path) or load(path)
+    )
+
+    result = scan_action.scan_models(False, FakeProgress())
+    assert result == [str(tmp_path / "orphan.safetensors")]
+    # Each info file of the folder is read once per scan
+    assert sorted(parsed) == sorted(
+        [str(tmp_path / "other.civitai.info"), str(tmp_path / "sibling.civitai.info")]
+    )
+
+
+def test_index_handles_missing_directory_and_bad_info(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'INFO_EXT', '.info')
+    monkeypatch.setattr(settings, 'INFO_SUFFIX', '.civitai')
+    (tmp_path / "broken.civitai.info").write_text('{')
+    index = VersionInfoDirectoryIndex()
+
+    assert index.covers(str(tmp_path), 'broken.safetensors')
+    assert not index.covers(str(tmp_path), 'other.safetensors')
+    assert not index.covers(str(tmp_path / 'missing'), 'x.safetensors')
+    assert not scan_action.is_filename_in_version_info_in_directory(str(tmp_path), 'x')
+
+
+def test_folders_with_sibling_info_files_are_not_parsed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'INFO_EXT', '.info')
+    monkeypatch.setattr(settings, 'INFO_SUFFIX', '.civitai')
+    _write_info(str(tmp_path / "a.civitai.info"), ['a.safetensors'])
+    parsed = []
+    load = scan_action.get_json_store().read
+    monkeypatch.setattr(
+        scan_action.get_json_store(), 'read', lambda path: parsed.append(path) or load(path)
+    )
+
+    index = VersionInfoDirectoryIndex()
+    assert index.covers(str(tmp_path), 'a.safetensors')
+    assert parsed == []
+    assert not index.covers(str(tmp_path), 'b.safetensors')
+    assert not index.covers(str(tmp_path), 'c.safetensors')
+    assert parsed == [str(tmp_path / "a.civitai.info")]
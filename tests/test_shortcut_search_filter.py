@@ -1,6 +1,9 @@
 import pytest
 from scripts.civitai_manager_libs.settings import config_manager
 
+from scripts.civitai_manager_libs import settings
+from scripts.civitai_manager_libs.ishortcut_core import model_info_index
+from scripts.civitai_manager_libs.ishortcut_core.model_info_index import ModelInfoIndex
 from scripts.civitai_manager_libs.ishortcut_core.shortcut_search_filter import (
     ShortcutSearchFilter,
 )
@@ -35,6 +38,14 @@ def sample_data():
     }
 
 
+@pytest.fixture(autouse=True)
+def model_index(tmp_path, monkeypatch):
+    index_file = str(tmp_path / 'model_index.json')
+    monkeypatch.setattr(settings, 'shortcut_model_index', index_file)
+    # Bound to the file: the index flushes after the setting is restored
+    monkeypatch.setattr(model_info_index, '_global_model_info_index', ModelInfoIndex(index_file))
+
+
 @pytest.fixture
 def search_filter(sample_data):
     manager = DummyManager(sample_data)
@@ -104,3 +115,62 @@ def test_sorting(search_filter, sample_data):
 def test_extract_all_tags(search_filter):
     tags = search_filter.extract_all_tags()
     assert set(tags) == {'tag1', 'tag2'}
+
+
+def test_base_model_filter_uses_facet_index(search_filter, tmp_path, monkeypatch):
+    index = ModelInfoIndex(str(tmp_path / 'index.json'))
+    index.update('1', {'modelVersions': [{'baseModel': 'SDXL 1.0'}]}, mtime=1)
+    index.update('2', {'modelVersions': [{'baseModel': 'SD 1.5'}]}, mtime=1)
+    monkeypatch.setattr(search_filter, '_info_index', index)
+
+    result = search_filter.get_filtered_shortcuts(base_models=['SDXL 1.0', '3'])
+    # '3' has no record and falls back to the model processor
+    assert [r['id'] for r in result] == ['1', '3']
+
+
+def test_downloaded_filter(search_filter):
+    downloaded = search_filter.get_filtered_shortcuts(downloaded=True, downloaded_ids=['2', 3])
+    assert [r['id'] for r in downloaded] == ['2', '3']
+    missing = search_filter.get_filtered_shortcuts(downloaded=False, downloaded_ids=['2'])
+    assert [r['id'] for r in missing] == ['1', '3']
+    assert search_filter.get_filtered_shortcuts(downloaded=True, downloaded_ids=[]) == []
+
+
+def test_facet_counts_apply_other_filters(search_filter, monkeypatch):
+    from scripts.civitai_manager_libs import settings
+    import scripts.civitai_manager_libs.classification as clsmod
+
+    monkeypatch.setattr(settings, 'UI_TYPENAMES', {'A': 'typeA', 'B': 'typeB'})
+    CISC = {'cat': {'shortcuts': ['1', '2']}}
+    monkeypatch.setattr(clsmod, 'load', lambda: CISC)
+
+    counts = search_filter.get_facet_counts(shortcut_types=['A'], search='#tag2')
+    # Type counts ignore the type filter itself, classification counts apply it
+    assert counts['types'] == {'A': 2}
+    assert counts['classifications'] == {'cat': 1}
+    assert counts['base_models'] == {}
+
+
+class VersionedManager(DummyManager):
+    version = 1
+    loads = 0
+
+    def load_shortcuts(self):
+        self.loads += 1
+        return self._data
+
+
+def test_result_view_is_sorted_and_cached(sample_data):
+    manager = VersionedManager(sample_data)
+    search_filter = ShortcutSearchFilter(manager, DummyModelProcessor())
+
+    assert search_filter.get_result_view(sort_by='id') == ['3', '2', '1']
+    assert search_filter.get_result_view(search='#tag2') == ['1', '3']
+    loads = manager.loads
+    assert search_filter.get_result_view(search='#tag2') == ['1', '3']
+    assert manager.loads == loads
+
+    sample_data['4'] = {'id': '4', 'name': 'Aardvark', 'tags': ['tag2']}
+    manager.version = 2
+    assert search_filter.get_result_view(search='#tag2') == ['4', '1', '3']
+    assert [v['id'] for v in search_filter.get_shortcuts_by_ids(['3', 'x', '1'])] == ['3', '1']